@@ -0,0 +1,49 @@
+"""Add HNSW indexes on passage embeddings
+
+Revision ID: 3d2b8e1f6a4c
+Revises: 495f3f474131
+Create Date: 2025-07-14 10:21:37.412309
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from letta.constants import PGVECTOR_HNSW_INDEX_DIM
+from letta.settings import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "3d2b8e1f6a4c"
+down_revision: Union[str, None] = "495f3f474131"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# pgvector caps HNSW at 2000 dims, so index the leading PGVECTOR_HNSW_INDEX_DIM dims of the zero-padded column.
+# This expression must stay in sync with `hnsw_embedding_expression` in letta/services/helpers/agent_manager_helper.py.
+EMBEDDING_INDEX_EXPRESSION = f"(((embedding)::real[])[1:{PGVECTOR_HNSW_INDEX_DIM}]::vector({PGVECTOR_HNSW_INDEX_DIM}))"
+
+PASSAGE_INDEXES = {
+    "agent_passages": "agent_passages_embedding_hnsw_idx",
+    "source_passages": "source_passages_embedding_hnsw_idx",
+}
+
+
+def upgrade() -> None:
+    # Building an HNSW index over a large table takes a while, so build concurrently to avoid blocking writes
+    with op.get_context().autocommit_block():
+        for table_name, index_name in PASSAGE_INDEXES.items():
+            op.execute(
+                sa.text(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table_name} "
+                    f"USING hnsw ({EMBEDDING_INDEX_EXPRESSION} vector_cosine_ops) "
+                    f"WITH (m = {settings.pg_hnsw_m}, ef_construction = {settings.pg_hnsw_ef_construction})"
+                )
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name in PASSAGE_INDEXES.values():
+            op.execute(sa.text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
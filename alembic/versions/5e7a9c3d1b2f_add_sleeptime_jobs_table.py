@@ -0,0 +1,64 @@
+"""add sleeptime jobs table
+
+Revision ID: 5e7a9c3d1b2f
+Revises: 8c1f4e2a9b7d
+Create Date: 2025-07-21 10:12:37.402918
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e7a9c3d1b2f"
+down_revision: Union[str, None] = "8c1f4e2a9b7d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sleeptime_jobs",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("run_id", sa.String(), nullable=False),
+        sa.Column("group_id", sa.String(), nullable=False),
+        sa.Column("foreground_agent_id", sa.String(), nullable=False),
+        sa.Column("sleeptime_agent_id", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("after_message_id", sa.String(), nullable=True),
+        sa.Column("first_message_id", sa.String(), nullable=False),
+        sa.Column("last_message_id", sa.String(), nullable=False),
+        sa.Column("use_assistant_message", sa.Boolean(), nullable=False),
+        sa.Column("claimed_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.Column("is_deleted", sa.Boolean(), server_default=sa.text("FALSE"), nullable=False),
+        sa.Column("_created_by_id", sa.String(), nullable=True),
+        sa.Column("_last_updated_by_id", sa.String(), nullable=True),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(["run_id"], ["jobs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["group_id"], ["groups.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["foreground_agent_id"], ["agents.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["sleeptime_agent_id"], ["agents.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_sleeptime_jobs_status_created_at", "sleeptime_jobs", ["status", "created_at"], unique=False)
+    op.create_index("ix_sleeptime_jobs_sleeptime_agent_id", "sleeptime_jobs", ["sleeptime_agent_id"], unique=False)
+    op.create_index(
+        "uq_sleeptime_jobs_pending_agent",
+        "sleeptime_jobs",
+        ["sleeptime_agent_id"],
+        unique=True,
+        postgresql_where=sa.text("status = 'created'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_sleeptime_jobs_pending_agent", table_name="sleeptime_jobs")
+    op.drop_index("ix_sleeptime_jobs_sleeptime_agent_id", table_name="sleeptime_jobs")
+    op.drop_index("ix_sleeptime_jobs_status_created_at", table_name="sleeptime_jobs")
+    op.drop_table("sleeptime_jobs")
@@ -0,0 +1,101 @@
+"""Store passage embeddings at native dimension
+
+Revision ID: 8c1f4e2a9b7d
+Revises: 3d2b8e1f6a4c
+Create Date: 2025-07-16 15:42:08.118734
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from letta.settings import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "8c1f4e2a9b7d"
+down_revision: Union[str, None] = "3d2b8e1f6a4c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PASSAGE_TABLES = ["agent_passages", "source_passages"]
+PADDED_EMBEDDING_DIM = 4096
+
+# Frozen at this revision: the dimensions PGVECTOR_HNSW_INDEXED_DIMS listed when these indexes were created. Indexes for
+# dimensions added to it later belong in their own migration.
+INDEXED_DIMS = (384, 512, 768, 1024, 1536)
+# The prefix the indexes of 3d2b8e1f6a4c were built over, restored on downgrade
+PADDED_INDEX_DIM = 2000
+
+
+def upgrade() -> None:
+    # The prefix indexes from 3d2b8e1f6a4c depend on the fixed-width column type
+    with op.get_context().autocommit_block():
+        for table_name in PASSAGE_TABLES:
+            op.execute(sa.text(f"DROP INDEX CONCURRENTLY IF EXISTS {table_name}_embedding_hnsw_idx"))
+
+    for table_name in PASSAGE_TABLES:
+        op.execute(sa.text(f"ALTER TABLE {table_name} ALTER COLUMN embedding TYPE vector"))
+
+        # Strip the zero padding down to the dimension recorded in each row's embedding config. Rows with anything
+        # non-zero past that dimension keep their full width; scripts/migrate_passage_embeddings.py trims those by
+        # their last non-zero value instead.
+        op.execute(
+            sa.text(
+                f"""
+                UPDATE {table_name}
+                SET embedding = ((embedding::real[])[1:(embedding_config->>'embedding_dim')::int])::vector
+                WHERE vector_dims(embedding) = {PADDED_EMBEDDING_DIM}
+                  AND (embedding_config->>'embedding_dim')::int < {PADDED_EMBEDDING_DIM}
+                  AND NOT EXISTS (
+                      SELECT 1
+                      FROM unnest((embedding::real[])[(embedding_config->>'embedding_dim')::int + 1:{PADDED_EMBEDDING_DIM}]) AS tail(value)
+                      WHERE tail.value <> 0
+                  )
+                """
+            )
+        )
+
+    # HNSW needs a fixed dimension, so index each common dimension separately as a partial expression index
+    with op.get_context().autocommit_block():
+        for table_name in PASSAGE_TABLES:
+            for dim in INDEXED_DIMS:
+                op.execute(
+                    sa.text(
+                        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {table_name}_embedding_{dim}_hnsw_idx ON {table_name} "
+                        f"USING hnsw ((embedding::vector({dim})) vector_cosine_ops) "
+                        f"WITH (m = {settings.pg_hnsw_m}, ef_construction = {settings.pg_hnsw_ef_construction}) "
+                        f"WHERE vector_dims(embedding) = {dim}"
+                    )
+                )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table_name in PASSAGE_TABLES:
+            for dim in INDEXED_DIMS:
+                op.execute(sa.text(f"DROP INDEX CONCURRENTLY IF EXISTS {table_name}_embedding_{dim}_hnsw_idx"))
+
+    for table_name in PASSAGE_TABLES:
+        # Re-pad every embedding before restoring the fixed-width column type
+        op.execute(
+            sa.text(
+                f"""
+                UPDATE {table_name}
+                SET embedding = (embedding::real[] || array_fill(0::real, ARRAY[{PADDED_EMBEDDING_DIM} - vector_dims(embedding)]))::vector
+                WHERE vector_dims(embedding) < {PADDED_EMBEDDING_DIM}
+                """
+            )
+        )
+        op.execute(sa.text(f"ALTER TABLE {table_name} ALTER COLUMN embedding TYPE vector({PADDED_EMBEDDING_DIM})"))
+
+    with op.get_context().autocommit_block():
+        for table_name in PASSAGE_TABLES:
+            op.execute(
+                sa.text(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {table_name}_embedding_hnsw_idx ON {table_name} "
+                    f"USING hnsw ((((embedding)::real[])[1:{PADDED_INDEX_DIM}]::vector({PADDED_INDEX_DIM})) vector_cosine_ops) "
+                    f"WITH (m = {settings.pg_hnsw_m}, ef_construction = {settings.pg_hnsw_ef_construction})"
+                )
+            )
@@ -0,0 +1,34 @@
+"""add message blobs table
+
+Revision ID: 9d4b6f1e2c3a
+Revises: 5e7a9c3d1b2f
+Create Date: 2025-07-24 14:03:51.118204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4b6f1e2c3a"
+down_revision: Union[str, None] = "5e7a9c3d1b2f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "message_blobs",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("message_blobs")
@@ -0,0 +1,27 @@
+"""add token counts to messages
+
+Revision ID: b7e3a1c9d5f2
+Revises: 9d4b6f1e2c3a
+Create Date: 2025-07-28 09:41:26.583017
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e3a1c9d5f2"
+down_revision: Union[str, None] = "9d4b6f1e2c3a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("messages", sa.Column("token_counts", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("messages", "token_counts")
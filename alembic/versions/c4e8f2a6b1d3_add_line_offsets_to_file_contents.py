@@ -0,0 +1,29 @@
+"""add line offsets to file contents
+
+Revision ID: c4e8f2a6b1d3
+Revises: b7e3a1c9d5f2
+Create Date: 2025-07-29 14:12:08.271904
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e8f2a6b1d3"
+down_revision: Union[str, None] = "b7e3a1c9d5f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("file_contents", sa.Column("line_offsets", sa.LargeBinary(), nullable=True))
+    op.add_column("file_contents", sa.Column("line_chunking_strategy", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("file_contents", "line_chunking_strategy")
+    op.drop_column("file_contents", "line_offsets")
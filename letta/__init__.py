@@ -1,5 +1,7 @@
+import importlib
 import os
 from importlib.metadata import PackageNotFoundError, version
+from typing import TYPE_CHECKING
 
 try:
     __version__ = version("letta")
@@ -11,24 +13,69 @@ if os.environ.get("LETTA_VERSION"):
     __version__ = os.environ["LETTA_VERSION"]
 
 
-# import clients
-from letta.client.client import RESTClient
-
-# imports for easier access
-from letta.schemas.agent import AgentState
-from letta.schemas.block import Block
-from letta.schemas.embedding_config import EmbeddingConfig
-from letta.schemas.enums import JobStatus
-from letta.schemas.file import FileMetadata
-from letta.schemas.job import Job
-from letta.schemas.letta_message import LettaMessage
-from letta.schemas.letta_stop_reason import LettaStopReason
-from letta.schemas.llm_config import LLMConfig
-from letta.schemas.memory import ArchivalMemorySummary, BasicBlockMemory, ChatMemory, Memory, RecallMemorySummary
-from letta.schemas.message import Message
-from letta.schemas.organization import Organization
-from letta.schemas.passage import Passage
-from letta.schemas.source import Source
-from letta.schemas.tool import Tool
-from letta.schemas.usage import LettaUsageStatistics
-from letta.schemas.user import User
+# The client and schemas below are re-exported for easier access, but importing them pulls in the ORM, pydantic models
+# and provider SDKs, so they are only imported on first attribute access (PEP 562), e.g. `from letta import AgentState`.
+# This keeps `import letta` and CLI startup fast for code that only needs a submodule.
+_LAZY_ATTRIBUTES = {
+    # clients
+    "RESTClient": "letta.client.client",
+    # schemas
+    "AgentState": "letta.schemas.agent",
+    "Block": "letta.schemas.block",
+    "EmbeddingConfig": "letta.schemas.embedding_config",
+    "JobStatus": "letta.schemas.enums",
+    "FileMetadata": "letta.schemas.file",
+    "Job": "letta.schemas.job",
+    "LettaMessage": "letta.schemas.letta_message",
+    "LettaStopReason": "letta.schemas.letta_stop_reason",
+    "LLMConfig": "letta.schemas.llm_config",
+    "ArchivalMemorySummary": "letta.schemas.memory",
+    "BasicBlockMemory": "letta.schemas.memory",
+    "ChatMemory": "letta.schemas.memory",
+    "Memory": "letta.schemas.memory",
+    "RecallMemorySummary": "letta.schemas.memory",
+    "Message": "letta.schemas.message",
+    "Organization": "letta.schemas.organization",
+    "Passage": "letta.schemas.passage",
+    "Source": "letta.schemas.source",
+    "Tool": "letta.schemas.tool",
+    "LettaUsageStatistics": "letta.schemas.usage",
+    "User": "letta.schemas.user",
+}
+
+__all__ = ["__version__", *_LAZY_ATTRIBUTES]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    # cache it, so later lookups don't go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+if TYPE_CHECKING:
+    from letta.client.client import RESTClient
+    from letta.schemas.agent import AgentState
+    from letta.schemas.block import Block
+    from letta.schemas.embedding_config import EmbeddingConfig
+    from letta.schemas.enums import JobStatus
+    from letta.schemas.file import FileMetadata
+    from letta.schemas.job import Job
+    from letta.schemas.letta_message import LettaMessage
+    from letta.schemas.letta_stop_reason import LettaStopReason
+    from letta.schemas.llm_config import LLMConfig
+    from letta.schemas.memory import ArchivalMemorySummary, BasicBlockMemory, ChatMemory, Memory, RecallMemorySummary
+    from letta.schemas.message import Message
+    from letta.schemas.organization import Organization
+    from letta.schemas.passage import Passage
+    from letta.schemas.source import Source
+    from letta.schemas.tool import Tool
+    from letta.schemas.usage import LettaUsageStatistics
+    from letta.schemas.user import User
@@ -63,6 +63,7 @@ from letta.services.helpers.agent_manager_helper import check_supports_structure
 from letta.services.helpers.tool_parser_helper import runtime_override_tool_json_schema
 from letta.services.job_manager import JobManager
 from letta.services.mcp.base_client import AsyncBaseMCPClient
+from letta.services.message_blob_store import message_blob_store
 from letta.services.message_manager import MessageManager
 from letta.services.passage_manager import PassageManager
 from letta.services.provider_manager import ProviderManager
@@ -1432,7 +1433,7 @@ class Agent(BaseAgent):
             self.passage_manager.agent_passage_size_async(actor=self.user, agent_id=self.agent_state.id),
             self.message_manager.size_async(actor=self.user, agent_id=self.agent_state.id),
         )
-        in_context_messages_anthropic = [m.to_anthropic_dict() for m in in_context_messages]
+        in_context_messages_anthropic = [m.to_anthropic_dict() for m in await message_blob_store.load_images_async(in_context_messages)]
 
         # Extract system, memory and external summary
         if (
@@ -90,13 +90,15 @@ class BaseAgent(ABC):
         tool_rules_solver: Optional[ToolRulesSolver] = None,
         num_messages: Optional[int] = None,  # storing these calculations is specific to the voice agent
         num_archival_memories: Optional[int] = None,
+        refresh_memory: bool = True,
     ) -> List[Message]:
         """
         Async version of function above. For now before breaking up components, changes should be made in both places.
         """
         try:
-            # [DB Call] loading blocks (modifies: agent_state.memory.blocks)
-            agent_state = await self.agent_manager.refresh_memory_async(agent_state=agent_state, actor=self.actor)
+            if refresh_memory:
+                # [DB Call] loading blocks (modifies: agent_state.memory.blocks)
+                agent_state = await self.agent_manager.refresh_memory_async(agent_state=agent_state, actor=self.actor)
 
             tool_constraint_block = None
             if tool_rules_solver is not None:
@@ -106,7 +106,9 @@ async def _prepare_in_context_messages_async(
         current_in_context_messages = [await message_manager.get_message_by_id_async(message_id=agent_state.message_ids[0], actor=actor)]
     else:
         # Otherwise, include the full list of messages by ID for context
-        current_in_context_messages = await message_manager.get_messages_by_ids_async(message_ids=agent_state.message_ids, actor=actor)
+        current_in_context_messages = await message_manager.get_in_context_messages_async(
+            agent_id=agent_state.id, message_ids=agent_state.message_ids, actor=actor
+        )
 
     # Create a new user message from the input and store it
     new_in_context_messages = await message_manager.create_many_messages_async(
@@ -143,7 +145,9 @@ async def _prepare_in_context_messages_no_persist_async(
         current_in_context_messages = [await message_manager.get_message_by_id_async(message_id=agent_state.message_ids[0], actor=actor)]
     else:
         # Otherwise, include the full list of messages by ID for context
-        current_in_context_messages = await message_manager.get_messages_by_ids_async(message_ids=agent_state.message_ids, actor=actor)
+        current_in_context_messages = await message_manager.get_in_context_messages_async(
+            agent_id=agent_state.id, message_ids=agent_state.message_ids, actor=actor
+        )
 
     # Create a new user message from the input but dont store it yet
     new_in_context_messages = create_input_messages(
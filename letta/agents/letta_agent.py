@@ -47,9 +47,11 @@ from letta.schemas.provider_trace import ProviderTraceCreate
 from letta.schemas.tool_execution_result import ToolExecutionResult
 from letta.schemas.usage import LettaUsageStatistics
 from letta.schemas.user import User
-from letta.server.rest_api.utils import create_letta_messages_from_llm_response
+from letta.server.db import db_registry
+from letta.server.rest_api.utils import create_letta_messages_from_llm_response, create_letta_messages_from_parallel_llm_response
 from letta.services.agent_manager import AgentManager
 from letta.services.block_manager import BlockManager
+from letta.services.context_window_calculator.prompt_token_estimator import context_window_budget, prompt_token_estimator
 from letta.services.helpers.tool_parser_helper import runtime_override_tool_json_schema
 from letta.services.job_manager import JobManager
 from letta.services.message_manager import MessageManager
@@ -68,6 +70,17 @@ logger = get_logger(__name__)
 
 DEFAULT_SUMMARY_BLOCK_LABEL = "conversation_summary"
 
+# Relationships of the agent state the agent loop reads; callers that already load the agent can include these and pass it in
+AGENT_STEP_RELATIONSHIPS = ["tools", "memory", "tool_exec_environment_variables", "sources"]
+
+# Tools that edit the agent's own memory or files; these aren't run concurrently with each other in parallel tool calls
+SERIAL_TOOL_TYPES = {
+    ToolType.LETTA_MEMORY_CORE,
+    ToolType.LETTA_SLEEPTIME_CORE,
+    ToolType.LETTA_VOICE_SLEEPTIME_CORE,
+    ToolType.LETTA_FILES_CORE,
+}
+
 
 class LettaAgent(BaseAgent):
     def __init__(
@@ -112,6 +125,9 @@ class LettaAgent(BaseAgent):
         self.num_messages = None
         self.num_archival_memories = None
 
+        # Whether the agent state's memory blocks were loaded in this request and haven't been rebuilt into the context yet
+        self._memory_freshly_loaded = False
+
         self.summarization_agent = None
         self.summary_block_label = summary_block_label
         self.max_summarization_retries = max_summarization_retries
@@ -156,6 +172,17 @@ class LettaAgent(BaseAgent):
             logger.warning(f"Failed to check job cancellation status for job {self.current_run_id}: {e}")
             return False
 
+    async def _load_agent_state(self, agent_state: Optional[AgentState] = None) -> AgentState:
+        """Use the agent state the caller loaded for this request (with `AGENT_STEP_RELATIONSHIPS`), or load it."""
+        if agent_state is None:
+            agent_state = await self.agent_manager.get_agent_by_id_async(
+                agent_id=self.agent_id,
+                include_relationships=AGENT_STEP_RELATIONSHIPS,
+                actor=self.actor,
+            )
+        self._memory_freshly_loaded = True
+        return agent_state
+
     @trace_method
     async def step(
         self,
@@ -166,13 +193,10 @@ class LettaAgent(BaseAgent):
         request_start_timestamp_ns: int | None = None,
         include_return_message_types: list[MessageType] | None = None,
         dry_run: bool = False,
+        agent_state: Optional[AgentState] = None,
     ) -> Union[LettaResponse, dict]:
         # TODO (cliandy): pass in run_id and use at send_message endpoints for all step functions
-        agent_state = await self.agent_manager.get_agent_by_id_async(
-            agent_id=self.agent_id,
-            include_relationships=["tools", "memory", "tool_exec_environment_variables", "sources"],
-            actor=self.actor,
-        )
+        agent_state = await self._load_agent_state(agent_state)
         result = await self._step(
             agent_state=agent_state,
             input_messages=input_messages,
@@ -203,12 +227,9 @@ class LettaAgent(BaseAgent):
         use_assistant_message: bool = True,
         request_start_timestamp_ns: int | None = None,
         include_return_message_types: list[MessageType] | None = None,
+        agent_state: Optional[AgentState] = None,
     ):
-        agent_state = await self.agent_manager.get_agent_by_id_async(
-            agent_id=self.agent_id,
-            include_relationships=["tools", "memory", "tool_exec_environment_variables", "sources"],
-            actor=self.actor,
-        )
+        agent_state = await self._load_agent_state(agent_state)
         current_in_context_messages, new_in_context_messages = await _prepare_in_context_messages_no_persist_async(
             input_messages, agent_state, self.message_manager, self.actor
         )
@@ -267,7 +288,7 @@ class LettaAgent(BaseAgent):
             if not response.choices[0].message.tool_calls:
                 # TODO: make into a real error
                 raise ValueError("No tool calls found in response, model must make a tool call")
-            tool_call = response.choices[0].message.tool_calls[0]
+            tool_calls = response.choices[0].message.tool_calls
             if response.choices[0].message.reasoning_content:
                 reasoning = [
                     ReasoningContent(
@@ -284,18 +305,32 @@ class LettaAgent(BaseAgent):
                 self.logger.info("No reasoning content found.")
                 reasoning = None
 
-            persisted_messages, should_continue, stop_reason = await self._handle_ai_response(
-                tool_call,
-                valid_tool_names,
-                agent_state,
-                tool_rules_solver,
-                response.usage,
-                reasoning_content=reasoning,
-                step_id=step_id,
-                initial_messages=initial_messages,
-                agent_step_span=agent_step_span,
-                is_final_step=(i == max_steps - 1),
-            )
+            if agent_state.llm_config.parallel_tool_calls and len(tool_calls) > 1:
+                persisted_messages, should_continue, stop_reason = await self._handle_parallel_ai_response(
+                    tool_calls,
+                    valid_tool_names,
+                    agent_state,
+                    tool_rules_solver,
+                    response.usage,
+                    reasoning_content=reasoning,
+                    step_id=step_id,
+                    initial_messages=initial_messages,
+                    agent_step_span=agent_step_span,
+                    is_final_step=(i == max_steps - 1),
+                )
+            else:
+                persisted_messages, should_continue, stop_reason = await self._handle_ai_response(
+                    tool_calls[0],
+                    valid_tool_names,
+                    agent_state,
+                    tool_rules_solver,
+                    response.usage,
+                    reasoning_content=reasoning,
+                    step_id=step_id,
+                    initial_messages=initial_messages,
+                    agent_step_span=agent_step_span,
+                    is_final_step=(i == max_steps - 1),
+                )
 
             # TODO (cliandy): handle message contexts with larger refactor and dedupe logic
             new_message_idx = len(initial_messages) if initial_messages else 0
@@ -311,7 +346,7 @@ class LettaAgent(BaseAgent):
             agent_step_span.end()
 
             # Log LLM Trace
-            await self.telemetry_manager.create_provider_trace_async(
+            await self.telemetry_manager.enqueue_provider_trace_async(
                 actor=self.actor,
                 provider_trace_create=ProviderTraceCreate(
                     request_json=request_data,
@@ -441,7 +476,7 @@ class LettaAgent(BaseAgent):
             if not response.choices[0].message.tool_calls:
                 # TODO: make into a real error
                 raise ValueError("No tool calls found in response, model must make a tool call")
-            tool_call = response.choices[0].message.tool_calls[0]
+            tool_calls = response.choices[0].message.tool_calls
             if response.choices[0].message.reasoning_content:
                 reasoning = [
                     ReasoningContent(
@@ -458,19 +493,34 @@ class LettaAgent(BaseAgent):
                 self.logger.info("No reasoning content found.")
                 reasoning = None
 
-            persisted_messages, should_continue, stop_reason = await self._handle_ai_response(
-                tool_call,
-                valid_tool_names,
-                agent_state,
-                tool_rules_solver,
-                response.usage,
-                reasoning_content=reasoning,
-                step_id=step_id,
-                initial_messages=initial_messages,
-                agent_step_span=agent_step_span,
-                is_final_step=(i == max_steps - 1),
-                run_id=run_id,
-            )
+            if agent_state.llm_config.parallel_tool_calls and len(tool_calls) > 1:
+                persisted_messages, should_continue, stop_reason = await self._handle_parallel_ai_response(
+                    tool_calls,
+                    valid_tool_names,
+                    agent_state,
+                    tool_rules_solver,
+                    response.usage,
+                    reasoning_content=reasoning,
+                    step_id=step_id,
+                    initial_messages=initial_messages,
+                    agent_step_span=agent_step_span,
+                    is_final_step=(i == max_steps - 1),
+                    run_id=run_id,
+                )
+            else:
+                persisted_messages, should_continue, stop_reason = await self._handle_ai_response(
+                    tool_calls[0],
+                    valid_tool_names,
+                    agent_state,
+                    tool_rules_solver,
+                    response.usage,
+                    reasoning_content=reasoning,
+                    step_id=step_id,
+                    initial_messages=initial_messages,
+                    agent_step_span=agent_step_span,
+                    is_final_step=(i == max_steps - 1),
+                    run_id=run_id,
+                )
             new_message_idx = len(initial_messages) if initial_messages else 0
             self.response_messages.extend(persisted_messages[new_message_idx:])
             new_in_context_messages.extend(persisted_messages[new_message_idx:])
@@ -485,7 +535,7 @@ class LettaAgent(BaseAgent):
             agent_step_span.end()
 
             # Log LLM Trace
-            await self.telemetry_manager.create_provider_trace_async(
+            await self.telemetry_manager.enqueue_provider_trace_async(
                 actor=self.actor,
                 provider_trace_create=ProviderTraceCreate(
                     request_json=request_data,
@@ -544,6 +594,7 @@ class LettaAgent(BaseAgent):
         use_assistant_message: bool = True,
         request_start_timestamp_ns: int | None = None,
         include_return_message_types: list[MessageType] | None = None,
+        agent_state: Optional[AgentState] = None,
     ) -> AsyncGenerator[str, None]:
         """
         Carries out an invocation of the agent loop in a streaming fashion that yields partial tokens.
@@ -553,11 +604,7 @@ class LettaAgent(BaseAgent):
             3. Fetches a response from the LLM
             4. Processes the response
         """
-        agent_state = await self.agent_manager.get_agent_by_id_async(
-            agent_id=self.agent_id,
-            include_relationships=["tools", "memory", "tool_exec_environment_variables", "sources"],
-            actor=self.actor,
-        )
+        agent_state = await self._load_agent_state(agent_state)
         current_in_context_messages, new_in_context_messages = await _prepare_in_context_messages_no_persist_async(
             input_messages, agent_state, self.message_manager, self.actor
         )
@@ -707,7 +754,7 @@ class LettaAgent(BaseAgent):
 
             # Log LLM Trace
             # TODO (cliandy): we are piecing together the streamed response here. Content here does not match the actual response schema.
-            await self.telemetry_manager.create_provider_trace_async(
+            await self.telemetry_manager.enqueue_provider_trace_async(
                 actor=self.actor,
                 provider_trace_create=ProviderTraceCreate(
                     request_json=request_data,
@@ -788,6 +835,14 @@ class LettaAgent(BaseAgent):
                 )
                 log_event("agent.stream_no_tokens.llm_request.created")
 
+                if attempt < self.max_summarization_retries:
+                    rebuilt_in_context_messages = await self._preflight_context_window(
+                        request_data, current_in_context_messages, new_in_context_messages, agent_state.llm_config
+                    )
+                    if rebuilt_in_context_messages is not None:
+                        current_in_context_messages, new_in_context_messages = rebuilt_in_context_messages, []
+                        continue
+
                 async with AsyncTimer() as timer:
                     # Attempt LLM request
                     response = await llm_client.request_async(request_data, agent_state.llm_config)
@@ -836,9 +891,19 @@ class LettaAgent(BaseAgent):
                     in_context_messages=current_in_context_messages + new_in_context_messages,
                     agent_state=agent_state,
                     tool_rules_solver=tool_rules_solver,
+                    # the streaming interfaces only follow a single tool call
+                    allow_parallel_tool_calls=False,
                 )
                 log_event("agent.stream.llm_request.created")  # [2^]
 
+                if attempt < self.max_summarization_retries:
+                    rebuilt_in_context_messages = await self._preflight_context_window(
+                        request_data, current_in_context_messages, new_in_context_messages, agent_state.llm_config
+                    )
+                    if rebuilt_in_context_messages is not None:
+                        current_in_context_messages, new_in_context_messages = rebuilt_in_context_messages, []
+                        continue
+
                 provider_request_start_timestamp_ns = get_utc_timestamp_ns()
                 if first_chunk and ttft_span is not None:
                     request_start_to_provider_request_start_ns = provider_request_start_timestamp_ns - request_start_timestamp_ns
@@ -873,6 +938,46 @@ class LettaAgent(BaseAgent):
                 new_in_context_messages: list[Message] = []
                 log_event(f"agent.stream_no_tokens.retry_attempt.{attempt + 1}")
 
+    async def _preflight_context_window(
+        self,
+        request_data: dict,
+        in_context_messages: list[Message],
+        new_in_context_messages: list[Message],
+        llm_config: LLMConfig,
+    ) -> list[Message] | None:
+        """
+        Estimate the request's prompt tokens before sending it, and evict messages (summarizing them) if the estimate is over
+        the context window budget, rather than spending a round trip on a request the provider will reject.
+        Returns the rebuilt in-context messages, or None if the request can be sent as is.
+        """
+        budget = context_window_budget(llm_config)
+        if budget is None:
+            return None
+        try:
+            estimated_tokens = await prompt_token_estimator.estimate_async(
+                in_context_messages + new_in_context_messages, request_data.get("tools"), model=llm_config.model
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to estimate prompt tokens, sending the request without a pre-flight check: {e}")
+            return None
+        if estimated_tokens <= budget:
+            return None
+
+        log_event("agent.preflight.context_window_exceeded", {"estimated_tokens": estimated_tokens, "budget": budget})
+        try:
+            return await self._rebuild_context_window(
+                in_context_messages=in_context_messages,
+                new_letta_messages=new_in_context_messages,
+                llm_config=llm_config,
+                total_tokens=estimated_tokens,
+                force=True,
+                clear=False,
+            )
+        except Exception:
+            # the estimate is only approximate, so let the provider decide
+            self.logger.exception(f"Failed to summarize context estimated at {estimated_tokens} tokens, sending the request as is")
+            return None
+
     @trace_method
     async def _handle_llm_error(
         self,
@@ -898,18 +1003,19 @@ class LettaAgent(BaseAgent):
         llm_config: LLMConfig,
         total_tokens: int | None = None,
         force: bool = False,
+        clear: bool = True,
     ) -> list[Message]:
         # If total tokens is reached, we truncate down
         # TODO: This can be broken by bad configs, e.g. lower bound too high, initial messages too fat, etc.
         if force or (total_tokens and total_tokens > llm_config.context_window):
             self.logger.warning(
-                f"Total tokens {total_tokens} exceeds configured max tokens {llm_config.context_window}, forcefully clearing message history."
+                f"Total tokens {total_tokens} exceeds configured max tokens {llm_config.context_window}, forcefully {'clearing' if clear else 'trimming'} message history."
             )
             new_in_context_messages, updated = await self.summarizer.summarize(
                 in_context_messages=in_context_messages,
                 new_letta_messages=new_letta_messages,
                 force=True,
-                clear=True,
+                clear=clear,
             )
         else:
             self.logger.info(
@@ -932,7 +1038,9 @@ class LettaAgent(BaseAgent):
         """Called when the developer explicitly triggers compaction via the API"""
         agent_state = await self.agent_manager.get_agent_by_id_async(agent_id=self.agent_id, actor=self.actor)
         message_ids = agent_state.message_ids
-        in_context_messages = await self.message_manager.get_messages_by_ids_async(message_ids=message_ids, actor=self.actor)
+        in_context_messages = await self.message_manager.get_in_context_messages_async(
+            agent_id=self.agent_id, message_ids=message_ids, actor=self.actor
+        )
         new_in_context_messages, updated = await self.summarizer.summarize(
             in_context_messages=in_context_messages, new_letta_messages=[], force=True
         )
@@ -947,6 +1055,7 @@ class LettaAgent(BaseAgent):
         in_context_messages: list[Message],
         agent_state: AgentState,
         tool_rules_solver: ToolRulesSolver,
+        allow_parallel_tool_calls: bool = True,
     ) -> tuple[dict, list[str]]:
         self.num_messages, self.num_archival_memories = await asyncio.gather(
             (
@@ -966,7 +1075,10 @@ class LettaAgent(BaseAgent):
             num_messages=self.num_messages,
             num_archival_memories=self.num_archival_memories,
             tool_rules_solver=tool_rules_solver,
+            # the blocks were just loaded, so only later steps need to pick up the tools' memory edits
+            refresh_memory=not self._memory_freshly_loaded,
         )
+        self._memory_freshly_loaded = False
 
         tools = [
             t
@@ -1004,10 +1116,14 @@ class LettaAgent(BaseAgent):
             tool_list=allowed_tools, response_format=agent_state.response_format, request_heartbeat=True
         )
 
+        llm_config = agent_state.llm_config
+        if llm_config.parallel_tool_calls and not allow_parallel_tool_calls:
+            llm_config = llm_config.model_copy(update={"parallel_tool_calls": False})
+
         return (
-            llm_client.build_request_data(
+            await llm_client.build_request_data_async(
                 in_context_messages,
-                agent_state.llm_config,
+                llm_config,
                 allowed_tools,
                 force_tool_call,
             ),
@@ -1094,51 +1210,228 @@ class LettaAgent(BaseAgent):
             is_final_step=is_final_step,
         )
 
-        # 5.  Persist step + messages and propagate to jobs
-        logged_step = await self.step_manager.log_step_async(
-            actor=self.actor,
-            agent_id=agent_state.id,
-            provider_name=agent_state.llm_config.model_endpoint_type,
-            provider_category=agent_state.llm_config.provider_category or "base",
-            model=agent_state.llm_config.model,
-            model_endpoint=agent_state.llm_config.model_endpoint,
-            context_window_limit=agent_state.llm_config.context_window,
-            usage=usage,
-            provider_id=None,
-            job_id=run_id if run_id else self.current_run_id,
-            step_id=step_id,
-            project_id=agent_state.project_id,
+        # 5.  Persist step + messages and propagate to jobs, in one transaction
+        async with db_registry.unit_of_work():
+            logged_step = await self.step_manager.log_step_async(
+                actor=self.actor,
+                agent_id=agent_state.id,
+                provider_name=agent_state.llm_config.model_endpoint_type,
+                provider_category=agent_state.llm_config.provider_category or "base",
+                model=agent_state.llm_config.model,
+                model_endpoint=agent_state.llm_config.model_endpoint,
+                context_window_limit=agent_state.llm_config.context_window,
+                usage=usage,
+                provider_id=None,
+                job_id=run_id if run_id else self.current_run_id,
+                step_id=step_id,
+                project_id=agent_state.project_id,
+            )
+
+            tool_call_messages = create_letta_messages_from_llm_response(
+                agent_id=agent_state.id,
+                model=agent_state.llm_config.model,
+                function_name=tool_call_name,
+                function_arguments=tool_args,
+                tool_execution_result=tool_execution_result,
+                tool_call_id=tool_call_id,
+                function_call_success=tool_execution_result.success_flag,
+                function_response=function_response_string,
+                timezone=agent_state.timezone,
+                actor=self.actor,
+                continue_stepping=continue_stepping,
+                heartbeat_reason=heartbeat_reason,
+                reasoning_content=reasoning_content,
+                pre_computed_assistant_message_id=pre_computed_assistant_message_id,
+                step_id=logged_step.id if logged_step else None,
+            )
+
+            persisted_messages = await self.message_manager.create_many_messages_async(
+                (initial_messages or []) + tool_call_messages, actor=self.actor
+            )
+
+            if run_id:
+                await self.job_manager.add_messages_to_job_async(
+                    job_id=run_id,
+                    message_ids=[m.id for m in persisted_messages if m.role != "user"],
+                    actor=self.actor,
+                )
+
+        return persisted_messages, continue_stepping, stop_reason
+
+    @trace_method
+    async def _handle_parallel_ai_response(
+        self,
+        tool_calls: list[ToolCall],
+        valid_tool_names: list[str],
+        agent_state: AgentState,
+        tool_rules_solver: ToolRulesSolver,
+        usage: UsageStatistics,
+        reasoning_content: list[TextContent | ReasoningContent | RedactedReasoningContent | OmittedReasoningContent] | None = None,
+        step_id: str | None = None,
+        initial_messages: list[Message] | None = None,
+        agent_step_span: Optional["Span"] = None,
+        is_final_step: bool | None = None,
+        run_id: str | None = None,
+    ) -> tuple[list[Message], bool, LettaStopReason | None]:
+        """
+        Handle a response with several tool calls (when `llm_config.parallel_tool_calls` is enabled) in a single step.
+
+        Tool rules are checked in the order the model returned the calls, as if they had been made one after another. Calls
+        after a terminal tool, or after a tool whose output decides what may run next, are not run and get an error result
+        instead. The remaining calls are executed concurrently, at most `llm_config.max_parallel_tool_calls` at a time, and
+        their messages are persisted in call order in one batch, except that the tool message of the call the next tool rules
+        are decided by (the blocking call, or else the last call that was run) is persisted last.
+        """
+        # 1.  Parse the calls and check them against the tool rules in order
+        tool_call_names = [tool_call.function.name for tool_call in tool_calls]
+        tool_call_ids = [tool_call.id or f"call_{uuid.uuid4().hex[:8]}" for tool_call in tool_calls]
+        tool_args_list, request_heartbeats = [], []
+        for tool_call in tool_calls:
+            tool_args = _safe_load_tool_call_str(tool_call.function.arguments)
+            request_heartbeats.append(_pop_heartbeat(tool_args))
+            tool_args.pop(INNER_THOUGHTS_KWARG, None)
+            tool_args_list.append(tool_args)
+
+        available_tools = set(t.name for t in agent_state.tools)
+        planning_solver = tool_rules_solver.model_copy(update={"tool_call_history": list(tool_rules_solver.tool_call_history)})
+        allowed_tool_names = valid_tool_names
+        tool_execution_results: list[ToolExecutionResult | None] = [None] * len(tool_calls)
+        tool_rule_violations = [False] * len(tool_calls)
+        blocking_tool_name = None
+        response_index = len(tool_calls) - 1
+        for i, tool_call_name in enumerate(tool_call_names):
+            if blocking_tool_name:
+                tool_rule_violations[i] = True
+                tool_execution_results[i] = ToolExecutionResult(
+                    status="error",
+                    func_return=f"[ToolConstraintError] {tool_call_name} was not run because it was called in parallel with "
+                    f"{blocking_tool_name}, which must be called on its own.",
+                )
+            elif tool_call_name not in allowed_tool_names:
+                tool_rule_violations[i] = True
+                tool_execution_results[i] = _build_rule_violation_result(tool_call_name, allowed_tool_names, planning_solver)
+            else:
+                response_index = i
+                planning_solver.register_tool_call(tool_call_name)
+                if planning_solver.is_terminal_tool(tool_call_name) or planning_solver.is_conditional_tool(tool_call_name):
+                    blocking_tool_name = tool_call_name
+                else:
+                    allowed_tool_names = planning_solver.get_allowed_tool_names(available_tools=available_tools) or list(available_tools)
+
+        log_telemetry(
+            self.logger,
+            "_handle_parallel_ai_response execute tools start",
+            tool_names=tool_call_names,
+            tool_call_ids=tool_call_ids,
+            tool_rule_violations=tool_rule_violations,
         )
 
-        tool_call_messages = create_letta_messages_from_llm_response(
-            agent_id=agent_state.id,
-            model=agent_state.llm_config.model,
-            function_name=tool_call_name,
-            function_arguments=tool_args,
-            tool_execution_result=tool_execution_result,
-            tool_call_id=tool_call_id,
-            function_call_success=tool_execution_result.success_flag,
-            function_response=function_response_string,
+        # 2.  Execute the allowed calls concurrently. Tools that edit the agent's own state run one at a time in call order.
+        semaphore = asyncio.Semaphore(agent_state.llm_config.max_parallel_tool_calls)
+        tool_types = {t.name: t.tool_type for t in agent_state.tools}
+
+        async def execute(i: int):
+            async with semaphore:
+                tool_execution_results[i] = await self._execute_tool(
+                    tool_name=tool_call_names[i],
+                    tool_args=tool_args_list[i],
+                    agent_state=agent_state,
+                    agent_step_span=agent_step_span,
+                    step_id=step_id,
+                )
+
+        async def execute_in_order(indices: list[int]):
+            for i in indices:
+                await execute(i)
+
+        to_execute = [i for i, result in enumerate(tool_execution_results) if result is None]
+        serial = [i for i in to_execute if tool_types.get(tool_call_names[i]) in SERIAL_TOOL_TYPES]
+        await asyncio.gather(execute_in_order(serial), *(execute(i) for i in to_execute if i not in serial))
+
+        log_telemetry(
+            self.logger,
+            "_handle_parallel_ai_response execute tools finish",
+            tool_execution_results=tool_execution_results,
+            tool_call_ids=tool_call_ids,
+        )
+
+        # 3.  Prepare the function-response payloads
+        function_response_strings = []
+        for tool_call_name, tool_execution_result in zip(tool_call_names, tool_execution_results):
+            truncate = tool_call_name not in {"conversation_search", "conversation_search_date", "archival_memory_search"}
+            return_char_limit = next((t.return_char_limit for t in agent_state.tools if t.name == tool_call_name), None)
+            function_response_strings.append(
+                validate_function_response(tool_execution_result.func_return, return_char_limit=return_char_limit, truncate=truncate)
+            )
+        self.last_function_response = package_function_response(
+            was_success=tool_execution_results[response_index].success_flag,
+            response_string=function_response_strings[response_index],
             timezone=agent_state.timezone,
-            actor=self.actor,
-            continue_stepping=continue_stepping,
-            heartbeat_reason=heartbeat_reason,
-            reasoning_content=reasoning_content,
-            pre_computed_assistant_message_id=pre_computed_assistant_message_id,
-            step_id=logged_step.id if logged_step else None,
         )
 
-        persisted_messages = await self.message_manager.create_many_messages_async(
-            (initial_messages or []) + tool_call_messages, actor=self.actor
+        # 4.  Decide whether to keep stepping. A terminal tool ends the step; otherwise any call can ask to continue.
+        continue_stepping, heartbeat_reason, stop_reason = False, None, None
+        for tool_call_name, request_heartbeat, tool_rule_violated in zip(tool_call_names, request_heartbeats, tool_rule_violations):
+            call_continue, call_heartbeat_reason, call_stop_reason = self._decide_tool_call_continuation(
+                request_heartbeat=request_heartbeat,
+                tool_call_name=tool_call_name,
+                tool_rule_violated=tool_rule_violated,
+                tool_rules_solver=tool_rules_solver,
+            )
+            if not tool_rule_violated and tool_rules_solver.is_terminal_tool(tool_call_name):
+                continue_stepping, heartbeat_reason, stop_reason = call_continue, call_heartbeat_reason, call_stop_reason
+                break
+            if call_continue and not continue_stepping:
+                continue_stepping, heartbeat_reason = True, call_heartbeat_reason
+        continue_stepping, heartbeat_reason, stop_reason = self._apply_continuation_overrides(
+            agent_state, tool_rules_solver, is_final_step, continue_stepping, heartbeat_reason, stop_reason
         )
 
-        if run_id:
-            await self.job_manager.add_messages_to_job_async(
-                job_id=run_id,
-                message_ids=[m.id for m in persisted_messages if m.role != "user"],
+        # 5.  Persist step + messages and propagate to jobs, in one transaction
+        async with db_registry.unit_of_work():
+            logged_step = await self.step_manager.log_step_async(
+                actor=self.actor,
+                agent_id=agent_state.id,
+                provider_name=agent_state.llm_config.model_endpoint_type,
+                provider_category=agent_state.llm_config.provider_category or "base",
+                model=agent_state.llm_config.model,
+                model_endpoint=agent_state.llm_config.model_endpoint,
+                context_window_limit=agent_state.llm_config.context_window,
+                usage=usage,
+                provider_id=None,
+                job_id=run_id if run_id else self.current_run_id,
+                step_id=step_id,
+                project_id=agent_state.project_id,
+            )
+
+            tool_call_messages = create_letta_messages_from_parallel_llm_response(
+                agent_id=agent_state.id,
+                model=agent_state.llm_config.model,
+                function_names=tool_call_names,
+                function_arguments=tool_args_list,
+                tool_execution_results=tool_execution_results,
+                tool_call_ids=tool_call_ids,
+                function_responses=function_response_strings,
+                last_response_index=response_index,
+                timezone=agent_state.timezone,
                 actor=self.actor,
+                continue_stepping=continue_stepping,
+                heartbeat_reason=heartbeat_reason,
+                reasoning_content=reasoning_content,
+                step_id=logged_step.id if logged_step else None,
             )
 
+            persisted_messages = await self.message_manager.create_many_messages_async(
+                (initial_messages or []) + tool_call_messages, actor=self.actor
+            )
+
+            if run_id:
+                await self.job_manager.add_messages_to_job_async(
+                    job_id=run_id,
+                    message_ids=[m.id for m in persisted_messages if m.role != "user"],
+                    actor=self.actor,
+                )
+
         return persisted_messages, continue_stepping, stop_reason
 
     def _decide_continuation(
@@ -1150,7 +1443,23 @@ class LettaAgent(BaseAgent):
         tool_rules_solver: ToolRulesSolver,
         is_final_step: bool | None,
     ) -> tuple[bool, str | None, LettaStopReason | None]:
+        continue_stepping, heartbeat_reason, stop_reason = self._decide_tool_call_continuation(
+            request_heartbeat=request_heartbeat,
+            tool_call_name=tool_call_name,
+            tool_rule_violated=tool_rule_violated,
+            tool_rules_solver=tool_rules_solver,
+        )
+        return self._apply_continuation_overrides(
+            agent_state, tool_rules_solver, is_final_step, continue_stepping, heartbeat_reason, stop_reason
+        )
 
+    def _decide_tool_call_continuation(
+        self,
+        request_heartbeat: bool,
+        tool_call_name: str,
+        tool_rule_violated: bool,
+        tool_rules_solver: ToolRulesSolver,
+    ) -> tuple[bool, str | None, LettaStopReason | None]:
         continue_stepping = request_heartbeat
         heartbeat_reason: str | None = None
         stop_reason: LettaStopReason | None = None
@@ -1174,6 +1483,17 @@ class LettaAgent(BaseAgent):
                 continue_stepping = True
                 heartbeat_reason = f"{NON_USER_MSG_PREFIX}Continuing: continue tool rule."
 
+        return continue_stepping, heartbeat_reason, stop_reason
+
+    def _apply_continuation_overrides(
+        self,
+        agent_state: AgentState,
+        tool_rules_solver: ToolRulesSolver,
+        is_final_step: bool | None,
+        continue_stepping: bool,
+        heartbeat_reason: str | None,
+        stop_reason: LettaStopReason | None,
+    ) -> tuple[bool, str | None, LettaStopReason | None]:
         # – hard stop overrides –
         if is_final_step:
             continue_stepping = False
@@ -36,6 +36,7 @@ from letta.services.agent_manager import AgentManager
 from letta.services.block_manager import BlockManager
 from letta.services.job_manager import JobManager
 from letta.services.llm_batch_manager import LLMBatchManager
+from letta.services.message_blob_store import message_blob_store
 from letta.services.message_manager import MessageManager
 from letta.services.passage_manager import PassageManager
 from letta.services.sandbox_config_manager import SandboxConfigManager
@@ -621,7 +622,8 @@ class LettaAgentBatch(BaseAgent):
         )
 
         in_context_messages = await self._rebuild_memory_async(current_in_context_messages + new_in_context_messages, agent_state)
-        return in_context_messages
+        # images are only referenced by the stored messages, load their data before the request is built
+        return await message_blob_store.load_images_async(in_context_messages)
 
     # Not used in batch.
     async def step(
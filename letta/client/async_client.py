@@ -0,0 +1,271 @@
+from typing import Any, AsyncGenerator, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+
+import httpx
+from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
+from pydantic import TypeAdapter
+
+from letta.client.http import (
+    DEFAULT_KEEPALIVE_EXPIRY,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_RETRY_BACKOFF,
+    create_async_http_client,
+)
+from letta.client.streaming import _sse_post_async
+from letta.helpers.fan_out import fan_out
+from letta.schemas.agent import AgentState, CreateAgent, UpdateAgent
+from letta.schemas.embedding_config import EmbeddingConfig
+from letta.schemas.enums import MessageRole
+from letta.schemas.letta_message import LettaMessageUnion
+from letta.schemas.letta_request import LettaRequest, LettaStreamingRequest
+from letta.schemas.letta_response import LettaResponse, LettaStreamingResponse
+from letta.schemas.llm_config import LLMConfig
+from letta.schemas.memory import Memory
+from letta.schemas.message import MessageCreate
+from letta.schemas.run import Run
+
+T = TypeVar("T")
+
+_letta_messages_adapter = TypeAdapter(List[LettaMessageUnion])
+
+# default number of requests a bulk helper keeps in flight
+DEFAULT_BULK_CONCURRENCY = 16
+
+
+class AsyncRESTClient:
+    """
+    Async REST client for Letta.
+
+    All requests go through one httpx client, which keeps connections alive (and multiplexes them over HTTP/2 when the
+    `h2` package is installed), so creating or messaging thousands of agents doesn't pay a TCP + TLS handshake each.
+    Requests that fail to connect, and idempotent requests the server rejects as overloaded, are retried with backoff.
+
+    Use it as an async context manager, or call `aclose()` when done, to close the connections. An existing
+    `httpx.AsyncClient` can be passed as `http_client` to share its pool, in which case it is not closed by this client.
+
+    Attributes:
+        base_url (str): Base URL of the REST API
+        headers (Dict): Headers for the REST API (includes token)
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: Optional[str] = None,
+        password: Optional[str] = None,
+        api_prefix: str = "v1",
+        default_llm_config: Optional[LLMConfig] = None,
+        default_embedding_config: Optional[EmbeddingConfig] = None,
+        headers: Optional[Dict] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_prefix = api_prefix
+        self.headers = {"accept": "application/json"}
+        if token or password:
+            self.headers["Authorization"] = f"Bearer {token or password}"
+        if headers:
+            self.headers.update(headers)
+        self._default_llm_config = default_llm_config
+        self._default_embedding_config = default_embedding_config
+
+        self._owns_http_client = http_client is None
+        self._http_client = http_client or create_async_http_client(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            max_retries=max_retries,
+            retry_backoff=retry_backoff,
+        )
+
+    async def aclose(self):
+        """Close the connections to the server, unless the httpx client was passed in."""
+        if self._owns_http_client:
+            await self._http_client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def _url(self, path: str) -> str:
+        return f"{self.base_url}/{self.api_prefix}/{path}"
+
+    async def _request(self, method: str, path: str, action: str, **kwargs) -> httpx.Response:
+        # like `requests`, leave out unset query parameters instead of sending them empty
+        if kwargs.get("params"):
+            kwargs["params"] = {key: value for key, value in kwargs["params"].items() if value is not None}
+        headers = kwargs.pop("headers", self.headers)
+        response = await self._http_client.request(method, self._url(path), headers=headers, **kwargs)
+        if response.status_code != 200:
+            raise ValueError(f"Status {response.status_code} - Failed to {action}: {response.text}")
+        return response
+
+    # ======================================================================================================================
+    # Agents
+    # ======================================================================================================================
+    async def list_agents(
+        self,
+        tags: Optional[List[str]] = None,
+        query_text: Optional[str] = None,
+        limit: int = 50,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+    ) -> List[AgentState]:
+        params = {"limit": limit, "query_text": query_text, "before": before, "after": after}
+        if tags:
+            params["tags"] = tags
+            params["match_all_tags"] = False
+        response = await self._request("GET", "agents", "list agents", params=params)
+        return [AgentState(**agent) for agent in response.json()]
+
+    async def agent_exists(self, agent_id: str) -> bool:
+        response = await self._http_client.get(self._url(f"agents/{agent_id}"), headers=self.headers)
+        if response.status_code == 404:
+            return False
+        elif response.status_code == 200:
+            return True
+        else:
+            raise ValueError(f"Failed to check if agent exists: {response.text}")
+
+    async def get_agent(self, agent_id: str) -> AgentState:
+        response = await self._request("GET", f"agents/{agent_id}", "get agent")
+        return AgentState(**response.json())
+
+    async def create_agent(self, request: CreateAgent) -> AgentState:
+        """Create an agent, using the client's default LLM and embedding configs if the request sets neither a config nor a handle."""
+        updates = {}
+        if request.llm_config is None and request.model is None and self._default_llm_config is not None:
+            updates["llm_config"] = self._default_llm_config
+        if request.embedding_config is None and request.embedding is None and self._default_embedding_config is not None:
+            updates["embedding_config"] = self._default_embedding_config
+        if updates:
+            request = request.model_copy(update=updates)
+
+        # model_dump_json() serializes datetimes correctly, unlike json=model_dump()
+        response = await self._request(
+            "POST",
+            "agents",
+            "create agent",
+            content=request.model_dump_json(),
+            headers={"Content-Type": "application/json", **self.headers},
+        )
+        return AgentState(**response.json())
+
+    async def update_agent(self, agent_id: str, request: UpdateAgent) -> AgentState:
+        response = await self._request(
+            "PATCH",
+            f"agents/{agent_id}",
+            "update agent",
+            content=request.model_dump_json(exclude_unset=True),
+            headers={"Content-Type": "application/json", **self.headers},
+        )
+        return AgentState(**response.json())
+
+    async def delete_agent(self, agent_id: str) -> None:
+        await self._request("DELETE", f"agents/{agent_id}", "delete agent")
+
+    async def get_core_memory(self, agent_id: str) -> Memory:
+        response = await self._request("GET", f"agents/{agent_id}/core-memory", "get core memory")
+        return Memory(**response.json())
+
+    # ======================================================================================================================
+    # Messages
+    # ======================================================================================================================
+    async def send_message(
+        self,
+        agent_id: str,
+        message: str,
+        role: str = MessageRole.user.value,
+        name: Optional[str] = None,
+        max_steps: Optional[int] = None,
+    ) -> LettaResponse:
+        request = LettaRequest(messages=[MessageCreate(role=MessageRole(role), content=message, name=name)])
+        if max_steps is not None:
+            request = request.model_copy(update={"max_steps": max_steps})
+        response = await self._request("POST", f"agents/{agent_id}/messages", "send message", json=request.model_dump(mode="json"))
+        return LettaResponse(**response.json())
+
+    async def send_message_stream(
+        self,
+        agent_id: str,
+        message: str,
+        role: str = MessageRole.user.value,
+        name: Optional[str] = None,
+        stream_tokens: bool = False,
+    ) -> AsyncGenerator[Union[LettaStreamingResponse, ChatCompletionChunk], None]:
+        request = LettaStreamingRequest(
+            messages=[MessageCreate(role=MessageRole(role), content=message, name=name)], stream_tokens=stream_tokens
+        )
+        async for chunk in _sse_post_async(
+            self._http_client, self._url(f"agents/{agent_id}/messages/stream"), request.model_dump(mode="json"), self.headers
+        ):
+            yield chunk
+
+    async def send_message_async(self, agent_id: str, message: str, role: str = MessageRole.user.value, name: Optional[str] = None) -> Run:
+        """Send a message to an agent without waiting for the response, returns the run processing it."""
+        request = LettaRequest(messages=[MessageCreate(role=MessageRole(role), content=message, name=name)])
+        response = await self._request("POST", f"agents/{agent_id}/messages/async", "send message", json=request.model_dump(mode="json"))
+        return Run(**response.json())
+
+    async def get_messages(
+        self, agent_id: str, before: Optional[str] = None, after: Optional[str] = None, limit: Optional[int] = 1000
+    ) -> List[LettaMessageUnion]:
+        params = {"before": before, "after": after, "limit": limit}
+        response = await self._request("GET", f"agents/{agent_id}/messages", "get messages", params=params)
+        return _letta_messages_adapter.validate_python(response.json())
+
+    # ======================================================================================================================
+    # Bulk operations
+    # ======================================================================================================================
+    async def create_agents(
+        self, requests: Sequence[CreateAgent], max_concurrency: int = DEFAULT_BULK_CONCURRENCY, return_exceptions: bool = False
+    ) -> List[Union[AgentState, BaseException]]:
+        """
+        Create many agents with at most `max_concurrency` requests in flight, returning them in the order of `requests`.
+
+        If `return_exceptions` is set, failed creations are returned as their exception, otherwise the first failure is raised
+        once every request has finished.
+        """
+        return await self._bulk(requests, self.create_agent, max_concurrency, return_exceptions)
+
+    async def send_messages(
+        self,
+        messages: Sequence[Tuple[str, str]],
+        role: str = MessageRole.user.value,
+        max_concurrency: int = DEFAULT_BULK_CONCURRENCY,
+        return_exceptions: bool = False,
+    ) -> List[Union[LettaResponse, BaseException]]:
+        """
+        Send each `(agent_id, message)` pair with at most `max_concurrency` requests in flight, returning the responses in
+        order. Failures are handled as in `create_agents`.
+        """
+
+        async def send(agent_message: Tuple[str, str]) -> LettaResponse:
+            agent_id, message = agent_message
+            return await self.send_message(agent_id=agent_id, message=message, role=role)
+
+        return await self._bulk(messages, send, max_concurrency, return_exceptions)
+
+    @staticmethod
+    async def _bulk(items: Sequence[T], worker, max_concurrency: int, return_exceptions: bool) -> List[Any]:
+        results: List[Any] = [None] * len(items)
+
+        async def run(indexed_item: Tuple[int, T]):
+            return await worker(indexed_item[1])
+
+        async for outcome in fan_out(list(enumerate(items)), run, max_concurrency=max_concurrency):
+            results[outcome.item[0]] = outcome.error if outcome.error is not None else outcome.result
+
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        return results
@@ -2,8 +2,9 @@ import sys
 import time
 from typing import Callable, Dict, List, Optional, Union
 
-import requests
+import httpx
 
+from letta.client.http import DEFAULT_MAX_CONNECTIONS, DEFAULT_MAX_RETRIES, create_http_client, create_requests_session
 from letta.constants import ADMIN_PREFIX, BASE_MEMORY_TOOLS, BASE_TOOLS, DEFAULT_HUMAN, DEFAULT_PERSONA, FUNCTION_RETURN_CHAR_LIMIT
 from letta.data_sources.connectors import DataConnector
 from letta.functions.functions import parse_source_code
@@ -444,6 +445,8 @@ class RESTClient(AbstractClient):
         default_llm_config: Optional[LLMConfig] = None,
         default_embedding_config: Optional[EmbeddingConfig] = None,
         headers: Optional[Dict] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_retries: int = DEFAULT_MAX_RETRIES,
     ):
         """
         Initializes a new instance of Client class.
@@ -456,6 +459,8 @@ class RESTClient(AbstractClient):
             headers (Optional[Dict]): The additional headers for the REST API.
             token (Optional[str]): The token for the REST API when using managed letta service.
             password (Optional[str]): The password for the REST API when using self hosted letta service.
+            max_connections (int): The maximum number of connections kept open to the server.
+            max_retries (int): How often to retry requests that failed to connect or hit an overloaded server.
         """
         super().__init__(debug=debug)
         self.base_url = base_url
@@ -470,6 +475,29 @@ class RESTClient(AbstractClient):
             self.headers.update(headers)
         self._default_llm_config = default_llm_config
         self._default_embedding_config = default_embedding_config
+        # connections are kept alive and reused across calls, instead of a new TCP + TLS handshake per request
+        self._session = create_requests_session(max_connections=max_connections, max_retries=max_retries)
+        self._max_connections = max_connections
+        self._max_retries = max_retries
+        self._stream_client: Optional[httpx.Client] = None
+
+    def close(self):
+        """Close the connections to the server."""
+        self._session.close()
+        if self._stream_client is not None:
+            self._stream_client.close()
+            self._stream_client = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _get_stream_client(self) -> httpx.Client:
+        if self._stream_client is None:
+            self._stream_client = create_http_client(max_connections=self._max_connections, max_retries=self._max_retries)
+        return self._stream_client
 
     def list_agents(
         self,
@@ -493,7 +521,7 @@ class RESTClient(AbstractClient):
         if after:
             params["after"] = after
 
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/agents", headers=self.headers, params=params)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/agents", headers=self.headers, params=params)
         return [AgentState(**agent) for agent in response.json()]
 
     def agent_exists(self, agent_id: str) -> bool:
@@ -508,7 +536,7 @@ class RESTClient(AbstractClient):
             exists (bool): `True` if the agent exists, `False` otherwise
         """
 
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}", headers=self.headers)
         if response.status_code == 404:
             # not found error
             return False
@@ -616,8 +644,8 @@ class RESTClient(AbstractClient):
 
         # Use model_dump_json() instead of model_dump()
         # If we use model_dump(), the datetime objects will not be serialized correctly
-        # response = requests.post(f"{self.base_url}/{self.api_prefix}/agents", json=request.model_dump(), headers=self.headers)
-        response = requests.post(
+        # response = self._session.post(f"{self.base_url}/{self.api_prefix}/agents", json=request.model_dump(), headers=self.headers)
+        response = self._session.post(
             f"{self.base_url}/{self.api_prefix}/agents",
             data=request.model_dump_json(),  # Use model_dump_json() instead of json=model_dump()
             headers={"Content-Type": "application/json", **self.headers},
@@ -676,7 +704,9 @@ class RESTClient(AbstractClient):
             message_ids=message_ids,
             response_format=response_format,
         )
-        response = requests.patch(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}", json=request.model_dump(), headers=self.headers)
+        response = self._session.patch(
+            f"{self.base_url}/{self.api_prefix}/agents/{agent_id}", json=request.model_dump(), headers=self.headers
+        )
         if response.status_code != 200:
             raise ValueError(f"Failed to update agent: {response.text}")
         return AgentState(**response.json())
@@ -691,7 +721,7 @@ class RESTClient(AbstractClient):
         Returns:
            List[Tool]: A List of Tool objs
         """
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/tools", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/tools", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to get tools from agents: {response.text}")
         return [Tool(**tool) for tool in response.json()]
@@ -707,7 +737,7 @@ class RESTClient(AbstractClient):
         Returns:
             agent_state (AgentState): State of the updated agent
         """
-        response = requests.patch(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/tools/attach/{tool_id}", headers=self.headers)
+        response = self._session.patch(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/tools/attach/{tool_id}", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to update agent: {response.text}")
         return AgentState(**response.json())
@@ -724,7 +754,7 @@ class RESTClient(AbstractClient):
             agent_state (AgentState): State of the updated agent
         """
 
-        response = requests.patch(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/tools/detach/{tool_id}", headers=self.headers)
+        response = self._session.patch(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/tools/detach/{tool_id}", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to update agent: {response.text}")
         return AgentState(**response.json())
@@ -749,7 +779,7 @@ class RESTClient(AbstractClient):
         Args:
             agent_id (str): ID of the agent to delete
         """
-        response = requests.delete(f"{self.base_url}/{self.api_prefix}/agents/{str(agent_id)}", headers=self.headers)
+        response = self._session.delete(f"{self.base_url}/{self.api_prefix}/agents/{str(agent_id)}", headers=self.headers)
         assert response.status_code == 200, f"Failed to delete agent: {response.text}"
 
     def get_agent(self, agent_id: Optional[str] = None, agent_name: Optional[str] = None) -> AgentState:
@@ -762,7 +792,7 @@ class RESTClient(AbstractClient):
         Returns:
             agent_state (AgentState): State representation of the agent
         """
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}", headers=self.headers)
         assert response.status_code == 200, f"Failed to get agent: {response.text}"
         return AgentState(**response.json())
 
@@ -777,7 +807,7 @@ class RESTClient(AbstractClient):
             agent_id (str): ID of the agent
         """
         # TODO: implement this
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/agents", headers=self.headers, params={"name": agent_name})
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/agents", headers=self.headers, params={"name": agent_name})
         agents = [AgentState(**agent) for agent in response.json()]
         if len(agents) == 0:
             return None
@@ -796,7 +826,7 @@ class RESTClient(AbstractClient):
         Returns:
             memory (Memory): In-context memory of the agent
         """
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/core-memory", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/core-memory", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to get in-context memory: {response.text}")
         return Memory(**response.json())
@@ -816,7 +846,7 @@ class RESTClient(AbstractClient):
 
         """
         memory_update_dict = {section: value}
-        response = requests.patch(
+        response = self._session.patch(
             f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/core-memory", json=memory_update_dict, headers=self.headers
         )
         if response.status_code != 200:
@@ -834,7 +864,7 @@ class RESTClient(AbstractClient):
             summary (ArchivalMemorySummary): Summary of the archival memory
 
         """
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/context", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/context", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to get archival memory summary: {response.text}")
         return ArchivalMemorySummary(size=response.json().get("num_archival_memory", 0))
@@ -849,7 +879,7 @@ class RESTClient(AbstractClient):
         Returns:
             summary (RecallMemorySummary): Summary of the recall memory
         """
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/context", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/context", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to get recall memory summary: {response.text}")
         return RecallMemorySummary(size=response.json().get("num_recall_memory", 0))
@@ -864,7 +894,7 @@ class RESTClient(AbstractClient):
         Returns:
             messages (List[Message]): List of in-context messages
         """
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/context", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/context", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to get recall memory summary: {response.text}")
         return [Message(**message) for message in response.json().get("messages", "")]
@@ -909,7 +939,7 @@ class RESTClient(AbstractClient):
             params["before"] = str(before)
         if after:
             params["after"] = str(after)
-        response = requests.get(
+        response = self._session.get(
             f"{self.base_url}/{self.api_prefix}/agents/{str(agent_id)}/archival-memory", params=params, headers=self.headers
         )
         assert response.status_code == 200, f"Failed to get archival memory: {response.text}"
@@ -927,7 +957,7 @@ class RESTClient(AbstractClient):
             passages (List[Passage]): List of inserted passages
         """
         request = CreateArchivalMemory(text=memory)
-        response = requests.post(
+        response = self._session.post(
             f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/archival-memory", headers=self.headers, json=request.model_dump()
         )
         if response.status_code != 200:
@@ -942,7 +972,9 @@ class RESTClient(AbstractClient):
             agent_id (str): ID of the agent
             memory_id (str): ID of the memory
         """
-        response = requests.delete(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/archival-memory/{memory_id}", headers=self.headers)
+        response = self._session.delete(
+            f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/archival-memory/{memory_id}", headers=self.headers
+        )
         assert response.status_code == 200, f"Failed to delete archival memory: {response.text}"
 
     # messages (recall memory)
@@ -964,7 +996,7 @@ class RESTClient(AbstractClient):
         """
 
         params = {"before": before, "after": after, "limit": limit, "msg_object": True}
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/messages", params=params, headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/messages", params=params, headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to get messages: {response.text}")
         return [LettaMessage(**message) for message in response.json()]
@@ -1004,10 +1036,15 @@ class RESTClient(AbstractClient):
             from letta.client.streaming import _sse_post
 
             request = LettaStreamingRequest(messages=messages, stream_tokens=stream_tokens)
-            return _sse_post(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/messages/stream", request.model_dump(), self.headers)
+            return _sse_post(
+                f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/messages/stream",
+                request.model_dump(),
+                self.headers,
+                client=self._get_stream_client(),
+            )
         else:
             request = LettaRequest(messages=messages)
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/messages", json=request.model_dump(), headers=self.headers
             )
             if response.status_code != 200:
@@ -1046,7 +1083,7 @@ class RESTClient(AbstractClient):
         messages = [MessageCreate(role=MessageRole(role), content=message, name=name)]
 
         request = LettaRequest(messages=messages)
-        response = requests.post(
+        response = self._session.post(
             f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/messages/async",
             json=request.model_dump(),
             headers=self.headers,
@@ -1061,7 +1098,7 @@ class RESTClient(AbstractClient):
 
     def list_blocks(self, label: Optional[str] = None, templates_only: Optional[bool] = True) -> List[Block]:
         params = {"label": label, "templates_only": templates_only}
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/blocks", params=params, headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/blocks", params=params, headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to list blocks: {response.text}")
 
@@ -1079,7 +1116,7 @@ class RESTClient(AbstractClient):
         if limit:
             request_kwargs["limit"] = limit
         request = CreateBlock(**request_kwargs)
-        response = requests.post(f"{self.base_url}/{self.api_prefix}/blocks", json=request.model_dump(), headers=self.headers)
+        response = self._session.post(f"{self.base_url}/{self.api_prefix}/blocks", json=request.model_dump(), headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to create block: {response.text}")
         if request.label == "human":
@@ -1091,13 +1128,15 @@ class RESTClient(AbstractClient):
 
     def update_block(self, block_id: str, name: Optional[str] = None, text: Optional[str] = None, limit: Optional[int] = None) -> Block:
         request = BlockUpdate(id=block_id, template_name=name, value=text, limit=limit if limit else self.get_block(block_id).limit)
-        response = requests.post(f"{self.base_url}/{self.api_prefix}/blocks/{block_id}", json=request.model_dump(), headers=self.headers)
+        response = self._session.post(
+            f"{self.base_url}/{self.api_prefix}/blocks/{block_id}", json=request.model_dump(), headers=self.headers
+        )
         if response.status_code != 200:
             raise ValueError(f"Failed to update block: {response.text}")
         return Block(**response.json())
 
     def get_block(self, block_id: str) -> Optional[Block]:
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/blocks/{block_id}", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/blocks/{block_id}", headers=self.headers)
         if response.status_code == 404:
             return None
         elif response.status_code != 200:
@@ -1106,7 +1145,7 @@ class RESTClient(AbstractClient):
 
     def get_block_id(self, name: str, label: str) -> str:
         params = {"name": name, "label": label}
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/blocks", params=params, headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/blocks", params=params, headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to get block ID: {response.text}")
         blocks = [Block(**block) for block in response.json()]
@@ -1117,7 +1156,7 @@ class RESTClient(AbstractClient):
         return blocks[0].id
 
     def delete_block(self, id: str) -> Block:
-        response = requests.delete(f"{self.base_url}/{self.api_prefix}/blocks/{id}", headers=self.headers)
+        response = self._session.delete(f"{self.base_url}/{self.api_prefix}/blocks/{id}", headers=self.headers)
         assert response.status_code == 200, f"Failed to delete block: {response.text}"
         if response.status_code != 200:
             raise ValueError(f"Failed to delete block: {response.text}")
@@ -1158,7 +1197,9 @@ class RESTClient(AbstractClient):
             human (Human): Updated human block
         """
         request = UpdateHuman(id=human_id, template_name=name, value=text)
-        response = requests.post(f"{self.base_url}/{self.api_prefix}/blocks/{human_id}", json=request.model_dump(), headers=self.headers)
+        response = self._session.post(
+            f"{self.base_url}/{self.api_prefix}/blocks/{human_id}", json=request.model_dump(), headers=self.headers
+        )
         if response.status_code != 200:
             raise ValueError(f"Failed to update human: {response.text}")
         return Human(**response.json())
@@ -1198,7 +1239,9 @@ class RESTClient(AbstractClient):
             persona (Persona): Updated persona block
         """
         request = UpdatePersona(id=persona_id, template_name=name, value=text)
-        response = requests.post(f"{self.base_url}/{self.api_prefix}/blocks/{persona_id}", json=request.model_dump(), headers=self.headers)
+        response = self._session.post(
+            f"{self.base_url}/{self.api_prefix}/blocks/{persona_id}", json=request.model_dump(), headers=self.headers
+        )
         if response.status_code != 200:
             raise ValueError(f"Failed to update persona: {response.text}")
         return Persona(**response.json())
@@ -1281,7 +1324,7 @@ class RESTClient(AbstractClient):
         Returns:
             source (Source): Source
         """
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/sources/{source_id}", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/sources/{source_id}", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to get source: {response.text}")
         return Source(**response.json())
@@ -1296,7 +1339,7 @@ class RESTClient(AbstractClient):
         Returns:
             source_id (str): ID of the source
         """
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/sources/name/{source_name}", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/sources/name/{source_name}", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to get source ID: {response.text}")
         return response.json()
@@ -1308,7 +1351,7 @@ class RESTClient(AbstractClient):
         Returns:
             sources (List[Source]): List of sources
         """
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/sources", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/sources", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to list sources: {response.text}")
         return [Source(**source) for source in response.json()]
@@ -1320,27 +1363,27 @@ class RESTClient(AbstractClient):
         Args:
             source_id (str): ID of the source
         """
-        response = requests.delete(f"{self.base_url}/{self.api_prefix}/sources/{str(source_id)}", headers=self.headers)
+        response = self._session.delete(f"{self.base_url}/{self.api_prefix}/sources/{str(source_id)}", headers=self.headers)
         assert response.status_code == 200, f"Failed to delete source: {response.text}"
 
     def get_job(self, job_id: str) -> Job:
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/jobs/{job_id}", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/jobs/{job_id}", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to get job: {response.text}")
         return Job(**response.json())
 
     def delete_job(self, job_id: str) -> Job:
-        response = requests.delete(f"{self.base_url}/{self.api_prefix}/jobs/{job_id}", headers=self.headers)
+        response = self._session.delete(f"{self.base_url}/{self.api_prefix}/jobs/{job_id}", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to delete job: {response.text}")
         return Job(**response.json())
 
     def list_jobs(self):
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/jobs", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/jobs", headers=self.headers)
         return [Job(**job) for job in response.json()]
 
     def list_active_jobs(self):
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/jobs/active", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/jobs/active", headers=self.headers)
         return [Job(**job) for job in response.json()]
 
     def load_data(self, connector: DataConnector, source_name: str):
@@ -1361,7 +1404,7 @@ class RESTClient(AbstractClient):
         files = {"file": open(filename, "rb")}
 
         # create job
-        response = requests.post(f"{self.base_url}/{self.api_prefix}/sources/{source_id}/upload", files=files, headers=self.headers)
+        response = self._session.post(f"{self.base_url}/{self.api_prefix}/sources/{source_id}/upload", files=files, headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to upload file to source: {response.text}")
 
@@ -1378,7 +1421,7 @@ class RESTClient(AbstractClient):
         return job
 
     def delete_file_from_source(self, source_id: str, file_id: str) -> None:
-        response = requests.delete(f"{self.base_url}/{self.api_prefix}/sources/{source_id}/{file_id}", headers=self.headers)
+        response = self._session.delete(f"{self.base_url}/{self.api_prefix}/sources/{source_id}/{file_id}", headers=self.headers)
         if response.status_code not in [200, 204]:
             raise ValueError(f"Failed to delete tool: {response.text}")
 
@@ -1395,7 +1438,7 @@ class RESTClient(AbstractClient):
         assert embedding_config or self._default_embedding_config, f"Must specify embedding_config for source"
         source_create = SourceCreate(name=name, embedding_config=embedding_config or self._default_embedding_config)
         payload = source_create.model_dump()
-        response = requests.post(f"{self.base_url}/{self.api_prefix}/sources", json=payload, headers=self.headers)
+        response = self._session.post(f"{self.base_url}/{self.api_prefix}/sources", json=payload, headers=self.headers)
         response_json = response.json()
         return Source(**response_json)
 
@@ -1409,7 +1452,7 @@ class RESTClient(AbstractClient):
         Returns:
             sources (List[Source]): List of sources
         """
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/sources", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/sources", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to list attached sources: {response.text}")
         return [Source(**source) for source in response.json()]
@@ -1430,7 +1473,7 @@ class RESTClient(AbstractClient):
         params = {"limit": limit, "after": after}
 
         # Make the request to the FastAPI endpoint
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/sources/{source_id}/files", headers=self.headers, params=params)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/sources/{source_id}/files", headers=self.headers, params=params)
 
         if response.status_code != 200:
             raise ValueError(f"Failed to list files with source id {source_id}: [{response.status_code}] {response.text}")
@@ -1450,7 +1493,9 @@ class RESTClient(AbstractClient):
             source (Source): Updated source
         """
         request = SourceUpdate(name=name)
-        response = requests.patch(f"{self.base_url}/{self.api_prefix}/sources/{source_id}", json=request.model_dump(), headers=self.headers)
+        response = self._session.patch(
+            f"{self.base_url}/{self.api_prefix}/sources/{source_id}", json=request.model_dump(), headers=self.headers
+        )
         if response.status_code != 200:
             raise ValueError(f"Failed to update source: {response.text}")
         return Source(**response.json())
@@ -1465,7 +1510,7 @@ class RESTClient(AbstractClient):
             source_name (str): Name of the source
         """
         params = {"agent_id": agent_id}
-        response = requests.patch(
+        response = self._session.patch(
             f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/sources/attach/{source_id}", params=params, headers=self.headers
         )
         assert response.status_code == 200, f"Failed to attach source to agent: {response.text}"
@@ -1474,7 +1519,7 @@ class RESTClient(AbstractClient):
     def detach_source(self, source_id: str, agent_id: str) -> AgentState:
         """Detach a source from an agent"""
         params = {"agent_id": str(agent_id)}
-        response = requests.patch(
+        response = self._session.patch(
             f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/sources/detach/{source_id}", params=params, headers=self.headers
         )
         assert response.status_code == 200, f"Failed to detach source from agent: {response.text}"
@@ -1492,7 +1537,7 @@ class RESTClient(AbstractClient):
         Returns:
             id (str): ID of the tool (`None` if not found)
         """
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/tools", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/tools", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to get tool: {response.text}")
 
@@ -1511,13 +1556,13 @@ class RESTClient(AbstractClient):
         Returns:
             List[Tool]: A list of attached tools
         """
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/tools", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/tools", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to list attached tools: {response.text}")
         return [Tool(**tool) for tool in response.json()]
 
     def upsert_base_tools(self) -> List[Tool]:
-        response = requests.post(f"{self.base_url}/{self.api_prefix}/tools/add-base-tools/", headers=self.headers)
+        response = self._session.post(f"{self.base_url}/{self.api_prefix}/tools/add-base-tools/", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to add base tools: {response.text}")
 
@@ -1548,7 +1593,7 @@ class RESTClient(AbstractClient):
         request = ToolCreate(source_type=source_type, source_code=source_code, return_char_limit=return_char_limit)
         if tags:
             request.tags = tags
-        response = requests.post(f"{self.base_url}/{self.api_prefix}/tools", json=request.model_dump(), headers=self.headers)
+        response = self._session.post(f"{self.base_url}/{self.api_prefix}/tools", json=request.model_dump(), headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to create tool: {response.text}")
         return Tool(**response.json())
@@ -1578,7 +1623,7 @@ class RESTClient(AbstractClient):
         request = ToolCreate(source_type=source_type, source_code=source_code, return_char_limit=return_char_limit)
         if tags:
             request.tags = tags
-        response = requests.put(f"{self.base_url}/{self.api_prefix}/tools", json=request.model_dump(), headers=self.headers)
+        response = self._session.put(f"{self.base_url}/{self.api_prefix}/tools", json=request.model_dump(), headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to create tool: {response.text}")
         return Tool(**response.json())
@@ -1618,7 +1663,7 @@ class RESTClient(AbstractClient):
             tags=tags,
             return_char_limit=return_char_limit,
         )
-        response = requests.patch(f"{self.base_url}/{self.api_prefix}/tools/{id}", json=request.model_dump(), headers=self.headers)
+        response = self._session.patch(f"{self.base_url}/{self.api_prefix}/tools/{id}", json=request.model_dump(), headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to update tool: {response.text}")
         return Tool(**response.json())
@@ -1636,7 +1681,7 @@ class RESTClient(AbstractClient):
         if limit:
             params["limit"] = limit
 
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/tools", params=params, headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/tools", params=params, headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to list tools: {response.text}")
         return [Tool(**tool) for tool in response.json()]
@@ -1648,7 +1693,7 @@ class RESTClient(AbstractClient):
         Args:
             id (str): ID of the tool
         """
-        response = requests.delete(f"{self.base_url}/{self.api_prefix}/tools/{name}", headers=self.headers)
+        response = self._session.delete(f"{self.base_url}/{self.api_prefix}/tools/{name}", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to delete tool: {response.text}")
 
@@ -1662,7 +1707,7 @@ class RESTClient(AbstractClient):
         Returns:
             tool (Tool): Tool
         """
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/tools/{id}", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/tools/{id}", headers=self.headers)
         if response.status_code == 404:
             return None
         elif response.status_code != 200:
@@ -1694,7 +1739,7 @@ class RESTClient(AbstractClient):
         Returns:
             configs (List[LLMConfig]): List of LLM configurations
         """
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/models", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/models", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to list LLM configs: {response.text}")
         return [LLMConfig(**config) for config in response.json()]
@@ -1706,7 +1751,7 @@ class RESTClient(AbstractClient):
         Returns:
             configs (List[EmbeddingConfig]): List of embedding configurations
         """
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/models/embedding", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/models/embedding", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to list embedding configs: {response.text}")
         return [EmbeddingConfig(**config) for config in response.json()]
@@ -1720,7 +1765,7 @@ class RESTClient(AbstractClient):
         @return: a list of Organization objects
         """
         params = {"after": after, "limit": limit}
-        response = requests.get(f"{self.base_url}/{ADMIN_PREFIX}/orgs", headers=self.headers, params=params)
+        response = self._session.get(f"{self.base_url}/{ADMIN_PREFIX}/orgs", headers=self.headers, params=params)
         if response.status_code != 200:
             raise ValueError(f"Failed to retrieve organizations: {response.text}")
         return [Organization(**org_data) for org_data in response.json()]
@@ -1733,7 +1778,7 @@ class RESTClient(AbstractClient):
         @return: the created Organization
         """
         payload = {"name": name}
-        response = requests.post(f"{self.base_url}/{ADMIN_PREFIX}/orgs", headers=self.headers, json=payload)
+        response = self._session.post(f"{self.base_url}/{ADMIN_PREFIX}/orgs", headers=self.headers, json=payload)
         if response.status_code != 200:
             raise ValueError(f"Failed to create org: {response.text}")
         return Organization(**response.json())
@@ -1749,7 +1794,7 @@ class RESTClient(AbstractClient):
         params = {"org_id": org_id}
 
         # Make the DELETE request with query parameters
-        response = requests.delete(f"{self.base_url}/{ADMIN_PREFIX}/orgs", headers=self.headers, params=params)
+        response = self._session.delete(f"{self.base_url}/{ADMIN_PREFIX}/orgs", headers=self.headers, params=params)
 
         if response.status_code == 404:
             raise ValueError(f"Organization with ID '{org_id}' does not exist")
@@ -1772,7 +1817,7 @@ class RESTClient(AbstractClient):
         payload = {
             "config": config.model_dump(),
         }
-        response = requests.post(f"{self.base_url}/{self.api_prefix}/sandbox-config", headers=self.headers, json=payload)
+        response = self._session.post(f"{self.base_url}/{self.api_prefix}/sandbox-config", headers=self.headers, json=payload)
         if response.status_code != 200:
             raise ValueError(f"Failed to create sandbox config: {response.text}")
         return SandboxConfig(**response.json())
@@ -1791,7 +1836,7 @@ class RESTClient(AbstractClient):
         payload = {
             "config": config.model_dump(),
         }
-        response = requests.patch(
+        response = self._session.patch(
             f"{self.base_url}/{self.api_prefix}/sandbox-config/{sandbox_config_id}",
             headers=self.headers,
             json=payload,
@@ -1807,7 +1852,7 @@ class RESTClient(AbstractClient):
         Args:
             sandbox_config_id (str): The ID of the sandbox configuration to delete.
         """
-        response = requests.delete(f"{self.base_url}/{self.api_prefix}/sandbox-config/{sandbox_config_id}", headers=self.headers)
+        response = self._session.delete(f"{self.base_url}/{self.api_prefix}/sandbox-config/{sandbox_config_id}", headers=self.headers)
         if response.status_code == 404:
             raise ValueError(f"Sandbox config with ID '{sandbox_config_id}' does not exist")
         elif response.status_code != 204:
@@ -1825,7 +1870,7 @@ class RESTClient(AbstractClient):
             List[SandboxConfig]: A list of sandbox configurations.
         """
         params = {"limit": limit, "after": after}
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/sandbox-config", headers=self.headers, params=params)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/sandbox-config", headers=self.headers, params=params)
         if response.status_code != 200:
             raise ValueError(f"Failed to list sandbox configs: {response.text}")
         return [SandboxConfig(**config_data) for config_data in response.json()]
@@ -1846,7 +1891,7 @@ class RESTClient(AbstractClient):
             SandboxEnvironmentVariable: The created environment variable.
         """
         payload = {"key": key, "value": value, "description": description}
-        response = requests.post(
+        response = self._session.post(
             f"{self.base_url}/{self.api_prefix}/sandbox-config/{sandbox_config_id}/environment-variable",
             headers=self.headers,
             json=payload,
@@ -1871,7 +1916,7 @@ class RESTClient(AbstractClient):
             SandboxEnvironmentVariable: The updated environment variable.
         """
         payload = {k: v for k, v in {"key": key, "value": value, "description": description}.items() if v is not None}
-        response = requests.patch(
+        response = self._session.patch(
             f"{self.base_url}/{self.api_prefix}/sandbox-config/environment-variable/{env_var_id}",
             headers=self.headers,
             json=payload,
@@ -1887,7 +1932,7 @@ class RESTClient(AbstractClient):
         Args:
             env_var_id (str): The ID of the environment variable to delete.
         """
-        response = requests.delete(
+        response = self._session.delete(
             f"{self.base_url}/{self.api_prefix}/sandbox-config/environment-variable/{env_var_id}", headers=self.headers
         )
         if response.status_code == 404:
@@ -1910,7 +1955,7 @@ class RESTClient(AbstractClient):
             List[SandboxEnvironmentVariable]: A list of environment variables.
         """
         params = {"limit": limit, "after": after}
-        response = requests.get(
+        response = self._session.get(
             f"{self.base_url}/{self.api_prefix}/sandbox-config/{sandbox_config_id}/environment-variable",
             headers=self.headers,
             params=params,
@@ -1941,7 +1986,7 @@ class RESTClient(AbstractClient):
             agent_id (str): ID of the agent
             block_id (str): ID of the block to attach
         """
-        response = requests.patch(
+        response = self._session.patch(
             f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/core-memory/blocks/attach/{block_id}",
             headers=self.headers,
         )
@@ -1957,7 +2002,7 @@ class RESTClient(AbstractClient):
             agent_id (str): ID of the agent
             block_id (str): ID of the block to detach
         """
-        response = requests.patch(
+        response = self._session.patch(
             f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/core-memory/blocks/detach/{block_id}", headers=self.headers
         )
         if response.status_code != 200:
@@ -1974,7 +2019,7 @@ class RESTClient(AbstractClient):
         Returns:
             blocks (List[Block]): The blocks in the agent's core memory
         """
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/core-memory/blocks", headers=self.headers)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/core-memory/blocks", headers=self.headers)
         if response.status_code != 200:
             raise ValueError(f"Failed to get agent memory blocks: {response.text}")
         return [Block(**block) for block in response.json()]
@@ -1990,7 +2035,7 @@ class RESTClient(AbstractClient):
         Returns:
             block (Block): The block corresponding to the label
         """
-        response = requests.get(
+        response = self._session.get(
             f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/core-memory/blocks/{label}",
             headers=self.headers,
         )
@@ -2023,7 +2068,7 @@ class RESTClient(AbstractClient):
             data["value"] = value
         if limit:
             data["limit"] = limit
-        response = requests.patch(
+        response = self._session.patch(
             f"{self.base_url}/{self.api_prefix}/agents/{agent_id}/core-memory/blocks/{label}",
             headers=self.headers,
             json=data,
@@ -2058,7 +2103,7 @@ class RESTClient(AbstractClient):
             data["limit"] = limit
         if label:
             data["label"] = label
-        response = requests.patch(
+        response = self._session.patch(
             f"{self.base_url}/{self.api_prefix}/blocks/{block_id}",
             headers=self.headers,
             json=data,
@@ -2099,7 +2144,7 @@ class RESTClient(AbstractClient):
         # Remove None values
         params = {k: v for k, v in params.items() if v is not None}
 
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/runs/{run_id}/messages", params=params)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/runs/{run_id}/messages", params=params)
         if response.status_code != 200:
             raise ValueError(f"Failed to get run messages: {response.text}")
         return [LettaMessage(**message) for message in response.json()]
@@ -2117,7 +2162,7 @@ class RESTClient(AbstractClient):
         Returns:
             List[UsageStatistics]: List of usage statistics associated with the job
         """
-        response = requests.get(
+        response = self._session.get(
             f"{self.base_url}/{self.api_prefix}/runs/{run_id}/usage",
             headers=self.headers,
         )
@@ -2135,7 +2180,7 @@ class RESTClient(AbstractClient):
         Returns:
             run (Run): Run
         """
-        response = requests.get(
+        response = self._session.get(
             f"{self.base_url}/{self.api_prefix}/runs/{run_id}",
             headers=self.headers,
         )
@@ -2150,7 +2195,7 @@ class RESTClient(AbstractClient):
         Args:
             run_id (str): ID of the run
         """
-        response = requests.delete(
+        response = self._session.delete(
             f"{self.base_url}/{self.api_prefix}/runs/{run_id}",
             headers=self.headers,
         )
@@ -2164,7 +2209,7 @@ class RESTClient(AbstractClient):
         Returns:
             runs (List[Run]): List of runs
         """
-        response = requests.get(
+        response = self._session.get(
             f"{self.base_url}/{self.api_prefix}/runs",
             headers=self.headers,
         )
@@ -2179,7 +2224,7 @@ class RESTClient(AbstractClient):
         Returns:
             runs (List[Run]): List of active runs
         """
-        response = requests.get(
+        response = self._session.get(
             f"{self.base_url}/{self.api_prefix}/runs/active",
             headers=self.headers,
         )
@@ -2212,7 +2257,7 @@ class RESTClient(AbstractClient):
         if query_text:
             params["query_text"] = query_text
 
-        response = requests.get(f"{self.base_url}/{self.api_prefix}/tags", headers=self.headers, params=params)
+        response = self._session.get(f"{self.base_url}/{self.api_prefix}/tags", headers=self.headers, params=params)
         if response.status_code != 200:
             raise ValueError(f"Failed to get tags: {response.text}")
         return response.json()
@@ -0,0 +1,159 @@
+import asyncio
+import importlib.util
+import random
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# statuses that mean the server didn't handle the request, so it's safe to send again if the method is idempotent
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+# errors raised before the request reached the server, which are safe to retry for any method
+RETRY_EXCEPTIONS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_BACKOFF = 0.5
+# generous, since a single agent step may run tools in a remote sandbox
+DEFAULT_TIMEOUT = httpx.Timeout(5 * 60.0, connect=10.0)
+
+
+def retry_delay(attempt: int, backoff: float, response: Optional[httpx.Response] = None) -> float:
+    """Seconds to wait before retry `attempt` (starting at 0): the server's Retry-After if given, else jittered exponential backoff."""
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass  # an HTTP date, fall back to our own backoff
+    return backoff * (2**attempt) * (0.5 + random.random() / 2)
+
+
+def should_retry(method: str, response: httpx.Response) -> bool:
+    return response.status_code in RETRY_STATUSES and method.upper() in IDEMPOTENT_METHODS
+
+
+class RetryTransport(httpx.BaseTransport):
+    """Wraps an httpx transport to retry failed connections and overloaded responses with exponential backoff."""
+
+    def __init__(self, transport: httpx.BaseTransport, max_retries: int = DEFAULT_MAX_RETRIES, backoff: float = DEFAULT_RETRY_BACKOFF):
+        self.transport = transport
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.transport.handle_request(request)
+            except RETRY_EXCEPTIONS:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(retry_delay(attempt, self.backoff))
+                continue
+            if attempt == self.max_retries or not should_retry(request.method, response):
+                return response
+            response.close()
+            time.sleep(retry_delay(attempt, self.backoff, response))
+        return response
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of `RetryTransport`."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_retries: int = DEFAULT_MAX_RETRIES, backoff: float = DEFAULT_RETRY_BACKOFF):
+        self.transport = transport
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.transport.handle_async_request(request)
+            except RETRY_EXCEPTIONS:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(retry_delay(attempt, self.backoff))
+                continue
+            if attempt == self.max_retries or not should_retry(request.method, response):
+                return response
+            await response.aclose()
+            await asyncio.sleep(retry_delay(attempt, self.backoff, response))
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+def _pool_kwargs(max_connections: int, max_keepalive_connections: int, keepalive_expiry: float) -> Dict[str, Any]:
+    return {
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        # HTTP/2 multiplexes concurrent requests over one connection, but needs the optional `h2` package
+        "http2": importlib.util.find_spec("h2") is not None,
+    }
+
+
+def create_http_client(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+) -> httpx.Client:
+    """An httpx client that keeps connections alive across requests and retries transient failures."""
+    transport = httpx.HTTPTransport(**_pool_kwargs(max_connections, max_keepalive_connections, keepalive_expiry))
+    return httpx.Client(
+        transport=RetryTransport(transport, max_retries=max_retries, backoff=retry_backoff), timeout=timeout, follow_redirects=True
+    )
+
+
+def create_async_http_client(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+) -> httpx.AsyncClient:
+    """Async counterpart of `create_http_client`."""
+    transport = httpx.AsyncHTTPTransport(**_pool_kwargs(max_connections, max_keepalive_connections, keepalive_expiry))
+    return httpx.AsyncClient(
+        transport=AsyncRetryTransport(transport, max_retries=max_retries, backoff=retry_backoff), timeout=timeout, follow_redirects=True
+    )
+
+
+def create_requests_session(
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+) -> requests.Session:
+    """A requests session with a connection pool per host and the same retry policy as `create_http_client`."""
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=0,
+        status=max_retries,
+        backoff_factor=retry_backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=IDEMPOTENT_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_maxsize=max_connections, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
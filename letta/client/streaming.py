@@ -1,8 +1,9 @@
+import contextlib
 import json
-from typing import Generator, Union, get_args
+from typing import AsyncGenerator, Generator, Optional, Union, get_args
 
 import httpx
-from httpx_sse import SSEError, connect_sse
+from httpx_sse import SSEError, aconnect_sse, connect_sse
 from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 
 from letta.constants import OPENAI_CONTEXT_WINDOW_ERROR_SUBSTRING
@@ -16,12 +17,44 @@ from letta.schemas.usage import LettaUsageStatistics
 logger = get_logger(__name__)
 
 
-def _sse_post(url: str, data: dict, headers: dict) -> Generator[Union[LettaStreamingResponse, ChatCompletionChunk], None, None]:
+def _parse_sse_data(data: str) -> Union[LettaStreamingResponse, ChatCompletionChunk]:
+    """
+    Parses the data of one server-sent event into a stream status, message, usage statistics or completion chunk.
+    """
+    if data in {status.value for status in MessageStreamStatus}:
+        return MessageStreamStatus(data)
+
+    chunk_data = json.loads(data)
+    if "reasoning" in chunk_data:
+        return ReasoningMessage(**chunk_data)
+    elif chunk_data.get("message_type") == "assistant_message":
+        return AssistantMessage(**chunk_data)
+    elif "hidden_reasoning" in chunk_data:
+        return HiddenReasoningMessage(**chunk_data)
+    elif "tool_call" in chunk_data:
+        return ToolCallMessage(**chunk_data)
+    elif "tool_return" in chunk_data:
+        return ToolReturnMessage(**chunk_data)
+    elif "step_count" in chunk_data:
+        return LettaUsageStatistics(**chunk_data)
+    elif chunk_data.get("object") == get_args(ChatCompletionChunk.__annotations__["object"])[0]:
+        return ChatCompletionChunk(**chunk_data)
+    else:
+        raise ValueError(f"Unknown message type in chunk_data: {chunk_data}")
+
+
+def _sse_post(
+    url: str, data: dict, headers: dict, client: Optional[httpx.Client] = None
+) -> Generator[Union[LettaStreamingResponse, ChatCompletionChunk], None, None]:
     """
     Sends an SSE POST request and yields parsed response chunks.
+
+    Pass a long-lived `client` to reuse its connections across streams, otherwise a new client is opened for this one.
     """
-    # TODO: Please note his is a very generous timeout for e2b reasons
-    with httpx.Client(timeout=httpx.Timeout(5 * 60.0, read=5 * 60.0)) as client:
+    with contextlib.ExitStack() as stack:
+        if client is None:
+            # TODO: Please note his is a very generous timeout for e2b reasons
+            client = stack.enter_context(httpx.Client(timeout=httpx.Timeout(5 * 60.0, read=5 * 60.0)))
         with connect_sse(client, method="POST", url=url, json=data, headers=headers) as event_source:
 
             # Check for immediate HTTP errors before processing the SSE stream
@@ -45,30 +78,11 @@ def _sse_post(url: str, data: dict, headers: dict) -> Generator[Union[LettaStrea
 
             try:
                 for sse in event_source.iter_sse():
-                    if sse.data in {status.value for status in MessageStreamStatus}:
-                        yield MessageStreamStatus(sse.data)
-                        if sse.data == MessageStreamStatus.done.value:
-                            # We received the [DONE], so stop reading the stream.
-                            break
-                    else:
-                        chunk_data = json.loads(sse.data)
-
-                        if "reasoning" in chunk_data:
-                            yield ReasoningMessage(**chunk_data)
-                        elif chunk_data.get("message_type") == "assistant_message":
-                            yield AssistantMessage(**chunk_data)
-                        elif "hidden_reasoning" in chunk_data:
-                            yield HiddenReasoningMessage(**chunk_data)
-                        elif "tool_call" in chunk_data:
-                            yield ToolCallMessage(**chunk_data)
-                        elif "tool_return" in chunk_data:
-                            yield ToolReturnMessage(**chunk_data)
-                        elif "step_count" in chunk_data:
-                            yield LettaUsageStatistics(**chunk_data)
-                        elif chunk_data.get("object") == get_args(ChatCompletionChunk.__annotations__["object"])[0]:
-                            yield ChatCompletionChunk(**chunk_data)
-                        else:
-                            raise ValueError(f"Unknown message type in chunk_data: {chunk_data}")
+                    chunk = _parse_sse_data(sse.data)
+                    yield chunk
+                    if chunk == MessageStreamStatus.done:
+                        # We received the [DONE], so stop reading the stream.
+                        break
 
             except SSEError as e:
                 logger.error(f"SSE stream error: {e}")
@@ -94,3 +108,30 @@ def _sse_post(url: str, data: dict, headers: dict) -> Generator[Union[LettaStrea
                     logger.error(f"HTTP Headers: {event_source.response.headers}")
 
                 raise e
+
+
+async def _sse_post_async(
+    client: httpx.AsyncClient, url: str, data: dict, headers: dict
+) -> AsyncGenerator[Union[LettaStreamingResponse, ChatCompletionChunk], None]:
+    """
+    Async counterpart of `_sse_post`, streaming over the connections of `client`.
+    """
+    async with aconnect_sse(client, method="POST", url=url, json=data, headers=headers) as event_source:
+        if not event_source.response.is_success:
+            response_bytes = await event_source.response.aread()
+            logger.warning(f"SSE request error: {response_bytes.decode('utf-8')}")
+            try:
+                error_message = json.loads(response_bytes.decode("utf-8")).get("error", {}).get("message", "")
+            except Exception:
+                error_message = ""
+            if OPENAI_CONTEXT_WINDOW_ERROR_SUBSTRING in error_message:
+                logger.error(error_message)
+                raise LLMError(error_message)
+            event_source.response.raise_for_status()
+
+        async for sse in event_source.aiter_sse():
+            chunk = _parse_sse_data(sse.data)
+            yield chunk
+            if chunk == MessageStreamStatus.done:
+                # We received the [DONE], so stop reading the stream.
+                break
@@ -56,12 +56,20 @@ MIN_CONTEXT_WINDOW = 4096
 # number of concurrent embedding requests to sent
 EMBEDDING_BATCH_SIZE = 200
 
+# number of messages/passages read per cursor fetch and inserted per batch when streaming agent exports and imports
+AGENT_SERIALIZATION_CHUNK_SIZE = 500
+
 # Voice Sleeptime message buffer lengths
 DEFAULT_MAX_MESSAGE_BUFFER_LENGTH = 30
 DEFAULT_MIN_MESSAGE_BUFFER_LENGTH = 15
 
 # embeddings
-MAX_EMBEDDING_DIM = 4096  # maximum supported embeding size - do NOT change or else DBs will need to be reset
+MAX_EMBEDDING_DIM = 4096  # maximum supported embeding size; passages written before native-dimension storage are zero-padded to it
+# Embeddings are stored at their native dimension, and pgvector can only HNSW-index a column of one fixed dimension (<= 2000),
+# so there is one partial HNSW index per dimension listed here; searches at any other dimension fall back to an exact scan
+PGVECTOR_HNSW_INDEXED_DIMS = (384, 512, 768, 1024, 1536)
+# the leading dims of the zero-padded column indexed by the HNSW indexes of migration 3d2b8e1f6a4c, before native-dimension storage
+PGVECTOR_HNSW_INDEX_DIM = 2000
 DEFAULT_EMBEDDING_CHUNK_SIZE = 300
 
 # tokenizers
@@ -359,6 +367,7 @@ REDIS_EXCLUDE = "exclude"
 REDIS_SET_DEFAULT_VAL = "None"
 REDIS_DEFAULT_CACHE_PREFIX = "letta_cache"
 REDIS_RUN_ID_PREFIX = "agent:send_message:run_id"
+REDIS_IN_CONTEXT_MESSAGES_VERSION_PREFIX = "agent:in_context_messages:version"
 
 # TODO: This is temporary, eventually use token-based eviction
 MAX_FILES_OPEN = 5
@@ -1,11 +1,10 @@
 import uuid
 from typing import Any, List, Optional
 
-import numpy as np
 import tiktoken
 from openai import OpenAI
 
-from letta.constants import EMBEDDING_TO_TOKENIZER_DEFAULT, EMBEDDING_TO_TOKENIZER_MAP, MAX_EMBEDDING_DIM
+from letta.constants import EMBEDDING_TO_TOKENIZER_DEFAULT, EMBEDDING_TO_TOKENIZER_MAP
 from letta.schemas.embedding_config import EmbeddingConfig
 from letta.utils import is_valid_url, printd
 
@@ -218,11 +217,9 @@ class OpenAIEmbeddings:
 
 
 def query_embedding(embedding_model, query_text: str):
-    """Generate padded embedding for querying database"""
+    """Generate embedding for querying database (at the model's native dimension, matching stored passages)"""
     query_vec = embedding_model.get_text_embedding(query_text)
-    query_vec = np.array(query_vec)
-    query_vec = np.pad(query_vec, (0, MAX_EMBEDDING_DIM - query_vec.shape[0]), mode="constant").tolist()
-    return query_vec
+    return list(query_vec)
 
 
 def embedding_model(config: EmbeddingConfig, user_id: Optional[uuid.UUID] = None):
@@ -1,17 +1,7 @@
 import os
 from typing import Any, Optional
 
-from composio.constants import DEFAULT_ENTITY_ID
-from composio.exceptions import (
-    ApiKeyNotProvidedError,
-    ComposioSDKError,
-    ConnectedAccountNotFoundError,
-    EnumMetadataNotFound,
-    EnumStringNotFound,
-)
-
 from letta.constants import COMPOSIO_ENTITY_ENV_VAR_KEY
-from letta.functions.async_composio_toolset import AsyncComposioToolSet
 from letta.utils import run_async_task
 
 
@@ -61,6 +51,18 @@ def {func_name}(**kwargs):
 async def execute_composio_action_async(
     action_name: str, args: dict, api_key: Optional[str] = None, entity_id: Optional[str] = None
 ) -> tuple[str, str]:
+    # composio is slow to import, and only needed once a composio tool actually runs
+    from composio.constants import DEFAULT_ENTITY_ID
+    from composio.exceptions import (
+        ApiKeyNotProvidedError,
+        ComposioSDKError,
+        ConnectedAccountNotFoundError,
+        EnumMetadataNotFound,
+        EnumStringNotFound,
+    )
+
+    from letta.functions.async_composio_toolset import AsyncComposioToolSet
+
     entity_id = entity_id or os.getenv(COMPOSIO_ENTITY_ENV_VAR_KEY, DEFAULT_ENTITY_ID)
     composio_toolset = AsyncComposioToolSet(api_key=api_key, entity_id=entity_id, lock=False)
     try:
@@ -10,6 +10,7 @@ from pydantic import BaseModel, Field, create_model
 
 from letta.constants import DEFAULT_MESSAGE_TOOL, DEFAULT_MESSAGE_TOOL_KWARG
 from letta.functions.interface import MultiAgentMessagingInterface
+from letta.helpers.fan_out import fan_out, get_provider_rate_limiter, round_robin_priority
 from letta.orm.errors import NoResultFound
 from letta.schemas.enums import MessageRole
 from letta.schemas.letta_message import AssistantMessage
@@ -438,26 +439,7 @@ def fire_and_forget_send_to_agent(
 async def _send_message_to_agents_matching_tags_async(
     sender_agent: "Agent", server: "SyncServer", messages: List[MessageCreate], matching_agents: List["AgentState"]
 ) -> List[str]:
-    async def _send_single(agent_state):
-        return await _async_send_message_with_retries(
-            server=server,
-            sender_agent=sender_agent,
-            target_agent_id=agent_state.id,
-            messages=messages,
-            max_retries=3,
-            timeout=settings.multi_agent_send_message_timeout,
-        )
-
-    tasks = [asyncio.create_task(_send_single(agent_state)) for agent_state in matching_agents]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    final = []
-    for r in results:
-        if isinstance(r, Exception):
-            final.append(str(r))
-        else:
-            final.append(r)
-
-    return final
+    return await _broadcast_with_retries(server=server, sender_agent=sender_agent, messages=messages, target_agents=matching_agents)
 
 
 async def _send_message_to_all_agents_in_group_async(sender_agent: "Agent", message: str) -> List[str]:
@@ -475,30 +457,47 @@ async def _send_message_to_all_agents_in_group_async(sender_agent: "Agent", mess
     # Create a system message
     messages = [MessageCreate(role=MessageRole.system, content=augmented_message, name=sender_agent.agent_state.name)]
 
-    # Possibly limit concurrency to avoid meltdown:
-    sem = asyncio.Semaphore(settings.multi_agent_concurrent_sends)
+    return await _broadcast_with_retries(server=server, sender_agent=sender_agent, messages=messages, target_agents=worker_agents)
+
+
+async def _broadcast_with_retries(
+    server: "SyncServer", sender_agent: "Agent", messages: List[MessageCreate], target_agents: List["AgentState"]
+) -> List[str]:
+    """
+    Send the messages to every target agent, at most `multi_agent_concurrent_sends` at a time and subject to each LLM
+    provider's rate limit, alternating between providers. Agents that haven't replied within `multi_agent_send_message_timeout`
+    are reported as timed out.
+    """
 
     async def _send_single(agent_state):
-        async with sem:
-            return await _async_send_message_with_retries(
-                server=server,
-                sender_agent=sender_agent,
-                target_agent_id=agent_state.id,
-                messages=messages,
-                max_retries=3,
-                timeout=settings.multi_agent_send_message_timeout,
-            )
+        return await _async_send_message_with_retries(
+            server=server,
+            sender_agent=sender_agent,
+            target_agent_id=agent_state.id,
+            messages=messages,
+            max_retries=3,
+            timeout=settings.multi_agent_send_message_timeout,
+        )
 
-    tasks = [asyncio.create_task(_send_single(agent_state)) for agent_state in worker_agents]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    final = []
-    for r in results:
-        if isinstance(r, Exception):
-            final.append(str(r))
+    results = {}
+    async for fan_out_result in fan_out(
+        target_agents,
+        _send_single,
+        max_concurrency=settings.multi_agent_concurrent_sends,
+        timeout=settings.multi_agent_send_message_timeout,
+        rate_limiter=lambda agent_state: get_provider_rate_limiter(agent_state.llm_config.model_endpoint_type),
+        priority=round_robin_priority(target_agents, key=lambda agent_state: agent_state.llm_config.model_endpoint_type),
+    ):
+        agent_id = fan_out_result.item.id
+        if fan_out_result.timed_out:
+            results[agent_id] = f"(Timeout after {settings.multi_agent_send_message_timeout} seconds for agent {agent_id})"
+        elif fan_out_result.error is not None:
+            results[agent_id] = str(fan_out_result.error)
         else:
-            final.append(r)
+            results[agent_id] = fan_out_result.result
+            sender_agent.logger.info(f"Received reply {len(results)}/{len(target_agents)} of broadcast from agent {agent_id}")
 
-    return final
+    return [results[agent_state.id] for agent_state in target_agents]
 
 
 def generate_model_from_args_json_schema(schema: Dict[str, Any]) -> Type[BaseModel]:
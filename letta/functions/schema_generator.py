@@ -1,8 +1,7 @@
 import inspect
 import warnings
-from typing import Any, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
 
-from composio.client.collections import ActionParametersModel
 from docstring_parser import parse
 from pydantic import BaseModel
 from typing_extensions import Literal
@@ -11,6 +10,9 @@ from letta.constants import REQUEST_HEARTBEAT_DESCRIPTION, REQUEST_HEARTBEAT_PAR
 from letta.functions.mcp_client.types import MCPTool
 from letta.log import get_logger
 
+if TYPE_CHECKING:
+    from composio.client.collections import ActionParametersModel
+
 logger = get_logger(__name__)
 
 
@@ -637,7 +639,7 @@ def generate_tool_schema_for_mcp(
 
 
 def generate_tool_schema_for_composio(
-    parameters_model: ActionParametersModel,
+    parameters_model: "ActionParametersModel",
     name: str,
     description: str,
     append_heartbeat: bool = True,
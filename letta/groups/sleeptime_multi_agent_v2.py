@@ -1,20 +1,17 @@
-import asyncio
 from collections.abc import AsyncGenerator
-from datetime import datetime, timezone
+from typing import Optional
 
 from letta.agents.base_agent import BaseAgent
 from letta.agents.letta_agent import LettaAgent
 from letta.constants import DEFAULT_MAX_STEPS
-from letta.groups.helpers import stringify_message
+from letta.groups.sleeptime_worker import sleeptime_worker
 from letta.otel.tracing import trace_method
-from letta.schemas.enums import JobStatus
+from letta.schemas.agent import AgentState
 from letta.schemas.group import Group, ManagerType
-from letta.schemas.job import JobUpdate
 from letta.schemas.letta_message import MessageType
 from letta.schemas.letta_message_content import TextContent
 from letta.schemas.letta_response import LettaResponse
 from letta.schemas.message import Message, MessageCreate
-from letta.schemas.run import Run
 from letta.schemas.user import User
 from letta.services.agent_manager import AgentManager
 from letta.services.block_manager import BlockManager
@@ -69,6 +66,7 @@ class SleeptimeMultiAgentV2(BaseAgent):
         use_assistant_message: bool = True,
         request_start_timestamp_ns: int | None = None,
         include_return_message_types: list[MessageType] | None = None,
+        agent_state: Optional[AgentState] = None,
     ) -> LettaResponse:
         run_ids = []
 
@@ -100,6 +98,7 @@ class SleeptimeMultiAgentV2(BaseAgent):
             run_id=run_id,
             use_assistant_message=use_assistant_message,
             include_return_message_types=include_return_message_types,
+            agent_state=agent_state,
         )
 
         # Get last response messages
@@ -142,6 +141,7 @@ class SleeptimeMultiAgentV2(BaseAgent):
         use_assistant_message: bool = True,
         request_start_timestamp_ns: int | None = None,
         include_return_message_types: list[MessageType] | None = None,
+        agent_state: Optional[AgentState] = None,
     ):
         response = await self.step(
             input_messages=input_messages,
@@ -149,6 +149,7 @@ class SleeptimeMultiAgentV2(BaseAgent):
             use_assistant_message=use_assistant_message,
             request_start_timestamp_ns=request_start_timestamp_ns,
             include_return_message_types=include_return_message_types,
+            agent_state=agent_state,
         )
 
         for message in response.messages:
@@ -165,6 +166,7 @@ class SleeptimeMultiAgentV2(BaseAgent):
         use_assistant_message: bool = True,
         request_start_timestamp_ns: int | None = None,
         include_return_message_types: list[MessageType] | None = None,
+        agent_state: Optional[AgentState] = None,
     ) -> AsyncGenerator[str, None]:
         # Prepare new messages
         new_messages = []
@@ -194,6 +196,7 @@ class SleeptimeMultiAgentV2(BaseAgent):
             use_assistant_message=use_assistant_message,
             request_start_timestamp_ns=request_start_timestamp_ns,
             include_return_message_types=include_return_message_types,
+            agent_state=agent_state,
         ):
             yield chunk
 
@@ -226,109 +229,12 @@ class SleeptimeMultiAgentV2(BaseAgent):
         last_processed_message_id: str,
         use_assistant_message: bool = True,
     ) -> str:
-        run = Run(
-            user_id=self.actor.id,
-            status=JobStatus.created,
-            metadata={
-                "job_type": "sleeptime_agent_send_message_async",  # is this right?
-                "agent_id": sleeptime_agent_id,
-            },
-        )
-        run = await self.job_manager.create_job_async(pydantic_job=run, actor=self.actor)
-
-        asyncio.create_task(
-            self._participant_agent_step(
-                foreground_agent_id=self.agent_id,
-                sleeptime_agent_id=sleeptime_agent_id,
-                response_messages=response_messages,
-                last_processed_message_id=last_processed_message_id,
-                run_id=run.id,
-                use_assistant_message=True,
-            )
+        return await sleeptime_worker.enqueue(
+            group_id=self.group.id,
+            foreground_agent_id=self.agent_id,
+            sleeptime_agent_id=sleeptime_agent_id,
+            response_messages=response_messages,
+            last_processed_message_id=last_processed_message_id,
+            actor=self.actor,
+            use_assistant_message=True,
         )
-        return run.id
-
-    async def _participant_agent_step(
-        self,
-        foreground_agent_id: str,
-        sleeptime_agent_id: str,
-        response_messages: list[Message],
-        last_processed_message_id: str,
-        run_id: str,
-        use_assistant_message: bool = True,
-    ) -> str:
-        try:
-            # Update job status
-            job_update = JobUpdate(status=JobStatus.running)
-            await self.job_manager.update_job_by_id_async(job_id=run_id, job_update=job_update, actor=self.actor)
-
-            # Create conversation transcript
-            prior_messages = []
-            if self.group.sleeptime_agent_frequency:
-                try:
-                    prior_messages = await self.message_manager.list_messages_for_agent_async(
-                        agent_id=foreground_agent_id,
-                        actor=self.actor,
-                        after=last_processed_message_id,
-                        before=response_messages[0].id,
-                    )
-                except Exception:
-                    pass  # continue with just latest messages
-
-            transcript_summary = [stringify_message(message) for message in prior_messages + response_messages]
-            transcript_summary = [summary for summary in transcript_summary if summary is not None]
-            message_text = "\n".join(transcript_summary)
-
-            sleeptime_agent_messages = [
-                MessageCreate(
-                    role="user",
-                    content=[TextContent(text=message_text)],
-                    id=Message.generate_id(),
-                    agent_id=sleeptime_agent_id,
-                    group_id=self.group.id,
-                )
-            ]
-
-            # Load sleeptime agent
-            sleeptime_agent = LettaAgent(
-                agent_id=sleeptime_agent_id,
-                message_manager=self.message_manager,
-                agent_manager=self.agent_manager,
-                block_manager=self.block_manager,
-                job_manager=self.job_manager,
-                passage_manager=self.passage_manager,
-                actor=self.actor,
-                step_manager=self.step_manager,
-                telemetry_manager=self.telemetry_manager,
-                current_run_id=self.current_run_id,
-                message_buffer_limit=20,  # TODO: Make this configurable
-                message_buffer_min=8,  # TODO: Make this configurable
-                enable_summarization=False,  # TODO: Make this configurable
-            )
-
-            # Perform sleeptime agent step
-            result = await sleeptime_agent.step(
-                input_messages=sleeptime_agent_messages,
-                use_assistant_message=use_assistant_message,
-                run_id=run_id,
-            )
-
-            # Update job status
-            job_update = JobUpdate(
-                status=JobStatus.completed,
-                completed_at=datetime.now(timezone.utc).replace(tzinfo=None),
-                metadata={
-                    "result": result.model_dump(mode="json"),
-                    "agent_id": sleeptime_agent_id,
-                },
-            )
-            await self.job_manager.update_job_by_id_async(job_id=run_id, job_update=job_update, actor=self.actor)
-            return result
-        except Exception as e:
-            job_update = JobUpdate(
-                status=JobStatus.failed,
-                completed_at=datetime.now(timezone.utc).replace(tzinfo=None),
-                metadata={"error": str(e)},
-            )
-            await self.job_manager.update_job_by_id_async(job_id=run_id, job_update=job_update, actor=self.actor)
-            raise
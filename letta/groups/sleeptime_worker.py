@@ -0,0 +1,237 @@
+import asyncio
+import threading
+import weakref
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from letta.agents.letta_agent import LettaAgent
+from letta.groups.helpers import stringify_message
+from letta.helpers.datetime_helpers import get_utc_time
+from letta.log import get_logger
+from letta.schemas.enums import JobStatus
+from letta.schemas.job import JobUpdate
+from letta.schemas.letta_message_content import TextContent
+from letta.schemas.message import Message, MessageCreate
+from letta.schemas.sleeptime_job import SleeptimeJob
+from letta.schemas.user import User
+from letta.services.agent_manager import AgentManager
+from letta.services.block_manager import BlockManager
+from letta.services.group_manager import GroupManager
+from letta.services.job_manager import JobManager
+from letta.services.message_manager import MessageManager
+from letta.services.passage_manager import PassageManager
+from letta.services.sleeptime_job_manager import SleeptimeJobManager
+from letta.services.user_manager import UserManager
+from letta.settings import settings
+
+logger = get_logger(__name__)
+
+
+class _LoopWorker:
+    """The polling task and running jobs of one event loop, since tasks are bound to the loop they were created on."""
+
+    def __init__(self, worker: "SleeptimeWorker"):
+        self.wake = asyncio.Event()
+        self.running: Dict[asyncio.Task, str] = {}
+        self.task = asyncio.get_running_loop().create_task(worker._run(self))
+
+
+class SleeptimeWorker:
+    """
+    Runs the sleeptime jobs queued in the database, on every server worker.
+
+    Each worker polls the queue every `sleeptime_worker_poll_interval_seconds`, and right away when a job is queued or
+    finishes in the same process. At most `sleeptime_max_concurrent_jobs` jobs run at once across all workers, and each
+    is given `sleeptime_job_timeout_seconds`. Jobs claimed by a worker that stopped are failed after twice that long.
+    """
+
+    def __init__(self):
+        self.sleeptime_job_manager = SleeptimeJobManager()
+        self.job_manager = JobManager()
+        self.message_manager = MessageManager()
+        self._lock = threading.Lock()
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopWorker]" = weakref.WeakKeyDictionary()
+
+    def start(self) -> _LoopWorker:
+        """Start polling the queue on the running event loop, if it isn't already."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            loop_worker = self._loops.get(loop)
+            if loop_worker is None:
+                loop_worker = self._loops[loop] = _LoopWorker(self)
+        return loop_worker
+
+    async def enqueue(
+        self,
+        group_id: str,
+        foreground_agent_id: str,
+        sleeptime_agent_id: str,
+        response_messages: List[Message],
+        last_processed_message_id: Optional[str],
+        actor: User,
+        use_assistant_message: bool = True,
+    ) -> str:
+        """Queue a sleeptime run over the turn that produced `response_messages`, returns the id of the run processing it."""
+        sleeptime_job = await self.sleeptime_job_manager.enqueue_sleeptime_job_async(
+            group_id=group_id,
+            foreground_agent_id=foreground_agent_id,
+            sleeptime_agent_id=sleeptime_agent_id,
+            after_message_id=last_processed_message_id,
+            first_message_id=response_messages[0].id,
+            last_message_id=response_messages[-1].id,
+            actor=actor,
+            use_assistant_message=use_assistant_message,
+        )
+        self.start().wake.set()
+        return sleeptime_job.run_id
+
+    async def aclose(self):
+        """Stop polling on the running event loop, and put the jobs it was running back in the queue."""
+        with self._lock:
+            loop_worker = self._loops.pop(asyncio.get_running_loop(), None)
+        if loop_worker is None:
+            return
+        tasks = [loop_worker.task, *loop_worker.running]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, loop_worker: _LoopWorker):
+        while True:
+            loop_worker.wake.clear()
+            try:
+                stale_before = get_utc_time().replace(tzinfo=None) - timedelta(seconds=2 * settings.sleeptime_job_timeout_seconds)
+                await self.sleeptime_job_manager.fail_stale_sleeptime_jobs_async(claimed_before=stale_before)
+                while len(loop_worker.running) < settings.sleeptime_max_concurrent_jobs:
+                    sleeptime_job = await self.sleeptime_job_manager.claim_next_sleeptime_job_async(
+                        max_running=settings.sleeptime_max_concurrent_jobs
+                    )
+                    if sleeptime_job is None:
+                        break
+                    task = asyncio.create_task(self._process(sleeptime_job))
+                    loop_worker.running[task] = sleeptime_job.id
+                    task.add_done_callback(lambda t: (loop_worker.running.pop(t, None), loop_worker.wake.set()))
+            except Exception as e:
+                logger.error(f"Failed to claim sleeptime jobs: {e}")
+
+            try:
+                await asyncio.wait_for(loop_worker.wake.wait(), timeout=settings.sleeptime_worker_poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _process(self, sleeptime_job: SleeptimeJob):
+        try:
+            actor = await UserManager().get_actor_by_id_async(actor_id=sleeptime_job.user_id)
+            await asyncio.wait_for(self._run_sleeptime_job(sleeptime_job, actor), timeout=settings.sleeptime_job_timeout_seconds)
+        except asyncio.CancelledError:
+            # the worker is shutting down, let another one pick the job up
+            await self.sleeptime_job_manager.release_sleeptime_job_async(sleeptime_job.id)
+            raise
+        except asyncio.TimeoutError:
+            logger.error(f"Sleeptime job {sleeptime_job.id} timed out after {settings.sleeptime_job_timeout_seconds} seconds")
+            job_update = JobUpdate(
+                status=JobStatus.failed,
+                completed_at=datetime.now(timezone.utc).replace(tzinfo=None),
+                metadata={"error": f"Timed out after {settings.sleeptime_job_timeout_seconds} seconds"},
+            )
+            await self.job_manager.update_job_by_id_async(job_id=sleeptime_job.run_id, job_update=job_update, actor=actor)
+        except Exception as e:
+            logger.error(f"Sleeptime job {sleeptime_job.id} failed: {e}")
+        # the run is finished, so the job must not be released if shutdown interrupts its removal
+        await asyncio.shield(self.sleeptime_job_manager.delete_sleeptime_job_async(sleeptime_job.id))
+
+    async def _run_sleeptime_job(self, sleeptime_job: SleeptimeJob, actor: User):
+        run_id = sleeptime_job.run_id
+        try:
+            # Update job status
+            job_update = JobUpdate(status=JobStatus.running)
+            await self.job_manager.update_job_by_id_async(job_id=run_id, job_update=job_update, actor=actor)
+
+            # Create conversation transcript
+            message_text = await self._build_transcript(sleeptime_job, actor)
+            sleeptime_agent_messages = [
+                MessageCreate(
+                    role="user",
+                    content=[TextContent(text=message_text)],
+                    id=Message.generate_id(),
+                    agent_id=sleeptime_job.sleeptime_agent_id,
+                    group_id=sleeptime_job.group_id,
+                )
+            ]
+
+            # Load sleeptime agent
+            sleeptime_agent = LettaAgent(
+                agent_id=sleeptime_job.sleeptime_agent_id,
+                message_manager=self.message_manager,
+                agent_manager=AgentManager(),
+                block_manager=BlockManager(),
+                job_manager=self.job_manager,
+                passage_manager=PassageManager(),
+                actor=actor,
+                current_run_id=run_id,
+                message_buffer_limit=20,  # TODO: Make this configurable
+                message_buffer_min=8,  # TODO: Make this configurable
+                enable_summarization=False,  # TODO: Make this configurable
+            )
+
+            # Perform sleeptime agent step
+            result = await sleeptime_agent.step(
+                input_messages=sleeptime_agent_messages,
+                use_assistant_message=sleeptime_job.use_assistant_message,
+                run_id=run_id,
+            )
+
+            # Update job status
+            job_update = JobUpdate(
+                status=JobStatus.completed,
+                completed_at=datetime.now(timezone.utc).replace(tzinfo=None),
+                metadata={
+                    "result": result.model_dump(mode="json"),
+                    "agent_id": sleeptime_job.sleeptime_agent_id,
+                },
+            )
+            await self.job_manager.update_job_by_id_async(job_id=run_id, job_update=job_update, actor=actor)
+            return result
+        except Exception as e:
+            job_update = JobUpdate(
+                status=JobStatus.failed,
+                completed_at=datetime.now(timezone.utc).replace(tzinfo=None),
+                metadata={"error": str(e)},
+            )
+            await self.job_manager.update_job_by_id_async(job_id=run_id, job_update=job_update, actor=actor)
+            raise
+
+    async def _build_transcript(self, sleeptime_job: SleeptimeJob, actor: User) -> str:
+        group = await GroupManager().retrieve_group_async(group_id=sleeptime_job.group_id, actor=actor)
+        prior_messages = []
+        if group.sleeptime_agent_frequency:
+            try:
+                prior_messages = await self.message_manager.list_messages_for_agent_async(
+                    agent_id=sleeptime_job.foreground_agent_id,
+                    actor=actor,
+                    after=sleeptime_job.after_message_id,
+                    before=sleeptime_job.first_message_id,
+                )
+            except Exception:
+                pass  # continue with just latest messages
+
+        # the responses of every merged turn, and the turns in between
+        response_messages = await self.message_manager.get_messages_by_ids_async(message_ids=[sleeptime_job.first_message_id], actor=actor)
+        if sleeptime_job.last_message_id != sleeptime_job.first_message_id:
+            response_messages += await self.message_manager.list_messages_for_agent_async(
+                agent_id=sleeptime_job.foreground_agent_id,
+                actor=actor,
+                after=sleeptime_job.first_message_id,
+                before=sleeptime_job.last_message_id,
+                limit=None,
+            )
+            response_messages += await self.message_manager.get_messages_by_ids_async(
+                message_ids=[sleeptime_job.last_message_id], actor=actor
+            )
+
+        transcript_summary = [stringify_message(message) for message in prior_messages + response_messages]
+        transcript_summary = [summary for summary in transcript_summary if summary is not None]
+        return "\n".join(transcript_summary)
+
+
+sleeptime_worker = SleeptimeWorker()
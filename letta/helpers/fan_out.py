@@ -0,0 +1,132 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import AsyncGenerator, Awaitable, Callable, Dict, Generic, Iterable, Optional, TypeVar
+
+from letta.settings import settings
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class TokenBucket:
+    """Token bucket rate limiter: allows `rate` acquisitions per second on average, in bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        # acquisitions reserve a token up front (going into debt if needed), so a plain lock works across event loops
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token, returns how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_provider_buckets: Dict[str, TokenBucket] = {}
+_provider_buckets_lock = threading.Lock()
+
+
+def get_provider_rate_limiter(provider: str) -> Optional[TokenBucket]:
+    """The process-wide rate limiter for starting multi-agent sends to agents on `provider`, None if rate limiting is off."""
+    if settings.multi_agent_provider_rate_limit <= 0:
+        return None
+    with _provider_buckets_lock:
+        bucket = _provider_buckets.get(provider)
+        if bucket is None:
+            bucket = _provider_buckets[provider] = TokenBucket(
+                rate=settings.multi_agent_provider_rate_limit, capacity=max(settings.multi_agent_provider_burst, 1)
+            )
+        return bucket
+
+
+def round_robin_priority(items: Iterable[T], key: Callable[[T], str]) -> Callable[[T], float]:
+    """
+    A `fan_out` priority that interleaves `items` by `key` (e.g. their LLM provider), so that items waiting on one
+    provider's rate limit don't take up every concurrency slot ahead of the others. Items with the same key keep their order.
+    """
+    ranks, counts = {}, {}
+    for item in items:
+        item_key = key(item)
+        ranks[id(item)] = counts.get(item_key, 0)
+        counts[item_key] = ranks[id(item)] + 1
+    return lambda item: ranks[id(item)]
+
+
+@dataclass
+class FanOutResult(Generic[T, R]):
+    item: T
+    result: Optional[R] = None
+    error: Optional[BaseException] = None
+    timed_out: bool = False
+
+
+async def fan_out(
+    items: Iterable[T],
+    worker: Callable[[T], Awaitable[R]],
+    max_concurrency: Optional[int] = None,
+    timeout: Optional[float] = None,
+    rate_limiter: Optional[Callable[[T], Optional[TokenBucket]]] = None,
+    priority: Optional[Callable[[T], float]] = None,
+) -> AsyncGenerator[FanOutResult[T, R], None]:
+    """
+    Run `worker` on every item with at most `max_concurrency` running at once, yielding results as they complete.
+
+    Items start in order of `priority` (lowest first), or in the given order. Before an item starts, it waits for a
+    token from its `rate_limiter` bucket, if any. Once `timeout` seconds have passed, the running workers are cancelled,
+    and they and the items that never started are yielded with `timed_out` set. Worker exceptions are yielded as `error`.
+    """
+    queue = sorted(items, key=priority) if priority else list(items)
+    queue.reverse()  # pop from the end
+    max_concurrency = max_concurrency or len(queue) or 1
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+
+    async def run(item: T) -> R:
+        bucket = rate_limiter(item) if rate_limiter else None
+        if bucket is not None:
+            await bucket.acquire()
+        return await worker(item)
+
+    running: Dict[asyncio.Task, T] = {}
+    try:
+        while queue or running:
+            while queue and len(running) < max_concurrency:
+                item = queue.pop()
+                running[asyncio.create_task(run(item))] = item
+
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                break
+            done, _ = await asyncio.wait(running, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                item = running.pop(task)
+                if task.cancelled():
+                    yield FanOutResult(item=item, error=asyncio.CancelledError())
+                elif task.exception() is not None:
+                    yield FanOutResult(item=item, error=task.exception())
+                else:
+                    yield FanOutResult(item=item, result=task.result())
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    for item in running.values():
+        yield FanOutResult(item=item, timed_out=True)
+    for item in reversed(queue):
+        yield FanOutResult(item=item, timed_out=True)
@@ -66,9 +66,6 @@ def _convert_message_create_to_message(
                     image_media_type, _ = mimetypes.guess_type(content.source.url)
                 image_data = base64.standard_b64encode(image_response.content).decode("utf-8")
                 content.source = Base64Image(media_type=image_media_type, data=image_data)
-            if content.source.type == ImageSourceType.letta and not content.source.data:
-                # TODO: hydrate letta image with data from db
-                pass
 
     return Message(
         agent_id=agent_id,
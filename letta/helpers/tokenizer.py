@@ -0,0 +1,140 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence
+
+import tiktoken
+
+from letta.log import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_ENCODING = "cl100k_base"
+# texts at least this long have their counts cached: system prompts, memory blocks and tool schemas are counted over and over,
+# while shorter texts are about as cheap to encode as to look up
+MIN_CACHED_TEXT_LENGTH = 1024
+MAX_CACHED_COUNTS = 4096
+# batches smaller than this are encoded in the calling thread, handing them to the pool would cost more than it saves
+MIN_PARALLEL_BATCH_SIZE = 256
+
+
+@lru_cache(maxsize=128)
+def get_encoding(model: str) -> tiktoken.Encoding:
+    """The tiktoken encoding of a model, cl100k_base for models tiktoken doesn't know."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        logger.debug(f"No tiktoken encoding for model {model}, falling back to {DEFAULT_ENCODING}")
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+
+
+class Tokenizer:
+    """
+    Token counting with tiktoken, shared by everything that counts tokens locally.
+
+    Encoders are looked up once per model, the counts of long texts are kept in a bounded LRU keyed by their hash, and large
+    batches (e.g. long message histories) are encoded over a thread pool, as tiktoken releases the GIL while encoding.
+    Special tokens are counted as the plain text they are in messages, rather than rejected.
+    """
+
+    def __init__(
+        self,
+        max_cached_counts: int = MAX_CACHED_COUNTS,
+        min_cached_text_length: int = MIN_CACHED_TEXT_LENGTH,
+        max_workers: Optional[int] = None,
+    ):
+        self._lock = threading.Lock()
+        self._counts: "OrderedDict[bytes, int]" = OrderedDict()
+        self._max_cached_counts = max_cached_counts
+        self._min_cached_text_length = min_cached_text_length
+        self._max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.hits = 0
+        self.misses = 0
+
+    def count(self, text: str, model: str = "gpt-4") -> int:
+        return self.count_batch([text], model)[0]
+
+    def count_batch(self, texts: Sequence[str], model: str = "gpt-4") -> List[int]:
+        """Count the tokens of each text, encoding the ones that aren't cached in parallel if there are enough of them."""
+        counts: List[Optional[int]] = [None] * len(texts)
+        keys = [self._cache_key(text, model) for text in texts]
+        uncached = []
+        for i, key in enumerate(keys):
+            if key is not None:
+                counts[i] = self._get(key)
+            if counts[i] is None:
+                uncached.append(i)
+
+        if uncached:
+            encoding = get_encoding(model)
+            uncached_counts = self._encode_counts(encoding, [texts[i] for i in uncached])
+            for i, count in zip(uncached, uncached_counts):
+                counts[i] = count
+                if keys[i] is not None:
+                    self._put(keys[i], count)
+        return counts
+
+    def count_cached(self, key_text: str, model: str, counter: Callable[[], int]) -> int:
+        """
+        Cached result of `counter`, for counts that aren't just the encoding of a text (e.g. function definitions, counted by
+        `num_tokens_from_functions`). `key_text` identifies what is counted, and must not be a text that is itself counted.
+        """
+        key = self._cache_key(key_text, model, always=True)
+        count = self._get(key)
+        if count is None:
+            count = counter()
+            self._put(key, count)
+        return count
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _encode_counts(self, encoding: tiktoken.Encoding, texts: List[str]) -> List[int]:
+        if len(texts) < MIN_PARALLEL_BATCH_SIZE or self._max_workers < 2:
+            return [len(encoding.encode_ordinary(text)) for text in texts]
+        chunk_size = -(-len(texts) // self._max_workers)
+        chunks = [texts[i : i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        counts = []
+        for chunk_counts in self._get_executor().map(lambda chunk: [len(encoding.encode_ordinary(text)) for text in chunk], chunks):
+            counts.extend(chunk_counts)
+        return counts
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="letta-tokenizer")
+            return self._executor
+
+    def _cache_key(self, text: str, model: str, always: bool = False) -> Optional[bytes]:
+        if not always and len(text) < self._min_cached_text_length:
+            return None
+        digest = hashlib.blake2b(f"{model}\0".encode("utf-8"), digest_size=16)
+        digest.update(text.encode("utf-8"))
+        return digest.digest()
+
+    def _get(self, key: bytes) -> Optional[int]:
+        with self._lock:
+            count = self._counts.get(key)
+            if count is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._counts.move_to_end(key)
+            return count
+
+    def _put(self, key: bytes, count: int) -> None:
+        with self._lock:
+            self._counts[key] = count
+            self._counts.move_to_end(key)
+            while len(self._counts) > self._max_cached_counts:
+                self._counts.popitem(last=False)
+
+
+tokenizer = Tokenizer()
@@ -147,6 +147,10 @@ class ToolRulesSolver(BaseModel):
         """Check if the tool has children tools"""
         return any(rule.tool_name == tool_name for rule in self.child_based_tool_rules)
 
+    def is_conditional_tool(self, tool_name: str) -> bool:
+        """Check if the tools allowed after this tool depend on its output (conditional tool rules)."""
+        return any(isinstance(rule, ConditionalToolRule) and rule.tool_name == tool_name for rule in self.child_based_tool_rules)
+
     def is_continue_tool(self, tool_name):
         """Check if the tool is defined as a continue tool in the tool rules."""
         return any(rule.tool_name == tool_name for rule in self.continue_tool_rules)
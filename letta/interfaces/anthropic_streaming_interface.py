@@ -42,7 +42,7 @@ from letta.schemas.letta_message_content import ReasoningContent, RedactedReason
 from letta.schemas.letta_stop_reason import LettaStopReason, StopReasonType
 from letta.schemas.message import Message
 from letta.schemas.openai.chat_completion_response import FunctionCall, ToolCall
-from letta.server.rest_api.json_parser import JSONParser, PydanticJSONParser
+from letta.server.rest_api.json_parser import IncrementalJSONParser
 
 logger = get_logger(__name__)
 
@@ -63,7 +63,7 @@ class AnthropicStreamingInterface:
     """
 
     def __init__(self, use_assistant_message: bool = False, put_inner_thoughts_in_kwarg: bool = False):
-        self.json_parser: JSONParser = PydanticJSONParser()
+        self.json_parser = IncrementalJSONParser()
         self.use_assistant_message = use_assistant_message
 
         # Premake IDs for database writes
@@ -75,7 +75,9 @@ class AnthropicStreamingInterface:
         self.tool_call_id = None
         self.tool_call_name = None
         self.accumulated_tool_call_args = ""
-        self.previous_parse = {}
+        # how much of the inner thoughts / send_message argument has already been streamed out
+        self.inner_thoughts_offset = 0
+        self.send_message_offset = 0
 
         # usage trackers
         self.input_tokens = 0
@@ -112,7 +114,7 @@ class AnthropicStreamingInterface:
             arguments = self.accumulated_tool_call_args
         return ToolCall(id=self.tool_call_id, function=FunctionCall(arguments=arguments, name=self.tool_call_name))
 
-    def _check_inner_thoughts_complete(self, combined_args: str) -> bool:
+    def _check_inner_thoughts_complete(self) -> bool:
         """
         Check if inner thoughts are complete in the current tool call arguments
         by looking for a closing quote after the inner_thoughts field
@@ -122,9 +124,9 @@ class AnthropicStreamingInterface:
                 # None of the things should have inner thoughts in kwargs
                 return True
             else:
-                parsed = self.json_parser.parse(combined_args)
+                keys = self.json_parser.keys()
                 # TODO: This will break on tools with 0 input
-                return len(parsed.keys()) > 1 and INNER_THOUGHTS_KWARG in parsed.keys()
+                return len(keys) > 1 and INNER_THOUGHTS_KWARG in keys
         except Exception as e:
             logger.error("Error checking inner thoughts: %s", e)
             raise
@@ -241,12 +243,12 @@ class AnthropicStreamingInterface:
                                 )
 
                             self.accumulated_tool_call_args += delta.partial_json
-                            current_parsed = self.json_parser.parse(self.accumulated_tool_call_args)
+                            # Only the new fragment is parsed; the parser keeps its state across deltas
+                            self.json_parser.feed(delta.partial_json)
 
                             # Start detecting a difference in inner thoughts
-                            previous_inner_thoughts = self.previous_parse.get(INNER_THOUGHTS_KWARG, "")
-                            current_inner_thoughts = current_parsed.get(INNER_THOUGHTS_KWARG, "")
-                            inner_thoughts_diff = current_inner_thoughts[len(previous_inner_thoughts) :]
+                            inner_thoughts_diff = self.json_parser.read_string(INNER_THOUGHTS_KWARG, self.inner_thoughts_offset) or ""
+                            self.inner_thoughts_offset += len(inner_thoughts_diff)
 
                             if inner_thoughts_diff:
                                 if prev_message_type and prev_message_type != "reasoning_message":
@@ -262,7 +264,7 @@ class AnthropicStreamingInterface:
                                 yield reasoning_message
 
                             # Check if inner thoughts are complete - if so, flush the buffer
-                            if not self.inner_thoughts_complete and self._check_inner_thoughts_complete(self.accumulated_tool_call_args):
+                            if not self.inner_thoughts_complete and self._check_inner_thoughts_complete():
                                 self.inner_thoughts_complete = True
                                 # Flush all buffered tool call messages
                                 if len(self.tool_call_buffer) > 0:
@@ -273,6 +275,7 @@ class AnthropicStreamingInterface:
                                     tool_call_args = ""
                                     for buffered_msg in self.tool_call_buffer:
                                         tool_call_args += buffered_msg.tool_call.arguments if buffered_msg.tool_call.arguments else ""
+                                    current_inner_thoughts = self.json_parser.get(INNER_THOUGHTS_KWARG, "")
                                     tool_call_args = tool_call_args.replace(f'"{INNER_THOUGHTS_KWARG}": "{current_inner_thoughts}"', "")
 
                                     tool_call_msg = ToolCallMessage(
@@ -294,9 +297,8 @@ class AnthropicStreamingInterface:
 
                             # Start detecting special case of "send_message"
                             if self.tool_call_name == DEFAULT_MESSAGE_TOOL and self.use_assistant_message:
-                                previous_send_message = self.previous_parse.get(DEFAULT_MESSAGE_TOOL_KWARG, "")
-                                current_send_message = current_parsed.get(DEFAULT_MESSAGE_TOOL_KWARG, "")
-                                send_message_diff = current_send_message[len(previous_send_message) :]
+                                send_message_diff = self.json_parser.read_string(DEFAULT_MESSAGE_TOOL_KWARG, self.send_message_offset) or ""
+                                self.send_message_offset += len(send_message_diff)
 
                                 # Only stream out if it's not an empty string
                                 if send_message_diff:
@@ -327,9 +329,6 @@ class AnthropicStreamingInterface:
                                     yield tool_call_msg
                                 else:
                                     self.tool_call_buffer.append(tool_call_msg)
-
-                            # Set previous parse
-                            self.previous_parse = current_parsed
                         elif isinstance(delta, BetaThinkingDelta):
                             # Safety check
                             if not self.anthropic_mode == EventMode.THINKING:
@@ -6,7 +6,7 @@ from openai.types.chat.chat_completion_chunk import ChatCompletionChunk, Choice,
 
 from letta.constants import PRE_EXECUTION_MESSAGE_ARG
 from letta.interfaces.utils import _format_sse_chunk
-from letta.server.rest_api.json_parser import OptimisticJSONParser
+from letta.server.rest_api.json_parser import IncrementalJSONParser
 
 
 class OpenAIChatCompletionsStreamingInterface:
@@ -17,7 +17,7 @@ class OpenAIChatCompletionsStreamingInterface:
     """
 
     def __init__(self, stream_pre_execution_message: bool = True):
-        self.optimistic_json_parser: OptimisticJSONParser = OptimisticJSONParser()
+        self.json_parser: IncrementalJSONParser = IncrementalJSONParser()
         self.stream_pre_execution_message: bool = stream_pre_execution_message
 
         self.current_parsed_json_result: dict[str, Any] = {}
@@ -80,7 +80,7 @@ class OpenAIChatCompletionsStreamingInterface:
 
     async def _stream_pre_execution_message(self, chunk: ChatCompletionChunk, tool_call: Any) -> AsyncGenerator[str, None]:
         """Parses and streams pre-execution messages if they have changed."""
-        parsed_args = self.optimistic_json_parser.parse(self.tool_call_args_str)
+        parsed_args = self.json_parser.parse(self.tool_call_args_str)
 
         if parsed_args.get(PRE_EXECUTION_MESSAGE_ARG) and parsed_args[PRE_EXECUTION_MESSAGE_ARG] != self.current_parsed_json_result.get(
             PRE_EXECUTION_MESSAGE_ARG
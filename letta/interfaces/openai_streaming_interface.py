@@ -17,7 +17,7 @@ from letta.schemas.letta_message_content import OmittedReasoningContent, TextCon
 from letta.schemas.letta_stop_reason import LettaStopReason, StopReasonType
 from letta.schemas.message import Message
 from letta.schemas.openai.chat_completion_response import FunctionCall, ToolCall
-from letta.server.rest_api.json_parser import OptimisticJSONParser
+from letta.server.rest_api.json_parser import IncrementalJSONParser
 from letta.streaming_utils import JSONInnerThoughtsExtractor
 
 logger = get_logger(__name__)
@@ -35,7 +35,7 @@ class OpenAIStreamingInterface:
         self.assistant_message_tool_name = DEFAULT_MESSAGE_TOOL
         self.assistant_message_tool_kwarg = DEFAULT_MESSAGE_TOOL_KWARG
 
-        self.optimistic_json_parser: OptimisticJSONParser = OptimisticJSONParser()
+        self.json_parser: IncrementalJSONParser = IncrementalJSONParser()
         self.function_args_reader = JSONInnerThoughtsExtractor(wait_for_first_key=True)  # TODO: pass in kwarg
         self.function_name_buffer = None
         self.function_args_buffer = None
@@ -282,7 +282,7 @@ class OpenAIStreamingInterface:
                                                 # TODO: THIS IS HORRIBLE
                                                 # TODO: WE USE THE OLD JSON PARSER EARLIER (WHICH DOES NOTHING) AND NOW THE NEW JSON PARSER
                                                 # TODO: THIS IS TOTALLY WRONG AND BAD, BUT SAVING FOR A LARGER REWRITE IN THE NEAR FUTURE
-                                                parsed_args = self.optimistic_json_parser.parse(self.current_function_arguments)
+                                                parsed_args = self.json_parser.parse(self.current_function_arguments)
 
                                                 if parsed_args.get(self.assistant_message_tool_kwarg) and parsed_args.get(
                                                     self.assistant_message_tool_kwarg
@@ -27,6 +27,7 @@ from letta.errors import (
 from letta.helpers.datetime_helpers import get_utc_time_int
 from letta.helpers.decorators import deprecated
 from letta.llm_api.helpers import add_inner_thoughts_to_functions, unpack_all_inner_thoughts_from_kwargs
+from letta.llm_api.http_client_registry import llm_http_client_registry
 from letta.llm_api.llm_client_base import LLMClientBase
 from letta.local_llm.constants import INNER_THOUGHTS_KWARG, INNER_THOUGHTS_KWARG_DESCRIPTION
 from letta.log import get_logger
@@ -127,16 +128,10 @@ class AnthropicClient(LLMClientBase):
             override_key = ProviderManager().get_override_key(llm_config.provider_name, actor=self.actor)
 
         if async_client:
-            return (
-                anthropic.AsyncAnthropic(api_key=override_key, max_retries=model_settings.anthropic_max_retries)
-                if override_key
-                else anthropic.AsyncAnthropic(max_retries=model_settings.anthropic_max_retries)
+            return llm_http_client_registry.get_async_anthropic_client(
+                api_key=override_key, max_retries=model_settings.anthropic_max_retries
             )
-        return (
-            anthropic.Anthropic(api_key=override_key, max_retries=model_settings.anthropic_max_retries)
-            if override_key
-            else anthropic.Anthropic(max_retries=model_settings.anthropic_max_retries)
-        )
+        return llm_http_client_registry.get_anthropic_client(api_key=override_key, max_retries=model_settings.anthropic_max_retries)
 
     @trace_method
     async def _get_anthropic_client_async(
@@ -147,16 +142,10 @@ class AnthropicClient(LLMClientBase):
             override_key = await ProviderManager().get_override_key_async(llm_config.provider_name, actor=self.actor)
 
         if async_client:
-            return (
-                anthropic.AsyncAnthropic(api_key=override_key, max_retries=model_settings.anthropic_max_retries)
-                if override_key
-                else anthropic.AsyncAnthropic(max_retries=model_settings.anthropic_max_retries)
+            return llm_http_client_registry.get_async_anthropic_client(
+                api_key=override_key, max_retries=model_settings.anthropic_max_retries
             )
-        return (
-            anthropic.Anthropic(api_key=override_key, max_retries=model_settings.anthropic_max_retries)
-            if override_key
-            else anthropic.Anthropic(max_retries=model_settings.anthropic_max_retries)
-        )
+        return llm_http_client_registry.get_anthropic_client(api_key=override_key, max_retries=model_settings.anthropic_max_retries)
 
     @trace_method
     def build_request_data(
@@ -196,13 +185,14 @@ class AnthropicClient(LLMClientBase):
         # Tools
         # For an overview on tool choice:
         # https://docs.anthropic.com/en/docs/build-with-claude/tool-use/overview
+        disable_parallel_tool_use = not llm_config.parallel_tool_calls
         if not tools:
             # Special case for summarization path
             tools_for_request = None
             tool_choice = None
         elif llm_config.enable_reasoner:
             # NOTE: reasoning models currently do not allow for `any`
-            tool_choice = {"type": "auto", "disable_parallel_tool_use": True}
+            tool_choice = {"type": "auto", "disable_parallel_tool_use": disable_parallel_tool_use}
             tools_for_request = [OpenAITool(function=f) for f in tools]
         elif force_tool_call is not None:
             tool_choice = {"type": "tool", "name": force_tool_call, "disable_parallel_tool_use": True}
@@ -217,9 +207,9 @@ class AnthropicClient(LLMClientBase):
         else:
             if llm_config.put_inner_thoughts_in_kwargs:
                 # tool_choice_type other than "auto" only plays nice if thinking goes inside the tool calls
-                tool_choice = {"type": "any", "disable_parallel_tool_use": True}
+                tool_choice = {"type": "any", "disable_parallel_tool_use": disable_parallel_tool_use}
             else:
-                tool_choice = {"type": "auto", "disable_parallel_tool_use": True}
+                tool_choice = {"type": "auto", "disable_parallel_tool_use": disable_parallel_tool_use}
             tools_for_request = [OpenAITool(function=f) for f in tools] if tools is not None else None
 
         # Add tool choice
@@ -278,7 +268,7 @@ class AnthropicClient(LLMClientBase):
     async def count_tokens(self, messages: List[dict] = None, model: str = None, tools: List[OpenAITool] = None) -> int:
         logging.getLogger("httpx").setLevel(logging.WARNING)
 
-        client = anthropic.AsyncAnthropic()
+        client = llm_http_client_registry.get_async_anthropic_client()
         if messages and len(messages) == 0:
             messages = None
         if tools and len(tools) > 0:
@@ -453,7 +443,8 @@ class AnthropicClient(LLMClientBase):
                             arguments = str(tool_input["function"]["arguments"])
                     else:
                         arguments = json.dumps(tool_input, indent=2)
-                    tool_calls = [
+                    # several tool_use blocks are only returned when parallel tool use is enabled
+                    tool_calls = (tool_calls or []) + [
                         ToolCall(
                             id=content_part.id,
                             type="function",
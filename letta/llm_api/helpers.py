@@ -8,10 +8,11 @@ import requests
 
 from letta.constants import OPENAI_CONTEXT_WINDOW_ERROR_SUBSTRING
 from letta.helpers.json_helpers import json_dumps
+from letta.helpers.tokenizer import tokenizer
 from letta.schemas.message import Message
 from letta.schemas.openai.chat_completion_response import ChatCompletionResponse, Choice
 from letta.settings import summarizer_settings
-from letta.utils import count_tokens, printd
+from letta.utils import printd
 
 
 def _convert_to_structured_output_helper(property: dict) -> dict:
@@ -353,7 +354,7 @@ def calculate_summarizer_cutoff(in_context_messages: List[Message], token_counts
 
 def get_token_counts_for_messages(in_context_messages: List[Message]) -> List[int]:
     in_context_messages_openai = [m.to_openai_dict() for m in in_context_messages]
-    token_counts = [count_tokens(str(msg)) for msg in in_context_messages_openai]
+    token_counts = tokenizer.count_batch([str(msg) for msg in in_context_messages_openai])
     return token_counts
 
 
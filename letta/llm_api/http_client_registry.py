@@ -0,0 +1,192 @@
+import asyncio
+import hashlib
+import importlib.util
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple, Type, TypeVar
+
+import anthropic
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+from letta.log import get_logger
+from letta.settings import model_settings
+
+logger = get_logger(__name__)
+
+ClientT = TypeVar("ClientT")
+ClientKey = Tuple[Hashable, ...]
+
+
+def _hash_api_key(api_key: Optional[str]) -> Optional[str]:
+    # keys are only kept hashed so they never show up in cache keys, logs, or metric attributes
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16] if api_key else None
+
+
+def _http2_enabled() -> bool:
+    return model_settings.llm_http2_enabled and importlib.util.find_spec("h2") is not None
+
+
+def _pool_kwargs() -> Dict[str, Any]:
+    return {
+        "limits": httpx.Limits(
+            max_connections=model_settings.llm_http_max_connections,
+            max_keepalive_connections=model_settings.llm_http_max_keepalive_connections,
+            keepalive_expiry=model_settings.llm_http_keepalive_expiry,
+        ),
+        # per-request timeouts are still set by the provider SDKs; this is the fallback for anything that doesn't
+        "timeout": httpx.Timeout(600.0, connect=model_settings.llm_http_connect_timeout),
+        "http2": _http2_enabled(),
+        "follow_redirects": True,
+    }
+
+
+def _pool_connection_counts(client: httpx.Client | httpx.AsyncClient) -> Tuple[int, int]:
+    """(active, idle) connection counts of an httpx client's connection pool."""
+    # httpx doesn't expose pool stats publicly, so read them off the underlying httpcore pool when it's there
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", None) or []
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return len(connections) - idle, idle
+
+
+class LLMHTTPClientRegistry:
+    """Process-wide cache of provider SDK clients sharing one tuned httpx connection pool.
+
+    Constructing `AsyncOpenAI` / `AsyncAnthropic` per request pays a new TCP + TLS handshake on every agent step. Instead,
+    SDK clients are cached by (provider, base url, API key hash, client options) in a bounded LRU and all of them are built
+    on the same httpx client, so connections (and HTTP/2 streams, when available) are reused across requests, agents and
+    providers. httpx async clients are bound to the event loop they were first used on, so the shared async pool and the
+    async SDK clients built on it are kept per event loop.
+
+    SDK clients handed out here must never be closed by callers, since that would close the shared pool.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sync_http_client: Optional[httpx.Client] = None
+        self._sync_clients: "OrderedDict[ClientKey, Any]" = OrderedDict()
+        self._async_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, OrderedDict[ClientKey, Any]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._metrics_registered = False
+
+    # ======================================================================================================================
+    # Provider clients
+    # ======================================================================================================================
+    def get_openai_client(self, api_key: Optional[str], base_url: Optional[str], **client_kwargs) -> OpenAI:
+        return self._get_client(OpenAI, "openai", api_key=api_key, base_url=base_url, **client_kwargs)
+
+    def get_async_openai_client(self, api_key: Optional[str], base_url: Optional[str], **client_kwargs) -> AsyncOpenAI:
+        return self._get_client(AsyncOpenAI, "openai", api_key=api_key, base_url=base_url, **client_kwargs)
+
+    def get_anthropic_client(self, api_key: Optional[str] = None, **client_kwargs) -> anthropic.Anthropic:
+        return self._get_client(anthropic.Anthropic, "anthropic", api_key=api_key, **client_kwargs)
+
+    def get_async_anthropic_client(self, api_key: Optional[str] = None, **client_kwargs) -> anthropic.AsyncAnthropic:
+        return self._get_client(anthropic.AsyncAnthropic, "anthropic", api_key=api_key, **client_kwargs)
+
+    def _get_client(self, client_cls: Type[ClientT], provider: str, api_key: Optional[str], **client_kwargs) -> ClientT:
+        self._register_metrics()
+        is_async = client_cls in (AsyncOpenAI, anthropic.AsyncAnthropic)
+        key = (
+            provider,
+            is_async,
+            client_kwargs.get("base_url"),
+            _hash_api_key(api_key),
+            tuple(sorted((name, value) for name, value in client_kwargs.items() if name != "base_url")),
+        )
+
+        with self._lock:
+            if is_async:
+                loop = asyncio.get_running_loop()
+                http_client = self._get_async_http_client(loop)
+                clients = self._async_clients[loop]
+            else:
+                http_client = self._get_sync_http_client()
+                clients = self._sync_clients
+
+            client = clients.get(key)
+            if client is not None:
+                clients.move_to_end(key)
+                self._record_lookup(provider, hit=True)
+                return client
+
+            if api_key is not None:
+                client_kwargs["api_key"] = api_key
+            client = client_cls(http_client=http_client, **client_kwargs)
+            clients[key] = client
+            # evicted SDK clients don't own any connections (the pool is shared), so they can just be dropped
+            while len(clients) > model_settings.llm_client_cache_size:
+                clients.popitem(last=False)
+            self._record_lookup(provider, hit=False)
+            return client
+
+    def _get_sync_http_client(self) -> httpx.Client:
+        if self._sync_http_client is None or self._sync_http_client.is_closed:
+            self._sync_http_client = httpx.Client(**_pool_kwargs())
+            self._sync_clients.clear()
+        return self._sync_http_client
+
+    def _get_async_http_client(self, loop: asyncio.AbstractEventLoop) -> httpx.AsyncClient:
+        http_client = self._async_http_clients.get(loop)
+        if http_client is None or http_client.is_closed:
+            http_client = self._async_http_clients[loop] = httpx.AsyncClient(**_pool_kwargs())
+            # SDK clients built on a closed pool would fail every request
+            self._async_clients[loop] = OrderedDict()
+        return http_client
+
+    async def aclose(self):
+        """Close the connection pool of the running event loop (e.g. on server shutdown)."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            http_client = self._async_http_clients.pop(loop, None)
+            self._async_clients.pop(loop, None)
+        if http_client is not None:
+            await http_client.aclose()
+
+    # ======================================================================================================================
+    # Metrics
+    # ======================================================================================================================
+    def pool_stats(self) -> Dict[str, int]:
+        """Connection and client counts across the sync pool and every event loop's async pool."""
+        with self._lock:
+            http_clients = list(self._async_http_clients.values())
+            if self._sync_http_client is not None:
+                http_clients.append(self._sync_http_client)
+            cached_clients = len(self._sync_clients) + sum(len(clients) for clients in self._async_clients.values())
+
+        active = idle = 0
+        for http_client in http_clients:
+            client_active, client_idle = _pool_connection_counts(http_client)
+            active += client_active
+            idle += client_idle
+        return {"active_connections": active, "idle_connections": idle, "cached_clients": cached_clients, "pools": len(http_clients)}
+
+    def _observe_pool(self, _options) -> Iterable:
+        from opentelemetry.metrics import Observation
+
+        stats = self.pool_stats()
+        yield Observation(stats["active_connections"], {"state": "active"})
+        yield Observation(stats["idle_connections"], {"state": "idle"})
+
+    def _register_metrics(self):
+        if self._metrics_registered:
+            return
+        self._metrics_registered = True
+        try:
+            from letta.otel.metric_registry import MetricRegistry
+
+            MetricRegistry().llm_http_pool_connections_gauge(self._observe_pool)
+        except Exception as e:
+            logger.warning(f"Failed to register LLM connection pool metrics: {e}")
+
+    def _record_lookup(self, provider: str, hit: bool):
+        from letta.otel.metric_registry import MetricRegistry
+
+        MetricRegistry().llm_client_cache_counter.add(1, {"provider": provider, "hit": hit})
+
+
+llm_http_client_registry = LLMHTTPClientRegistry()
@@ -13,6 +13,7 @@ from letta.schemas.llm_config import LLMConfig
 from letta.schemas.message import Message
 from letta.schemas.openai.chat_completion_response import ChatCompletionResponse
 from letta.schemas.provider_trace import ProviderTraceCreate
+from letta.services.message_blob_store import message_blob_store
 from letta.services.telemetry_manager import TelemetryManager
 
 if TYPE_CHECKING:
@@ -50,6 +51,8 @@ class LLMClientBase:
         If stream=True, returns a Stream[ChatCompletionChunk] that can be iterated over.
         Otherwise returns a ChatCompletionResponse.
         """
+        # images are only referenced by the stored messages, load their data before serializing the messages
+        messages = message_blob_store.load_images(messages)
         request_data = self.build_request_data(messages, llm_config, tools, force_tool_call)
 
         try:
@@ -84,6 +87,8 @@ class LLMClientBase:
         Issues a request to the downstream model endpoint.
         If stream=True, returns an AsyncStream[ChatCompletionChunk] that can be async iterated over.
         Otherwise returns a ChatCompletionResponse.
+
+        `request_data` must be built with `build_request_data_async`, which loads the images the messages reference.
         """
 
         try:
@@ -126,6 +131,20 @@ class LLMClientBase:
         """
         raise NotImplementedError
 
+    async def build_request_data_async(
+        self,
+        messages: List[Message],
+        llm_config: LLMConfig,
+        tools: List[dict],
+        force_tool_call: Optional[str] = None,
+    ) -> dict:
+        """
+        Like `build_request_data`, after loading the data of the images the messages reference (stored messages only
+        reference them) in one read off the event loop.
+        """
+        messages = await message_blob_store.load_images_async(messages)
+        return self.build_request_data(messages, llm_config, tools, force_tool_call)
+
     @abstractmethod
     def request(self, request_data: dict, llm_config: LLMConfig) -> dict:
         """
@@ -1,6 +1,12 @@
 """Key idea: create drop-in replacement for agent's ChatCompletion call that runs on an OpenLLM backend"""
 
+import hashlib
+import inspect
+import json
+import threading
 import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
 
 import requests
 
@@ -8,7 +14,7 @@ from letta.constants import CLI_WARNING_PREFIX
 from letta.errors import LocalLLMConnectionError, LocalLLMError
 from letta.helpers.datetime_helpers import get_utc_time_int
 from letta.helpers.json_helpers import json_dumps
-from letta.local_llm.constants import DEFAULT_WRAPPER
+from letta.local_llm.constants import DEFAULT_WRAPPER, GRAMMAR_CACHE_SIZE
 from letta.local_llm.function_parser import patch_function
 from letta.local_llm.grammars.gbnf_grammar_generator import create_dynamic_model_from_function, generate_gbnf_grammar_and_documentation
 from letta.local_llm.koboldcpp.api import get_koboldcpp_completion
@@ -253,6 +259,23 @@ def get_chat_completion(
     return response
 
 
+# (grammar, documentation) by function set, since agents' tools rarely change between steps and generating them is slow
+_grammar_cache: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+_grammar_cache_lock = threading.Lock()
+
+
+def _grammar_cache_key(functions_python: Dict[str, Callable], *flags: bool) -> str:
+    # the grammar generator only reads each function's name, signature and docstring, so those identify its output
+    functions = [(key, func.__name__, str(inspect.signature(func)), func.__doc__) for key, func in functions_python.items()]
+    return hashlib.sha256(json.dumps([functions, flags]).encode()).hexdigest()
+
+
+def _record_grammar_cache_lookup(hit: bool):
+    from letta.otel.metric_registry import MetricRegistry
+
+    MetricRegistry().gbnf_grammar_cache_counter.add(1, {"hit": hit})
+
+
 def generate_grammar_and_documentation(
     functions_python: dict,
     add_inner_thoughts_top_level: bool,
@@ -265,10 +288,19 @@ def generate_grammar_and_documentation(
         add_inner_thoughts_top_level and add_inner_thoughts_param_level
     ), "Can only place inner thoughts in one location in the grammar generator"
 
+    key = _grammar_cache_key(functions_python, add_inner_thoughts_top_level, add_inner_thoughts_param_level, allow_only_inner_thoughts)
+    with _grammar_cache_lock:
+        cached = _grammar_cache.get(key)
+        if cached is not None:
+            _grammar_cache.move_to_end(key)
+    _record_grammar_cache_lookup(hit=cached is not None)
+    if cached is not None:
+        return cached
+
     grammar_function_models = []
     # create_dynamic_model_from_function will add inner thoughts to the function parameters if add_inner_thoughts is True.
     # generate_gbnf_grammar_and_documentation will add inner thoughts to the outer object of the function parameters if add_inner_thoughts is True.
-    for key, func in functions_python.items():
+    for func in functions_python.values():
         grammar_function_models.append(create_dynamic_model_from_function(func, add_inner_thoughts=add_inner_thoughts_param_level))
     grammar, documentation = generate_gbnf_grammar_and_documentation(
         grammar_function_models,
@@ -280,4 +312,9 @@ def generate_grammar_and_documentation(
         allow_only_inner_thoughts=allow_only_inner_thoughts,
     )
     printd(grammar)
+
+    with _grammar_cache_lock:
+        _grammar_cache[key] = (grammar, documentation)
+        while len(_grammar_cache) > GRAMMAR_CACHE_SIZE:
+            _grammar_cache.popitem(last=False)
     return grammar, documentation
@@ -1,9 +1,9 @@
+import json
 import os
 import warnings
 from typing import List, Union
 
 import requests
-import tiktoken
 
 import letta.local_llm.llm_chat_completion_wrappers.airoboros as airoboros
 import letta.local_llm.llm_chat_completion_wrappers.chatml as chatml
@@ -11,6 +11,7 @@ import letta.local_llm.llm_chat_completion_wrappers.configurable_wrapper as conf
 import letta.local_llm.llm_chat_completion_wrappers.dolphin as dolphin
 import letta.local_llm.llm_chat_completion_wrappers.llama3 as llama3
 import letta.local_llm.llm_chat_completion_wrappers.zephyr as zephyr
+from letta.helpers.tokenizer import get_encoding, tokenizer
 from letta.log import get_logger
 from letta.schemas.openai.chat_completion_request import Tool, ToolCall
 
@@ -70,14 +71,18 @@ def num_tokens_from_functions(functions: List[dict], model: str = "gpt-4"):
     """Return the number of tokens used by a list of functions.
 
     Copied from https://community.openai.com/t/how-to-calculate-the-tokens-when-using-function-call/266573/11
+
+    The same tools are sent with every request, so counts are cached by the functions' serialization.
     """
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        from letta.utils import printd
+    return tokenizer.count_cached(
+        key_text=f"functions:{json.dumps(functions, sort_keys=True, default=str)}",
+        model=model,
+        counter=lambda: _num_tokens_from_functions(functions, model),
+    )
 
-        printd(f"Warning: model not found. Using cl100k_base encoding.")
-        encoding = tiktoken.get_encoding("cl100k_base")
+
+def _num_tokens_from_functions(functions: List[dict], model: str) -> int:
+    encoding = get_encoding(model)
 
     num_tokens = 0
     for function in functions:
@@ -152,39 +157,24 @@ def num_tokens_from_tool_calls(tool_calls: Union[List[dict], List[ToolCall]], mo
         }
     }]
     """
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        # print("Warning: model not found. Using cl100k_base encoding.")
-        encoding = tiktoken.get_encoding("cl100k_base")
+    texts = [text for tool_call in tool_calls for text in _tool_call_texts(tool_call)]
+    return sum(tokenizer.count_batch(texts, model=model)) + _tool_calls_overhead_tokens(tool_calls)
 
-    num_tokens = 0
-    for tool_call in tool_calls:
-        if isinstance(tool_call, dict):
-            tool_call_id = tool_call["id"]
-            tool_call_type = tool_call["type"]
-            tool_call_function = tool_call["function"]
-            tool_call_function_name = tool_call_function["name"]
-            tool_call_function_arguments = tool_call_function["arguments"]
-        elif isinstance(tool_call, Tool):
-            tool_call_id = tool_call.id
-            tool_call_type = tool_call.type
-            tool_call_function = tool_call.function
-            tool_call_function_name = tool_call_function.name
-            tool_call_function_arguments = tool_call_function.arguments
-        else:
-            raise ValueError(f"Unknown tool call type: {type(tool_call)}")
 
-        function_tokens = len(encoding.encode(tool_call_id))
-        function_tokens += 2 + len(encoding.encode(tool_call_type))
-        function_tokens += 2 + len(encoding.encode(tool_call_function_name))
-        function_tokens += 2 + len(encoding.encode(tool_call_function_arguments))
+def _tool_call_texts(tool_call: Union[dict, ToolCall]) -> List[str]:
+    if isinstance(tool_call, dict):
+        tool_call_function = tool_call["function"]
+        return [tool_call["id"], tool_call["type"], tool_call_function["name"], tool_call_function["arguments"]]
+    elif isinstance(tool_call, Tool):
+        return [tool_call.id, tool_call.type, tool_call.function.name, tool_call.function.arguments]
+    else:
+        raise ValueError(f"Unknown tool call type: {type(tool_call)}")
 
-        num_tokens += function_tokens
 
+def _tool_calls_overhead_tokens(tool_calls: list) -> int:
+    # 2 per field but the id
     # TODO adjust?
-    num_tokens += 12
-    return num_tokens
+    return 6 * len(tool_calls) + 12
 
 
 def num_tokens_from_messages(messages: List[dict], model: str = "gpt-4") -> int:
@@ -198,13 +188,15 @@ def num_tokens_from_messages(messages: List[dict], model: str = "gpt-4") -> int:
     For counting tokens in function calling REQUESTS, see:
         https://community.openai.com/t/how-to-calculate-the-tokens-when-using-function-call/266573/11
     """
-    try:
-        # Attempt to search for the encoding based on the model string
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        # print("Warning: model not found. Using cl100k_base encoding.")
-        encoding = tiktoken.get_encoding("cl100k_base")
+    num_tokens = sum(num_tokens_per_message(messages, model=model))
+    num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
+    return num_tokens
+
+
+def message_token_counting_model(model: str) -> str:
+    """The model whose message format `num_tokens_from_messages` counts the messages of `model` with."""
     if model in {
+        "gpt-3.5-turbo-0301",
         "gpt-3.5-turbo-0613",
         "gpt-3.5-turbo-16k-0613",
         "gpt-4-0314",
@@ -212,54 +204,66 @@ def num_tokens_from_messages(messages: List[dict], model: str = "gpt-4") -> int:
         "gpt-4-0613",
         "gpt-4-32k-0613",
     }:
-        tokens_per_message = 3
-        tokens_per_name = 1
-    elif model == "gpt-3.5-turbo-0301":
-        tokens_per_message = 4  # every message follows <|start|>{role/name}\n{content}<|end|>\n
-        tokens_per_name = -1  # if there's a name, the role is omitted
+        return model
     elif "gpt-3.5-turbo" in model:
         # print("Warning: gpt-3.5-turbo may update over time. Returning num tokens assuming gpt-3.5-turbo-0613.")
-        return num_tokens_from_messages(messages, model="gpt-3.5-turbo-0613")
+        return "gpt-3.5-turbo-0613"
     elif "gpt-4" in model:
         # print("Warning: gpt-4 may update over time. Returning num tokens assuming gpt-4-0613.")
-        return num_tokens_from_messages(messages, model="gpt-4-0613")
+        return "gpt-4-0613"
     else:
         from letta.utils import printd
 
         printd(
             f"num_tokens_from_messages() is not implemented for model {model}. See https://github.com/openai/openai-python/blob/main/chatml.md for information on how messages are converted to tokens."
         )
-        return num_tokens_from_messages(messages, model="gpt-4-0613")
-        # raise NotImplementedError(
-        # f"""num_tokens_from_messages() is not implemented for model {model}. See https://github.com/openai/openai-python/blob/main/chatml.md for information on how messages are converted to tokens."""
-        # )
-    num_tokens = 0
-    for message in messages:
-        num_tokens += tokens_per_message
-        for key, value in message.items():
-            try:
+        return "gpt-4-0613"
 
-                if isinstance(value, list) and key == "tool_calls":
-                    num_tokens += num_tokens_from_tool_calls(tool_calls=value, model=model)
-                    # special case for tool calling (list)
-                    # num_tokens += len(encoding.encode(value["name"]))
-                    # num_tokens += len(encoding.encode(value["arguments"]))
 
-                else:
-                    if value is not None:
-                        if not isinstance(value, str):
-                            raise ValueError(f"Message has non-string value: {key} with value: {value} - message={message}")
-                        num_tokens += len(encoding.encode(value))
+def message_token_counts_key(model: str) -> str:
+    """Key of the counts of `num_tokens_per_message` in `Message.token_counts`, models counted the same way share their counts."""
+    return f"tiktoken:{message_token_counting_model(model)}"
 
-                if key == "name":
-                    num_tokens += tokens_per_name
 
-            except TypeError as e:
-                print(f"tiktoken encoding failed on: {value}")
-                raise e
+def num_tokens_per_message(messages: List[dict], model: str = "gpt-4") -> List[int]:
+    """The tokens of each message of a list, which `num_tokens_from_messages` adds up (plus the reply priming).
 
-    num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
-    return num_tokens
+    The message texts are counted in one batch, so long histories are encoded in parallel.
+    """
+    model = message_token_counting_model(model)
+    if model == "gpt-3.5-turbo-0301":
+        tokens_per_message = 4  # every message follows <|start|>{role/name}\n{content}<|end|>\n
+        tokens_per_name = -1  # if there's a name, the role is omitted
+    else:
+        tokens_per_message = 3
+        tokens_per_name = 1
+
+    counts = []
+    texts = []
+    text_message_indices = []
+    for i, message in enumerate(messages):
+        num_tokens = tokens_per_message
+        for key, value in message.items():
+            if isinstance(value, list) and key == "tool_calls":
+                # special case for tool calling (list), see `num_tokens_from_tool_calls`
+                for tool_call in value:
+                    tool_call_texts = _tool_call_texts(tool_call)
+                    texts.extend(tool_call_texts)
+                    text_message_indices.extend([i] * len(tool_call_texts))
+                num_tokens += _tool_calls_overhead_tokens(value)
+            elif value is not None:
+                if not isinstance(value, str):
+                    raise ValueError(f"Message has non-string value: {key} with value: {value} - message={message}")
+                texts.append(value)
+                text_message_indices.append(i)
+
+            if key == "name":
+                num_tokens += tokens_per_name
+        counts.append(num_tokens)
+
+    for i, text_tokens in zip(text_message_indices, tokenizer.count_batch(texts, model=model)):
+        counts[i] += text_tokens
+    return counts
 
 
 def get_available_wrappers() -> dict:
@@ -1,7 +1,7 @@
 import uuid
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import ForeignKey, Index, Integer, String, Text, UniqueConstraint, desc
+from sqlalchemy import ForeignKey, Index, Integer, LargeBinary, String, Text, UniqueConstraint, desc
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -29,6 +29,12 @@ class FileContent(SqlalchemyBase):
     file_id: Mapped[str] = mapped_column(ForeignKey("files.id", ondelete="CASCADE"), nullable=False, doc="Foreign key to files table.")
 
     text: Mapped[str] = mapped_column(Text, nullable=False, doc="Full plain-text content of the file (e.g., extracted from a PDF).")
+    line_offsets: Mapped[Optional[bytes]] = mapped_column(
+        LargeBinary, nullable=True, doc="Character spans of the chunks LineChunker splits the text into, as packed uint32 pairs."
+    )
+    line_chunking_strategy: Mapped[Optional[str]] = mapped_column(
+        String, nullable=True, doc="The chunking strategy the line offsets were computed with."
+    )
 
     # back-reference to FileMetadata
     file: Mapped["FileMetadata"] = relationship(back_populates="content", lazy="selectin")
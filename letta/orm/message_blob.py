@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, LargeBinary, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from letta.orm.base import Base
+
+
+class MessageBlob(Base):
+    """Content-addressed bytes of a message attachment, used when message attachments are stored in the database"""
+
+    __tablename__ = "message_blobs"
+
+    # blobs are immutable and shared by every message with the same bytes, so they only need their hash as identity
+    id: Mapped[str] = mapped_column(String, primary_key=True, doc="blob-<sha256 of the data>")
+    data: Mapped[bytes] = mapped_column(LargeBinary, doc="The raw bytes of the attachment")
+    size: Mapped[int] = mapped_column(Integer, doc="The size of the data in bytes")
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
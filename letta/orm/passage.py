@@ -4,7 +4,6 @@ from sqlalchemy import JSON, Column, Index
 from sqlalchemy.orm import Mapped, declared_attr, mapped_column, relationship
 
 from letta.config import LettaConfig
-from letta.constants import MAX_EMBEDDING_DIM
 from letta.orm.custom_columns import CommonVector, EmbeddingConfigColumn
 from letta.orm.mixins import AgentMixin, FileMixin, OrganizationMixin, SourceMixin
 from letta.orm.sqlalchemy_base import SqlalchemyBase
@@ -28,11 +27,11 @@ class BasePassage(SqlalchemyBase, OrganizationMixin):
     embedding_config: Mapped[dict] = mapped_column(EmbeddingConfigColumn, doc="Embedding configuration")
     metadata_: Mapped[dict] = mapped_column(JSON, doc="Additional metadata")
 
-    # Vector embedding field based on database type
+    # Vector embedding field based on database type; embeddings are stored at the embedding model's native dimension
     if settings.letta_pg_uri_no_default:
         from pgvector.sqlalchemy import Vector
 
-        embedding = mapped_column(Vector(MAX_EMBEDDING_DIM))
+        embedding = mapped_column(Vector())
     else:
         embedding = Column(CommonVector)
 
@@ -0,0 +1,46 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Boolean, ForeignKey, Index, String, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from letta.orm.mixins import UserMixin
+from letta.orm.sqlalchemy_base import SqlalchemyBase
+from letta.schemas.enums import JobStatus
+from letta.schemas.sleeptime_job import SleeptimeJob as PydanticSleeptimeJob
+
+
+class SleeptimeJob(SqlalchemyBase, UserMixin):
+    """A queued sleeptime agent run, claimed and executed by any server worker"""
+
+    __tablename__ = "sleeptime_jobs"
+    __pydantic_model__ = PydanticSleeptimeJob
+    __table_args__ = (
+        Index("ix_sleeptime_jobs_status_created_at", "status", "created_at"),
+        Index("ix_sleeptime_jobs_sleeptime_agent_id", "sleeptime_agent_id"),
+        # at most one pending job per sleeptime agent, later turns are merged into it
+        Index(
+            "uq_sleeptime_jobs_pending_agent",
+            "sleeptime_agent_id",
+            unique=True,
+            postgresql_where=text("status = 'created'"),
+            sqlite_where=text("status = 'created'"),
+        ),
+    )
+
+    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: f"sleeptime_job-{uuid.uuid4()}")
+    run_id: Mapped[str] = mapped_column(ForeignKey("jobs.id", ondelete="CASCADE"), doc="The run that reports the job's status and result")
+    group_id: Mapped[str] = mapped_column(ForeignKey("groups.id", ondelete="CASCADE"), doc="The sleeptime group the job belongs to")
+    foreground_agent_id: Mapped[str] = mapped_column(
+        ForeignKey("agents.id", ondelete="CASCADE"), doc="The agent whose messages are processed"
+    )
+    sleeptime_agent_id: Mapped[str] = mapped_column(
+        ForeignKey("agents.id", ondelete="CASCADE"), doc="The sleeptime agent that processes them"
+    )
+    status: Mapped[JobStatus] = mapped_column(String, default=JobStatus.created, doc="created while pending, running once claimed")
+    after_message_id: Mapped[Optional[str]] = mapped_column(String, nullable=True, doc="The last message processed before this job")
+    first_message_id: Mapped[str] = mapped_column(String, doc="The first response message of the earliest merged turn")
+    last_message_id: Mapped[str] = mapped_column(String, doc="The last response message of the latest merged turn")
+    use_assistant_message: Mapped[bool] = mapped_column(Boolean, default=True, doc="Whether the run returns assistant messages")
+    claimed_at: Mapped[Optional[datetime]] = mapped_column(nullable=True, doc="When a worker claimed the job")
@@ -491,6 +491,7 @@ class SqlalchemyBase(CommonSqlalchemyMetaMixins, Base):
         access: Optional[List[Literal["read", "write", "admin"]]] = ["read"],
         access_type: AccessType = AccessType.ORGANIZATION,
         check_is_deleted: bool = False,
+        query_options: Sequence[ORMOption] | None = None,
         **kwargs,
     ) -> "SqlalchemyBase":
         """The primary accessor for an ORM record. Async version of read method.
@@ -499,6 +500,7 @@ class SqlalchemyBase(CommonSqlalchemyMetaMixins, Base):
             identifier: the identifier of the record to read, can be the id string or the UUID object for backwards compatibility
             actor: if specified, results will be scoped only to records the user is able to access
             access: if actor is specified, records will be filtered to the minimum permission level for the actor
+            query_options: loader options for the query, e.g. to control which relationships are loaded
             kwargs: additional arguments to pass to the read, used for more complex objects
         Returns:
             The matching object
@@ -509,6 +511,8 @@ class SqlalchemyBase(CommonSqlalchemyMetaMixins, Base):
         query, query_conditions = cls._read_multiple_preprocess(identifiers, actor, access, access_type, check_is_deleted, **kwargs)
         if query is None:
             raise NoResultFound(f"{cls.__name__} not found with identifier {identifier}")
+        if query_options:
+            query = query.options(*query_options)
         if is_postgresql_session(db_session):
             await db_session.execute(text("SET LOCAL enable_seqscan = OFF"))
         try:
@@ -562,6 +566,7 @@ class SqlalchemyBase(CommonSqlalchemyMetaMixins, Base):
         access: Optional[List[Literal["read", "write", "admin"]]] = ["read"],
         access_type: AccessType = AccessType.ORGANIZATION,
         check_is_deleted: bool = False,
+        query_options: Sequence[ORMOption] | None = None,
         **kwargs,
     ) -> List["SqlalchemyBase"]:
         """
@@ -571,6 +576,8 @@ class SqlalchemyBase(CommonSqlalchemyMetaMixins, Base):
         query, query_conditions = cls._read_multiple_preprocess(identifiers, actor, access, access_type, check_is_deleted, **kwargs)
         if query is None:
             return []
+        if query_options:
+            query = query.options(*query_options)
         results = await db_session.execute(query)
         return cls._read_multiple_postprocess(results.scalars().all(), identifiers, query_conditions)
 
@@ -67,14 +67,14 @@ def verify_embedding_dimension(embedding: np.ndarray, expected_dim: int = MAX_EM
 
 
 def validate_and_transform_embedding(
-    embedding: Union[bytes, sqlite3.Binary, list, np.ndarray], expected_dim: int = MAX_EMBEDDING_DIM, dtype: np.dtype = np.float32
+    embedding: Union[bytes, sqlite3.Binary, list, np.ndarray], expected_dim: Optional[int] = None, dtype: np.dtype = np.float32
 ) -> Optional[np.ndarray]:
     """
     Validates and transforms embeddings to ensure correct dimensionality.
 
     Args:
         embedding: Input embedding in various possible formats
-        expected_dim: Expected embedding dimension (default 4096)
+        expected_dim: Expected embedding dimension (default None, any dimension is accepted)
         dtype: NumPy dtype for the embedding (default float32)
 
     Returns:
@@ -97,20 +97,23 @@ def validate_and_transform_embedding(
         raise ValueError(f"Unsupported embedding type: {type(embedding)}")
 
     # Validate dimension
-    if vec.shape[0] != expected_dim:
+    if expected_dim is not None and vec.shape[0] != expected_dim:
         raise ValueError(f"Invalid embedding dimension: got {vec.shape[0]}, expected {expected_dim}")
 
     return vec
 
 
-def cosine_distance(embedding1, embedding2, expected_dim=MAX_EMBEDDING_DIM):
+def cosine_distance(embedding1, embedding2, expected_dim=None):
     """
     Calculate cosine distance between two embeddings
 
+    Embeddings are stored at their native dimension, but passages written before that are zero-padded, so a shorter
+    embedding is compared as if zero-padded to the longer one's length (which leaves the distance unchanged).
+
     Args:
         embedding1: First embedding
         embedding2: Second embedding
-        expected_dim: Expected embedding dimension (default 4096)
+        expected_dim: Expected embedding dimension (default None, any dimension is accepted)
 
     Returns:
         float: Cosine distance
@@ -125,7 +128,9 @@ def cosine_distance(embedding1, embedding2, expected_dim=MAX_EMBEDDING_DIM):
     except ValueError:
         return 0.0
 
-    similarity = np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
+    # only the overlapping dims contribute to the dot product; the norms still cover each full vector
+    dim = min(vec1.shape[0], vec2.shape[0])
+    similarity = np.dot(vec1[:dim], vec2[:dim]) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
     distance = float(1.0 - similarity)
 
     return distance
@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from functools import partial
 
 from opentelemetry import metrics
-from opentelemetry.metrics import Counter, Histogram
+from opentelemetry.metrics import CallbackT, Counter, Histogram, ObservableGauge
 
 from letta.helpers.singleton import singleton
 from letta.otel.metrics import get_letta_meter
@@ -19,7 +19,7 @@ class MetricRegistry:
         - unit: UCUM unit of the metric (i.e. 'By' for bytes, 'ms' for milliseconds, '1' for count
         - bucket_bounds (list[float] | None): the explicit bucket bounds for histogram metrics
 
-        and instruments are of types Counter, Histogram, and Gauge
+        and instruments are of types Counter, Histogram, and (Observable)Gauge
 
     The relationship between the various models is as follows:
         project_id -N:1-> base_template_id -N:1-> template_id -N:1-> agent_id
@@ -27,7 +27,7 @@ class MetricRegistry:
         agent_id -1:N -> tool_name
     """
 
-    Instrument = Counter | Histogram
+    Instrument = Counter | Histogram | ObservableGauge
     _metrics: dict[str, Instrument] = field(default_factory=dict, init=False)
     _meter: metrics.Meter = field(init=False)
 
@@ -169,6 +169,19 @@ class MetricRegistry:
             ),
         )
 
+    # (includes endpoint_path, method, status_code)
+    @property
+    def endpoint_db_queries_histogram(self) -> Histogram:
+        return self._get_or_create_metric(
+            "hist_endpoint_db_queries",
+            partial(
+                self._meter.create_histogram,
+                name="hist_endpoint_db_queries",
+                description="Histogram for the number of database queries per endpoint request",
+                unit="1",
+            ),
+        )
+
     @property
     def file_process_bytes_histogram(self) -> Histogram:
         return self._get_or_create_metric(
@@ -180,3 +193,68 @@ class MetricRegistry:
                 unit="By",
             ),
         )
+
+    # (includes provider, hit)
+    @property
+    def llm_client_cache_counter(self) -> Counter:
+        return self._get_or_create_metric(
+            "count_llm_client_cache_lookup",
+            partial(
+                self._meter.create_counter,
+                name="count_llm_client_cache_lookup",
+                description="Counts lookups of pooled LLM provider clients, split by cache hit or miss",
+                unit="1",
+            ),
+        )
+
+    # (includes hit)
+    @property
+    def gbnf_grammar_cache_counter(self) -> Counter:
+        return self._get_or_create_metric(
+            "count_gbnf_grammar_cache_lookup",
+            partial(
+                self._meter.create_counter,
+                name="count_gbnf_grammar_cache_lookup",
+                description="Counts lookups of generated GBNF grammars for local LLM function calling, split by cache hit or miss",
+                unit="1",
+            ),
+        )
+
+    # (includes state: active | idle); observed from the LLM http client registry on each export
+    def llm_http_pool_connections_gauge(self, callback: CallbackT) -> ObservableGauge:
+        return self._get_or_create_metric(
+            "gauge_llm_http_pool_connections",
+            partial(
+                self._meter.create_observable_gauge,
+                name="gauge_llm_http_pool_connections",
+                callbacks=[callback],
+                description="Number of connections held by the shared LLM provider HTTP connection pool",
+                unit="1",
+            ),
+        )
+
+    # observed from the provider trace writer on each export
+    def provider_trace_queue_depth_gauge(self, callback: CallbackT) -> ObservableGauge:
+        return self._get_or_create_metric(
+            "gauge_provider_trace_queue_depth",
+            partial(
+                self._meter.create_observable_gauge,
+                name="gauge_provider_trace_queue_depth",
+                callbacks=[callback],
+                description="Number of provider traces waiting to be written",
+                unit="1",
+            ),
+        )
+
+    # (includes reason: queue_full | write_failed)
+    @property
+    def provider_trace_dropped_counter(self) -> Counter:
+        return self._get_or_create_metric(
+            "count_provider_trace_dropped",
+            partial(
+                self._meter.create_counter,
+                name="count_provider_trace_dropped",
+                description="Counts provider traces that were dropped instead of written",
+                unit="1",
+            ),
+        )
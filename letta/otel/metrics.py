@@ -13,6 +13,7 @@ from letta.helpers.datetime_helpers import ns_to_ms
 from letta.log import get_logger
 from letta.otel.context import add_ctx_attribute, get_ctx_attributes
 from letta.otel.resource import get_resource, is_pytest_environment
+from letta.server.db import track_db_queries
 from letta.settings import settings
 
 logger = get_logger(__name__)
@@ -58,27 +59,30 @@ async def _otel_metric_middleware(request: Request, call_next):
     response = None
     status_code = 500  # reasonable default
 
-    try:
-        response = await call_next(request)
-        status_code = response.status_code
-        return response
-    except Exception as e:
-        # Determine status code from exception
-        status_code = getattr(e, "status_code", 500)
-        raise
-    finally:
-        end_to_end_ms = ns_to_ms(time.perf_counter_ns() - start_perf_counter_ns)
-        _record_endpoint_metrics(
-            request=request,
-            latency_ms=end_to_end_ms,
-            status_code=status_code,
-        )
+    with track_db_queries() as db_queries:
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        except Exception as e:
+            # Determine status code from exception
+            status_code = getattr(e, "status_code", 500)
+            raise
+        finally:
+            end_to_end_ms = ns_to_ms(time.perf_counter_ns() - start_perf_counter_ns)
+            _record_endpoint_metrics(
+                request=request,
+                latency_ms=end_to_end_ms,
+                status_code=status_code,
+                db_queries=db_queries.count,
+            )
 
 
 def _record_endpoint_metrics(
     request: Request,
     latency_ms: float,
     status_code: int,
+    db_queries: int,
 ):
     """Record endpoint latency and request count metrics."""
     try:
@@ -96,6 +100,8 @@ def _record_endpoint_metrics(
 
         MetricRegistry().endpoint_e2e_ms_histogram.record(latency_ms, attributes=attrs)
         MetricRegistry().endpoint_request_counter.add(1, attributes=attrs)
+        # for streaming endpoints, this only counts queries made before the response started
+        MetricRegistry().endpoint_db_queries_histogram.record(db_queries, attributes=attrs)
 
     except Exception as e:
         logger.warning(f"Failed to record endpoint metrics: {e}")
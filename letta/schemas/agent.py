@@ -122,6 +122,19 @@ class AgentState(OrmMetadataBase, validate_assignment=True):
         return per_agent_env_vars
 
 
+class AgentSummary(BaseModel):
+    """
+    A lightweight view of an agent, for listing many agents without loading their configs, memory and tools.
+    Use the agent's id to retrieve the full AgentState.
+    """
+
+    id: str = Field(..., description="The id of the agent. Assigned by the database.")
+    name: str = Field(..., description="The name of the agent.")
+    tags: List[str] = Field(default_factory=list, description="The tags associated with the agent.")
+    created_at: Optional[datetime] = Field(None, description="The timestamp when the agent was created.")
+    updated_at: Optional[datetime] = Field(None, description="The timestamp when the agent was last updated.")
+
+
 class CreateAgent(BaseModel, validate_assignment=True):  #
     # all optional as server can generate defaults
     name: str = Field(default_factory=lambda: create_random_username(), description="The name of the agent.")
@@ -82,6 +82,21 @@ class LLMConfig(BaseModel):
         None,  # Can also deafult to 0.0?
         description="Positive values penalize new tokens based on their existing frequency in the text so far, decreasing the model's likelihood to repeat the same line verbatim. From OpenAI: Number between -2.0 and 2.0.",
     )
+    parallel_tool_calls: bool = Field(
+        False,
+        description="Whether the model may return several tool calls in one response, which are then executed concurrently within a single agent step.",
+    )
+    max_parallel_tool_calls: int = Field(
+        4,
+        ge=1,
+        description="The maximum number of tool calls from one response that are executed at the same time when parallel_tool_calls is enabled.",
+    )
+    context_window_safety_margin: Optional[float] = Field(
+        0.1,
+        ge=0,
+        lt=1,
+        description="Fraction of the context window kept free when estimating a request's prompt size before sending it. Prompts estimated above the rest of the window are summarized first, instead of after the provider rejects them. Set to null to disable the estimate.",
+    )
 
     # FIXME hack to silence pydantic protected namespace warning
     model_config = ConfigDict(protected_namespaces=())
@@ -1,7 +1,10 @@
 import logging
-from typing import TYPE_CHECKING, List, Optional
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import TYPE_CHECKING, Any, List, Optional
 
-from jinja2 import Template, TemplateSyntaxError
+from jinja2 import TemplateSyntaxError
 from pydantic import BaseModel, Field, field_validator
 
 # Forward referencing to avoid circular import with Agent -> Memory -> Agent
@@ -13,6 +16,17 @@ from openai.types.beta.function_tool import FunctionTool as OpenAITool
 from letta.constants import CORE_MEMORY_BLOCK_CHAR_LIMIT
 from letta.schemas.block import Block
 from letta.schemas.message import Message
+from letta.templates.template_helper import compile_template
+
+# Rendered memory strings by template and fingerprint of everything rendered into it
+MAX_CACHED_MEMORY_RENDERS = 256
+_memory_render_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_memory_render_cache_lock = threading.Lock()
+
+
+def _fingerprint(obj: Any) -> tuple:
+    """Hashable snapshot of a model's field values, so equal fingerprints always render the same."""
+    return (type(obj),) + tuple(value if isinstance(value, Hashable) else repr(value) for value in vars(obj).values())
 
 
 class ContextWindowOverview(BaseModel):
@@ -121,10 +135,10 @@ class Memory(BaseModel, validate_assignment=True):
         """
         try:
             # Validate Jinja2 syntax
-            Template(prompt_template)
+            template = compile_template(prompt_template)
 
             # Validate compatibility with current memory structure
-            Template(prompt_template).render(blocks=self.blocks, file_blocks=self.file_blocks, sources=[])
+            template.render(blocks=self.blocks, file_blocks=self.file_blocks, sources=[])
 
             # If we get here, the template is valid and compatible
             self.prompt_template = prompt_template
@@ -133,16 +147,50 @@ class Memory(BaseModel, validate_assignment=True):
         except Exception as e:
             raise ValueError(f"Prompt template is not compatible with current memory structure: {str(e)}")
 
+    def fingerprint(self, tool_usage_rules=None, sources=None) -> Optional[tuple]:
+        """
+        A hashable key for everything `compile` renders: the template and a snapshot of each block, the tool usage rules
+        and the sources. Returns None if one of them can't be fingerprinted.
+        """
+        try:
+            key = (
+                self.prompt_template,
+                tuple(_fingerprint(block) for block in self.blocks),
+                tuple(_fingerprint(block) for block in self.file_blocks),
+                _fingerprint(tool_usage_rules) if tool_usage_rules is not None else None,
+                tuple(_fingerprint(source) for source in sources) if sources is not None else None,
+            )
+            hash(key)
+            return key
+        except TypeError:
+            return None
+
     def compile(self, tool_usage_rules=None, sources=None) -> str:
         """Generate a string representation of the memory in-context using the Jinja2 template"""
+        # an unchanged memory (e.g. when rebuilding the system prompt every step) is only rendered once
+        key = self.fingerprint(tool_usage_rules=tool_usage_rules, sources=sources)
+        if key is not None:
+            with _memory_render_cache_lock:
+                rendered = _memory_render_cache.get(key)
+                if rendered is not None:
+                    _memory_render_cache.move_to_end(key)
+                    return rendered
+
         try:
-            template = Template(self.prompt_template)
-            return template.render(blocks=self.blocks, file_blocks=self.file_blocks, tool_usage_rules=tool_usage_rules, sources=sources)
+            template = compile_template(self.prompt_template)
+            rendered = template.render(blocks=self.blocks, file_blocks=self.file_blocks, tool_usage_rules=tool_usage_rules, sources=sources)
         except TemplateSyntaxError as e:
             raise ValueError(f"Invalid Jinja2 template syntax: {str(e)}")
         except Exception as e:
             raise ValueError(f"Prompt template is not compatible with current memory structure: {str(e)}")
 
+        if key is not None:
+            with _memory_render_cache_lock:
+                _memory_render_cache[key] = rendered
+                if len(_memory_render_cache) > MAX_CACHED_MEMORY_RENDERS:
+                    _memory_render_cache.popitem(last=False)
+        return rendered
+
     def list_block_labels(self) -> List[str]:
         """Return a list of the block names held inside the memory object"""
         # return list(self.memory.keys())
@@ -172,6 +172,9 @@ class Message(BaseMessage):
     group_id: Optional[str] = Field(default=None, description="The multi-agent group that the message was sent in")
     sender_id: Optional[str] = Field(default=None, description="The id of the sender of the message, can be an identity id or agent id")
     batch_item_id: Optional[str] = Field(default=None, description="The id of the LLMBatchItem that this message is associated with")
+    token_counts: Optional[Dict[str, int]] = Field(
+        default=None, description="The number of tokens of the message per tokenizer family, counted when the context window is."
+    )
     # This overrides the optional base orm schema, created_at MUST exist on all messages objects
     created_at: datetime = Field(default_factory=get_utc_time, description="The timestamp when the object was created.")
 
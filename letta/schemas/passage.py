@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Dict, List, Optional
 
-from pydantic import Field, field_validator
+from pydantic import Field, model_validator
 
 from letta.constants import MAX_EMBEDDING_DIM
 from letta.helpers.datetime_helpers import get_utc_time
@@ -9,6 +9,22 @@ from letta.schemas.embedding_config import EmbeddingConfig
 from letta.schemas.letta_base import OrmMetadataBase
 
 
+def unpad_embedding(embedding: List[float], embedding_dim: Optional[int] = None) -> List[float]:
+    """Trim an embedding zero-padded to `MAX_EMBEDDING_DIM` back to its native dimension.
+
+    The native dimension is `embedding_dim` when everything past it is zero, otherwise the position of the last non-zero
+    value. Embeddings of any other length are returned unchanged.
+    """
+    import numpy as np
+
+    if len(embedding) != MAX_EMBEDDING_DIM:
+        return embedding
+    if embedding_dim and embedding_dim < MAX_EMBEDDING_DIM and not any(embedding[embedding_dim:]):
+        return embedding[:embedding_dim]
+    nonzero = np.flatnonzero(embedding)
+    return embedding[: nonzero[-1] + 1] if len(nonzero) else embedding
+
+
 class PassageBase(OrmMetadataBase):
     __id_prefix__ = "passage"
 
@@ -53,17 +69,12 @@ class Passage(PassageBase):
 
     created_at: datetime = Field(default_factory=get_utc_time, description="The creation date of the passage.")
 
-    @field_validator("embedding")
-    @classmethod
-    def pad_embeddings(cls, embedding: List[float]) -> List[float]:
-        """Pad embeddings to `MAX_EMBEDDING_SIZE`. This is necessary to ensure all stored embeddings are the same size."""
-        import numpy as np
-
-        if embedding and len(embedding) != MAX_EMBEDDING_DIM:
-            np_embedding = np.array(embedding)
-            padded_embedding = np.pad(np_embedding, (0, MAX_EMBEDDING_DIM - np_embedding.shape[0]), mode="constant")
-            return padded_embedding.tolist()
-        return embedding
+    @model_validator(mode="after")
+    def strip_embedding_padding(self) -> "Passage":
+        """Embeddings are stored at their native dimension; strip the zero padding older passages were written with."""
+        if self.embedding:
+            self.embedding = unpad_embedding(self.embedding, self.embedding_config.embedding_dim if self.embedding_config else None)
+        return self
 
 
 class PassageCreate(PassageBase):
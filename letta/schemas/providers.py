@@ -7,7 +7,6 @@ import requests
 from pydantic import BaseModel, Field, model_validator
 
 from letta.constants import DEFAULT_EMBEDDING_CHUNK_SIZE, LETTA_MODEL_ENDPOINT, LLM_MAX_TOKENS, MIN_CONTEXT_WINDOW
-from letta.llm_api.azure_openai import get_azure_chat_completions_endpoint, get_azure_embeddings_endpoint
 from letta.llm_api.azure_openai_constants import AZURE_MODEL_TO_CONTEXT_LENGTH
 from letta.schemas.embedding_config import EmbeddingConfig
 from letta.schemas.embedding_config_overrides import EMBEDDING_HANDLE_OVERRIDES
@@ -1402,7 +1401,7 @@ class AzureProvider(Provider):
         return values
 
     def list_llm_models(self) -> List[LLMConfig]:
-        from letta.llm_api.azure_openai import azure_openai_get_chat_completion_model_list
+        from letta.llm_api.azure_openai import azure_openai_get_chat_completion_model_list, get_azure_chat_completions_endpoint
 
         model_options = azure_openai_get_chat_completion_model_list(self.base_url, api_key=self.api_key, api_version=self.api_version)
         configs = []
@@ -1424,7 +1423,7 @@ class AzureProvider(Provider):
         return configs
 
     def list_embedding_models(self) -> List[EmbeddingConfig]:
-        from letta.llm_api.azure_openai import azure_openai_get_embeddings_model_list
+        from letta.llm_api.azure_openai import azure_openai_get_embeddings_model_list, get_azure_embeddings_endpoint
 
         model_options = azure_openai_get_embeddings_model_list(
             self.base_url, api_key=self.api_key, api_version=self.api_version, require_embedding_in_name=True
@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import Field
+
+from letta.schemas.enums import JobStatus
+from letta.schemas.letta_base import OrmMetadataBase
+
+
+class SleeptimeJobBase(OrmMetadataBase):
+    __id_prefix__ = "sleeptime_job"
+
+
+class SleeptimeJob(SleeptimeJobBase):
+    """
+    A queued sleeptime agent run over a range of the foreground agent's messages.
+
+    Turns that arrive while a job is still pending are merged into it by moving `last_message_id` forward, so the
+    sleeptime agent processes them in a single run.
+
+    Attributes:
+        id (str): The unique identifier of the sleeptime job.
+        run_id (str): The run that reports the job's status and result.
+        group_id (str): The sleeptime group the job belongs to.
+        foreground_agent_id (str): The agent whose messages are processed.
+        sleeptime_agent_id (str): The sleeptime agent that processes them.
+        status (JobStatus): `created` while pending, `running` once a worker has claimed it.
+        after_message_id (str): The last message processed before this job, if any.
+        first_message_id (str): The first response message of the earliest merged turn.
+        last_message_id (str): The last response message of the latest merged turn.
+        claimed_at (datetime): When a worker claimed the job.
+    """
+
+    id: str = SleeptimeJobBase.generate_id_field()
+    run_id: str = Field(..., description="The run that reports the job's status and result.")
+    group_id: str = Field(..., description="The sleeptime group the job belongs to.")
+    foreground_agent_id: str = Field(..., description="The agent whose messages are processed.")
+    sleeptime_agent_id: str = Field(..., description="The sleeptime agent that processes them.")
+    user_id: str = Field(..., description="The user the sleeptime agent runs as.")
+    status: JobStatus = Field(JobStatus.created, description="`created` while pending, `running` once a worker has claimed it.")
+    after_message_id: Optional[str] = Field(None, description="The last message processed before this job, if any.")
+    first_message_id: str = Field(..., description="The first response message of the earliest merged turn.")
+    last_message_id: str = Field(..., description="The last response message of the latest merged turn.")
+    use_assistant_message: bool = Field(True, description="Whether the run returns assistant messages.")
+    claimed_at: Optional[datetime] = Field(None, description="When a worker claimed the job.")
@@ -2,11 +2,11 @@ import json
 import logging
 from typing import Annotated, Any, Dict, List, Literal, Optional, Set, Union
 
-from jinja2 import Template
 from pydantic import Field
 
 from letta.schemas.enums import ToolRuleType
 from letta.schemas.letta_base import LettaBase
+from letta.templates.template_helper import compile_template
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +30,7 @@ class BaseToolRule(LettaBase):
             return None
 
         try:
-            template = Template(template_to_use)
+            template = compile_template(template_to_use)
             return template.render(**self.model_dump())
         except Exception as e:
             logger.warning(
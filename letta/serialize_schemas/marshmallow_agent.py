@@ -41,9 +41,11 @@ class MarshmallowAgentSchema(BaseSchema):
     tool_exec_environment_variables = fields.List(fields.Nested(SerializedAgentEnvironmentVariableSchema))
     tags = fields.List(fields.Nested(SerializedAgentTagSchema))
 
-    def __init__(self, *args, session: sessionmaker, actor: User, **kwargs):
+    def __init__(self, *args, session: sessionmaker, actor: User, include_messages: bool = True, **kwargs):
         super().__init__(*args, actor=actor, **kwargs)
         self.session = session
+        # the streaming export writes the messages separately
+        self.include_messages = include_messages
 
         # Propagate session and actor to nested schemas automatically
         for field in self.fields.values():
@@ -59,6 +61,10 @@ class MarshmallowAgentSchema(BaseSchema):
         """
         After dumping the agent, load all its Message rows and serialize them here.
         """
+        if not self.include_messages:
+            data[self.FIELD_MESSAGES] = []
+            return data
+
         # TODO: This is hacky, but want to move fast, please refactor moving forward
         from letta.server.db import db_registry
 
@@ -0,0 +1,34 @@
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+NDJSON_AGENT_FORMAT = "letta-agent-ndjson"
+NDJSON_AGENT_FORMAT_VERSION = 1
+
+# fields of messages and passages that are tied to the exporting server and regenerated on import
+NDJSON_MESSAGE_EXCLUDE = {"id", "organization_id", "agent_id", "step_id", "otid", "batch_item_id", "created_by_id", "last_updated_by_id"}
+NDJSON_PASSAGE_EXCLUDE = {"id", "organization_id", "agent_id", "source_id", "file_id", "file_name", "created_by_id", "last_updated_by_id"}
+
+
+class NDJSONAgentSection(str, Enum):
+    """
+    The kinds of lines in a streamed agent export, in the order they are written: one header, one agent, then any
+    number of blocks, tools, messages and passages, and a footer with the number of lines in each section.
+    """
+
+    header = "header"
+    agent = "agent"
+    block = "block"
+    tool = "tool"
+    message = "message"
+    passage = "passage"
+    footer = "footer"
+
+
+class NDJSONAgentLine(BaseModel):
+    """One line of a streamed agent export."""
+
+    type: NDJSONAgentSection = Field(..., description="The section the line belongs to.")
+    data: Dict[str, Any] = Field(default_factory=dict, description="The serialized record.")
+    in_context_index: Optional[int] = Field(None, description="The position of a message in the agent's context window, if it is in it.")
@@ -1,13 +1,15 @@
+import asyncio
 import os
 import threading
 import uuid
 from contextlib import asynccontextmanager, contextmanager
-from typing import Any, AsyncGenerator, Generator
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, Callable, Generator, List, Optional
 
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
-from sqlalchemy import Engine, NullPool, QueuePool, create_engine
+from sqlalchemy import Engine, NullPool, QueuePool, create_engine, event
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -19,6 +21,72 @@ from letta.settings import settings
 logger = get_logger(__name__)
 
 
+class DatabaseQueryCounter:
+    """Number of SQL statements executed while tracking, see `track_db_queries`."""
+
+    def __init__(self):
+        self.count = 0
+
+
+_db_query_counter: ContextVar[Optional[DatabaseQueryCounter]] = ContextVar("db_query_counter", default=None)
+
+
+@contextmanager
+def track_db_queries() -> Generator[DatabaseQueryCounter, None, None]:
+    """Count the SQL statements executed by the current task (and tasks it starts) until the block exits, e.g. per request."""
+    counter = DatabaseQueryCounter()
+    token = _db_query_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _db_query_counter.reset(token)
+
+
+def _count_db_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _db_query_counter.get()
+    if counter is not None:
+        counter.count += 1
+
+
+class _UnitOfWorkSession(AsyncSession):
+    """The session shared by the writes of a unit of work: their commits only flush, the unit of work commits once when it ends."""
+
+    async def commit(self) -> None:
+        await self.flush()
+        # expire like a real commit would, so that callers re-reading their rows see server-side defaults
+        self.expire_all()
+
+    async def commit_unit_of_work(self) -> None:
+        await super().commit()
+
+
+class _UnitOfWork:
+    def __init__(self, session: _UnitOfWorkSession):
+        self.session = session
+        # sessions can't be used concurrently, so only the task that started the unit of work shares its session
+        self.task = asyncio.current_task()
+        self.after_commit: List[Callable[[], None]] = []
+
+
+_unit_of_work: ContextVar[Optional[_UnitOfWork]] = ContextVar("db_unit_of_work", default=None)
+
+
+def _current_unit_of_work() -> Optional[_UnitOfWork]:
+    unit_of_work = _unit_of_work.get()
+    if unit_of_work is not None and unit_of_work.task is asyncio.current_task():
+        return unit_of_work
+    return None
+
+
+def run_after_commit(callback: Callable[[], None]) -> None:
+    """Run `callback` once the current unit of work is committed (and never if it is rolled back), or right away outside of one."""
+    unit_of_work = _current_unit_of_work()
+    if unit_of_work is None:
+        callback()
+    else:
+        unit_of_work.after_commit.append(callback)
+
+
 def print_sqlite_schema_error():
     """Print a formatted error message for SQLite schema issues"""
     console = Console()
@@ -99,6 +167,8 @@ class DatabaseRegistry:
                 Base.metadata.create_all(bind=engine)
                 self._engines["default"] = engine
 
+            event.listen(self._engines["default"], "before_cursor_execute", _count_db_query)
+
             # Create session factory
             self._session_factories["default"] = sessionmaker(autocommit=False, autoflush=False, bind=self._engines["default"])
             self._initialized["sync"] = True
@@ -130,6 +200,7 @@ class DatabaseRegistry:
 
             # Create async session factory
             self._async_engines["default"] = async_engine
+            event.listen(async_engine.sync_engine, "before_cursor_execute", _count_db_query)
             self._async_session_factories["default"] = async_sessionmaker(
                 expire_on_commit=True,
                 close_resets_only=False,
@@ -265,7 +336,12 @@ class DatabaseRegistry:
     @trace_method
     @asynccontextmanager
     async def async_session(self, name: str = "default") -> AsyncGenerator[AsyncSession, None]:
-        """Async context manager for database sessions."""
+        """Async context manager for database sessions. Within a unit of work, this is the unit of work's session."""
+        unit_of_work = _current_unit_of_work()
+        if unit_of_work is not None:
+            yield unit_of_work.session
+            return
+
         session_factory = self.get_async_session_factory(name)
         if not session_factory:
             raise ValueError(f"No async session factory found for '{name}' or async database is not configured")
@@ -276,6 +352,40 @@ class DatabaseRegistry:
         finally:
             await session.close()
 
+    @trace_method
+    @asynccontextmanager
+    async def unit_of_work(self, name: str = "default") -> AsyncGenerator[AsyncSession, None]:
+        """
+        Run the writes made through `async_session` in this block (by this task) in a single transaction.
+
+        Managers' commits inside the block only flush, so their writes are sent as they happen but committed together
+        when the block exits, or rolled back together if it raises. Nested units of work join the outer one.
+        Keep the block to the writes themselves: it holds a connection until it exits.
+        """
+        if _current_unit_of_work() is not None:
+            async with self.async_session(name) as session:
+                yield session
+            return
+
+        session_factory = self.get_async_session_factory(name)
+        if not session_factory:
+            raise ValueError(f"No async session factory found for '{name}' or async database is not configured")
+
+        unit_of_work = _UnitOfWork(_UnitOfWorkSession(**session_factory.kw))
+        token = _unit_of_work.set(unit_of_work)
+        try:
+            yield unit_of_work.session
+            await unit_of_work.session.commit_unit_of_work()
+        except BaseException:
+            await unit_of_work.session.rollback()
+            raise
+        finally:
+            _unit_of_work.reset(token)
+            await unit_of_work.session.close()
+
+        for callback in unit_of_work.after_commit:
+            callback()
+
     @trace_method
     def session_caller_trace(self, caller_info: str):
         """Trace sync db caller information for debugging purposes."""
@@ -145,6 +145,11 @@ async def lifespan(app_: FastAPI):
         logger.info(f"[Worker {worker_id}] Scheduler initialization completed")
     except Exception as e:
         logger.error(f"[Worker {worker_id}] Scheduler initialization failed: {e}", exc_info=True)
+
+    from letta.groups.sleeptime_worker import sleeptime_worker
+
+    sleeptime_worker.start()
+    logger.info(f"[Worker {worker_id}] Sleeptime worker started")
     logger.info(f"[Worker {worker_id}] Lifespan startup completed")
     yield
 
@@ -157,6 +162,30 @@ async def lifespan(app_: FastAPI):
         logger.info(f"[Worker {worker_id}] Scheduler shutdown completed")
     except Exception as e:
         logger.error(f"[Worker {worker_id}] Scheduler shutdown failed: {e}", exc_info=True)
+    try:
+        from letta.llm_api.http_client_registry import llm_http_client_registry
+
+        await llm_http_client_registry.aclose()
+    except Exception as e:
+        logger.error(f"[Worker {worker_id}] LLM connection pool shutdown failed: {e}", exc_info=True)
+    try:
+        from letta.services.tool_sandbox.local_sandbox_worker_pool import local_sandbox_worker_pools
+
+        await local_sandbox_worker_pools.aclose()
+    except Exception as e:
+        logger.error(f"[Worker {worker_id}] Local sandbox worker shutdown failed: {e}", exc_info=True)
+    try:
+        from letta.groups.sleeptime_worker import sleeptime_worker
+
+        await sleeptime_worker.aclose()
+    except Exception as e:
+        logger.error(f"[Worker {worker_id}] Sleeptime worker shutdown failed: {e}", exc_info=True)
+    try:
+        from letta.services.provider_trace_writer import provider_trace_writer
+
+        await provider_trace_writer.aclose()
+    except Exception as e:
+        logger.error(f"[Worker {worker_id}] Provider trace queue flush failed: {e}", exc_info=True)
     logger.info(f"[Worker {worker_id}] Lifespan shutdown completed")
 
 
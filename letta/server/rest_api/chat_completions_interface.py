@@ -12,7 +12,7 @@ from letta.schemas.enums import MessageStreamStatus
 from letta.schemas.letta_message import LettaMessage
 from letta.schemas.message import Message
 from letta.schemas.openai.chat_completion_response import ChatCompletionChunkResponse
-from letta.server.rest_api.json_parser import OptimisticJSONParser
+from letta.server.rest_api.json_parser import IncrementalJSONParser
 from letta.streaming_interface import AgentChunkStreamingInterface
 
 logger = get_logger(__name__)
@@ -55,6 +55,7 @@ class ChatCompletionsStreamingInterface(AgentChunkStreamingInterface):
         # Parsing state for incremental function-call data
         self.current_function_name = ""
         self.current_function_arguments = []
+        self.current_json_parser = IncrementalJSONParser()
         self.current_json_parse_result = {}
         self._found_message_tool_kwarg = False
 
@@ -226,11 +227,11 @@ class ChatCompletionsStreamingInterface(AgentChunkStreamingInterface):
                 self.current_function_name += tool_call.function.name
             if tool_call.function.arguments:
                 self.current_function_arguments.append(tool_call.function.arguments)
+                self.current_json_parser.feed(tool_call.function.arguments)
 
             # Only parse arguments for "send_message" to stream partial text
             if self.current_function_name.strip() == self.assistant_message_tool_name:
-                combined_args = "".join(self.current_function_arguments)
-                parsed_args = OptimisticJSONParser().parse(combined_args)
+                parsed_args = self.current_json_parser.value
 
                 if parsed_args.get(self.assistant_message_tool_kwarg) and parsed_args.get(
                     self.assistant_message_tool_kwarg
@@ -274,5 +275,6 @@ class ChatCompletionsStreamingInterface(AgentChunkStreamingInterface):
         """Clears internal buffers for function call name/args."""
         self.current_function_name = ""
         self.current_function_arguments = []
+        self.current_json_parser = IncrementalJSONParser()
         self.current_json_parse_result = {}
         self._found_message_tool_kwarg = False
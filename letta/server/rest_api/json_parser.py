@@ -1,6 +1,7 @@
 import json
+import re
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Dict, List, Optional, Union
 
 from pydantic_core import from_json
 
@@ -226,6 +227,384 @@ class OptimisticJSONParser(JSONParser):
         raise decode_error
 
 
+_STRING_RUN = re.compile(r'[^"\\]+')
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+_WHITESPACE = frozenset(" \t\n\r")
+_SIMPLE_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_LITERALS = {"true": True, "false": False, "null": None}
+_MISSING = object()
+
+# what an open container expects next
+_EXPECT_KEY = "key"  # a key or the closing brace (objects only)
+_EXPECT_COLON = "colon"
+_EXPECT_VALUE = "value"
+_EXPECT_COMMA = "comma"  # a comma or the closing bracket/brace
+
+
+class _Frame:
+    """An object or array that has been opened but not closed yet."""
+
+    __slots__ = ("container", "expect", "key")
+
+    def __init__(self, container: Union[Dict, List]):
+        self.container = container
+        self.expect = _EXPECT_KEY if isinstance(container, dict) else _EXPECT_VALUE
+        self.key: Optional[str] = None
+
+
+class IncrementalJSONParser(JSONParser):
+    """
+    A resumable JSON parser for streamed tool call arguments.
+
+    `OptimisticJSONParser` and `PydanticJSONParser` re-parse the whole accumulated buffer on every delta, which is
+    quadratic in the length of the arguments. This parser is a state machine that only consumes the new fragment on
+    each `feed`, keeping its position inside (possibly nested) objects, arrays, strings, numbers and escape sequences
+    across fragments. Completed values are kept as-is; only the value currently being parsed is materialized on read.
+
+    Partial results follow `PydanticJSONParser`'s "trailing-strings" semantics: an object key only appears once its
+    value has started, incomplete strings are returned as far as they got (with escapes decoded), incomplete numbers
+    are returned if what has arrived so far is a valid number, and incomplete `true`/`false`/`null` literals are left out.
+
+    `parse(input_str)` is supported for drop-in use with callers that keep the accumulated buffer: when `input_str`
+    extends the previously parsed input only the new suffix is consumed, otherwise the parser starts over.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._stack: List[_Frame] = []
+        self._root: Any = None
+        self._has_root = False
+        self._done = False
+        self._failed = False
+        self._last_input = ""
+        # in-progress string
+        self._string_chunks: Optional[List[str]] = None
+        self._string_len = 0
+        self._string_is_key = False
+        self._escape = ""
+        self._high_surrogate: Optional[int] = None
+        # in-progress number or true/false/null
+        self._token: Optional[str] = None
+        self.last_parse_reminding = ""
+
+    # ======================================================================================================================
+    # Input
+    # ======================================================================================================================
+    def parse(self, input_str: str) -> Any:
+        if not input_str.startswith(self._last_input):
+            self.reset()
+        self.feed(input_str[len(self._last_input) :])
+        self._last_input = input_str
+        return self.value
+
+    def feed(self, fragment: str):
+        """Consume the next fragment of the JSON document."""
+        if self._failed:
+            return
+        try:
+            self._consume(fragment)
+        except ValueError as e:
+            # keep whatever was parsed so far rather than failing the stream, like the other parsers' lenient modes
+            logger.warning(f"IncrementalJSONParser stopped on malformed input: {e}")
+            self._failed = True
+
+    def _consume(self, fragment: str):
+        i, n = 0, len(fragment)
+        while i < n:
+            if self._string_chunks is not None:
+                i = self._consume_string(fragment, i)
+                continue
+            if self._token is not None:
+                i = self._consume_token(fragment, i)
+                continue
+
+            char = fragment[i]
+            if char in _WHITESPACE:
+                i += 1
+                continue
+            if self._done:
+                self.last_parse_reminding += fragment[i:]
+                return
+
+            if not self._stack:
+                self._start_value(char)
+                i += 1
+                continue
+
+            frame = self._stack[-1]
+            if frame.expect == _EXPECT_VALUE:
+                if char == "]" and isinstance(frame.container, list) and not frame.container:
+                    self._close_container()
+                else:
+                    self._start_value(char)
+            elif frame.expect == _EXPECT_COMMA:
+                if char == ",":
+                    frame.expect = _EXPECT_KEY if isinstance(frame.container, dict) else _EXPECT_VALUE
+                elif char == ("}" if isinstance(frame.container, dict) else "]"):
+                    self._close_container()
+                else:
+                    raise ValueError(f"expected ',' or closing bracket, got {char!r}")
+            elif frame.expect == _EXPECT_KEY:
+                if char == '"':
+                    self._start_string(is_key=True)
+                elif char == "}":
+                    self._close_container()
+                else:
+                    raise ValueError(f"expected object key, got {char!r}")
+            elif frame.expect == _EXPECT_COLON:
+                if char != ":":
+                    raise ValueError(f"expected ':', got {char!r}")
+                frame.expect = _EXPECT_VALUE
+            i += 1
+
+    def _start_value(self, char: str):
+        if char == "{":
+            self._open_container({})
+        elif char == "[":
+            self._open_container([])
+        elif char == '"':
+            self._start_string(is_key=False)
+        elif char in _NUMBER_CHARS or char in "tfn":
+            self._token = char
+        else:
+            raise ValueError(f"unexpected character {char!r}")
+
+    def _open_container(self, container: Union[Dict, List]):
+        # containers are attached to their parent as soon as they open; `_snapshot` copies the still-open ones
+        self._attach(container)
+        self._stack.append(_Frame(container))
+
+    def _close_container(self):
+        self._stack.pop()
+        if not self._stack:
+            self._done = True
+        elif isinstance(self._stack[-1].container, dict):
+            self._stack[-1].key = None
+
+    def _attach(self, value: Any):
+        if not self._stack:
+            self._root, self._has_root = value, True
+            if not isinstance(value, (dict, list)):
+                self._done = True
+            return
+        frame = self._stack[-1]
+        if isinstance(frame.container, dict):
+            frame.container[frame.key] = value
+        else:
+            frame.container.append(value)
+        frame.expect = _EXPECT_COMMA
+
+    def _complete_value(self, value: Any):
+        self._attach(value)
+        if self._stack and isinstance(self._stack[-1].container, dict):
+            self._stack[-1].key = None
+
+    def _start_string(self, is_key: bool):
+        self._string_chunks = []
+        self._string_len = 0
+        self._string_is_key = is_key
+
+    def _append_string(self, text: str):
+        if text:
+            self._string_chunks.append(text)
+            self._string_len += len(text)
+
+    def _consume_string(self, fragment: str, i: int) -> int:
+        n = len(fragment)
+        while i < n:
+            if self._escape:
+                i = self._consume_escape(fragment, i)
+                continue
+            match = _STRING_RUN.match(fragment, i)
+            if match:
+                self._flush_surrogate()
+                self._append_string(match.group())
+                i = match.end()
+                continue
+            char = fragment[i]
+            i += 1
+            if char == "\\":
+                self._escape = char
+                continue
+            # closing quote
+            self._flush_surrogate()
+            text = "".join(self._string_chunks)
+            self._string_chunks = None
+            if self._string_is_key:
+                frame = self._stack[-1]
+                frame.key = text
+                frame.expect = _EXPECT_COLON
+            else:
+                self._complete_value(text)
+            return i
+        return i
+
+    def _consume_escape(self, fragment: str, i: int) -> int:
+        # escape sequences can be split across fragments, so collect them in `self._escape` until complete
+        self._escape += fragment[i]
+        i += 1
+        if len(self._escape) < 2 or (self._escape[1] == "u" and len(self._escape) < 6):
+            return i
+
+        escape, self._escape = self._escape, ""
+        if escape[1] != "u":
+            if escape[1] not in _SIMPLE_ESCAPES:
+                raise ValueError(f"invalid escape {escape!r}")
+            self._flush_surrogate()
+            self._append_string(_SIMPLE_ESCAPES[escape[1]])
+            return i
+
+        code = int(escape[2:], 16)
+        if 0xD800 <= code < 0xDC00:
+            self._flush_surrogate()
+            self._high_surrogate = code
+        elif 0xDC00 <= code < 0xE000 and self._high_surrogate is not None:
+            self._append_string(chr(0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)))
+            self._high_surrogate = None
+        else:
+            self._flush_surrogate()
+            self._append_string(chr(code))
+        return i
+
+    def _flush_surrogate(self):
+        # a high surrogate that isn't followed by a low one is kept as a lone code point, like json.loads does
+        if self._high_surrogate is not None:
+            self._append_string(chr(self._high_surrogate))
+            self._high_surrogate = None
+
+    def _consume_token(self, fragment: str, i: int) -> int:
+        n = len(fragment)
+        start = i
+        if self._token[0] in "tfn":
+            while i < n and fragment[i].isalpha():
+                i += 1
+        else:
+            while i < n and fragment[i] in _NUMBER_CHARS:
+                i += 1
+        self._token += fragment[start:i]
+        if i == n:
+            return i  # the token may continue in the next fragment
+
+        token, self._token = self._token, None
+        if token in _LITERALS:
+            self._complete_value(_LITERALS[token])
+        else:
+            try:
+                self._complete_value(json.loads(token))
+            except json.JSONDecodeError:
+                raise ValueError(f"invalid token {token!r}")
+        return i
+
+    # ======================================================================================================================
+    # Partial results
+    # ======================================================================================================================
+    @property
+    def complete(self) -> bool:
+        """Whether a whole JSON document has been consumed."""
+        return self._done and self._token is None
+
+    @property
+    def value(self) -> Any:
+        """The (partial) document parsed so far; an empty dict before anything has been parsed."""
+        if self._token is not None and not self._stack:
+            scalar = self._partial_scalar()
+            return {} if scalar is _MISSING else scalar
+        if self._string_chunks is not None and not self._stack:
+            return self._partial_string()
+        if not self._has_root:
+            return {}
+        if not self._stack:
+            return self._root
+        return self._snapshot(0)
+
+    def keys(self) -> List[str]:
+        """Keys of the top-level object whose values have started."""
+        if not self._stack or not isinstance(self._root, dict):
+            return list(self._root.keys()) if isinstance(self._root, dict) else []
+        keys = list(self._root.keys())
+        if self._open_value_depth() == 0 and self._stack[0].key is not None and self._partial_scalar() is not _MISSING:
+            keys.append(self._stack[0].key)
+        return keys
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """The (partial) value of `key` in the top-level object, materializing only that value."""
+        if not isinstance(self._root, dict):
+            return default
+        if self._stack and self._stack[0].key == key:
+            if len(self._stack) > 1:
+                return self._snapshot(1)
+            value = self._partial_scalar()
+            return default if value is _MISSING else value
+        return self._root.get(key, default)
+
+    def read_string(self, key: str, start: int = 0) -> Optional[str]:
+        """
+        The (partial) string value of top-level `key` from character `start` on, or None if it isn't a string (yet).
+
+        Unlike `get`, this doesn't join the whole in-progress string, so reading just the newly streamed part of a long
+        value stays proportional to the length of that part.
+        """
+        if not isinstance(self._root, dict):
+            return None
+        if len(self._stack) == 1 and self._stack[0].key == key and self._string_chunks is not None and not self._string_is_key:
+            parts, remaining = [], self._string_len - start
+            for chunk in reversed(self._string_chunks):
+                if remaining <= 0:
+                    break
+                parts.append(chunk if len(chunk) <= remaining else chunk[-remaining:])
+                remaining -= len(chunk)
+            return "".join(reversed(parts))
+        value = self._root.get(key)
+        return value[start:] if isinstance(value, str) else None
+
+    def _open_value_depth(self) -> int:
+        """Depth of the frame holding the in-progress scalar."""
+        return len(self._stack) - 1
+
+    def _partial_string(self) -> str:
+        text = "".join(self._string_chunks)
+        self._string_chunks[:] = [text] if text else []
+        return text
+
+    def _partial_scalar(self) -> Any:
+        """The in-progress scalar of the innermost open container, or _MISSING if there is none to show."""
+        if self._string_chunks is not None and not self._string_is_key:
+            return self._partial_string()
+        if self._token is not None and self._token[0] not in "tfn":
+            try:
+                return json.loads(self._token.rstrip("+-.eE"))
+            except json.JSONDecodeError:
+                return _MISSING
+        return _MISSING
+
+    def _snapshot(self, depth: int) -> Union[Dict, List]:
+        """Copy of the open container at `depth`, with the in-progress values below it filled in."""
+        frame = self._stack[depth]
+        container = frame.container
+        if depth + 1 < len(self._stack):
+            child = self._snapshot(depth + 1)
+        else:
+            child = self._partial_scalar()
+
+        if isinstance(container, dict):
+            copied = dict(container)
+            if frame.key is not None:
+                if child is _MISSING:
+                    copied.pop(frame.key, None)
+                else:
+                    copied[frame.key] = child
+            return copied
+
+        copied = list(container)
+        if depth + 1 < len(self._stack):
+            copied[-1] = child
+        elif child is not _MISSING:
+            copied.append(child)
+        return copied
+
+
 # TODO: Keeping this around for posterity
 # def main():
 #     test_string = '{"inner_thoughts":}'
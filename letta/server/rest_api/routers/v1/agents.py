@@ -12,7 +12,7 @@ from pydantic import Field
 from sqlalchemy.exc import IntegrityError, OperationalError
 from starlette.responses import Response, StreamingResponse
 
-from letta.agents.letta_agent import LettaAgent
+from letta.agents.letta_agent import AGENT_STEP_RELATIONSHIPS, LettaAgent
 from letta.constants import DEFAULT_MAX_STEPS, DEFAULT_MESSAGE_TOOL, DEFAULT_MESSAGE_TOOL_KWARG, LETTA_MODEL_ENDPOINT, REDIS_RUN_ID_PREFIX
 from letta.data_sources.redis_client import get_redis_client
 from letta.groups.sleeptime_multi_agent_v2 import SleeptimeMultiAgentV2
@@ -21,7 +21,7 @@ from letta.log import get_logger
 from letta.orm.errors import NoResultFound
 from letta.otel.context import get_ctx_attributes
 from letta.otel.metric_registry import MetricRegistry
-from letta.schemas.agent import AgentState, AgentType, CreateAgent, UpdateAgent
+from letta.schemas.agent import AgentState, AgentSummary, AgentType, CreateAgent, UpdateAgent
 from letta.schemas.block import Block, BlockUpdate
 from letta.schemas.group import Group
 from letta.schemas.job import JobStatus, JobUpdate, LettaRequestConfig
@@ -118,6 +118,59 @@ async def list_agents(
     )
 
 
+@router.get("/summaries", response_model=list[AgentSummary], operation_id="list_agent_summaries")
+async def list_agent_summaries(
+    name: str | None = Query(None, description="Name of the agent"),
+    tags: list[str] | None = Query(None, description="List of tags to filter agents by"),
+    match_all_tags: bool = Query(
+        False,
+        description="If True, only returns agents that match ALL given tags. Otherwise, return agents that have ANY of the passed-in tags.",
+    ),
+    server: SyncServer = Depends(get_letta_server),
+    actor_id: str | None = Header(None, alias="user_id"),
+    before: str | None = Query(None, description="Cursor for pagination"),
+    after: str | None = Query(None, description="Cursor for pagination"),
+    limit: int | None = Query(50, description="Limit for pagination"),
+    query_text: str | None = Query(None, description="Search agents by name"),
+    project_id: str | None = Query(None, description="Search agents by project ID"),
+    template_id: str | None = Query(None, description="Search agents by template ID"),
+    base_template_id: str | None = Query(None, description="Search agents by base template ID"),
+    identity_id: str | None = Query(None, description="Search agents by identity ID"),
+    identifier_keys: list[str] | None = Query(None, description="Search agents by identifier keys"),
+    ascending: bool = Query(
+        False,
+        description="Whether to sort agents oldest to newest (True) or newest to oldest (False, default)",
+    ),
+    sort_by: str | None = Query(
+        "created_at",
+        description="Field to sort by. Options: 'created_at' (default), 'last_run_completion'",
+    ),
+):
+    """
+    List the id, name, tags and timestamps of agents, with the same filters as listing agents.
+
+    Much cheaper than listing the full agents, for pickers and dashboards over many agents.
+    """
+    actor = await server.user_manager.get_actor_or_default_async(actor_id=actor_id)
+    return await server.agent_manager.list_agent_summaries_async(
+        actor=actor,
+        name=name,
+        before=before,
+        after=after,
+        limit=limit,
+        query_text=query_text,
+        tags=tags,
+        match_all_tags=match_all_tags,
+        project_id=project_id,
+        template_id=template_id,
+        base_template_id=base_template_id,
+        identity_id=identity_id,
+        identifier_keys=identifier_keys,
+        ascending=ascending,
+        sort_by=sort_by,
+    )
+
+
 @router.get("/count", response_model=int, operation_id="count_agents")
 async def count_agents(
     server: SyncServer = Depends(get_letta_server),
@@ -213,6 +266,87 @@ def import_agent_serialized(
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred while uploading the agent: {e!s}")
 
 
+@router.get("/{agent_id}/export/stream", response_class=StreamingResponse, operation_id="export_agent_serialized_stream")
+async def export_agent_serialized_stream(
+    agent_id: str,
+    server: "SyncServer" = Depends(get_letta_server),
+    actor_id: str | None = Header(None, alias="user_id"),
+):
+    """
+    Export an agent as newline-delimited JSON, streamed section by section (agent, blocks, tools, messages, passages).
+    Suited for agents with long histories, which the JSON export has to hold in memory at once.
+    """
+    actor = await server.user_manager.get_actor_or_default_async(actor_id=actor_id)
+
+    try:
+        await server.agent_manager.get_agent_by_id_async(agent_id=agent_id, actor=actor, include_relationships=[])
+    except NoResultFound:
+        raise HTTPException(status_code=404, detail=f"Agent with id={agent_id} not found for user_id={actor.id}.")
+
+    return StreamingResponse(
+        server.agent_manager.serialize_stream_async(agent_id=agent_id, actor=actor),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{agent_id}.ndjson"'},
+    )
+
+
+async def _read_upload_lines(file: UploadFile, chunk_size: int = 1024 * 1024):
+    """Yield the lines of an uploaded file without reading it into memory at once."""
+    remainder = b""
+    while chunk := await file.read(chunk_size):
+        lines = (remainder + chunk).split(b"\n")
+        remainder = lines.pop()
+        for line in lines:
+            yield line
+    if remainder:
+        yield remainder
+
+
+@router.post("/import/stream", response_model=AgentState, operation_id="import_agent_serialized_stream")
+async def import_agent_serialized_stream(
+    file: UploadFile = File(...),
+    server: "SyncServer" = Depends(get_letta_server),
+    actor_id: str | None = Header(None, alias="user_id"),
+    append_copy_suffix: bool = Query(True, description='If set to True, appends "_copy" to the end of the agent name.'),
+    override_existing_tools: bool = Query(
+        True,
+        description="If set to True, existing tools can get their source code overwritten by the uploaded tool definitions. Note that Letta core tools can never be updated externally.",
+    ),
+    project_id: str | None = Query(None, description="The project ID to associate the uploaded agent with."),
+    strip_messages: bool = Query(
+        False,
+        description="If set to True, strips all messages from the agent's context window after importing.",
+    ),
+):
+    """
+    Import an agent exported as newline-delimited JSON, inserting its messages and passages in batches as they are read.
+    """
+    actor = await server.user_manager.get_actor_or_default_async(actor_id=actor_id)
+
+    try:
+        return await server.agent_manager.deserialize_stream_async(
+            lines=_read_upload_lines(file),
+            actor=actor,
+            append_copy_suffix=append_copy_suffix,
+            override_existing_tools=override_existing_tools,
+            project_id=project_id,
+            strip_messages=strip_messages,
+        )
+
+    except (ValueError, ValidationError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid agent export: {e!s}")
+
+    except IntegrityError as e:
+        raise HTTPException(status_code=409, detail=f"Database integrity error: {e!s}")
+
+    except OperationalError as e:
+        raise HTTPException(status_code=503, detail=f"Database connection error. Please try again later: {e!s}")
+
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"An unexpected error occurred while uploading the agent: {e!s}")
+
+
 @router.get("/{agent_id}/context", response_model=ContextWindowOverview, operation_id="retrieve_agent_context_window")
 async def retrieve_agent_context_window(
     agent_id: str,
@@ -696,7 +830,9 @@ async def send_message(
 
     actor = await server.user_manager.get_actor_or_default_async(actor_id=actor_id)
     # TODO: This is redundant, remove soon
-    agent = await server.agent_manager.get_agent_by_id_async(agent_id, actor, include_relationships=["multi_agent_group"])
+    agent = await server.agent_manager.get_agent_by_id_async(
+        agent_id, actor, include_relationships=["multi_agent_group", *AGENT_STEP_RELATIONSHIPS]
+    )
     agent_eligible = agent.multi_agent_group is None or agent.multi_agent_group.manager_type in ["sleeptime", "voice_sleeptime"]
     model_compatible = agent.llm_config.model_endpoint_type in ["anthropic", "openai", "together", "google_ai", "google_vertex", "bedrock"]
 
@@ -765,6 +901,7 @@ async def send_message(
                 use_assistant_message=request.use_assistant_message,
                 request_start_timestamp_ns=request_start_timestamp_ns,
                 include_return_message_types=request.include_return_message_types,
+                agent_state=agent,
             )
         else:
             result = await server.send_message_to_agent(
@@ -825,7 +962,9 @@ async def send_message_streaming(
 
     actor = await server.user_manager.get_actor_or_default_async(actor_id=actor_id)
     # TODO: This is redundant, remove soon
-    agent = await server.agent_manager.get_agent_by_id_async(agent_id, actor, include_relationships=["multi_agent_group"])
+    agent = await server.agent_manager.get_agent_by_id_async(
+        agent_id, actor, include_relationships=["multi_agent_group", *AGENT_STEP_RELATIONSHIPS]
+    )
     agent_eligible = agent.multi_agent_group is None or agent.multi_agent_group.manager_type in ["sleeptime", "voice_sleeptime"]
     model_compatible = agent.llm_config.model_endpoint_type in ["anthropic", "openai", "together", "google_ai", "google_vertex", "bedrock"]
     model_compatible_token_streaming = agent.llm_config.model_endpoint_type in ["anthropic", "openai", "bedrock"]
@@ -902,6 +1041,7 @@ async def send_message_streaming(
                         use_assistant_message=request.use_assistant_message,
                         request_start_timestamp_ns=request_start_timestamp_ns,
                         include_return_message_types=request.include_return_message_types,
+                        agent_state=agent,
                     ),
                     media_type="text/event-stream",
                 )
@@ -913,6 +1053,7 @@ async def send_message_streaming(
                         use_assistant_message=request.use_assistant_message,
                         request_start_timestamp_ns=request_start_timestamp_ns,
                         include_return_message_types=request.include_return_message_types,
+                        agent_state=agent,
                     ),
                     media_type="text/event-stream",
                 )
@@ -993,7 +1134,9 @@ async def _process_message_background(
     """Background task to process the message and update job status."""
     request_start_timestamp_ns = get_utc_timestamp_ns()
     try:
-        agent = await server.agent_manager.get_agent_by_id_async(agent_id, actor, include_relationships=["multi_agent_group"])
+        agent = await server.agent_manager.get_agent_by_id_async(
+            agent_id, actor, include_relationships=["multi_agent_group", *AGENT_STEP_RELATIONSHIPS]
+        )
         agent_eligible = agent.multi_agent_group is None or agent.multi_agent_group.manager_type in ["sleeptime", "voice_sleeptime"]
         model_compatible = agent.llm_config.model_endpoint_type in [
             "anthropic",
@@ -1042,6 +1185,7 @@ async def _process_message_background(
                 use_assistant_message=use_assistant_message,
                 request_start_timestamp_ns=request_start_timestamp_ns,
                 include_return_message_types=include_return_message_types,
+                agent_state=agent,
             )
         else:
             result = await server.send_message_to_agent(
@@ -1179,7 +1323,9 @@ async def preview_raw_payload(
     be sent to the LLM provider. Useful for debugging and inspection.
     """
     actor = await server.user_manager.get_actor_or_default_async(actor_id=actor_id)
-    agent = await server.agent_manager.get_agent_by_id_async(agent_id, actor, include_relationships=["multi_agent_group"])
+    agent = await server.agent_manager.get_agent_by_id_async(
+        agent_id, actor, include_relationships=["multi_agent_group", *AGENT_STEP_RELATIONSHIPS]
+    )
     agent_eligible = agent.multi_agent_group is None or agent.multi_agent_group.manager_type in ["sleeptime", "voice_sleeptime"]
     model_compatible = agent.llm_config.model_endpoint_type in ["anthropic", "openai", "together", "google_ai", "google_vertex", "bedrock"]
 
@@ -1214,6 +1360,7 @@ async def preview_raw_payload(
             use_assistant_message=request.use_assistant_message,
             include_return_message_types=request.include_return_message_types,
             dry_run=True,
+            agent_state=agent,
         )
 
     else:
@@ -277,6 +277,97 @@ def create_letta_messages_from_llm_response(
     return messages
 
 
+def create_letta_messages_from_parallel_llm_response(
+    agent_id: str,
+    model: str,
+    function_names: List[str],
+    function_arguments: List[Dict],
+    tool_execution_results: List[ToolExecutionResult],
+    tool_call_ids: List[str],
+    function_responses: List[Optional[str]],
+    timezone: str,
+    actor: User,
+    last_response_index: Optional[int] = None,
+    continue_stepping: bool = False,
+    heartbeat_reason: Optional[str] = None,
+    reasoning_content: Optional[List[Union[TextContent, ReasoningContent, RedactedReasoningContent, OmittedReasoningContent]]] = None,
+    step_id: str | None = None,
+) -> List[Message]:
+    """
+    Like `create_letta_messages_from_llm_response`, for a response with several tool calls: one assistant message carrying
+    all of the tool calls, followed by their tool messages in call order (and a single heartbeat, if continuing).
+
+    The tool message of the call at `last_response_index` is moved after the others, so that it is the last function
+    response in the agent's history.
+    """
+    tool_calls = []
+    for function_name, arguments, tool_call_id in zip(function_names, function_arguments, tool_call_ids):
+        arguments[REQUEST_HEARTBEAT_PARAM] = continue_stepping
+        tool_calls.append(
+            OpenAIToolCall(
+                id=tool_call_id,
+                function=OpenAIFunction(name=function_name, arguments=json.dumps(arguments)),
+                type="function",
+            )
+        )
+    messages = [
+        Message(
+            role=MessageRole.assistant,
+            content=reasoning_content if reasoning_content else [],
+            organization_id=actor.organization_id,
+            agent_id=agent_id,
+            model=model,
+            tool_calls=tool_calls,
+            tool_call_id=tool_call_ids[0],
+            created_at=get_utc_time(),
+        )
+    ]
+
+    order = list(range(len(function_names)))
+    if last_response_index is not None:
+        order.append(order.pop(last_response_index))
+    for i in order:
+        function_name, tool_execution_result = function_names[i], tool_execution_results[i]
+        tool_call_id, function_response = tool_call_ids[i], function_responses[i]
+        messages.append(
+            Message(
+                role=MessageRole.tool,
+                content=[TextContent(text=package_function_response(tool_execution_result.success_flag, function_response, timezone))],
+                organization_id=actor.organization_id,
+                agent_id=agent_id,
+                model=model,
+                tool_calls=[],
+                tool_call_id=tool_call_id,
+                created_at=get_utc_time(),
+                name=function_name,
+                tool_returns=[
+                    ToolReturn(
+                        status=tool_execution_result.status,
+                        stderr=tool_execution_result.stderr,
+                        stdout=tool_execution_result.stdout,
+                    )
+                ],
+            )
+        )
+
+    if continue_stepping:
+        messages.append(
+            create_heartbeat_system_message(
+                agent_id=agent_id,
+                model=model,
+                function_call_success=all(result.success_flag for result in tool_execution_results),
+                actor=actor,
+                timezone=timezone,
+                heartbeat_reason=heartbeat_reason,
+            )
+        )
+
+    for message in messages:
+        message.step_id = step_id
+
+    return messages
+
+
 def create_heartbeat_system_message(
     agent_id: str,
     model: str,
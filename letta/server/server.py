@@ -93,6 +93,7 @@ from letta.services.mcp.base_client import AsyncBaseMCPClient
 from letta.services.mcp.sse_client import MCP_CONFIG_TOPLEVEL_KEY, AsyncSSEMCPClient
 from letta.services.mcp.stdio_client import AsyncStdioMCPClient
 from letta.services.mcp_manager import MCPManager
+from letta.services.message_blob_store import message_blob_store
 from letta.services.message_manager import MessageManager
 from letta.services.organization_manager import OrganizationManager
 from letta.services.passage_manager import PassageManager
@@ -1216,6 +1217,8 @@ class SyncServer(Server):
             ascending=not reverse,
             group_id=group_id,
         )
+        # stored messages only reference their images, return them with the image data
+        records = message_blob_store.load_images(records)
 
         if not return_message_object:
             records = Message.to_letta_messages_from_list(
@@ -1254,6 +1257,8 @@ class SyncServer(Server):
             ascending=not reverse,
             group_id=group_id,
         )
+        # stored messages only reference their images, return them with the image data
+        records = await message_blob_store.load_images_async(records)
 
         if not return_message_object:
             records = Message.to_letta_messages_from_list(
@@ -1,13 +1,16 @@
 import asyncio
 import os
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Set, Tuple
+from typing import AsyncGenerator, AsyncIterator, Dict, List, Optional, Set, Tuple, Union
 
 import sqlalchemy as sa
-from sqlalchemy import delete, func, insert, literal, or_, select, tuple_
+from sqlalchemy import Select, delete, func, insert, literal, or_, select, tuple_
 from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import load_only, noload
 
+import letta
 from letta.constants import (
+    AGENT_SERIALIZATION_CHUNK_SIZE,
     BASE_MEMORY_TOOLS,
     BASE_MEMORY_TOOLS_V2,
     BASE_SLEEPTIME_CHAT_TOOLS,
@@ -29,6 +32,7 @@ from letta.orm import Block as BlockModel
 from letta.orm import BlocksAgents
 from letta.orm import Group as GroupModel
 from letta.orm import IdentitiesAgents
+from letta.orm import Message as MessageModel
 from letta.orm import Source as SourceModel
 from letta.orm import SourcePassage, SourcesAgents
 from letta.orm import Tool as ToolModel
@@ -40,7 +44,7 @@ from letta.orm.sandbox_config import AgentEnvironmentVariable as AgentEnvironmen
 from letta.orm.sqlalchemy_base import AccessType
 from letta.otel.tracing import trace_method
 from letta.schemas.agent import AgentState as PydanticAgentState
-from letta.schemas.agent import AgentType, CreateAgent, UpdateAgent, get_prompt_template_for_agent_type
+from letta.schemas.agent import AgentSummary, AgentType, CreateAgent, UpdateAgent, get_prompt_template_for_agent_type
 from letta.schemas.block import DEFAULT_BLOCKS
 from letta.schemas.block import Block as PydanticBlock
 from letta.schemas.block import BlockUpdate
@@ -60,6 +64,14 @@ from letta.schemas.user import User as PydanticUser
 from letta.serialize_schemas import MarshmallowAgentSchema
 from letta.serialize_schemas.marshmallow_message import SerializedMessageSchema
 from letta.serialize_schemas.marshmallow_tool import SerializedToolSchema
+from letta.serialize_schemas.ndjson_agent_schema import (
+    NDJSON_AGENT_FORMAT,
+    NDJSON_AGENT_FORMAT_VERSION,
+    NDJSON_MESSAGE_EXCLUDE,
+    NDJSON_PASSAGE_EXCLUDE,
+    NDJSONAgentLine,
+    NDJSONAgentSection,
+)
 from letta.serialize_schemas.pydantic_agent_schema import AgentSchema
 from letta.server.db import db_registry
 from letta.services.block_manager import BlockManager
@@ -72,9 +84,12 @@ from letta.services.helpers.agent_manager_helper import (
     _apply_pagination,
     _apply_pagination_async,
     _apply_tag_filter,
+    _embed_passage_query,
     _process_relationship,
     _process_relationship_async,
+    agent_relationship_load_options,
     build_agent_passage_query,
+    build_hnsw_search_settings,
     build_passage_query,
     build_source_passage_query,
     calculate_base_tools,
@@ -86,10 +101,13 @@ from letta.services.helpers.agent_manager_helper import (
     package_initial_message_sequence,
 )
 from letta.services.identity_manager import IdentityManager
+from letta.services.in_context_message_cache import in_context_message_cache
+from letta.services.message_blob_store import message_blob_store
 from letta.services.message_manager import MessageManager
 from letta.services.passage_manager import PassageManager
 from letta.services.source_manager import SourceManager
 from letta.services.tool_manager import ToolManager
+from letta.services.vector_index.sqlite_vector_index import sqlite_vector_index
 from letta.utils import enforce_types, united_diff
 
 logger = get_logger(__name__)
@@ -973,6 +991,7 @@ class AgentManager:
             query = _apply_identity_filters(query, identity_id, identifier_keys)
             query = _apply_tag_filter(query, tags, match_all_tags)
             query = _apply_pagination(query, before, after, session, ascending=ascending, sort_by=sort_by)
+            query = query.options(*agent_relationship_load_options(include_relationships))
 
             if limit:
                 query = query.limit(limit)
@@ -1033,6 +1052,7 @@ class AgentManager:
             query = _apply_identity_filters(query, identity_id, identifier_keys)
             query = _apply_tag_filter(query, tags, match_all_tags)
             query = await _apply_pagination_async(query, before, after, session, ascending=ascending, sort_by=sort_by)
+            query = query.options(*agent_relationship_load_options(include_relationships))
 
             if limit:
                 query = query.limit(limit)
@@ -1041,6 +1061,58 @@ class AgentManager:
             agents = result.scalars().all()
             return await asyncio.gather(*[agent.to_pydantic_async(include_relationships=include_relationships) for agent in agents])
 
+    @trace_method
+    async def list_agent_summaries_async(
+        self,
+        actor: PydanticUser,
+        name: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        match_all_tags: bool = False,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: Optional[int] = 50,
+        query_text: Optional[str] = None,
+        project_id: Optional[str] = None,
+        template_id: Optional[str] = None,
+        base_template_id: Optional[str] = None,
+        identity_id: Optional[str] = None,
+        identifier_keys: Optional[List[str]] = None,
+        ascending: bool = True,
+        sort_by: Optional[str] = "created_at",
+    ) -> List[AgentSummary]:
+        """
+        Same as `list_agents_async`, but only loads the agents' id, name, tags and timestamps.
+        This takes two queries however many agents are listed, and skips the agents' (large) configs and prompts.
+        """
+        async with db_registry.async_session() as session:
+            query = select(AgentModel)
+            query = AgentModel.apply_access_predicate(query, actor, ["read"], AccessType.ORGANIZATION)
+
+            # Apply filters
+            query = _apply_filters(query, name, query_text, project_id, template_id, base_template_id)
+            query = _apply_identity_filters(query, identity_id, identifier_keys)
+            query = _apply_tag_filter(query, tags, match_all_tags)
+            query = await _apply_pagination_async(query, before, after, session, ascending=ascending, sort_by=sort_by)
+            query = query.options(
+                load_only(AgentModel.id, AgentModel.name, AgentModel.created_at, AgentModel.updated_at),
+                *agent_relationship_load_options(["tags"]),
+            )
+
+            if limit:
+                query = query.limit(limit)
+
+            result = await session.execute(query)
+            return [
+                AgentSummary(
+                    id=agent.id,
+                    name=agent.name,
+                    tags=[tag.tag for tag in agent.tags],
+                    created_at=agent.created_at,
+                    updated_at=agent.updated_at,
+                )
+                for agent in result.scalars()
+            ]
+
     @enforce_types
     @trace_method
     def list_agents_matching_tags(
@@ -1093,6 +1165,7 @@ class AgentManager:
         match_all: List[str],
         match_some: List[str],
         limit: Optional[int] = 50,
+        include_relationships: Optional[List[str]] = None,
     ) -> List[PydanticAgentState]:
         """
         Retrieves agents in the same organization that match all specified `match_all` tags
@@ -1104,6 +1177,7 @@ class AgentManager:
             match_all (List[str]): Agents must have all these tags.
             match_some (List[str]): Agents must have at least one of these tags.
             limit (Optional[int]): Maximum number of agents to return.
+            include_relationships (Optional[List[str]]): List of fields to load for performance optimization.
 
         Returns:
             List[PydanticAgentState: The filtered list of matching agents.
@@ -1126,8 +1200,11 @@ class AgentManager:
                 query = query.join(AgentsTags).where(AgentsTags.tag.in_(match_some))
 
             query = query.distinct(AgentModel.id).order_by(AgentModel.id).limit(limit)
+            query = query.options(*agent_relationship_load_options(include_relationships))
             result = await session.execute(query)
-            return await asyncio.gather(*[agent.to_pydantic_async() for agent in result.scalars()])
+            return await asyncio.gather(
+                *[agent.to_pydantic_async(include_relationships=include_relationships) for agent in result.scalars()]
+            )
 
     @trace_method
     def size(
@@ -1170,7 +1247,12 @@ class AgentManager:
         """Fetch an agent by its ID."""
 
         async with db_registry.async_session() as session:
-            agent = await AgentModel.read_async(db_session=session, identifier=agent_id, actor=actor)
+            agent = await AgentModel.read_async(
+                db_session=session,
+                identifier=agent_id,
+                actor=actor,
+                query_options=agent_relationship_load_options(include_relationships),
+            )
             return await agent.to_pydantic_async(include_relationships=include_relationships)
 
     @enforce_types
@@ -1187,6 +1269,7 @@ class AgentManager:
                 db_session=session,
                 identifiers=agent_ids,
                 actor=actor,
+                query_options=agent_relationship_load_options(include_relationships),
             )
             return await asyncio.gather(*[agent.to_pydantic_async(include_relationships=include_relationships) for agent in agents])
 
@@ -1239,6 +1322,8 @@ class AgentManager:
                 for agent in agents_to_delete:
                     session.delete(agent)
                 session.commit()
+                for agent in agents_to_delete:
+                    sqlite_vector_index.drop_collection("agent", agent.id)
             except Exception as e:
                 session.rollback()
                 logger.exception(f"Failed to hard delete Agent with ID {agent_id}")
@@ -1289,6 +1374,7 @@ class AgentManager:
                 for agent in agents_to_delete:
                     await session.delete(agent)
                     await session.commit()
+                    sqlite_vector_index.drop_collection("agent", agent.id)
             except Exception as e:
                 await session.rollback()
                 logger.exception(f"Failed to hard delete Agent with ID {agent_id}")
@@ -1303,7 +1389,10 @@ class AgentManager:
             agent = AgentModel.read(db_session=session, identifier=agent_id, actor=actor)
             schema = MarshmallowAgentSchema(session=session, actor=actor)
             data = schema.dump(agent)
-            return AgentSchema(**data)
+        serialized_agent = AgentSchema(**data)
+        # stored messages only reference their images, export the image data so the agent can be imported on another server
+        serialized_agent.messages = message_blob_store.load_images(serialized_agent.messages)
+        return serialized_agent
 
     @enforce_types
     @trace_method
@@ -1372,6 +1461,204 @@ class AgentManager:
 
         return pydantic_agent
 
+    @trace_method
+    async def serialize_stream_async(self, agent_id: str, actor: PydanticUser) -> AsyncGenerator[str, None]:
+        """
+        Export an agent as newline-delimited JSON: a header, the agent, its blocks, tools, messages and archival passages,
+        and a footer with the number of lines in each section.
+
+        Messages and passages are read through server-side cursors, so memory use doesn't grow with the agent's history.
+        """
+
+        def serialize_agent() -> Tuple[dict, List[str]]:
+            with db_registry.session() as session:
+                agent = AgentModel.read(db_session=session, identifier=agent_id, actor=actor)
+                message_ids = list(agent.message_ids or [])
+                data = MarshmallowAgentSchema(session=session, actor=actor, include_messages=False).dump(agent)
+                return data, message_ids
+
+        # the agent row and its blocks and tools are small, only the messages and passages need streaming
+        agent_data, message_ids = await asyncio.to_thread(serialize_agent)
+        in_context_indices = {message_id: index for index, message_id in enumerate(message_ids)}
+        blocks = agent_data.pop("core_memory", [])
+        tools = agent_data.pop("tools", [])
+        for field in (MarshmallowAgentSchema.FIELD_MESSAGES, MarshmallowAgentSchema.FIELD_IN_CONTEXT_INDICES):
+            agent_data.pop(field, None)
+
+        counts = {
+            section.value: 0
+            for section in (NDJSONAgentSection.block, NDJSONAgentSection.tool, NDJSONAgentSection.message, NDJSONAgentSection.passage)
+        }
+
+        def line(section: NDJSONAgentSection, data: dict, in_context_index: Optional[int] = None) -> str:
+            if section.value in counts:
+                counts[section.value] += 1
+            return NDJSONAgentLine(type=section, data=data, in_context_index=in_context_index).model_dump_json(exclude_none=True) + "\n"
+
+        header = {"format": NDJSON_AGENT_FORMAT, "format_version": NDJSON_AGENT_FORMAT_VERSION, "version": letta.__version__}
+        yield line(NDJSONAgentSection.header, header)
+        yield line(NDJSONAgentSection.agent, agent_data)
+        for block in blocks:
+            yield line(NDJSONAgentSection.block, block)
+        for tool in tools:
+            yield line(NDJSONAgentSection.tool, tool)
+
+        async with db_registry.async_session() as session:
+            query = (
+                select(MessageModel)
+                .where(MessageModel.agent_id == agent_id, MessageModel.organization_id == actor.organization_id)
+                .order_by(MessageModel.sequence_id.asc())
+                .options(noload("*"))
+                .execution_options(yield_per=AGENT_SERIALIZATION_CHUNK_SIZE)
+            )
+            async for message in await session.stream_scalars(query):
+                # stored messages only reference their images, export the image data so the agent can be imported elsewhere
+                [pydantic_message] = await message_blob_store.load_images_async([message.to_pydantic()])
+                data = pydantic_message.model_dump(mode="json", exclude=NDJSON_MESSAGE_EXCLUDE)
+                yield line(NDJSONAgentSection.message, data, in_context_index=in_context_indices.get(message.id))
+
+            query = (
+                select(AgentPassage)
+                .where(AgentPassage.agent_id == agent_id, AgentPassage.organization_id == actor.organization_id)
+                .where(AgentPassage.is_deleted == False)
+                .order_by(AgentPassage.created_at.asc(), AgentPassage.id.asc())
+                .options(noload("*"))
+                .execution_options(yield_per=AGENT_SERIALIZATION_CHUNK_SIZE)
+            )
+            async for passage in await session.stream_scalars(query):
+                yield line(NDJSONAgentSection.passage, passage.to_pydantic().model_dump(mode="json", exclude=NDJSON_PASSAGE_EXCLUDE))
+
+        yield line(NDJSONAgentSection.footer, {"counts": counts})
+
+    @trace_method
+    async def deserialize_stream_async(
+        self,
+        lines: AsyncIterator[Union[str, bytes]],
+        actor: PydanticUser,
+        append_copy_suffix: bool = True,
+        override_existing_tools: bool = True,
+        project_id: Optional[str] = None,
+        strip_messages: Optional[bool] = False,
+    ) -> PydanticAgentState:
+        """
+        Import an agent exported by `serialize_stream_async`. Messages and passages are inserted in chunks as they are
+        read. If the export is invalid or truncated, the partially imported agent is deleted again.
+        """
+        agent_data, blocks, tools = None, [], []
+        pydantic_agent = None
+        counts = {
+            section.value: 0
+            for section in (NDJSONAgentSection.block, NDJSONAgentSection.tool, NDJSONAgentSection.message, NDJSONAgentSection.passage)
+        }
+        message_chunk, passage_chunk = [], []
+        in_context_message_ids: Dict[int, str] = {}
+        footer = None
+
+        async def create_agent() -> PydanticAgentState:
+            if agent_data is None:
+                raise ValueError("Agent export is missing the agent line")
+            serialized_agent = AgentSchema(
+                **agent_data,
+                core_memory=blocks,
+                tools=tools,
+                messages=[],
+                in_context_message_indices=[],
+            )
+            return await asyncio.to_thread(
+                self.deserialize,
+                serialized_agent=serialized_agent,
+                actor=actor,
+                append_copy_suffix=append_copy_suffix,
+                override_existing_tools=override_existing_tools,
+                project_id=project_id,
+            )
+
+        async def flush_messages():
+            if not message_chunk:
+                return
+            await self.message_manager.create_many_messages_async([message for _, message in message_chunk], actor=actor)
+            for in_context_index, message in message_chunk:
+                if in_context_index is not None:
+                    in_context_message_ids[in_context_index] = message.id
+            message_chunk.clear()
+
+        async def flush_passages():
+            if not passage_chunk:
+                return
+            await self.passage_manager.create_many_agent_passages_async(list(passage_chunk), actor=actor)
+            passage_chunk.clear()
+
+        header = None
+        try:
+            async for raw_line in lines:
+                if not raw_line.strip():
+                    continue
+                line = NDJSONAgentLine.model_validate_json(raw_line)
+                if header is None:
+                    if line.type != NDJSONAgentSection.header or line.data.get("format") != NDJSON_AGENT_FORMAT:
+                        raise ValueError("Not a streamed agent export, the first line must be the header")
+                    if line.data.get("format_version", 0) > NDJSON_AGENT_FORMAT_VERSION:
+                        raise ValueError(f"Unsupported agent export format version {line.data.get('format_version')}")
+                    header = line.data
+                    continue
+                if footer is not None:
+                    raise ValueError("Agent export has lines after the footer")
+
+                if line.type in (NDJSONAgentSection.block, NDJSONAgentSection.tool, NDJSONAgentSection.message, NDJSONAgentSection.passage):
+                    counts[line.type.value] += 1
+
+                if line.type in (NDJSONAgentSection.agent, NDJSONAgentSection.block, NDJSONAgentSection.tool):
+                    if pydantic_agent is not None:
+                        # the agent is created with its blocks and tools before the first message or passage is inserted
+                        raise ValueError(
+                            f"Agent export has a {line.type.value} line after its messages or passages, "
+                            "the agent, block and tool lines must come first"
+                        )
+                    if line.type == NDJSONAgentSection.agent and agent_data is not None:
+                        raise ValueError("Agent export has more than one agent line")
+
+                if line.type == NDJSONAgentSection.agent:
+                    agent_data = line.data
+                elif line.type == NDJSONAgentSection.block:
+                    blocks.append(line.data)
+                elif line.type == NDJSONAgentSection.tool:
+                    tools.append(line.data)
+                else:
+                    if pydantic_agent is None:
+                        pydantic_agent = await create_agent()
+
+                    if line.type == NDJSONAgentSection.message:
+                        message = PydanticMessage.model_validate({**line.data, "agent_id": pydantic_agent.id})
+                        message_chunk.append((line.in_context_index, message))
+                        if len(message_chunk) >= AGENT_SERIALIZATION_CHUNK_SIZE:
+                            await flush_messages()
+                    elif line.type == NDJSONAgentSection.passage:
+                        passage = PydanticPassage.model_validate(
+                            {**line.data, "agent_id": pydantic_agent.id, "organization_id": actor.organization_id}
+                        )
+                        passage_chunk.append(passage)
+                        if len(passage_chunk) >= AGENT_SERIALIZATION_CHUNK_SIZE:
+                            await flush_passages()
+                    elif line.type == NDJSONAgentSection.footer:
+                        footer = line.data
+
+            if footer is None:
+                raise ValueError("Agent export is truncated, the footer is missing")
+            if footer.get("counts") != counts:
+                raise ValueError(f"Agent export is incomplete, expected {footer.get('counts')} lines but read {counts}")
+            await flush_messages()
+            await flush_passages()
+
+            message_ids = [in_context_message_ids[index] for index in sorted(in_context_message_ids)]
+            if strip_messages:
+                # we want to strip all but the first (system) message
+                message_ids = message_ids[:1]
+            return await self.set_in_context_messages_async(agent_id=pydantic_agent.id, message_ids=message_ids, actor=actor)
+        except Exception:
+            if pydantic_agent is not None:
+                await self.delete_agent_async(agent_id=pydantic_agent.id, actor=actor)
+            raise
+
     # ======================================================================================================================
     # Per Agent Environment Variable Management
     # ======================================================================================================================
@@ -1639,12 +1926,16 @@ class AgentManager:
     @enforce_types
     @trace_method
     def set_in_context_messages(self, agent_id: str, message_ids: List[str], actor: PydanticUser) -> PydanticAgentState:
-        return self.update_agent(agent_id=agent_id, agent_update=UpdateAgent(message_ids=message_ids), actor=actor)
+        agent_state = self.update_agent(agent_id=agent_id, agent_update=UpdateAgent(message_ids=message_ids), actor=actor)
+        in_context_message_cache.retain(agent_id=agent_id, message_ids=message_ids)
+        return agent_state
 
     @enforce_types
     @trace_method
     async def set_in_context_messages_async(self, agent_id: str, message_ids: List[str], actor: PydanticUser) -> PydanticAgentState:
-        return await self.update_agent_async(agent_id=agent_id, agent_update=UpdateAgent(message_ids=message_ids), actor=actor)
+        agent_state = await self.update_agent_async(agent_id=agent_id, agent_update=UpdateAgent(message_ids=message_ids), actor=actor)
+        in_context_message_cache.retain(agent_id=agent_id, message_ids=message_ids)
+        return agent_state
 
     @enforce_types
     @trace_method
@@ -2218,12 +2509,18 @@ class AgentManager:
                 ascending=ascending,
                 embedding_config=embedding_config,
                 agent_only=agent_only,
+                limit=limit,
             )
 
             # Add limit
             if limit:
                 main_query = main_query.limit(limit)
 
+            if embed_query:
+                hnsw_search_settings = build_hnsw_search_settings(limit)
+                if hnsw_search_settings is not None:
+                    session.execute(hnsw_search_settings)
+
             # Execute query
             results = list(session.execute(main_query))
 
@@ -2265,6 +2562,28 @@ class AgentManager:
     ) -> List[PydanticPassage]:
         """Lists all passages attached to an agent."""
         async with db_registry.async_session() as session:
+            if embed_query and sqlite_vector_index.enabled:
+                candidate_query = build_passage_query(
+                    actor=actor,
+                    agent_id=agent_id,
+                    file_id=file_id,
+                    start_date=start_date,
+                    end_date=end_date,
+                    before=before,
+                    after=after,
+                    source_id=source_id,
+                    ascending=ascending,
+                    agent_only=agent_only,
+                )
+                columns = candidate_query.selected_columns
+                return await self._search_passages_with_sqlite_index_async(
+                    session,
+                    candidate_query=candidate_query.with_only_columns(columns.id, columns.agent_id, columns.source_id),
+                    query_text=query_text,
+                    embedding_config=embedding_config,
+                    limit=limit,
+                )
+
             main_query = build_passage_query(
                 actor=actor,
                 agent_id=agent_id,
@@ -2279,12 +2598,18 @@ class AgentManager:
                 ascending=ascending,
                 embedding_config=embedding_config,
                 agent_only=agent_only,
+                limit=limit,
             )
 
             # Add limit
             if limit:
                 main_query = main_query.limit(limit)
 
+            if embed_query:
+                hnsw_search_settings = build_hnsw_search_settings(limit)
+                if hnsw_search_settings is not None:
+                    await session.execute(hnsw_search_settings)
+
             # Execute query
             result = await session.execute(main_query)
 
@@ -2325,6 +2650,28 @@ class AgentManager:
     ) -> List[PydanticPassage]:
         """Lists all passages attached to an agent."""
         async with db_registry.async_session() as session:
+            if embed_query and sqlite_vector_index.enabled:
+                candidate_query = build_source_passage_query(
+                    actor=actor,
+                    agent_id=agent_id,
+                    file_id=file_id,
+                    start_date=start_date,
+                    end_date=end_date,
+                    before=before,
+                    after=after,
+                    source_id=source_id,
+                    ascending=ascending,
+                )
+                return await self._search_passages_with_sqlite_index_async(
+                    session,
+                    candidate_query=candidate_query.with_only_columns(
+                        SourcePassage.id, literal(None).label("agent_id"), SourcePassage.source_id, maintain_column_froms=True
+                    ),
+                    query_text=query_text,
+                    embedding_config=embedding_config,
+                    limit=limit,
+                )
+
             main_query = build_source_passage_query(
                 actor=actor,
                 agent_id=agent_id,
@@ -2344,6 +2691,11 @@ class AgentManager:
             if limit:
                 main_query = main_query.limit(limit)
 
+            if embed_query:
+                hnsw_search_settings = build_hnsw_search_settings(limit)
+                if hnsw_search_settings is not None:
+                    await session.execute(hnsw_search_settings)
+
             # Execute query
             result = await session.execute(main_query)
 
@@ -2371,6 +2723,26 @@ class AgentManager:
     ) -> List[PydanticPassage]:
         """Lists all passages attached to an agent."""
         async with db_registry.async_session() as session:
+            if embed_query and sqlite_vector_index.enabled:
+                candidate_query = build_agent_passage_query(
+                    actor=actor,
+                    agent_id=agent_id,
+                    start_date=start_date,
+                    end_date=end_date,
+                    before=before,
+                    after=after,
+                    ascending=ascending,
+                )
+                return await self._search_passages_with_sqlite_index_async(
+                    session,
+                    candidate_query=candidate_query.with_only_columns(
+                        AgentPassage.id, AgentPassage.agent_id, literal(None).label("source_id"), maintain_column_froms=True
+                    ),
+                    query_text=query_text,
+                    embedding_config=embedding_config,
+                    limit=limit,
+                )
+
             main_query = build_agent_passage_query(
                 actor=actor,
                 agent_id=agent_id,
@@ -2388,6 +2760,11 @@ class AgentManager:
             if limit:
                 main_query = main_query.limit(limit)
 
+            if embed_query:
+                hnsw_search_settings = build_hnsw_search_settings(limit)
+                if hnsw_search_settings is not None:
+                    await session.execute(hnsw_search_settings)
+
             # Execute query
             result = await session.execute(main_query)
 
@@ -2397,6 +2774,43 @@ class AgentManager:
             # Convert to Pydantic models
             return [p.to_pydantic() for p in passages]
 
+    async def _search_passages_with_sqlite_index_async(
+        self,
+        session,
+        candidate_query: Select,
+        query_text: Optional[str],
+        embedding_config: Optional[EmbeddingConfig],
+        limit: Optional[int],
+    ) -> List[PydanticPassage]:
+        """Vector search on SQLite through the in-process index instead of ordering by the `cosine_distance` UDF.
+
+        `candidate_query` applies every non-vector filter and selects (id, agent_id, source_id); only the top `limit`
+        passages are then loaded in full.
+        """
+        assert embedding_config is not None, "embedding_config must be specified for vector search"
+        assert query_text is not None, "query_text must be specified for vector search"
+        embedded_text, _ = _embed_passage_query(query_text, embedding_config)
+
+        candidates = []
+        agent_passage_ids = set()
+        for row in await session.execute(candidate_query):
+            if row.agent_id is not None:
+                candidates.append((row.id, ("agent", row.agent_id)))
+                agent_passage_ids.add(row.id)
+            else:
+                candidates.append((row.id, ("source", row.source_id)))
+        ranked_ids = await sqlite_vector_index.search_async(session, embedded_text, candidates, limit=limit)
+
+        passages_by_id = {}
+        for model, ids in (
+            (AgentPassage, [passage_id for passage_id in ranked_ids if passage_id in agent_passage_ids]),
+            (SourcePassage, [passage_id for passage_id in ranked_ids if passage_id not in agent_passage_ids]),
+        ):
+            if ids:
+                result = await session.execute(select(model).where(model.id.in_(ids)))
+                passages_by_id.update({p.id: p for p in result.scalars()})
+        return [passages_by_id[passage_id].to_pydantic() for passage_id in ranked_ids if passage_id in passages_by_id]
+
     @enforce_types
     @trace_method
     def passage_size(
@@ -10,7 +10,8 @@ from letta.schemas.letta_message_content import TextContent
 from letta.schemas.memory import ContextWindowOverview
 from letta.schemas.message import Message
 from letta.schemas.user import User as PydanticUser
-from letta.services.context_window_calculator.token_counter import TokenCounter
+from letta.services.context_window_calculator.token_counter import TiktokenCounter, TokenCounter
+from letta.services.message_blob_store import message_blob_store
 from letta.services.message_manager import MessageManager
 
 logger = get_logger(__name__)
@@ -58,6 +59,32 @@ class ContextWindowCalculator:
 
         return None, 1
 
+    @staticmethod
+    async def count_in_context_message_tokens(
+        token_counter: TokenCounter, message_manager: MessageManager, messages: List[Message], actor: PydanticUser
+    ) -> int:
+        """
+        Count the tokens of stored messages. With a local tokenizer, only the messages without a count of its tokenizer
+        family yet are tokenized, and their counts are persisted for the next time.
+        """
+        if not isinstance(token_counter, TiktokenCounter):
+            # counted together by the provider, which needs the data of the images the messages reference
+            messages = await message_blob_store.load_images_async(messages)
+            return await token_counter.count_message_tokens(token_counter.convert_messages(messages))
+
+        key = token_counter.message_token_counts_key
+        uncounted_messages = [message for message in messages if key not in (message.token_counts or {})]
+        if uncounted_messages:
+            counts = token_counter.count_each_message_tokens(token_counter.convert_messages(uncounted_messages))
+            for message, count in zip(uncounted_messages, counts):
+                message.token_counts = {**(message.token_counts or {}), key: count}
+            try:
+                await message_manager.update_token_counts_async(uncounted_messages, actor=actor)
+            except Exception as e:
+                logger.warning(f"Failed to persist the token counts of {len(uncounted_messages)} messages: {e}")
+
+        return sum(message.token_counts[key] for message in messages) + token_counter.message_list_overhead_tokens
+
     async def calculate_context_window(
         self,
         agent_state: AgentState,
@@ -69,12 +96,11 @@ class ContextWindowCalculator:
         num_messages: int,
     ) -> ContextWindowOverview:
         """Calculate context window information using the provided token counter"""
-        messages = await message_manager.get_messages_by_ids_async(message_ids=agent_state.message_ids[1:], actor=actor)
+        messages = await message_manager.get_in_context_messages_async(
+            agent_id=agent_state.id, message_ids=agent_state.message_ids[1:], actor=actor
+        )
         in_context_messages = [system_message_compiled] + messages
 
-        # Convert messages to appropriate format
-        converted_messages = token_counter.convert_messages(in_context_messages)
-
         # Extract system components
         system_prompt = ""
         core_memory = ""
@@ -108,8 +134,8 @@ class ContextWindowCalculator:
             token_counter.count_text_tokens(external_memory_summary),
             token_counter.count_text_tokens(summary_memory) if summary_memory else asyncio.sleep(0, result=0),
             (
-                token_counter.count_message_tokens(converted_messages[message_start_index:])
-                if len(converted_messages) > message_start_index
+                self.count_in_context_message_tokens(token_counter, message_manager, in_context_messages[message_start_index:], actor)
+                if len(in_context_messages) > message_start_index
                 else asyncio.sleep(0, result=0)
             ),
             (
@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+from letta.helpers.tokenizer import tokenizer
+from letta.local_llm.utils import message_token_counts_key
+from letta.schemas.letta_message_content import ImageContent, ReasoningContent, TextContent
+from letta.schemas.llm_config import LLMConfig
+from letta.schemas.message import Message
+
+# tokens every chat message costs on top of its content (role, separators), as in `num_tokens_from_messages`
+TOKENS_PER_MESSAGE = 3
+# a rough upper bound of what one image costs, providers count them by resolution rather than by their bytes
+TOKENS_PER_IMAGE = 1000
+# number of message and tool set counts kept per process
+MAX_CACHED_COUNTS = 20_000
+
+
+def _message_text(message: Message) -> Tuple[str, int]:
+    """The parts of a message that end up in the prompt, and its number of images."""
+    parts = [message.role.value, message.name or "", message.tool_call_id or ""]
+    images = 0
+    for content in message.content or []:
+        if isinstance(content, TextContent):
+            parts.append(content.text)
+        elif isinstance(content, ReasoningContent):
+            parts.append(content.reasoning)
+        elif isinstance(content, ImageContent):
+            images += 1
+        else:
+            parts.append(content.model_dump_json())
+    for tool_call in message.tool_calls or []:
+        parts.append(tool_call.function.name)
+        parts.append(tool_call.function.arguments)
+    return "\n".join(parts), images
+
+
+def _image_count(message: Message) -> int:
+    return sum(isinstance(content, ImageContent) for content in message.content or [])
+
+
+class PromptTokenEstimator:
+    """
+    Fast local estimate of the prompt tokens of an LLM request, to catch context window overflows before sending it.
+
+    Counts use tiktoken whatever the provider, so they are approximate (see `LLMConfig.context_window_safety_margin`).
+    Messages with a persisted count (`Message.token_counts`, see `ContextWindowCalculator`) aren't tokenized again, and
+    the other counts are cached per message content and per tool set: an agent's context mostly carries over from one
+    step to the next, so each step only tokenizes its new messages and the (rebuilt) system message.
+    """
+
+    def __init__(self, max_cached_counts: int = MAX_CACHED_COUNTS):
+        self._lock = threading.Lock()
+        self._counts: "OrderedDict[bytes, int]" = OrderedDict()
+        self._max_cached_counts = max_cached_counts
+
+    def estimate(self, messages: List[Message], tools: Optional[List[Any]] = None, model: Optional[str] = None) -> int:
+        """
+        Estimated prompt tokens of a request with `messages` and the provider-formatted `tools` of its request data.
+        If `model` is given, the persisted counts of its messages are used instead of tokenizing them.
+        """
+        token_counts_key = message_token_counts_key(model) if model else None
+        texts = []
+        total = 0
+        for message in messages:
+            stored_count = (message.token_counts or {}).get(token_counts_key) if token_counts_key else None
+            if stored_count is not None:
+                total += stored_count + _image_count(message) * TOKENS_PER_IMAGE
+                continue
+            text, images = _message_text(message)
+            texts.append(text)
+            total += TOKENS_PER_MESSAGE + images * TOKENS_PER_IMAGE
+        if tools:
+            texts.append(json.dumps(tools))
+        return total + sum(self._cached_counts(texts))
+
+    async def estimate_async(self, messages: List[Message], tools: Optional[List[Any]] = None, model: Optional[str] = None) -> int:
+        """`estimate` off the event loop, tokenizing a new agent's history or a large system message takes a while."""
+        return await asyncio.to_thread(self.estimate, list(messages), tools, model)
+
+    def count_message(self, message: Message) -> int:
+        text, images = _message_text(message)
+        return TOKENS_PER_MESSAGE + self._cached_counts([text])[0] + images * TOKENS_PER_IMAGE
+
+    def _cached_counts(self, texts: List[str]) -> List[int]:
+        keys = [hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest() for text in texts]
+        with self._lock:
+            counts = [self._counts.get(key) for key in keys]
+            for key, count in zip(keys, counts):
+                if count is not None:
+                    self._counts.move_to_end(key)
+        uncounted = [i for i, count in enumerate(counts) if count is None]
+        if uncounted:
+            # a new agent's whole history is tokenized in one batch
+            new_counts = tokenizer.count_batch([texts[i] for i in uncounted])
+            with self._lock:
+                for i, count in zip(uncounted, new_counts):
+                    counts[i] = self._counts[keys[i]] = count
+                    self._counts.move_to_end(keys[i])
+                while len(self._counts) > self._max_cached_counts:
+                    self._counts.popitem(last=False)
+        return counts
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+def context_window_budget(llm_config: LLMConfig) -> Optional[int]:
+    """The most prompt tokens a request should be estimated at, or None if requests aren't checked before they are sent."""
+    if llm_config.context_window_safety_margin is None:
+        return None
+    return int(llm_config.context_window * (1 - llm_config.context_window_safety_margin))
+
+
+prompt_token_estimator = PromptTokenEstimator()
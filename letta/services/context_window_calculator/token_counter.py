@@ -121,3 +121,19 @@ class TiktokenCounter(TokenCounter):
 
     def convert_messages(self, messages: List[Any]) -> List[Dict[str, Any]]:
         return [m.to_openai_dict() for m in messages]
+
+    @property
+    def message_token_counts_key(self) -> str:
+        """Key of this counter's tokenizer family in `Message.token_counts`"""
+        from letta.local_llm.utils import message_token_counts_key
+
+        return message_token_counts_key(self.model)
+
+    # tokens a list of messages costs on top of the sum of its messages: every reply is primed with <|start|>assistant<|message|>
+    message_list_overhead_tokens: int = 3
+
+    def count_each_message_tokens(self, messages: List[Dict[str, Any]]) -> List[int]:
+        """Count tokens of each converted message, so that the counts can be stored per message"""
+        from letta.local_llm.utils import num_tokens_per_message
+
+        return num_tokens_per_message(messages=messages, model=self.model)
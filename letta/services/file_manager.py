@@ -1,6 +1,6 @@
 import os
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from sqlalchemy import func, select, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
@@ -19,6 +19,8 @@ from letta.schemas.source import Source as PydanticSource
 from letta.schemas.source_metadata import FileStats, OrganizationSourcesStats, SourceStats
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.services.file_processor.chunker.line_chunker import LineChunker
+from letta.services.file_processor.chunker.line_index import SPAN_SIZE, LineIndex
 from letta.utils import enforce_types
 
 
@@ -56,7 +58,13 @@ class FileManager:
                 await file_orm.create_async(session, actor=actor, no_commit=True)
 
                 if text is not None:
-                    content_orm = FileContentModel(file_id=file_orm.id, text=text)
+                    line_index = LineChunker().build_line_index(file_metadata, text)
+                    content_orm = FileContentModel(
+                        file_id=file_orm.id,
+                        text=text,
+                        line_offsets=line_index.to_bytes(),
+                        line_chunking_strategy=line_index.strategy.value,
+                    )
                     await content_orm.create_async(session, actor=actor, no_commit=True)
 
                 await session.commit()
@@ -171,19 +179,27 @@ class FileManager:
         file_id: str,
         text: str,
         actor: PydanticUser,
+        line_index: Optional[LineIndex] = None,
     ) -> PydanticFileMetadata:
+        """
+        Create or replace the text content of a file, along with the line index open_files and grep_files read it through.
+        The index is built from the text unless one built from it is passed in.
+        """
         async with db_registry.async_session() as session:
-            await FileMetadataModel.read_async(session, file_id, actor)
+            file_orm = await FileMetadataModel.read_async(session, file_id, actor)
+            if line_index is None:
+                line_index = LineChunker().build_line_index(await file_orm.to_pydantic_async(), text)
+            values = {"text": text, "line_offsets": line_index.to_bytes(), "line_chunking_strategy": line_index.strategy.value}
 
             dialect_name = session.bind.dialect.name
 
             if dialect_name == "postgresql":
                 stmt = (
                     pg_insert(FileContentModel)
-                    .values(file_id=file_id, text=text)
+                    .values(file_id=file_id, **values)
                     .on_conflict_do_update(
                         index_elements=[FileContentModel.file_id],
-                        set_={"text": text},
+                        set_=values,
                     )
                 )
                 await session.execute(stmt)
@@ -194,9 +210,9 @@ class FileManager:
                 existing = result.scalar_one_or_none()
 
                 if existing:
-                    await session.execute(update(FileContentModel).where(FileContentModel.file_id == file_id).values(text=text))
+                    await session.execute(update(FileContentModel).where(FileContentModel.file_id == file_id).values(**values))
                 else:
-                    session.add(FileContentModel(file_id=file_id, text=text))
+                    session.add(FileContentModel(file_id=file_id, **values))
 
             await session.commit()
 
@@ -205,6 +221,109 @@ class FileManager:
             result = await session.execute(query)
             return await result.scalar_one().to_pydantic_async(include_content=True)
 
+    @enforce_types
+    @trace_method
+    async def get_file_lines(
+        self,
+        file_metadata: PydanticFileMetadata,
+        actor: PydanticUser,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> Optional[Tuple[List[str], int]]:
+        """
+        Read chunks [start:end] of a file, as LineChunker splits it, along with the total number of chunks in the file.
+
+        Only the requested slice of the file's line index and the span of text it covers are read from the database, so opening
+        a few lines of a large file doesn't load or re-chunk the whole document. Returns None if the file has no content.
+        """
+        if (start is not None and start < 0) or (end is not None and end < 0):
+            # negative bounds count from the end of the file, which takes its whole index to resolve
+            file_content = await self.get_file_content_with_line_index(file_metadata, actor)
+            if file_content is None:
+                return None
+            text, line_index = file_content
+            return line_index.chunks(text, start, end), len(line_index)
+
+        first_chunk = start or 0
+        line_offsets = FileContentModel.line_offsets
+        if end is None:
+            line_offsets_slice = func.substr(line_offsets, first_chunk * SPAN_SIZE + 1)
+        else:
+            line_offsets_slice = func.substr(line_offsets, first_chunk * SPAN_SIZE + 1, max(end - first_chunk, 0) * SPAN_SIZE)
+
+        async with db_registry.async_session() as session:
+            query = self._file_content_query(
+                file_metadata.id,
+                actor,
+                FileContentModel.line_chunking_strategy,
+                func.length(line_offsets),
+                line_offsets_slice,
+                FileContentModel.text == "",
+            )
+            row = (await session.execute(query)).one_or_none()
+            if row is None:
+                return None
+            line_chunking_strategy, line_offsets_size, line_offsets_data, is_empty = row
+            if is_empty:
+                return None
+
+            strategy = LineChunker().determine_chunking_strategy(file_metadata)
+            if line_offsets_data is None or line_chunking_strategy != strategy.value:
+                text, line_index = await self._index_file_content(session, file_metadata, actor)
+                return line_index.chunks(text, start, end), len(line_index)
+
+            line_index = LineIndex.from_bytes(strategy, line_offsets_data)
+            text_start, text_end = line_index.text_span()
+            text = ""
+            if line_index.offsets:
+                query = self._file_content_query(
+                    file_metadata.id, actor, func.substr(FileContentModel.text, text_start + 1, text_end - text_start)
+                )
+                text = (await session.execute(query)).scalar_one()
+            return line_index.chunks(text, text_offset=text_start), line_offsets_size // SPAN_SIZE
+
+    @enforce_types
+    @trace_method
+    async def get_file_content_with_line_index(
+        self, file_metadata: PydanticFileMetadata, actor: PydanticUser
+    ) -> Optional[Tuple[str, LineIndex]]:
+        """Read the full text of a file along with its line index, or None if the file has no content."""
+        async with db_registry.async_session() as session:
+            query = self._file_content_query(
+                file_metadata.id, actor, FileContentModel.text, FileContentModel.line_chunking_strategy, FileContentModel.line_offsets
+            )
+            row = (await session.execute(query)).one_or_none()
+            if row is None or not row.text:
+                return None
+
+            strategy = LineChunker().determine_chunking_strategy(file_metadata)
+            if row.line_offsets is None or row.line_chunking_strategy != strategy.value:
+                return await self._index_file_content(session, file_metadata, actor, text=row.text)
+            return row.text, LineIndex.from_bytes(strategy, row.line_offsets)
+
+    def _file_content_query(self, file_id: str, actor: PydanticUser, *columns):
+        """Select columns of a file's content, scoped to the actor's organization."""
+        return (
+            select(*columns)
+            .join(FileMetadataModel, FileMetadataModel.id == FileContentModel.file_id)
+            .where(FileContentModel.file_id == file_id, FileMetadataModel.organization_id == actor.organization_id)
+        )
+
+    async def _index_file_content(
+        self, session, file_metadata: PydanticFileMetadata, actor: PydanticUser, text: Optional[str] = None
+    ) -> Tuple[str, LineIndex]:
+        """Build and store the line index of content stored before it was indexed, or indexed with another chunking strategy."""
+        if text is None:
+            text = (await session.execute(self._file_content_query(file_metadata.id, actor, FileContentModel.text))).scalar_one()
+        line_index = LineChunker().build_line_index(file_metadata, text)
+        await session.execute(
+            update(FileContentModel)
+            .where(FileContentModel.file_id == file_metadata.id)
+            .values(line_offsets=line_index.to_bytes(), line_chunking_strategy=line_index.strategy.value)
+        )
+        await session.commit()
+        return text, line_index
+
     @enforce_types
     @trace_method
     async def list_files(
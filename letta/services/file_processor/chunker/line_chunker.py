@@ -1,12 +1,20 @@
+import itertools
 import re
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
 from letta.log import get_logger
 from letta.schemas.file import FileMetadata
+from letta.services.file_processor.chunker.line_index import LineIndex
 from letta.services.file_processor.file_types import ChunkingStrategy, file_type_registry
 
 logger = get_logger(__name__)
 
+# the line boundaries of str.splitlines
+LINE_BREAK_PATTERN = re.compile(r"\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+# sentences end with a period, exclamation mark, or question mark followed by whitespace and a capital letter
+SENTENCE_BREAK_PATTERN = re.compile(r"(?<=[.!?])\s+(?=[A-Z])")
+WORD_PATTERN = re.compile(r"\S+")
+
 
 class LineChunker:
     """Content-aware line chunker that adapts chunking strategy based on file type"""
@@ -14,7 +22,7 @@ class LineChunker:
     def __init__(self):
         self.file_type_registry = file_type_registry
 
-    def _determine_chunking_strategy(self, file_metadata: FileMetadata) -> ChunkingStrategy:
+    def determine_chunking_strategy(self, file_metadata: FileMetadata) -> ChunkingStrategy:
         """Determine the best chunking strategy based on file metadata"""
         # Try to get strategy from MIME type first
         if file_metadata.file_type:
@@ -38,77 +46,90 @@ class LineChunker:
         # Default fallback
         return ChunkingStrategy.LINE_BASED
 
+    def _line_spans(self, text: str, preserve_indentation: bool = False) -> Iterator[Tuple[int, int]]:
+        """Spans of the non-empty lines of the text, with their whitespace stripped (only trailing whitespace for code)"""
+        line_start = 0
+        for line_break in itertools.chain(LINE_BREAK_PATTERN.finditer(text), [None]):
+            line_end = line_break.start() if line_break else len(text)
+            line = text[line_start:line_end]
+            stripped = line.rstrip() if preserve_indentation else line.strip()
+            if stripped:
+                start = line_start if preserve_indentation else line_start + len(line) - len(line.lstrip())
+                yield start, start + len(stripped)
+            if line_break:
+                line_start = line_break.end()
+
+    def _sentence_spans(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Spans of the sentences of the text, split on periods, exclamation marks, and question marks followed by whitespace"""
+        text_start = len(text) - len(text.lstrip())
+        stripped_text = text.strip()
+        sentence_start = 0
+        for sentence_break in itertools.chain(SENTENCE_BREAK_PATTERN.finditer(stripped_text), [None]):
+            sentence_end = sentence_break.start() if sentence_break else len(stripped_text)
+            sentence = stripped_text[sentence_start:sentence_end]
+            stripped = sentence.strip()
+            if stripped:
+                start = text_start + sentence_start + len(sentence) - len(sentence.lstrip())
+                yield start, start + len(stripped)
+            if sentence_break:
+                sentence_start = sentence_break.end()
+
+    def _character_spans(self, text: str, target_line_length: int = 100) -> Iterator[Tuple[int, int]]:
+        """Spans of the text wrapped at word boundaries into lines of about `target_line_length` characters"""
+        line_start = line_end = 0
+        line_words = 0
+        current_length = 0
+
+        for word in WORD_PATTERN.finditer(text):
+            # Check if adding this word would exceed the target length
+            word_length = word.end() - word.start()
+            if current_length + word_length + line_words > target_line_length and line_words:
+                # Start a new line
+                yield line_start, line_end
+                line_start = word.start()
+                line_words = 0
+                current_length = 0
+            elif not line_words:
+                line_start = word.start()
+            line_end = word.end()
+            line_words += 1
+            current_length += word_length
+
+        # Add the last line if there's content
+        if line_words:
+            yield line_start, line_end
+
     def _chunk_by_lines(self, text: str, preserve_indentation: bool = False) -> List[str]:
         """Traditional line-based chunking for code and structured data"""
-        # early stop, can happen if the there's nothing on a specific file
-        if not text:
-            return []
-
-        lines = []
-        for line in text.splitlines():
-            if preserve_indentation:
-                # For code: preserve leading whitespace (indentation), remove trailing whitespace
-                line = line.rstrip()
-                # Only skip completely empty lines
-                if line:
-                    lines.append(line)
-            else:
-                # For structured data: strip all whitespace
-                line = line.strip()
-                if line:
-                    lines.append(line)
-        return lines
+        strategy = ChunkingStrategy.CODE if preserve_indentation else ChunkingStrategy.LINE_BASED
+        return LineIndex.from_spans(strategy, self._line_spans(text, preserve_indentation)).chunks(text)
 
     def _chunk_by_sentences(self, text: str) -> List[str]:
         """Sentence-based chunking for documentation and markup"""
-        # early stop, can happen if the there's nothing on a specific file
-        if not text:
-            return []
-
-        # Simple sentence splitting on periods, exclamation marks, and question marks
-        # followed by whitespace or end of string
-        sentence_pattern = r"(?<=[.!?])\s+(?=[A-Z])"
-
-        # Split text into sentences
-        sentences = re.split(sentence_pattern, text.strip())
-
-        # Clean up sentences - remove extra whitespace and empty sentences
-        cleaned_sentences = []
-        for sentence in sentences:
-            sentence = re.sub(r"\s+", " ", sentence.strip())  # Normalize whitespace
-            if sentence:
-                cleaned_sentences.append(sentence)
-
-        return cleaned_sentences
+        return LineIndex.from_spans(ChunkingStrategy.DOCUMENTATION, self._sentence_spans(text)).chunks(text)
 
     def _chunk_by_characters(self, text: str, target_line_length: int = 100) -> List[str]:
         """Character-based wrapping for prose text"""
-        # early stop, can happen if the there's nothing on a specific file
-        if not text:
-            return []
+        return LineIndex.from_spans(ChunkingStrategy.PROSE, self._character_spans(text, target_line_length)).chunks(text)
 
-        words = text.split()
-        lines = []
-        current_line = []
-        current_length = 0
+    def build_line_index(self, file_metadata: FileMetadata, text: Optional[str] = None) -> LineIndex:
+        """Index the chunks `chunk_text` splits the file's content (or `text`) into, so ranges of them can be read without re-chunking"""
+        strategy = self.determine_chunking_strategy(file_metadata)
+        text = file_metadata.content if text is None else text
 
-        for word in words:
-            # Check if adding this word would exceed the target length
-            word_length = len(word)
-            if current_length + word_length + len(current_line) > target_line_length and current_line:
-                # Start a new line
-                lines.append(" ".join(current_line))
-                current_line = [word]
-                current_length = word_length
-            else:
-                current_line.append(word)
-                current_length += word_length
-
-        # Add the last line if there's content
-        if current_line:
-            lines.append(" ".join(current_line))
+        # early stop, can happen if the there's nothing on a specific file
+        if not text:
+            return LineIndex(strategy)
 
-        return [line for line in lines if line.strip()]
+        if strategy == ChunkingStrategy.DOCUMENTATION:
+            spans = self._sentence_spans(text)
+        elif strategy == ChunkingStrategy.PROSE:
+            spans = self._character_spans(text)
+        elif strategy == ChunkingStrategy.CODE:
+            spans = self._line_spans(text, preserve_indentation=True)
+        else:  # STRUCTURED_DATA or LINE_BASED
+            spans = self._line_spans(text, preserve_indentation=False)
+        return LineIndex.from_spans(strategy, spans)
 
     def chunk_text(
         self,
@@ -119,7 +140,6 @@ class LineChunker:
         validate_range: bool = False,
     ) -> List[str]:
         """Content-aware text chunking based on file type"""
-        strategy = self._determine_chunking_strategy(file_metadata)
         text = file_metadata.content
 
         # early stop, can happen if the there's nothing on a specific file
@@ -127,17 +147,29 @@ class LineChunker:
             logger.warning(f"File ({file_metadata}) has no content")
             return []
 
-        # Apply the appropriate chunking strategy
-        if strategy == ChunkingStrategy.DOCUMENTATION:
-            content_lines = self._chunk_by_sentences(text)
-        elif strategy == ChunkingStrategy.PROSE:
-            content_lines = self._chunk_by_characters(text)
-        elif strategy == ChunkingStrategy.CODE:
-            content_lines = self._chunk_by_lines(text, preserve_indentation=True)
-        else:  # STRUCTURED_DATA or LINE_BASED
-            content_lines = self._chunk_by_lines(text, preserve_indentation=False)
+        line_index = self.build_line_index(file_metadata, text)
+        return self.format_lines(
+            file_metadata,
+            line_index.chunks(text, start, end),
+            total_chunks=len(line_index),
+            start=start,
+            end=end,
+            add_metadata=add_metadata,
+            validate_range=validate_range,
+        )
 
-        total_chunks = len(content_lines)
+    def format_lines(
+        self,
+        file_metadata: FileMetadata,
+        content_lines: List[str],
+        total_chunks: int,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        add_metadata: bool = True,
+        validate_range: bool = False,
+    ) -> List[str]:
+        """Number the chunks [start:end] of a file, as read from its line index, and add the metadata header"""
+        strategy = self.determine_chunking_strategy(file_metadata)
         chunk_type = (
             "sentences" if strategy == ChunkingStrategy.DOCUMENTATION else "chunks" if strategy == ChunkingStrategy.PROSE else "lines"
         )
@@ -159,12 +191,7 @@ class LineChunker:
                     f"File {file_metadata.file_name} has only {total_chunks} lines, but requested range {start_display} to {end_display} extends beyond file bounds"
                 )
 
-        # Handle start/end slicing
-        if start is not None or end is not None:
-            content_lines = content_lines[start:end]
-            line_offset = start if start is not None else 0
-        else:
-            line_offset = 0
+        line_offset = start if start is not None else 0
 
         # Add line numbers for all strategies (1-indexed for user display)
         content_lines = [f"{i + line_offset + 1}: {line}" for i, line in enumerate(content_lines)]
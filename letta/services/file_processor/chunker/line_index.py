@@ -0,0 +1,69 @@
+import sys
+from array import array
+from typing import Iterable, List, Optional, Tuple
+
+from letta.services.file_processor.file_types import ChunkingStrategy
+
+# chunk spans are stored as pairs of little-endian uint32 character offsets into the file's text
+OFFSET_TYPECODE = "I"
+SPAN_SIZE = 2 * array(OFFSET_TYPECODE).itemsize
+
+# strategies whose chunks are their span of the text with whitespace collapsed, rather than the span itself
+WHITESPACE_NORMALIZING_STRATEGIES = (ChunkingStrategy.DOCUMENTATION, ChunkingStrategy.PROSE)
+
+
+class LineIndex:
+    """
+    Character spans of the chunks LineChunker splits a file's text into.
+
+    The index is built once when a file's content is stored, so reading a range of chunks (or every chunk, to grep them) slices
+    the text instead of re-chunking the whole document.
+    """
+
+    def __init__(self, strategy: ChunkingStrategy, offsets: Optional[array] = None):
+        self.strategy = strategy
+        self.offsets = offsets if offsets is not None else array(OFFSET_TYPECODE)
+
+    @classmethod
+    def from_spans(cls, strategy: ChunkingStrategy, spans: Iterable[Tuple[int, int]]) -> "LineIndex":
+        offsets = array(OFFSET_TYPECODE)
+        for start, end in spans:
+            offsets.append(start)
+            offsets.append(end)
+        return cls(strategy, offsets)
+
+    @classmethod
+    def from_bytes(cls, strategy: ChunkingStrategy, data: bytes) -> "LineIndex":
+        offsets = array(OFFSET_TYPECODE)
+        offsets.frombytes(data)
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        return cls(strategy, offsets)
+
+    def to_bytes(self) -> bytes:
+        if sys.byteorder == "big":
+            offsets = array(OFFSET_TYPECODE, self.offsets)
+            offsets.byteswap()
+            return offsets.tobytes()
+        return self.offsets.tobytes()
+
+    def __len__(self) -> int:
+        return len(self.offsets) // 2
+
+    def text_span(self) -> Tuple[int, int]:
+        """The span of the text covered by the indexed chunks."""
+        if not self.offsets:
+            return 0, 0
+        return self.offsets[0], self.offsets[-1]
+
+    def chunks(self, text: str, start: Optional[int] = None, end: Optional[int] = None, text_offset: int = 0) -> List[str]:
+        """
+        Chunks [start:end] (sliced like a list) of the indexed text. `text` may be only the part of the text starting at
+        `text_offset`, as long as it covers the spans of the requested chunks.
+        """
+        chunk_range = range(len(self))[start:end]
+        offsets = self.offsets[2 * chunk_range.start : 2 * chunk_range.stop]
+        spans = zip(offsets[::2], offsets[1::2])
+        if self.strategy in WHITESPACE_NORMALIZING_STRATEGIES:
+            return [" ".join(text[span_start - text_offset : span_end - text_offset].split()) for span_start, span_end in spans]
+        return [text[span_start - text_offset : span_end - text_offset] for span_start, span_end in spans]
@@ -147,7 +147,11 @@ class FileProcessor:
             file_metadata = await self.file_manager.update_file_status(
                 file_id=file_metadata.id, actor=self.actor, processing_status=FileProcessingStatus.EMBEDDING
             )
-            file_metadata = await self.file_manager.upsert_file_content(file_id=file_metadata.id, text=raw_markdown_text, actor=self.actor)
+            # index the lines open_files and grep_files read once here, rather than re-chunking the file on every tool call
+            line_index = self.line_chunker.build_line_index(file_metadata, raw_markdown_text)
+            file_metadata = await self.file_manager.upsert_file_content(
+                file_id=file_metadata.id, text=raw_markdown_text, actor=self.actor, line_index=line_index
+            )
 
             await server.insert_file_into_context_windows(
                 source_id=source_id,
@@ -14,6 +14,7 @@ from letta.schemas.letta_message import LettaMessage
 from letta.schemas.message import Message as PydanticMessage
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.services.message_blob_store import message_blob_store
 from letta.utils import enforce_types
 
 
@@ -248,7 +249,7 @@ class GroupManager:
             )
 
             messages = PydanticMessage.to_letta_messages_from_list(
-                messages=[msg.to_pydantic() for msg in messages],
+                messages=message_blob_store.load_images([msg.to_pydantic() for msg in messages]),
                 use_assistant_message=use_assistant_message,
                 assistant_message_tool_name=assistant_message_tool_name,
                 assistant_message_tool_kwarg=assistant_message_tool_kwarg,
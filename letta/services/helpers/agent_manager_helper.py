@@ -1,9 +1,10 @@
 import os
 from datetime import datetime
-from typing import List, Literal, Optional, Set
+from typing import Iterable, List, Literal, Optional, Set, Tuple
 
-import numpy as np
-from sqlalchemy import Select, and_, asc, desc, func, literal, nulls_last, or_, select, union_all
+from sqlalchemy import Select, TextClause, and_, asc, cast, desc, func, literal, literal_column, nulls_last, or_, select, text, union_all
+from sqlalchemy.orm import noload, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
 from sqlalchemy.sql.expression import exists
 
 from letta import system
@@ -14,8 +15,8 @@ from letta.constants import (
     DEPRECATED_LETTA_TOOLS,
     IN_CONTEXT_MEMORY_KEYWORD,
     LOCAL_ONLY_MULTI_AGENT_TOOLS,
-    MAX_EMBEDDING_DIM,
     MULTI_AGENT_TOOLS,
+    PGVECTOR_HNSW_INDEXED_DIMS,
     STRUCTURED_OUTPUT_MODELS,
 )
 from letta.embeddings import embedding_model
@@ -40,6 +41,32 @@ from letta.schemas.user import User
 from letta.settings import settings
 from letta.system import get_initial_boot_messages, get_login_event, package_function_response
 
+# Relationships behind each optional field of `AgentModel.to_pydantic_async`
+AGENT_RELATIONSHIP_FIELDS = {
+    "tags": [AgentModel.tags],
+    "tools": [AgentModel.tools],
+    "sources": [AgentModel.sources],
+    "memory": [AgentModel.core_memory, AgentModel.file_agents],
+    "identity_ids": [AgentModel.identities],
+    "multi_agent_group": [AgentModel.multi_agent_group],
+    "tool_exec_environment_variables": [AgentModel.tool_exec_environment_variables],
+}
+
+
+def agent_relationship_load_options(include_relationships: Optional[Iterable[str]] = None) -> List[ORMOption]:
+    """
+    Loader options that load exactly the relationships `to_pydantic_async` needs for `include_relationships` (all of
+    them if None). Every agent relationship is `lazy="selectin"`, and so are most relationships of the related rows
+    (e.g. the other agents sharing a block), so by default a single agent read fans out into dozens of queries.
+    """
+    include_relationships = set(AGENT_RELATIONSHIP_FIELDS if include_relationships is None else include_relationships)
+    options = [noload(AgentModel.groups), noload(AgentModel.batch_items)]
+    for field, relationships in AGENT_RELATIONSHIP_FIELDS.items():
+        for relationship in relationships:
+            # the related rows are only converted to pydantic, which never needs their own relationships
+            options.append(selectinload(relationship).noload("*") if field in include_relationships else noload(relationship))
+    return options
+
 
 # Static methods
 @trace_method
@@ -662,6 +689,52 @@ def _apply_filters(
     return query
 
 
+def _embed_passage_query(query_text: str, embedding_config: EmbeddingConfig) -> Tuple[List[float], int]:
+    """Embed a search query, returning the embedding at its native dimension and that dimension."""
+    embedded_text = list(embedding_model(embedding_config).get_text_embedding(query_text))
+    return embedded_text, len(embedded_text)
+
+
+def embedding_dimension_filter(embedding_column, native_dim: int):
+    """Restrict a pgvector search to embeddings of the query's dimension.
+
+    Embeddings are stored at their native dimension and pgvector can't compare vectors of different dimensions. The
+    dimension is inlined (not a bound parameter) so the planner can match the per-dimension partial HNSW indexes.
+    """
+    return func.vector_dims(embedding_column) == literal_column(str(native_dim))
+
+
+def hnsw_embedding_expression(embedding_column, native_dim: int):
+    """The expression the passage HNSW index for `native_dim` is built on.
+
+    Must stay in sync with the index definitions in alembic revision 8c1f4e2a9b7d, otherwise Postgres won't use the index.
+    """
+    from pgvector.sqlalchemy import Vector
+
+    return cast(embedding_column, Vector(native_dim))
+
+
+def pgvector_cosine_distance(embedding_column, embedded_text: List[float], native_dim: int):
+    """Cosine distance against `embedding_column`, routed through the HNSW index when there is one for `native_dim`.
+
+    Only valid alongside `embedding_dimension_filter`.
+    """
+    if settings.pg_vector_index_enabled and native_dim in PGVECTOR_HNSW_INDEXED_DIMS:
+        return hnsw_embedding_expression(embedding_column, native_dim).cosine_distance(embedded_text)
+    return embedding_column.cosine_distance(embedded_text)
+
+
+def build_hnsw_search_settings(limit: Optional[int] = None) -> Optional[TextClause]:
+    """Statement tuning `hnsw.ef_search` for the current transaction, or None when not searching through the HNSW index.
+
+    ef_search bounds how many candidates an HNSW scan returns, so it has to be at least the requested limit.
+    """
+    if not settings.letta_pg_uri_no_default or not settings.pg_vector_index_enabled:
+        return None
+    ef_search = min(max(settings.pg_hnsw_ef_search, limit or 0), 1000)
+    return text(f"SET LOCAL hnsw.ef_search = {ef_search}")
+
+
 def build_passage_query(
     actor: User,
     agent_id: Optional[str] = None,
@@ -676,19 +749,20 @@ def build_passage_query(
     ascending: bool = True,
     embedding_config: Optional[EmbeddingConfig] = None,
     agent_only: bool = False,
+    limit: Optional[int] = None,
 ) -> Select:
     """Helper function to build the base passage query with all filters applied.
     Supports both before and after pagination across merged source and agent passages.
 
-    Returns the query before any limit or count operations are applied.
+    Returns the query before any limit or count operations are applied. For vector search on Postgres, passing `limit`
+    lets each passage table run its own index-backed top-k scan; the merged candidates are then re-ranked exactly.
     """
     embedded_text = None
+    native_dim = None
     if embed_query:
         assert embedding_config is not None, "embedding_config must be specified for vector search"
         assert query_text is not None, "query_text must be specified for vector search"
-        embedded_text = embedding_model(embedding_config).get_text_embedding(query_text)
-        embedded_text = np.array(embedded_text)
-        embedded_text = np.pad(embedded_text, (0, MAX_EMBEDDING_DIM - embedded_text.shape[0]), mode="constant").tolist()
+        embedded_text, native_dim = _embed_passage_query(query_text, embedding_config)
 
     # Start with base query for source passages
     source_passages = None
@@ -739,6 +813,10 @@ def build_passage_query(
             source_passages = source_passages.where(SourcePassage.source_id == source_id)
         if file_id:
             source_passages = source_passages.where(SourcePassage.file_id == file_id)
+        if start_date:
+            source_passages = source_passages.where(SourcePassage.created_at >= start_date)
+        if end_date:
+            source_passages = source_passages.where(SourcePassage.created_at <= end_date)
 
     # Add agent passages query
     agent_passages = None
@@ -764,6 +842,33 @@ def build_passage_query(
             .where(AgentPassage.agent_id == agent_id)
             .where(AgentPassage.organization_id == actor.organization_id)
         )
+        if start_date:
+            agent_passages = agent_passages.where(AgentPassage.created_at >= start_date)
+        if end_date:
+            agent_passages = agent_passages.where(AgentPassage.created_at <= end_date)
+
+    # pgvector only compares embeddings of the query's dimension
+    if embedded_text and settings.letta_pg_uri_no_default:
+        if source_passages is not None:
+            source_passages = source_passages.where(embedding_dimension_filter(SourcePassage.embedding, native_dim))
+        if agent_passages is not None:
+            agent_passages = agent_passages.where(embedding_dimension_filter(AgentPassage.embedding, native_dim))
+
+    # Sorting the union of both tables by distance can't use either table's vector index, so on Postgres
+    # take an index-backed top-k from each table first and only merge those candidates
+    if embedded_text and settings.letta_pg_uri_no_default and limit and not (before or after):
+        if source_passages is not None:
+            source_passages = select(
+                source_passages.order_by(pgvector_cosine_distance(SourcePassage.embedding, embedded_text, native_dim).asc())
+                .limit(limit)
+                .subquery()
+            )
+        if agent_passages is not None:
+            agent_passages = select(
+                agent_passages.order_by(pgvector_cosine_distance(AgentPassage.embedding, embedded_text, native_dim).asc())
+                .limit(limit)
+                .subquery()
+            )
 
     # Combine queries
     if source_passages is not None and agent_passages is not None:
@@ -779,10 +884,6 @@ def build_passage_query(
     main_query = select(combined_query)
 
     # Apply filters
-    if start_date:
-        main_query = main_query.where(combined_query.c.created_at >= start_date)
-    if end_date:
-        main_query = main_query.where(combined_query.c.created_at <= end_date)
     if source_id:
         main_query = main_query.where(combined_query.c.source_id == source_id)
     if file_id:
@@ -791,7 +892,7 @@ def build_passage_query(
     # Vector search
     if embedded_text:
         if settings.letta_pg_uri_no_default:
-            # PostgreSQL with pgvector
+            # PostgreSQL with pgvector; exact distance over the merged candidates
             main_query = main_query.order_by(combined_query.c.embedding.cosine_distance(embedded_text).asc())
         else:
             # SQLite with custom vector type
@@ -890,12 +991,11 @@ def build_source_passage_query(
 
     # Handle embedding for vector search
     embedded_text = None
+    native_dim = None
     if embed_query:
         assert embedding_config is not None, "embedding_config must be specified for vector search"
         assert query_text is not None, "query_text must be specified for vector search"
-        embedded_text = embedding_model(embedding_config).get_text_embedding(query_text)
-        embedded_text = np.array(embedded_text)
-        embedded_text = np.pad(embedded_text, (0, MAX_EMBEDDING_DIM - embedded_text.shape[0]), mode="constant").tolist()
+        embedded_text, native_dim = _embed_passage_query(query_text, embedding_config)
 
     # Base query for source passages
     query = select(SourcePassage).where(SourcePassage.organization_id == actor.organization_id)
@@ -919,7 +1019,8 @@ def build_source_passage_query(
     if embedded_text:
         if settings.letta_pg_uri_no_default:
             # PostgreSQL with pgvector
-            query = query.order_by(SourcePassage.embedding.cosine_distance(embedded_text).asc())
+            query = query.where(embedding_dimension_filter(SourcePassage.embedding, native_dim))
+            query = query.order_by(pgvector_cosine_distance(SourcePassage.embedding, embedded_text, native_dim).asc())
         else:
             # SQLite with custom vector type
             query_embedding_binary = adapt_array(embedded_text)
@@ -986,12 +1087,11 @@ def build_agent_passage_query(
 
     # Handle embedding for vector search
     embedded_text = None
+    native_dim = None
     if embed_query:
         assert embedding_config is not None, "embedding_config must be specified for vector search"
         assert query_text is not None, "query_text must be specified for vector search"
-        embedded_text = embedding_model(embedding_config).get_text_embedding(query_text)
-        embedded_text = np.array(embedded_text)
-        embedded_text = np.pad(embedded_text, (0, MAX_EMBEDDING_DIM - embedded_text.shape[0]), mode="constant").tolist()
+        embedded_text, native_dim = _embed_passage_query(query_text, embedding_config)
 
     # Base query for agent passages
     query = select(AgentPassage).where(AgentPassage.agent_id == agent_id, AgentPassage.organization_id == actor.organization_id)
@@ -1006,7 +1106,8 @@ def build_agent_passage_query(
     if embedded_text:
         if settings.letta_pg_uri_no_default:
             # PostgreSQL with pgvector
-            query = query.order_by(AgentPassage.embedding.cosine_distance(embedded_text).asc())
+            query = query.where(embedding_dimension_filter(AgentPassage.embedding, native_dim))
+            query = query.order_by(pgvector_cosine_distance(AgentPassage.embedding, embedded_text, native_dim).asc())
         else:
             # SQLite with custom vector type
             query_embedding_binary = adapt_array(embedded_text)
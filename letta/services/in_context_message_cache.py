@@ -0,0 +1,170 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from letta.constants import REDIS_IN_CONTEXT_MESSAGES_VERSION_PREFIX
+from letta.data_sources.redis_client import get_redis_client
+from letta.helpers.decorators import CacheStats
+from letta.log import get_logger
+from letta.schemas.message import Message as PydanticMessage
+from letta.settings import settings
+from letta.utils import safe_create_task
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _AgentMessages:
+    messages: Dict[str, PydanticMessage] = field(default_factory=dict)
+    # the agent's version stamp in redis when the messages were read (None without redis)
+    version: Optional[str] = None
+
+
+class InContextMessageCache:
+    """
+    Per-process LRU cache of agents' hydrated in-context messages, keyed by agent id.
+
+    The agent's `message_ids` decide which messages are in context, so entries never need to be invalidated when the
+    context window changes: unknown ids are read from the database, and messages that dropped out are pruned whenever
+    the agent's context is set.
+    Only edits of messages already in the cache make entries stale. They bump a per-agent version stamp in redis, which
+    is checked on every read so that the other processes drop their copy. Without redis, the stamps only cover edits made
+    by this process.
+
+    Messages are handed out as copies, so callers may reassign their fields without affecting the cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._agents: "OrderedDict[str, _AgentMessages]" = OrderedDict()
+        self.stats = CacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.in_context_message_cache_size > 0
+
+    async def get(self, agent_id: str, message_ids: List[str]) -> Tuple[Dict[str, PydanticMessage], Optional[str]]:
+        """
+        The cached messages among `message_ids`, and the agent's current version stamp to `put` the missing ones with.
+        """
+        if not self.enabled:
+            return {}, None
+        version = await self._get_version(agent_id)
+        with self._lock:
+            entry = self._agents.get(agent_id)
+            if entry is not None and entry.version != version:
+                self.stats.invalidations += 1
+                entry = None
+                del self._agents[agent_id]
+            if entry is None:
+                self.stats.misses += 1
+                return {}, version
+
+            self._agents.move_to_end(agent_id)
+            cached_messages = {
+                message_id: entry.messages[message_id].model_copy() for message_id in message_ids if message_id in entry.messages
+            }
+            if len(cached_messages) == len(set(message_ids)):
+                self.stats.hits += 1
+            else:
+                self.stats.misses += 1
+            return cached_messages, version
+
+    def put(self, agent_id: str, messages: Iterable[PydanticMessage], version: Optional[str]):
+        """Add messages read from the database at `version` (as returned by `get`)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            entry = self._agents.get(agent_id)
+            if entry is None or entry.version != version:
+                entry = self._agents[agent_id] = _AgentMessages(version=version)
+            self._agents.move_to_end(agent_id)
+            entry.messages.update((message.id, message.model_copy()) for message in messages)
+            while len(self._agents) > settings.in_context_message_cache_size:
+                self._agents.popitem(last=False)
+
+    def add_created(self, messages: Iterable[PydanticMessage]):
+        """Write through newly created messages for the agents that are cached, they are usually added to the context next."""
+        self.update_local(messages)
+
+    def update_local(self, messages: Iterable[PydanticMessage]):
+        """Write through messages for the agents that are cached, without making the other processes drop their copies."""
+        with self._lock:
+            for message in messages:
+                entry = self._agents.get(message.agent_id)
+                if entry is not None:
+                    entry.messages[message.id] = message.model_copy()
+
+    async def update(self, message: PydanticMessage):
+        """Write through an edited message, and make the other processes drop their copy of its agent's messages."""
+        if message.agent_id is None:
+            return
+        version = await self._bump_version(message.agent_id)
+        with self._lock:
+            entry = self._agents.get(message.agent_id)
+            if entry is not None:
+                entry.messages[message.id] = message.model_copy()
+                entry.version = version
+
+    def update_from_sync(self, message: PydanticMessage):
+        """`update` for the sync code paths: drops the local copy and bumps the version stamp once the event loop gets to it."""
+        if message.agent_id is None:
+            return
+        self.invalidate_local(message.agent_id)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            logger.debug(f"No event loop to bump the in-context message version of agent {message.agent_id} in")
+            return
+        safe_create_task(
+            self._bump_version(message.agent_id), logger=logger, label=f"bump in-context message version of {message.agent_id}"
+        )
+
+    async def invalidate(self, agent_id: str):
+        """Drop the agent's messages in this and every other process."""
+        self.invalidate_local(agent_id)
+        await self._bump_version(agent_id)
+
+    def invalidate_local(self, agent_id: str):
+        with self._lock:
+            if self._agents.pop(agent_id, None) is not None:
+                self.stats.invalidations += 1
+
+    def retain(self, agent_id: str, message_ids: List[str]):
+        """Prune the agent's entry to its new context window."""
+        with self._lock:
+            entry = self._agents.get(agent_id)
+            if entry is not None:
+                entry.messages = {message_id: entry.messages[message_id] for message_id in message_ids if message_id in entry.messages}
+
+    def clear(self):
+        with self._lock:
+            self._agents.clear()
+
+    @staticmethod
+    def _version_key(agent_id: str) -> str:
+        return f"{REDIS_IN_CONTEXT_MESSAGES_VERSION_PREFIX}:{agent_id}"
+
+    async def _get_version(self, agent_id: str) -> Optional[str]:
+        try:
+            redis_client = await get_redis_client()
+            version = await redis_client.get(self._version_key(agent_id))
+        except Exception as e:
+            logger.warning(f"Failed to read in-context message version of agent {agent_id}: {e}")
+            return None
+        return None if version is None else str(version)
+
+    async def _bump_version(self, agent_id: str) -> Optional[str]:
+        try:
+            redis_client = await get_redis_client()
+            version = await redis_client.incr(self._version_key(agent_id))
+        except Exception as e:
+            logger.warning(f"Failed to bump in-context message version of agent {agent_id}: {e}")
+            # without the bump, the other processes can't tell their copy is stale; reading the stamp again keeps ours in sync
+            return await self._get_version(agent_id)
+        return str(version) if version else None
+
+
+in_context_message_cache = InContextMessageCache()
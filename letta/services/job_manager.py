@@ -27,6 +27,7 @@ from letta.schemas.step import Step as PydanticStep
 from letta.schemas.usage import LettaUsageStatistics
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.services.message_blob_store import message_blob_store
 from letta.utils import enforce_types
 
 logger = get_logger(__name__)
@@ -545,6 +546,7 @@ class JobManager:
         )
 
         request_config = self._get_run_request_config(run_id)
+        messages = message_blob_store.load_images(messages)
         print("request_config", request_config)
 
         messages = PydanticMessage.to_letta_messages_from_list(
@@ -602,6 +604,7 @@ class JobManager:
         )
 
         request_config = self._get_run_request_config(run_id)
+        messages = message_blob_store.load_images(messages)
 
         messages = PydanticMessage.to_letta_messages_from_list(
             messages=messages,
@@ -0,0 +1,332 @@
+import asyncio
+import base64
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from letta.constants import LETTA_DIR
+from letta.log import get_logger
+from letta.schemas.letta_message_content import ImageContent, ImageSourceType, LettaImage
+from letta.schemas.message import Message
+from letta.settings import settings
+
+logger = get_logger(__name__)
+
+BLOB_ID_PREFIX = "blob-"
+
+
+def blob_id_for(data: bytes) -> str:
+    """The content address of `data`, identical bytes always get the same id."""
+    return f"{BLOB_ID_PREFIX}{hashlib.sha256(data).hexdigest()}"
+
+
+def is_blob_id(file_id: Optional[str]) -> bool:
+    return file_id is not None and file_id.startswith(BLOB_ID_PREFIX)
+
+
+class FilesystemBlobBackend:
+    """Stores each blob in a file named by its hash, fanned out over subdirectories by the first two hex digits."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, blob_id: str) -> Path:
+        digest = blob_id[len(BLOB_ID_PREFIX) :]
+        return self.root / digest[:2] / digest
+
+    def put_many(self, blobs: Dict[str, bytes]) -> None:
+        for blob_id, data in blobs.items():
+            path = self._path(blob_id)
+            if path.exists():
+                continue  # content-addressed, so the stored bytes are already the same
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # write to a temporary file first, so concurrent readers never see a partially written blob
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+    def get_many(self, blob_ids: Iterable[str]) -> Dict[str, bytes]:
+        blobs = {}
+        for blob_id in blob_ids:
+            try:
+                blobs[blob_id] = self._path(blob_id).read_bytes()
+            except FileNotFoundError:
+                pass
+        return blobs
+
+    async def put_many_async(self, blobs: Dict[str, bytes]) -> None:
+        await asyncio.to_thread(self.put_many, blobs)
+
+    async def get_many_async(self, blob_ids: Iterable[str]) -> Dict[str, bytes]:
+        return await asyncio.to_thread(self.get_many, list(blob_ids))
+
+
+class DatabaseBlobBackend:
+    """Stores blobs in the message_blobs table, for deployments without a (shared) writable blob directory."""
+
+    @staticmethod
+    def _insert_statement(session, blobs: Dict[str, bytes]):
+        from sqlalchemy import insert
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        from letta.orm.message_blob import MessageBlob
+
+        rows = [{"id": blob_id, "data": data, "size": len(data)} for blob_id, data in blobs.items()]
+        if session.bind.dialect.name == "postgresql":
+            return pg_insert(MessageBlob).values(rows).on_conflict_do_nothing()
+        return insert(MessageBlob).values(rows).prefix_with("OR IGNORE")
+
+    @staticmethod
+    def _select_statement(blob_ids: List[str]):
+        from sqlalchemy import select
+
+        from letta.orm.message_blob import MessageBlob
+
+        return select(MessageBlob.id, MessageBlob.data).where(MessageBlob.id.in_(blob_ids))
+
+    def put_many(self, blobs: Dict[str, bytes]) -> None:
+        from letta.server.db import db_registry
+
+        if not blobs:
+            return
+        with db_registry.session() as session:
+            session.execute(self._insert_statement(session, blobs))
+            session.commit()
+
+    def get_many(self, blob_ids: Iterable[str]) -> Dict[str, bytes]:
+        from letta.server.db import db_registry
+
+        blob_ids = list(blob_ids)
+        if not blob_ids:
+            return {}
+        with db_registry.session() as session:
+            return {blob_id: data for blob_id, data in session.execute(self._select_statement(blob_ids))}
+
+    async def put_many_async(self, blobs: Dict[str, bytes]) -> None:
+        from letta.server.db import db_registry
+
+        if not blobs:
+            return
+        async with db_registry.async_session() as session:
+            await session.execute(self._insert_statement(session, blobs))
+            await session.commit()
+
+    async def get_many_async(self, blob_ids: Iterable[str]) -> Dict[str, bytes]:
+        from letta.server.db import db_registry
+
+        blob_ids = list(blob_ids)
+        if not blob_ids:
+            return {}
+        async with db_registry.async_session() as session:
+            return {blob_id: data for blob_id, data in await session.execute(self._select_statement(blob_ids))}
+
+
+class MessageBlobStore:
+    """
+    Content-addressed store for the bytes of message attachments.
+
+    Base64 images are moved out of the message `content` column when messages are created: the row keeps a `LettaImage`
+    whose `file_id` is the hash of the bytes, and the bytes go to the filesystem or to the database (see
+    `settings.message_blob_storage`). Identical images are stored once. Blobs missing from the filesystem are looked up in
+    the database before giving up.
+    The bytes are only read back when a provider request is built, messages are returned by the API or an agent is
+    exported (`load_images_async`, before the messages are serialized), through a per-process LRU cache of the base64
+    data, so loading messages (and caching them in the in-context message cache) no longer carries them around.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_size = 0
+        self._backend = None
+        self._backend_config = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self):
+        config = (settings.message_blob_storage, settings.message_blob_dir, settings.letta_dir, settings.letta_pg_uri_no_default)
+        if self._backend is None or self._backend_config != config:
+            self._backend = self._create_backend()
+            self._backend_config = config
+        return self._backend
+
+    @staticmethod
+    def _create_backend():
+        # replicas of a Postgres deployment don't share a filesystem, but they do share the database
+        storage = settings.message_blob_storage or ("database" if settings.letta_pg_uri_no_default else "filesystem")
+        if storage == "filesystem":
+            root = settings.message_blob_dir or Path(settings.letta_dir or LETTA_DIR) / "message_blobs"
+            try:
+                return FilesystemBlobBackend(root)
+            except OSError as e:
+                logger.warning(f"Message blob directory {root} is not writable ({e}), storing message attachments in the database")
+        return DatabaseBlobBackend()
+
+    def offload_images(self, messages: Iterable) -> Dict[str, bytes]:
+        """
+        Replace the base64 images in `messages` with references to their hash, in place.
+        Returns the bytes to store, which must be written (`put_many`) before the messages.
+        """
+        blobs = {}
+        for message in messages:
+            if not isinstance(message.content, list):
+                continue
+            for content in message.content:
+                if not isinstance(content, ImageContent) or content.source.type not in (ImageSourceType.base64, ImageSourceType.letta):
+                    continue
+                if content.source.data is None:
+                    continue  # already a reference
+                data = base64.b64decode(content.source.data)
+                blob_id = blob_id_for(data)
+                blobs[blob_id] = data
+                # the image is likely part of the next request, so keep its base64 data around
+                self._cache_put(blob_id, content.source.data)
+                content.source = LettaImage(file_id=blob_id, media_type=content.source.media_type, detail=content.source.detail)
+        return blobs
+
+    def put_many(self, blobs: Dict[str, bytes]) -> None:
+        if blobs:
+            self.backend.put_many(blobs)
+
+    async def put_many_async(self, blobs: Dict[str, bytes]) -> None:
+        if blobs:
+            await self.backend.put_many_async(blobs)
+
+    def load_images(self, messages: List[Message]) -> List[Message]:
+        """
+        `messages` with the data of the images they reference filled in, for building a provider request or returning
+        them. Messages that reference no stored image are returned as is, the others are copied so that cached messages
+        don't hold the bytes.
+        """
+        blob_ids = self._referenced_blob_ids(messages)
+        if not blob_ids:
+            return list(messages)
+        images = self._cached_images(blob_ids)
+        missing = blob_ids - images.keys()
+        if missing:
+            images.update(self._cache_blobs(self._read_blobs(missing)))
+        return self._with_image_data(messages, images)
+
+    async def load_images_async(self, messages: List[Message]) -> List[Message]:
+        """Async version of `load_images`, reading the images that aren't cached in one read off the event loop."""
+        blob_ids = self._referenced_blob_ids(messages)
+        if not blob_ids:
+            return list(messages)
+        images = self._cached_images(blob_ids)
+        missing = blob_ids - images.keys()
+        if missing:
+            images.update(self._cache_blobs(await self._read_blobs_async(missing)))
+        return self._with_image_data(messages, images)
+
+    @staticmethod
+    def _referenced_image(content) -> Optional[str]:
+        """The blob id of an image content that references the store rather than carrying its data."""
+        if isinstance(content, ImageContent) and getattr(content.source, "data", None) is None and is_blob_id(content.source.file_id):
+            return content.source.file_id
+        return None
+
+    def _referenced_blob_ids(self, messages: Iterable[Message]) -> Set[str]:
+        blob_ids = set()
+        for message in messages:
+            if isinstance(message.content, list):
+                blob_ids.update(filter(None, map(self._referenced_image, message.content)))
+        return blob_ids
+
+    def _with_image_data(self, messages: Iterable[Message], images: Dict[str, str]) -> List[Message]:
+        loaded = []
+        for message in messages:
+            if isinstance(message.content, list) and any(map(self._referenced_image, message.content)):
+                content = [
+                    (
+                        c.model_copy(update={"source": c.source.model_copy(update={"data": images[blob_id]})})
+                        if (blob_id := self._referenced_image(c))
+                        else c
+                    )
+                    for c in message.content
+                ]
+                message = message.model_copy(update={"content": content})
+            loaded.append(message)
+        return loaded
+
+    def _cached_images(self, blob_ids: Set[str]) -> Dict[str, str]:
+        images = {}
+        for blob_id in blob_ids:
+            data = self._cache_get(blob_id)
+            if data is not None:
+                images[blob_id] = data
+        with self._lock:
+            self.hits += len(images)
+            self.misses += len(blob_ids) - len(images)
+        return images
+
+    def _cache_blobs(self, blobs: Dict[str, bytes]) -> Dict[str, str]:
+        images = {}
+        for blob_id, blob in blobs.items():
+            images[blob_id] = base64.b64encode(blob).decode("utf-8")
+            self._cache_put(blob_id, images[blob_id])
+        return images
+
+    def _read_blobs(self, blob_ids: Iterable[str]) -> Dict[str, bytes]:
+        blob_ids = set(blob_ids)
+        backend = self.backend
+        blobs = backend.get_many(blob_ids)
+        if len(blobs) < len(blob_ids) and not isinstance(backend, DatabaseBlobBackend):
+            # written by a process that stored them in the database, e.g. one without a writable blob directory
+            blobs.update(DatabaseBlobBackend().get_many(blob_ids - blobs.keys()))
+        return self._check_found(blob_ids, blobs)
+
+    async def _read_blobs_async(self, blob_ids: Iterable[str]) -> Dict[str, bytes]:
+        blob_ids = set(blob_ids)
+        backend = self.backend
+        blobs = await backend.get_many_async(blob_ids)
+        if len(blobs) < len(blob_ids) and not isinstance(backend, DatabaseBlobBackend):
+            # written by a process that stored them in the database, e.g. one without a writable blob directory
+            blobs.update(await DatabaseBlobBackend().get_many_async(blob_ids - blobs.keys()))
+        return self._check_found(blob_ids, blobs)
+
+    @staticmethod
+    def _check_found(blob_ids: Set[str], blobs: Dict[str, bytes]) -> Dict[str, bytes]:
+        missing = blob_ids - blobs.keys()
+        if missing:
+            raise ValueError(f"Images {', '.join(sorted(missing))} not found in the message attachment store")
+        return blobs
+
+    def _cache_get(self, blob_id: str) -> Optional[str]:
+        with self._lock:
+            data = self._cache.get(blob_id)
+            if data is not None:
+                self._cache.move_to_end(blob_id)
+            return data
+
+    def _cache_put(self, blob_id: str, data: str) -> None:
+        max_size = settings.message_blob_cache_size_bytes
+        if len(data) > max_size:
+            return
+        with self._lock:
+            if blob_id in self._cache:
+                self._cache.move_to_end(blob_id)
+                return
+            self._cache[blob_id] = data
+            self._cache_size += len(data)
+            while self._cache_size > max_size:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_size -= len(evicted)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._cache_size = 0
+
+
+message_blob_store = MessageBlobStore()
@@ -1,8 +1,7 @@
 import json
-import uuid
 from typing import List, Optional, Sequence
 
-from sqlalchemy import delete, exists, func, select, text
+from sqlalchemy import delete, exists, func, select, text, update
 
 from letta.log import get_logger
 from letta.orm.agent import Agent as AgentModel
@@ -11,12 +10,13 @@ from letta.orm.message import Message as MessageModel
 from letta.otel.tracing import trace_method
 from letta.schemas.enums import MessageRole
 from letta.schemas.letta_message import LettaMessageUpdateUnion
-from letta.schemas.letta_message_content import ImageSourceType, LettaImage, MessageContentType
 from letta.schemas.message import Message as PydanticMessage
 from letta.schemas.message import MessageUpdate
 from letta.schemas.user import User as PydanticUser
-from letta.server.db import db_registry
+from letta.server.db import db_registry, run_after_commit
 from letta.services.file_manager import FileManager
+from letta.services.in_context_message_cache import in_context_message_cache
+from letta.services.message_blob_store import message_blob_store
 from letta.utils import enforce_types
 
 logger = get_logger(__name__)
@@ -67,6 +67,21 @@ class MessageManager:
             results = await MessageModel.read_multiple_async(db_session=session, identifiers=message_ids, actor=actor)
             return self._get_messages_by_id_postprocess(results, message_ids)
 
+    @enforce_types
+    @trace_method
+    async def get_in_context_messages_async(self, agent_id: str, message_ids: List[str], actor: PydanticUser) -> List[PydanticMessage]:
+        """
+        Fetch an agent's in-context messages by ID, in the requested order.
+        Same as `get_messages_by_ids_async`, but served from the in-context message cache where possible.
+        """
+        cached_messages, version = await in_context_message_cache.get(agent_id=agent_id, message_ids=message_ids)
+        missing_ids = [message_id for message_id in message_ids if message_id not in cached_messages]
+        if missing_ids:
+            fetched_messages = await self.get_messages_by_ids_async(message_ids=missing_ids, actor=actor)
+            in_context_message_cache.put(agent_id=agent_id, messages=fetched_messages, version=version)
+            cached_messages.update((message.id, message) for message in fetched_messages)
+        return [cached_messages[message_id] for message_id in message_ids if message_id in cached_messages]
+
     def _get_messages_by_id_postprocess(
         self,
         results: List[MessageModel],
@@ -84,6 +99,7 @@ class MessageManager:
     @trace_method
     def create_message(self, pydantic_msg: PydanticMessage, actor: PydanticUser) -> PydanticMessage:
         """Create a new message."""
+        message_blob_store.put_many(message_blob_store.offload_images([pydantic_msg]))
         with db_registry.session() as session:
             # Set the organization id of the Pydantic message
             pydantic_msg.organization_id = actor.organization_id
@@ -117,10 +133,13 @@ class MessageManager:
         if not pydantic_msgs:
             return []
 
+        message_blob_store.put_many(message_blob_store.offload_images(pydantic_msgs))
         orm_messages = self._create_many_preprocess(pydantic_msgs, actor)
         with db_registry.session() as session:
             created_messages = MessageModel.batch_create(orm_messages, session, actor=actor)
-            return [msg.to_pydantic() for msg in created_messages]
+            created_pydantic_messages = [msg.to_pydantic() for msg in created_messages]
+        in_context_message_cache.add_created(created_pydantic_messages)
+        return created_pydantic_messages
 
     @enforce_types
     @trace_method
@@ -138,35 +157,15 @@ class MessageManager:
         if not pydantic_msgs:
             return []
 
-        for message in pydantic_msgs:
-            if isinstance(message.content, list):
-                for content in message.content:
-                    if content.type == MessageContentType.image and content.source.type == ImageSourceType.base64:
-                        # TODO: actually persist image files in db
-                        # file = await self.file_manager.create_file( # TODO: use batch create to prevent multiple db round trips
-                        #     db_session=session,
-                        #     image_create=FileMetadata(
-                        #         user_id=actor.id, # TODO: add field
-                        #         source_id= '' # TODO: make optional
-                        #         organization_id=actor.organization_id,
-                        #         file_type=content.source.media_type,
-                        #         processing_status=FileProcessingStatus.COMPLETED,
-                        #         content= '' # TODO: should content be added here or in top level text field?
-                        #     ),
-                        #     actor=actor,
-                        #     text=content.source.data,
-                        # )
-                        file_id_placeholder = "file-" + str(uuid.uuid4())
-                        content.source = LettaImage(
-                            file_id=file_id_placeholder,
-                            data=content.source.data,
-                            media_type=content.source.media_type,
-                            detail=content.source.detail,
-                        )
+        # move image bytes out of the message rows, the blobs are written first so rows never reference missing ones
+        await message_blob_store.put_many_async(message_blob_store.offload_images(pydantic_msgs))
         orm_messages = self._create_many_preprocess(pydantic_msgs, actor)
         async with db_registry.async_session() as session:
             created_messages = await MessageModel.batch_create_async(orm_messages, session, actor=actor)
-            return [msg.to_pydantic() for msg in created_messages]
+            created_pydantic_messages = [msg.to_pydantic() for msg in created_messages]
+        # the messages only exist once the unit of work they were created in (if any) commits
+        run_after_commit(lambda: in_context_message_cache.add_created(created_pydantic_messages))
+        return created_pydantic_messages
 
     @enforce_types
     @trace_method
@@ -262,7 +261,9 @@ class MessageManager:
 
             message = self._update_message_by_id_impl(message_id, message_update, actor, message)
             message.update(db_session=session, actor=actor)
-            return message.to_pydantic()
+            updated_message = message.to_pydantic()
+        in_context_message_cache.update_from_sync(updated_message)
+        return updated_message
 
     @enforce_types
     @trace_method
@@ -281,7 +282,9 @@ class MessageManager:
 
             message = self._update_message_by_id_impl(message_id, message_update, actor, message)
             await message.update_async(db_session=session, actor=actor)
-            return message.to_pydantic()
+            updated_message = message.to_pydantic()
+        await in_context_message_cache.update(updated_message)
+        return updated_message
 
     def _update_message_by_id_impl(
         self, message_id: str, message_update: MessageUpdate, actor: PydanticUser, message: MessageModel
@@ -306,8 +309,30 @@ class MessageManager:
 
         for key, value in update_data.items():
             setattr(message, key, value)
+        # the stored token counts are of the previous version of the message
+        if update_data:
+            message.token_counts = None
         return message
 
+    @enforce_types
+    @trace_method
+    async def update_token_counts_async(self, messages: List[PydanticMessage], actor: PydanticUser) -> None:
+        """
+        Persist the `token_counts` of messages that were just counted, so they are only tokenized once.
+        The counts are derived from the messages, so the in-context message cache is written through without making the
+        other processes drop their copies: at worst they count the messages again.
+        """
+        if not messages:
+            return
+        async with db_registry.async_session() as session:
+            await session.execute(
+                update(MessageModel).where(MessageModel.organization_id == actor.organization_id),
+                [{"id": message.id, "token_counts": message.token_counts} for message in messages],
+                execution_options={"synchronize_session": None},
+            )
+            await session.commit()
+        in_context_message_cache.update_local(messages)
+
     @enforce_types
     @trace_method
     def delete_message_by_id(self, message_id: str, actor: PydanticUser) -> bool:
@@ -320,6 +345,7 @@ class MessageManager:
                     actor=actor,
                 )
                 msg.hard_delete(session, actor=actor)
+                in_context_message_cache.invalidate_local(msg.agent_id)
             except NoResultFound:
                 raise ValueError(f"Message with id {message_id} not found.")
 
@@ -627,8 +653,10 @@ class MessageManager:
             # 4) commit once
             await session.commit()
 
-            # 5) return the number of rows deleted
-            return result.rowcount
+        await in_context_message_cache.invalidate(agent_id)
+
+        # 5) return the number of rows deleted
+        return result.rowcount
 
     @enforce_types
     @trace_method
@@ -3,20 +3,24 @@ from datetime import datetime, timezone
 from functools import lru_cache
 from typing import List, Optional
 
-from openai import AsyncOpenAI, OpenAI
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 
 from letta.constants import MAX_EMBEDDING_DIM
 from letta.embeddings import embedding_model, parse_and_chunk_text
 from letta.helpers.decorators import async_redis_cache
+from letta.llm_api.http_client_registry import llm_http_client_registry
 from letta.orm.errors import NoResultFound
 from letta.orm.passage import AgentPassage, SourcePassage
+from letta.orm.sqlalchemy_base import AccessType
 from letta.otel.tracing import trace_method
 from letta.schemas.agent import AgentState
 from letta.schemas.file import FileMetadata as PydanticFileMetadata
 from letta.schemas.passage import Passage as PydanticPassage
+from letta.schemas.passage import unpad_embedding
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.services.vector_index.sqlite_vector_index import sqlite_vector_index
+from letta.settings import settings
 from letta.utils import enforce_types
 
 
@@ -25,7 +29,7 @@ from letta.utils import enforce_types
 def get_openai_embedding(text: str, model: str, endpoint: str) -> List[float]:
     from letta.settings import model_settings
 
-    client = OpenAI(api_key=model_settings.openai_api_key, base_url=endpoint, max_retries=0)
+    client = llm_http_client_registry.get_openai_client(api_key=model_settings.openai_api_key, base_url=endpoint, max_retries=0)
     response = client.embeddings.create(input=text, model=model)
     return response.data[0].embedding
 
@@ -34,7 +38,7 @@ def get_openai_embedding(text: str, model: str, endpoint: str) -> List[float]:
 async def get_openai_embedding_async(text: str, model: str, endpoint: str) -> list[float]:
     from letta.settings import model_settings
 
-    client = AsyncOpenAI(api_key=model_settings.openai_api_key, base_url=endpoint, max_retries=0)
+    client = llm_http_client_registry.get_async_openai_client(api_key=model_settings.openai_api_key, base_url=endpoint, max_retries=0)
     response = await client.embeddings.create(input=text, model=model)
     return response.data[0].embedding
 
@@ -164,7 +168,9 @@ class PassageManager:
 
         with db_registry.session() as session:
             passage.create(session, actor=actor)
-            return passage.to_pydantic()
+            pydantic_passage = passage.to_pydantic()
+            sqlite_vector_index.upsert_passages([pydantic_passage])
+            return pydantic_passage
 
     @enforce_types
     @trace_method
@@ -191,7 +197,9 @@ class PassageManager:
 
         async with db_registry.async_session() as session:
             passage = await passage.create_async(session, actor=actor)
-            return passage.to_pydantic()
+            pydantic_passage = passage.to_pydantic()
+            sqlite_vector_index.upsert_passages([pydantic_passage])
+            return pydantic_passage
 
     @enforce_types
     @trace_method
@@ -224,7 +232,9 @@ class PassageManager:
 
         with db_registry.session() as session:
             passage.create(session, actor=actor)
-            return passage.to_pydantic()
+            pydantic_passage = passage.to_pydantic()
+            sqlite_vector_index.upsert_passages([pydantic_passage])
+            return pydantic_passage
 
     @enforce_types
     @trace_method
@@ -257,7 +267,9 @@ class PassageManager:
 
         async with db_registry.async_session() as session:
             passage = await passage.create_async(session, actor=actor)
-            return passage.to_pydantic()
+            pydantic_passage = passage.to_pydantic()
+            sqlite_vector_index.upsert_passages([pydantic_passage])
+            return pydantic_passage
 
     # DEPRECATED - Use specific methods above
     @enforce_types
@@ -274,7 +286,9 @@ class PassageManager:
 
         with db_registry.session() as session:
             passage.create(session, actor=actor)
-            return passage.to_pydantic()
+            pydantic_passage = passage.to_pydantic()
+            sqlite_vector_index.upsert_passages([pydantic_passage])
+            return pydantic_passage
 
     @enforce_types
     @trace_method
@@ -292,7 +306,9 @@ class PassageManager:
         passage = self._preprocess_passage_for_creation(pydantic_passage=pydantic_passage)
         async with db_registry.async_session() as session:
             passage = await passage.create_async(session, actor=actor)
-            return passage.to_pydantic()
+            pydantic_passage = passage.to_pydantic()
+            sqlite_vector_index.upsert_passages([pydantic_passage])
+            return pydantic_passage
 
     @trace_method
     def _preprocess_passage_for_creation(self, pydantic_passage: PydanticPassage) -> "SqlAlchemyBase":
@@ -359,7 +375,9 @@ class PassageManager:
 
         async with db_registry.async_session() as session:
             agent_created = await AgentPassage.batch_create_async(items=agent_passages, db_session=session, actor=actor)
-            return [p.to_pydantic() for p in agent_created]
+            pydantic_passages = [p.to_pydantic() for p in agent_created]
+            sqlite_vector_index.upsert_passages(pydantic_passages)
+            return pydantic_passages
 
     @enforce_types
     @trace_method
@@ -402,7 +420,9 @@ class PassageManager:
 
         async with db_registry.async_session() as session:
             source_created = await SourcePassage.batch_create_async(items=source_passages, db_session=session, actor=actor)
-            return [p.to_pydantic() for p in source_created]
+            pydantic_passages = [p.to_pydantic() for p in source_created]
+            sqlite_vector_index.upsert_passages(pydantic_passages)
+            return pydantic_passages
 
     # DEPRECATED - Use specific methods above
     @enforce_types
@@ -451,7 +471,9 @@ class PassageManager:
                 source_created = await SourcePassage.batch_create_async(items=source_passages, db_session=session, actor=actor)
                 results.extend(source_created)
 
-            return [p.to_pydantic() for p in results]
+            pydantic_passages = [p.to_pydantic() for p in results]
+            sqlite_vector_index.upsert_passages(pydantic_passages)
+            return pydantic_passages
 
     @enforce_types
     @trace_method
@@ -611,7 +633,9 @@ class PassageManager:
 
             # Commit changes
             curr_passage.update(session, actor=actor)
-            return curr_passage.to_pydantic()
+            pydantic_passage = curr_passage.to_pydantic()
+            sqlite_vector_index.upsert_passages([pydantic_passage])
+            return pydantic_passage
 
     @enforce_types
     @trace_method
@@ -639,7 +663,9 @@ class PassageManager:
 
             # Commit changes
             await curr_passage.update_async(session, actor=actor)
-            return curr_passage.to_pydantic()
+            pydantic_passage = curr_passage.to_pydantic()
+            sqlite_vector_index.upsert_passages([pydantic_passage])
+            return pydantic_passage
 
     @enforce_types
     @trace_method
@@ -667,7 +693,9 @@ class PassageManager:
 
             # Commit changes
             curr_passage.update(session, actor=actor)
-            return curr_passage.to_pydantic()
+            pydantic_passage = curr_passage.to_pydantic()
+            sqlite_vector_index.upsert_passages([pydantic_passage])
+            return pydantic_passage
 
     @enforce_types
     @trace_method
@@ -695,7 +723,9 @@ class PassageManager:
 
             # Commit changes
             await curr_passage.update_async(session, actor=actor)
-            return curr_passage.to_pydantic()
+            pydantic_passage = curr_passage.to_pydantic()
+            sqlite_vector_index.upsert_passages([pydantic_passage])
+            return pydantic_passage
 
     @enforce_types
     @trace_method
@@ -708,6 +738,7 @@ class PassageManager:
             try:
                 passage = AgentPassage.read(db_session=session, identifier=passage_id, actor=actor)
                 passage.hard_delete(session, actor=actor)
+                sqlite_vector_index.remove_passages([passage_id])
                 return True
             except NoResultFound:
                 raise NoResultFound(f"Agent passage with id {passage_id} not found.")
@@ -723,6 +754,7 @@ class PassageManager:
             try:
                 passage = await AgentPassage.read_async(db_session=session, identifier=passage_id, actor=actor)
                 await passage.hard_delete_async(session, actor=actor)
+                sqlite_vector_index.remove_passages([passage_id])
                 return True
             except NoResultFound:
                 raise NoResultFound(f"Agent passage with id {passage_id} not found.")
@@ -738,6 +770,7 @@ class PassageManager:
             try:
                 passage = SourcePassage.read(db_session=session, identifier=passage_id, actor=actor)
                 passage.hard_delete(session, actor=actor)
+                sqlite_vector_index.remove_passages([passage_id])
                 return True
             except NoResultFound:
                 raise NoResultFound(f"Source passage with id {passage_id} not found.")
@@ -753,6 +786,7 @@ class PassageManager:
             try:
                 passage = await SourcePassage.read_async(db_session=session, identifier=passage_id, actor=actor)
                 await passage.hard_delete_async(session, actor=actor)
+                sqlite_vector_index.remove_passages([passage_id])
                 return True
             except NoResultFound:
                 raise NoResultFound(f"Source passage with id {passage_id} not found.")
@@ -799,7 +833,9 @@ class PassageManager:
 
             # Commit changes
             curr_passage.update(session, actor=actor)
-            return curr_passage.to_pydantic()
+            pydantic_passage = curr_passage.to_pydantic()
+            sqlite_vector_index.upsert_passages([pydantic_passage])
+            return pydantic_passage
 
     @enforce_types
     @trace_method
@@ -821,12 +857,14 @@ class PassageManager:
             try:
                 passage = SourcePassage.read(db_session=session, identifier=passage_id, actor=actor)
                 passage.hard_delete(session, actor=actor)
+                sqlite_vector_index.remove_passages([passage_id])
                 return True
             except NoResultFound:
                 # Try archival passages
                 try:
                     passage = AgentPassage.read(db_session=session, identifier=passage_id, actor=actor)
                     passage.hard_delete(session, actor=actor)
+                    sqlite_vector_index.remove_passages([passage_id])
                     return True
                 except NoResultFound:
                     raise NoResultFound(f"Passage with id {passage_id} not found.")
@@ -851,12 +889,14 @@ class PassageManager:
             try:
                 passage = await SourcePassage.read_async(db_session=session, identifier=passage_id, actor=actor)
                 await passage.hard_delete_async(session, actor=actor)
+                sqlite_vector_index.remove_passages([passage_id])
                 return True
             except NoResultFound:
                 # Try archival passages
                 try:
                     passage = await AgentPassage.read_async(db_session=session, identifier=passage_id, actor=actor)
                     await passage.hard_delete_async(session, actor=actor)
+                    sqlite_vector_index.remove_passages([passage_id])
                     return True
                 except NoResultFound:
                     raise NoResultFound(f"Passage with id {passage_id} not found.")
@@ -885,6 +925,7 @@ class PassageManager:
         """Delete multiple agent passages."""
         async with db_registry.async_session() as session:
             await AgentPassage.bulk_hard_delete_async(db_session=session, identifiers=[p.id for p in passages], actor=actor)
+            sqlite_vector_index.remove_passages([p.id for p in passages])
             return True
 
     @enforce_types
@@ -910,6 +951,7 @@ class PassageManager:
     ) -> bool:
         async with db_registry.async_session() as session:
             await SourcePassage.bulk_hard_delete_async(db_session=session, identifiers=[p.id for p in passages], actor=actor)
+            sqlite_vector_index.remove_passages([p.id for p in passages])
             return True
 
     # DEPRECATED - Use specific methods above
@@ -1021,6 +1063,9 @@ class PassageManager:
     ) -> float:
         """
         Estimate the size of the embeddings. Defaults to GB.
+
+        Embeddings are stored at their native dimension, so this sums the stored size of each agent passage's
+        embedding rather than assuming a fixed width per row.
         """
         BYTES_PER_STORAGE_UNIT = {
             "B": 1,
@@ -1031,9 +1076,62 @@ class PassageManager:
         }
         if storage_unit not in BYTES_PER_STORAGE_UNIT:
             raise ValueError(f"Invalid storage unit: {storage_unit}. Must be one of {list(BYTES_PER_STORAGE_UNIT.keys())}.")
-        BYTES_PER_EMBEDDING_DIM = 4
-        GB_PER_EMBEDDING = BYTES_PER_EMBEDDING_DIM / BYTES_PER_STORAGE_UNIT[storage_unit] * MAX_EMBEDDING_DIM
-        return await self.agent_passage_size_async(actor=actor, agent_id=agent_id) * GB_PER_EMBEDDING
+
+        if settings.letta_pg_uri_no_default:
+            embedding_bytes = func.pg_column_size(AgentPassage.embedding)
+        else:
+            embedding_bytes = func.length(AgentPassage.embedding)
+        query = AgentPassage.apply_access_predicate(
+            select(func.coalesce(func.sum(embedding_bytes), 0)), actor, ["read"], AccessType.ORGANIZATION
+        )
+        if agent_id:
+            query = query.where(AgentPassage.agent_id == agent_id)
+
+        async with db_registry.async_session() as session:
+            total_bytes = (await session.execute(query)).scalar()
+        return total_bytes / BYTES_PER_STORAGE_UNIT[storage_unit]
+
+    @enforce_types
+    @trace_method
+    async def rewrite_padded_embeddings_async(self, batch_size: int = 500) -> int:
+        """
+        Rewrite passages whose embeddings are still zero-padded to MAX_EMBEDDING_DIM at their native dimension.
+
+        Postgres databases are rewritten by the alembic migration that introduced native-dimension storage, except for
+        rows whose padding didn't match their embedding config; SQLite databases are only rewritten by this method.
+        Runs across all organizations in keyset-paginated batches, so it is safe to interrupt and re-run.
+
+        Returns:
+            int: The number of passages rewritten.
+        """
+        rewritten = 0
+        for model in (AgentPassage, SourcePassage):
+            last_id = None
+            while True:
+                query = select(model.id, model.embedding, model.embedding_config).order_by(model.id).limit(batch_size)
+                if last_id is not None:
+                    query = query.where(model.id > last_id)
+                if settings.letta_pg_uri_no_default:
+                    query = query.where(func.vector_dims(model.embedding) == MAX_EMBEDDING_DIM)
+
+                async with db_registry.async_session() as session:
+                    rows = (await session.execute(query)).all()
+                    if not rows:
+                        break
+                    last_id = rows[-1].id
+
+                    updates = []
+                    for row in rows:
+                        if row.embedding is None:
+                            continue
+                        embedding = unpad_embedding(row.embedding, row.embedding_config.embedding_dim if row.embedding_config else None)
+                        if len(embedding) != len(row.embedding):
+                            updates.append({"id": row.id, "embedding": list(embedding)})
+                    if updates:
+                        await session.execute(update(model), updates)
+                        await session.commit()
+                        rewritten += len(updates)
+        return rewritten
 
     @enforce_types
     @trace_method
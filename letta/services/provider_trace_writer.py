@@ -0,0 +1,149 @@
+import asyncio
+import threading
+import weakref
+from typing import Iterable, List, Tuple
+
+from letta.log import get_logger
+from letta.schemas.provider_trace import ProviderTraceCreate
+from letta.schemas.user import User as PydanticUser
+from letta.server.db import db_registry
+from letta.settings import settings
+
+logger = get_logger(__name__)
+
+_QueuedTrace = Tuple[PydanticUser, ProviderTraceCreate]
+
+
+class _LoopTraceQueue:
+    """The queue and writer task of one event loop, since both are bound to the loop they were created on."""
+
+    def __init__(self, writer: "ProviderTraceWriter"):
+        self.queue: "asyncio.Queue[_QueuedTrace]" = asyncio.Queue(maxsize=settings.provider_trace_queue_size)
+        self.task = asyncio.get_running_loop().create_task(writer._run(self.queue))
+
+
+class ProviderTraceWriter:
+    """
+    Write-behind queue for provider traces, so that agent steps don't wait on serializing and inserting them.
+
+    Traces are written by a background task in batches of up to `provider_trace_batch_size` rows, at least every
+    `provider_trace_flush_interval_seconds`. When `provider_trace_queue_size` traces are already waiting, `enqueue`
+    waits up to `provider_trace_enqueue_timeout_seconds` for room and then drops the trace.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queues: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopTraceQueue]" = weakref.WeakKeyDictionary()
+        self._metrics_registered = False
+
+    async def enqueue(self, actor: PydanticUser, provider_trace_create: ProviderTraceCreate) -> bool:
+        """Queue a trace to be written, returns False if it was dropped because the queue is full."""
+        queue = self._get_queue()
+        try:
+            queue.put_nowait((actor, provider_trace_create))
+            return True
+        except asyncio.QueueFull:
+            pass
+        try:
+            await asyncio.wait_for(queue.put((actor, provider_trace_create)), timeout=settings.provider_trace_enqueue_timeout_seconds)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"Provider trace queue is full, dropping trace for step {provider_trace_create.step_id}")
+            self._record_dropped(1, reason="queue_full")
+            return False
+
+    async def flush(self):
+        """Wait until the traces queued on the running event loop are written."""
+        with self._lock:
+            loop_queue = self._queues.get(asyncio.get_running_loop())
+        if loop_queue is not None:
+            await loop_queue.queue.join()
+
+    async def aclose(self):
+        """Write the traces queued on the running event loop, then stop its writer."""
+        with self._lock:
+            loop_queue = self._queues.pop(asyncio.get_running_loop(), None)
+        if loop_queue is None:
+            return
+        await loop_queue.queue.join()
+        loop_queue.task.cancel()
+        try:
+            await loop_queue.task
+        except asyncio.CancelledError:
+            pass
+
+    def queue_depth(self) -> int:
+        with self._lock:
+            return sum(loop_queue.queue.qsize() for loop_queue in self._queues.values())
+
+    def _get_queue(self) -> "asyncio.Queue[_QueuedTrace]":
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            loop_queue = self._queues.get(loop)
+            if loop_queue is None:
+                loop_queue = self._queues[loop] = _LoopTraceQueue(self)
+        self._register_metrics()
+        return loop_queue.queue
+
+    async def _run(self, queue: "asyncio.Queue[_QueuedTrace]"):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + settings.provider_trace_flush_interval_seconds
+            while len(batch) < settings.provider_trace_batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout=timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._write(batch)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} provider traces: {e}")
+                self._record_dropped(len(batch), reason="write_failed")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    @staticmethod
+    async def _write(batch: List[_QueuedTrace]):
+        from letta.services.telemetry_manager import build_provider_trace_model
+
+        # serializing large request/response payloads is CPU bound, keep it off the event loop
+        provider_traces = await asyncio.to_thread(lambda: [build_provider_trace_model(actor, create) for actor, create in batch])
+        async with db_registry.async_session() as session:
+            session.add_all(provider_traces)
+            await session.commit()
+
+    def _register_metrics(self):
+        if self._metrics_registered:
+            return
+        self._metrics_registered = True
+        try:
+            from letta.otel.metric_registry import MetricRegistry
+
+            MetricRegistry().provider_trace_queue_depth_gauge(self._observe_queue_depth)
+        except Exception as e:
+            logger.warning(f"Failed to register provider trace queue metrics: {e}")
+
+    def _observe_queue_depth(self, _options) -> Iterable:
+        from opentelemetry.metrics import Observation
+
+        yield Observation(self.queue_depth())
+
+    @staticmethod
+    def _record_dropped(count: int, reason: str):
+        from letta.otel.metric_registry import MetricRegistry
+
+        MetricRegistry().provider_trace_dropped_counter.add(count, {"reason": reason})
+
+
+provider_trace_writer = ProviderTraceWriter()
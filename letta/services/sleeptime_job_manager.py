@@ -0,0 +1,220 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import delete, exists, func, select, text, update
+from sqlalchemy.orm import aliased
+
+from letta.helpers.datetime_helpers import get_utc_time
+from letta.log import get_logger
+from letta.orm.errors import UniqueConstraintViolationError
+from letta.orm.job import Job as JobModel
+from letta.orm.sleeptime_job import SleeptimeJob as SleeptimeJobModel
+from letta.otel.tracing import trace_method
+from letta.schemas.enums import JobStatus
+from letta.schemas.run import Run as PydanticRun
+from letta.schemas.sleeptime_job import SleeptimeJob as PydanticSleeptimeJob
+from letta.schemas.user import User as PydanticUser
+from letta.server.db import db_registry
+from letta.utils import enforce_types
+
+logger = get_logger(__name__)
+
+# number of pending jobs to try claiming per query, in case other workers claim the first ones
+CLAIM_CANDIDATES = 10
+# Postgres advisory lock that serializes claims across workers
+CLAIM_ADVISORY_LOCK_KEY = 0x736C65657074696D
+
+
+class SleeptimeJobManager:
+    """
+    Manager for the queue of sleeptime agent runs.
+
+    Each sleeptime agent has at most one pending job (`created`), which later turns are merged into, and at most one
+    running job, so a sleeptime agent never processes overlapping message ranges at once. Jobs are claimed with a
+    conditional update, serialized across workers by a transaction-level advisory lock on Postgres (SQLite serializes all
+    writes), so any number of server workers can poll the same queue without exceeding the limits.
+    """
+
+    @enforce_types
+    @trace_method
+    async def enqueue_sleeptime_job_async(
+        self,
+        group_id: str,
+        foreground_agent_id: str,
+        sleeptime_agent_id: str,
+        after_message_id: Optional[str],
+        first_message_id: str,
+        last_message_id: str,
+        actor: PydanticUser,
+        use_assistant_message: bool = True,
+    ) -> PydanticSleeptimeJob:
+        """
+        Queue a sleeptime run over the messages after `after_message_id` up to `last_message_id`, or extend the sleeptime
+        agent's pending job up to `last_message_id`. Returns the job, whose run reports the result of both.
+        """
+        # a concurrent enqueue can insert the pending job between our read and insert, then we merge into theirs
+        for attempt in range(2):
+            async with db_registry.async_session() as session:
+                query = select(SleeptimeJobModel).where(
+                    SleeptimeJobModel.sleeptime_agent_id == sleeptime_agent_id, SleeptimeJobModel.status == JobStatus.created
+                )
+                pending_job = (await session.execute(query.with_for_update())).scalar_one_or_none()
+                if pending_job is not None:
+                    pending_job.last_message_id = last_message_id
+                    pending_job.use_assistant_message = use_assistant_message
+                    await pending_job.update_async(db_session=session, actor=actor)
+                    return pending_job.to_pydantic()
+
+                run = PydanticRun(
+                    user_id=actor.id,
+                    status=JobStatus.created,
+                    metadata={
+                        "job_type": "sleeptime_agent_send_message_async",
+                        "agent_id": sleeptime_agent_id,
+                    },
+                )
+                run = JobModel(**run.model_dump(to_orm=True))
+                await run.create_async(session, actor=actor, no_commit=True)
+                sleeptime_job = SleeptimeJobModel(
+                    run_id=run.id,
+                    group_id=group_id,
+                    foreground_agent_id=foreground_agent_id,
+                    sleeptime_agent_id=sleeptime_agent_id,
+                    user_id=actor.id,
+                    status=JobStatus.created,
+                    after_message_id=after_message_id,
+                    first_message_id=first_message_id,
+                    last_message_id=last_message_id,
+                    use_assistant_message=use_assistant_message,
+                )
+                try:
+                    await sleeptime_job.create_async(session, actor=actor)
+                except UniqueConstraintViolationError:
+                    await session.rollback()
+                    if attempt:
+                        raise
+                    continue
+                return sleeptime_job.to_pydantic()
+
+    @enforce_types
+    @trace_method
+    async def claim_next_sleeptime_job_async(self, max_running: int) -> Optional[PydanticSleeptimeJob]:
+        """
+        Claim the oldest pending job whose sleeptime agent isn't already running one, unless `max_running` jobs are
+        running across all workers. Returns None if there is nothing to claim.
+        """
+        running_job = aliased(SleeptimeJobModel)
+        agent_is_running = exists().where(
+            running_job.sleeptime_agent_id == SleeptimeJobModel.sleeptime_agent_id, running_job.status == JobStatus.running
+        )
+        candidates_query = (
+            select(SleeptimeJobModel.id)
+            .where(SleeptimeJobModel.status == JobStatus.created)
+            .where(~agent_is_running)
+            .order_by(SleeptimeJobModel.created_at)
+            .limit(CLAIM_CANDIDATES)
+        )
+        running_count = select(func.count()).select_from(running_job).where(running_job.status == JobStatus.running).scalar_subquery()
+
+        async with db_registry.async_session() as session:
+            for job_id in (await session.execute(candidates_query)).scalars().all():
+                if session.bind.dialect.name == "postgresql":
+                    # under READ COMMITTED, workers claiming different jobs at once would each count the running jobs
+                    # without the others' claims, so claims take turns (the lock is released when the claim commits)
+                    await session.execute(
+                        text("SELECT pg_advisory_xact_lock(CAST(:lock_key AS bigint))"), {"lock_key": CLAIM_ADVISORY_LOCK_KEY}
+                    )
+                # the conditional update makes the claim atomic, another worker may have claimed the job, or another job of
+                # the same sleeptime agent, since we read it
+                claim = (
+                    update(SleeptimeJobModel)
+                    .where(SleeptimeJobModel.id == job_id, SleeptimeJobModel.status == JobStatus.created)
+                    .where(~agent_is_running)
+                    .where(running_count < max_running)
+                    .values(status=JobStatus.running, claimed_at=get_utc_time().replace(tzinfo=None))
+                    .execution_options(synchronize_session=False)
+                )
+                result = await session.execute(claim)
+                await session.commit()
+                if result.rowcount == 1:
+                    sleeptime_job = await session.get(SleeptimeJobModel, job_id)
+                    return sleeptime_job.to_pydantic()
+                if (await session.execute(select(running_count))).scalar() >= max_running:
+                    return None
+        return None
+
+    @enforce_types
+    @trace_method
+    async def release_sleeptime_job_async(self, sleeptime_job_id: str) -> None:
+        """Put a claimed job back in the queue, e.g. when its worker shuts down, merging it into a newer pending job."""
+        async with db_registry.async_session() as session:
+            sleeptime_job = await session.get(SleeptimeJobModel, sleeptime_job_id)
+            if sleeptime_job is None:
+                return
+            query = select(SleeptimeJobModel).where(
+                SleeptimeJobModel.sleeptime_agent_id == sleeptime_job.sleeptime_agent_id, SleeptimeJobModel.status == JobStatus.created
+            )
+            pending_job = (await session.execute(query.with_for_update())).scalar_one_or_none()
+            if pending_job is None:
+                sleeptime_job.status = JobStatus.created
+                sleeptime_job.claimed_at = None
+                await sleeptime_job.update_async(db_session=session)
+                return
+
+            # the pending job continues from where the released one started
+            pending_job.after_message_id = sleeptime_job.after_message_id
+            pending_job.first_message_id = sleeptime_job.first_message_id
+            await self._fail_runs(
+                session, [sleeptime_job.run_id], error=f"Interrupted, the messages are processed by run {pending_job.run_id}"
+            )
+            await session.delete(sleeptime_job)
+            await pending_job.update_async(db_session=session)
+
+    @enforce_types
+    @trace_method
+    async def delete_sleeptime_job_async(self, sleeptime_job_id: str) -> None:
+        """Remove a job from the queue once its run has finished."""
+        async with db_registry.async_session() as session:
+            await session.execute(delete(SleeptimeJobModel).where(SleeptimeJobModel.id == sleeptime_job_id))
+            await session.commit()
+
+    @enforce_types
+    @trace_method
+    async def fail_stale_sleeptime_jobs_async(self, claimed_before: datetime) -> int:
+        """
+        Fail the runs of jobs claimed before `claimed_before` and remove them, so that a worker that died mid-run doesn't
+        block its sleeptime agent forever. Returns the number of jobs removed.
+        """
+        async with db_registry.async_session() as session:
+            query = select(SleeptimeJobModel.id, SleeptimeJobModel.run_id).where(
+                SleeptimeJobModel.status == JobStatus.running, SleeptimeJobModel.claimed_at < claimed_before
+            )
+            stale_jobs = (await session.execute(query)).all()
+            if not stale_jobs:
+                return 0
+
+            logger.warning(f"Failing {len(stale_jobs)} sleeptime jobs whose workers stopped responding")
+            await self._fail_runs(session, [run_id for _, run_id in stale_jobs], error="Sleeptime job timed out or its worker stopped")
+            await session.execute(delete(SleeptimeJobModel).where(SleeptimeJobModel.id.in_([job_id for job_id, _ in stale_jobs])))
+            await session.commit()
+            return len(stale_jobs)
+
+    @enforce_types
+    @trace_method
+    async def list_sleeptime_jobs_async(self, sleeptime_agent_id: str) -> List[PydanticSleeptimeJob]:
+        """List the queued and running jobs of a sleeptime agent."""
+        async with db_registry.async_session() as session:
+            query = (
+                select(SleeptimeJobModel)
+                .where(SleeptimeJobModel.sleeptime_agent_id == sleeptime_agent_id)
+                .order_by(SleeptimeJobModel.created_at)
+            )
+            return [sleeptime_job.to_pydantic() for sleeptime_job in (await session.execute(query)).scalars().all()]
+
+    @staticmethod
+    async def _fail_runs(session, run_ids: List[str], error: str):
+        now = get_utc_time().replace(tzinfo=None)
+        for run in (await session.execute(select(JobModel).where(JobModel.id.in_(run_ids)))).scalars().all():
+            run.status = JobStatus.failed
+            run.completed_at = now
+            run.metadata_ = {**(run.metadata_ or {}), "error": error}
@@ -13,6 +13,7 @@ from letta.schemas.source import Source as PydanticSource
 from letta.schemas.source import SourceUpdate
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.services.vector_index.sqlite_vector_index import sqlite_vector_index
 from letta.utils import enforce_types, printd
 
 
@@ -64,6 +65,7 @@ class SourceManager:
         async with db_registry.async_session() as session:
             source = await SourceModel.read_async(db_session=session, identifier=source_id)
             await source.hard_delete_async(db_session=session, actor=actor)
+            sqlite_vector_index.drop_collection("source", source_id)
             return source.to_pydantic()
 
     @enforce_types
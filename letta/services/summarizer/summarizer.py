@@ -148,7 +148,7 @@ class Summarizer:
         # Dynamically get the LLMConfig from the summarizer agent
         # Pretty cringe code here that we need the agent for this but we don't use it
         agent_state = await self.summarizer_agent.agent_manager.get_agent_by_id_async(
-            agent_id=self.summarizer_agent.agent_id, actor=self.summarizer_agent.actor
+            agent_id=self.summarizer_agent.agent_id, actor=self.summarizer_agent.actor, include_relationships=[]
         )
 
         # TODO if we do this via the "agent", then we can more easily allow toggling on the memory block version
@@ -6,9 +6,24 @@ from letta.schemas.provider_trace import ProviderTraceCreate
 from letta.schemas.step import Step as PydanticStep
 from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
+from letta.settings import settings
 from letta.utils import enforce_types
 
 
+def build_provider_trace_model(actor: PydanticUser, provider_trace_create: ProviderTraceCreate) -> ProviderTraceModel:
+    provider_trace = ProviderTraceModel(**provider_trace_create.model_dump())
+    # round trip through json to make the payloads json serializable
+    if provider_trace_create.request_json:
+        request_json_str = json_dumps(provider_trace_create.request_json)
+        provider_trace.request_json = json_loads(request_json_str)
+
+    if provider_trace_create.response_json:
+        response_json_str = json_dumps(provider_trace_create.response_json)
+        provider_trace.response_json = json_loads(response_json_str)
+    provider_trace._set_created_and_updated_by_fields(actor.id)
+    return provider_trace
+
+
 class TelemetryManager:
     @enforce_types
     async def get_provider_trace_by_step_id_async(
@@ -23,28 +38,24 @@ class TelemetryManager:
     @enforce_types
     async def create_provider_trace_async(self, actor: PydanticUser, provider_trace_create: ProviderTraceCreate) -> PydanticProviderTrace:
         async with db_registry.async_session() as session:
-            provider_trace = ProviderTraceModel(**provider_trace_create.model_dump())
-            if provider_trace_create.request_json:
-                request_json_str = json_dumps(provider_trace_create.request_json)
-                provider_trace.request_json = json_loads(request_json_str)
-
-            if provider_trace_create.response_json:
-                response_json_str = json_dumps(provider_trace_create.response_json)
-                provider_trace.response_json = json_loads(response_json_str)
+            provider_trace = build_provider_trace_model(actor, provider_trace_create)
             await provider_trace.create_async(session, actor=actor)
             return provider_trace.to_pydantic()
 
+    async def enqueue_provider_trace_async(self, actor: PydanticUser, provider_trace_create: ProviderTraceCreate) -> None:
+        """Write a provider trace in the background (see `ProviderTraceWriter`), or right away if the queue is disabled."""
+        if settings.provider_trace_queue_size <= 0:
+            await self.create_provider_trace_async(actor=actor, provider_trace_create=provider_trace_create)
+            return
+
+        from letta.services.provider_trace_writer import provider_trace_writer
+
+        await provider_trace_writer.enqueue(actor, provider_trace_create)
+
     @enforce_types
     def create_provider_trace(self, actor: PydanticUser, provider_trace_create: ProviderTraceCreate) -> PydanticProviderTrace:
         with db_registry.session() as session:
-            provider_trace = ProviderTraceModel(**provider_trace_create.model_dump())
-            if provider_trace_create.request_json:
-                request_json_str = json_dumps(provider_trace_create.request_json)
-                provider_trace.request_json = json_loads(request_json_str)
-
-            if provider_trace_create.response_json:
-                response_json_str = json_dumps(provider_trace_create.response_json)
-                provider_trace.response_json = json_loads(response_json_str)
+            provider_trace = build_provider_trace_model(actor, provider_trace_create)
             provider_trace.create(session, actor=actor)
             return provider_trace.to_pydantic()
 
@@ -58,6 +69,9 @@ class NoopTelemetryManager(TelemetryManager):
     async def create_provider_trace_async(self, actor: PydanticUser, provider_trace_create: ProviderTraceCreate) -> PydanticProviderTrace:
         return
 
+    async def enqueue_provider_trace_async(self, actor: PydanticUser, provider_trace_create: ProviderTraceCreate) -> None:
+        return
+
     async def get_provider_trace_by_step_id_async(self, step_id: str, actor: PydanticUser) -> PydanticStep:
         return
 
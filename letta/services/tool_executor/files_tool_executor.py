@@ -172,10 +172,16 @@ class LettaFileToolExecutor(ToolExecutor):
                 )
 
             file_id = file_agent.file_id
-            file = await self.file_manager.get_file_by_id(file_id=file_id, actor=self.actor, include_content=True)
+            file = await self.file_manager.get_file_by_id(file_id=file_id, actor=self.actor)
 
-            # Process file content
-            content_lines = LineChunker().chunk_text(file_metadata=file, start=start, end=end, validate_range=True)
+            # Read only the requested lines through the file's line index
+            file_lines = await self.file_manager.get_file_lines(file_metadata=file, actor=self.actor, start=start, end=end)
+            if file_lines:
+                lines, total_lines = file_lines
+                content_lines = LineChunker().format_lines(file, lines, total_lines, start=start, end=end, validate_range=True)
+            else:
+                self.logger.warning(f"File ({file_name}) has no content")
+                content_lines = []
             visible_content = "\n".join(content_lines)
 
             # Handle LRU eviction and file opening
@@ -245,50 +251,6 @@ class LettaFileToolExecutor(ToolExecutor):
         except re.error as e:
             raise ValueError(f"Invalid regex pattern: {e}")
 
-    def _get_context_lines(
-        self,
-        formatted_lines: List[str],
-        match_line_num: int,
-        context_lines: int,
-    ) -> List[str]:
-        """Get context lines around a match from already-chunked lines.
-
-        Args:
-            formatted_lines: Already chunked lines from LineChunker (format: "line_num: content")
-            match_line_num: The 1-based line number of the match
-            context_lines: Number of context lines before and after
-        """
-        if not formatted_lines or context_lines < 0:
-            return []
-
-        # Find the index of the matching line in the formatted_lines list
-        match_formatted_idx = None
-        for i, line in enumerate(formatted_lines):
-            if line and ":" in line:
-                try:
-                    line_num = int(line.split(":", 1)[0].strip())
-                    if line_num == match_line_num:
-                        match_formatted_idx = i
-                        break
-                except ValueError:
-                    continue
-
-        if match_formatted_idx is None:
-            return []
-
-        # Calculate context range with bounds checking
-        start_idx = max(0, match_formatted_idx - context_lines)
-        end_idx = min(len(formatted_lines), match_formatted_idx + context_lines + 1)
-
-        # Extract context lines and add match indicator
-        context_lines_with_indicator = []
-        for i in range(start_idx, end_idx):
-            line = formatted_lines[i]
-            prefix = ">" if i == match_formatted_idx else " "
-            context_lines_with_indicator.append(f"{prefix} {line}")
-
-        return context_lines_with_indicator
-
     @trace_method
     async def grep_files(
         self, agent_state: AgentState, pattern: str, include: Optional[str] = None, context_lines: Optional[int] = 3
@@ -359,16 +321,20 @@ class LettaFileToolExecutor(ToolExecutor):
             nonlocal results, total_matches, total_content_size, files_processed, files_skipped, files_with_matches
 
             for file_agent in file_agents:
-                # Load file content
-                file = await self.file_manager.get_file_by_id(file_id=file_agent.file_id, actor=self.actor, include_content=True)
+                # Load file content along with its line index
+                file = await self.file_manager.get_file_by_id(file_id=file_agent.file_id, actor=self.actor)
+                file_content = (
+                    await self.file_manager.get_file_content_with_line_index(file_metadata=file, actor=self.actor) if file else None
+                )
 
-                if not file or not file.content:
+                if not file_content:
                     files_skipped += 1
                     self.logger.warning(f"Grep: Skipping file {file_agent.file_name} - no content available")
                     continue
+                text, line_index = file_content
 
                 # Check individual file size
-                content_size = len(file.content.encode("utf-8"))
+                content_size = len(text.encode("utf-8"))
                 if content_size > self.MAX_FILE_SIZE_BYTES:
                     files_skipped += 1
                     self.logger.warning(
@@ -390,18 +356,11 @@ class LettaFileToolExecutor(ToolExecutor):
                 files_processed += 1
                 file_matches = 0
 
-                # Use LineChunker to get all lines with proper formatting
-                chunker = LineChunker()
-                formatted_lines = chunker.chunk_text(file_metadata=file)
+                # Lines as LineChunker splits the file, 1-indexed for display
+                lines = line_index.chunks(text)
+                context = max(context_lines or 0, 0)
 
-                # Remove metadata header
-                if formatted_lines and formatted_lines[0].startswith("[Viewing"):
-                    formatted_lines = formatted_lines[1:]
-
-                # LineChunker now returns 1-indexed line numbers, so no conversion needed
-
-                # Search for matches in formatted lines
-                for formatted_line in formatted_lines:
+                for i, line in enumerate(lines):
                     if total_matches >= self.MAX_TOTAL_MATCHES:
                         results.append(f"[TRUNCATED] Maximum total matches ({self.MAX_TOTAL_MATCHES}) reached")
                         return
@@ -410,27 +369,20 @@ class LettaFileToolExecutor(ToolExecutor):
                         results.append(f"[TRUNCATED] {file.file_name}: Maximum matches per file ({self.MAX_MATCHES_PER_FILE}) reached")
                         break
 
-                    # Extract line number and content from formatted line
-                    if ":" in formatted_line:
-                        try:
-                            line_parts = formatted_line.split(":", 1)
-                            line_num = int(line_parts[0].strip())
-                            line_content = line_parts[1].strip() if len(line_parts) > 1 else ""
-                        except (ValueError, IndexError):
-                            continue
-
-                        if pattern_regex.search(line_content):
-                            # Mark this file as having matches for LRU tracking
-                            files_with_matches.add(file.file_name)
-                            context = self._get_context_lines(formatted_lines, match_line_num=line_num, context_lines=context_lines or 0)
-
-                            # Format the match result
-                            match_header = f"\n=== {file.file_name}:{line_num} ==="
-                            match_content = "\n".join(context)
-                            results.append(f"{match_header}\n{match_content}")
-
-                            file_matches += 1
-                            total_matches += 1
+                    if pattern_regex.search(line.strip()):
+                        # Mark this file as having matches for LRU tracking
+                        files_with_matches.add(file.file_name)
+
+                        # Format the match result, with its context lines
+                        match_header = f"\n=== {file.file_name}:{i + 1} ==="
+                        match_content = "\n".join(
+                            f"{'>' if j == i else ' '} {j + 1}: {lines[j]}"
+                            for j in range(max(0, i - context), min(len(lines), i + context + 1))
+                        )
+                        results.append(f"{match_header}\n{match_content}")
+
+                        file_matches += 1
+                        total_matches += 1
 
                 # Break if global limits reached
                 if total_matches >= self.MAX_TOTAL_MATCHES:
@@ -2,6 +2,7 @@ import asyncio
 import os
 from typing import Any, Dict, List, Optional
 
+from letta.helpers.fan_out import fan_out, get_provider_rate_limiter, round_robin_priority
 from letta.log import get_logger
 from letta.schemas.agent import AgentState
 from letta.schemas.enums import MessageRole
@@ -13,6 +14,7 @@ from letta.schemas.tool import Tool
 from letta.schemas.tool_execution_result import ToolExecutionResult
 from letta.schemas.user import User
 from letta.services.tool_executor.tool_executor_base import ToolExecutor
+from letta.settings import settings
 
 logger = get_logger(__name__)
 
@@ -61,8 +63,9 @@ class LettaMultiAgentToolExecutor(ToolExecutor):
         self, agent_state: AgentState, message: str, match_all: List[str], match_some: List[str]
     ) -> str:
         # Find matching agents
+        # only the agents' ids and llm configs are needed, the agents are loaded in full when they are messaged
         matching_agents = await self.agent_manager.list_agents_matching_tags_async(
-            actor=self.actor, match_all=match_all, match_some=match_some
+            actor=self.actor, match_all=match_all, match_some=match_some, include_relationships=[]
         )
         if not matching_agents:
             return str([])
@@ -74,11 +77,33 @@ class LettaMultiAgentToolExecutor(ToolExecutor):
             f"{message}"
         )
 
-        tasks = [
-            asyncio.create_task(self._process_agent(agent_id=agent_state.id, message=augmented_message)) for agent_state in matching_agents
-        ]
-        results = await asyncio.gather(*tasks)
-        return str(results)
+        results = {}
+        async for fan_out_result in fan_out(
+            matching_agents,
+            lambda matching_agent: self._process_agent(agent_id=matching_agent.id, message=augmented_message),
+            max_concurrency=settings.multi_agent_concurrent_sends,
+            timeout=settings.multi_agent_send_message_timeout,
+            rate_limiter=lambda matching_agent: get_provider_rate_limiter(matching_agent.llm_config.model_endpoint_type),
+            priority=round_robin_priority(matching_agents, key=lambda matching_agent: matching_agent.llm_config.model_endpoint_type),
+        ):
+            agent_id = fan_out_result.item.id
+            if fan_out_result.timed_out:
+                results[agent_id] = {
+                    "agent_id": agent_id,
+                    "error": f"No response within {settings.multi_agent_send_message_timeout} seconds",
+                    "type": "TimeoutError",
+                }
+            elif fan_out_result.error is not None:
+                # _process_agent reports its own errors, this failed around it (e.g. in the rate limiter) or was cancelled
+                results[agent_id] = {
+                    "agent_id": agent_id,
+                    "error": str(fan_out_result.error),
+                    "type": type(fan_out_result.error).__name__,
+                }
+            else:
+                results[agent_id] = fan_out_result.result
+                logger.info(f"Received reply {len(results)}/{len(matching_agents)} of broadcast from agent {agent_state.id}: {agent_id}")
+        return str([results[matching_agent.id] for matching_agent in matching_agents])
 
     async def _process_agent(self, agent_id: str, message: str) -> Dict[str, Any]:
         from letta.agents.letta_agent import LettaAgent
@@ -30,6 +30,7 @@ from letta.schemas.user import User as PydanticUser
 from letta.server.db import db_registry
 from letta.services.helpers.agent_manager_helper import calculate_multi_agent_tools
 from letta.services.mcp.types import SSEServerConfig, StdioServerConfig
+from letta.services.tool_sandbox.local_venv_cache import build_tool_venv_in_background
 from letta.utils import enforce_types, printd
 
 logger = get_logger(__name__)
@@ -171,7 +172,11 @@ class ToolManager:
 
             tool = ToolModel(**tool_data)
             await tool.create_async(session, actor=actor)  # Re-raise other database-related errors
-            return tool.to_pydantic()
+            tool = tool.to_pydantic()
+
+        # Get the tool's sandbox venv ready before it is first called
+        await build_tool_venv_in_background(tool, actor)
+        return tool
 
     @enforce_types
     @trace_method
@@ -365,7 +370,11 @@ class ToolManager:
 
             # Save the updated tool to the database
             tool = await tool.update_async(db_session=session, actor=actor)
-            return tool.to_pydantic()
+            tool = tool.to_pydantic()
+
+        if "pip_requirements" in update_data:
+            await build_tool_venv_in_background(tool, actor)
+        return tool
 
     @enforce_types
     @trace_method
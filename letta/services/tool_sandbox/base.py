@@ -19,6 +19,7 @@ class AsyncToolSandboxBase(ABC):
     NAMESPACE = uuid.NAMESPACE_DNS
     LOCAL_SANDBOX_RESULT_START_MARKER = uuid.uuid5(NAMESPACE, "local-sandbox-result-start-marker").bytes
     LOCAL_SANDBOX_RESULT_VAR_NAME = "result_ZQqiequkcFwRwwGQMqkt"
+    PRECOMPILED_TOOL_CODE_VAR_NAME = "tool_code_ZQqiequkcFwRwwGQMqkt"
 
     def __init__(
         self,
@@ -54,6 +55,7 @@ class AsyncToolSandboxBase(ABC):
 
         # Detect if the tool function is async
         self.is_async_function = self._detect_async_function()
+        self.uses_future_annotations = False
 
     # Lazily initialize the manager only when needed
     @property
@@ -74,10 +76,15 @@ class AsyncToolSandboxBase(ABC):
         """
         raise NotImplementedError
 
-    def generate_execution_script(self, agent_state: Optional[AgentState], wrap_print_with_markers: bool = False) -> str:
+    def generate_execution_script(
+        self, agent_state: Optional[AgentState], wrap_print_with_markers: bool = False, precompiled_tool_source: bool = False
+    ) -> str:
         """
         Generate code to run inside of execution sandbox. Serialize the agent state and arguments, call the tool,
         then base64-encode/pickle the result. Runs a jinja2 template constructing the python file.
+
+        With `precompiled_tool_source`, the tool's source code is left out of the script and executed from an already
+        compiled code object in `PRECOMPILED_TOOL_CODE_VAR_NAME` instead.
         """
         from letta.templates.template_helper import render_template
 
@@ -105,6 +112,8 @@ class AsyncToolSandboxBase(ABC):
                 tool_args += self.initialize_param(param, self.args[param])
 
         agent_state_pickle = pickle.dumps(agent_state) if self.inject_agent_state else None
+        # a precompiled tool source has to be compiled with the same __future__ flags as the script
+        self.uses_future_annotations = future_import
 
         return render_template(
             TEMPLATE_NAME,
@@ -113,7 +122,9 @@ class AsyncToolSandboxBase(ABC):
             schema_imports=schema_code,
             agent_state_pickle=agent_state_pickle,
             tool_args=tool_args,
-            tool_source_code=self.tool.source_code,
+            tool_source_code=(
+                f"exec({self.PRECOMPILED_TOOL_CODE_VAR_NAME}, globals())" if precompiled_tool_source else self.tool.source_code
+            ),
             local_sandbox_result_var_name=self.LOCAL_SANDBOX_RESULT_VAR_NAME,
             invoke_function_call=self.invoke_function_call(),
             wrap_print_with_markers=wrap_print_with_markers,
@@ -11,16 +11,14 @@ from pydantic.config import JsonDict
 from letta.log import get_logger
 from letta.otel.tracing import log_event, trace_method
 from letta.schemas.agent import AgentState
-from letta.schemas.sandbox_config import SandboxConfig, SandboxType
+from letta.schemas.sandbox_config import LocalSandboxConfig, SandboxConfig, SandboxType
 from letta.schemas.tool import Tool
 from letta.schemas.tool_execution_result import ToolExecutionResult
-from letta.services.helpers.tool_execution_helper import (
-    create_venv_for_local_sandbox,
-    find_python_executable,
-    install_pip_requirements_for_sandbox,
-)
+from letta.services.helpers.tool_execution_helper import create_venv_for_local_sandbox, find_python_executable
 from letta.services.helpers.tool_parser_helper import parse_stdout_best_effort
 from letta.services.tool_sandbox.base import AsyncToolSandboxBase
+from letta.services.tool_sandbox.local_sandbox_worker_pool import local_sandbox_worker_pools, worker_pool_available
+from letta.services.tool_sandbox.local_venv_cache import local_venv_cache, resolve_pip_requirements
 from letta.settings import tool_settings
 from letta.utils import get_friendly_error_msg, parse_stderr_error_msg
 
@@ -105,34 +103,25 @@ class AsyncToolSandboxLocal(AsyncToolSandboxBase):
         # If using a virtual environment, ensure it's prepared in parallel
         venv_preparation_task = None
         if use_venv:
-            venv_path = str(os.path.join(sandbox_dir, local_configs.venv_name))
-            venv_preparation_task = asyncio.create_task(self._prepare_venv(local_configs, venv_path, env))
-
-        # Generate and write execution script (always with markers, since we rely on stdout)
-        with tempfile.NamedTemporaryFile(mode="w", dir=sandbox_dir, suffix=".py", delete=False) as temp_file:
-            code = self.generate_execution_script(agent_state=agent_state, wrap_print_with_markers=True)
-            temp_file.write(code)
-            temp_file.flush()
-            temp_file_path = temp_file.name
+            venv_preparation_task = asyncio.create_task(self._prepare_venv(local_configs, env))
 
+        code = None
+        temp_file_path = None
         try:
-            # If we started a venv preparation task, wait for it to complete
-            if venv_preparation_task:
-                await venv_preparation_task
-
             # Determine the python executable and environment for the subprocess
-            exec_env = env.copy()
-            if use_venv:
-                venv_path = str(os.path.join(sandbox_dir, local_configs.venv_name))
-                python_executable = find_python_executable(local_configs)
-                exec_env["VIRTUAL_ENV"] = venv_path
-                exec_env["PATH"] = os.path.join(venv_path, "bin") + ":" + exec_env["PATH"]
+            interpreter_env = {}
+            if venv_preparation_task:
+                venv_configs = await venv_preparation_task
+                venv_path = str(os.path.join(sandbox_dir, venv_configs.venv_name))
+                python_executable = find_python_executable(venv_configs)
+                interpreter_env["VIRTUAL_ENV"] = venv_path
+                interpreter_env["PATH"] = os.path.join(venv_path, "bin") + ":" + env["PATH"]
             else:
                 # If not using venv, use whatever Python we are running on
                 python_executable = sys.executable
 
             # handle unwanted terminal behavior
-            exec_env.update(
+            interpreter_env.update(
                 {
                     "PYTHONWARNINGS": "ignore",
                     "NO_COLOR": "1",
@@ -140,6 +129,26 @@ class AsyncToolSandboxLocal(AsyncToolSandboxBase):
                     "PYTHONUNBUFFERED": "1",
                 }
             )
+            exec_env = {**env, **interpreter_env}
+
+            if worker_pool_available():
+                code = self.generate_execution_script(agent_state=agent_state, wrap_print_with_markers=True, precompiled_tool_source=True)
+                return await self._execute_tool_in_worker(
+                    sbx_config=sbx_config,
+                    python_executable=python_executable,
+                    code=code,
+                    # workers are shared between agents, so they only get the sandbox's environment; each call sets its own
+                    worker_env={**os.environ, **interpreter_env},
+                    env=exec_env,
+                    cwd=sandbox_dir,
+                )
+
+            # Generate and write execution script (always with markers, since we rely on stdout)
+            with tempfile.NamedTemporaryFile(mode="w", dir=sandbox_dir, suffix=".py", delete=False) as temp_file:
+                code = self.generate_execution_script(agent_state=agent_state, wrap_print_with_markers=True)
+                temp_file.write(code)
+                temp_file.flush()
+                temp_file_path = temp_file.name
 
             # Execute in subprocess
             return await self._execute_tool_subprocess(
@@ -158,16 +167,24 @@ class AsyncToolSandboxLocal(AsyncToolSandboxBase):
             # Clean up the temp file if not debugging
             from letta.settings import settings
 
-            if not settings.debug:
+            if temp_file_path and not settings.debug:
                 os.remove(temp_file_path)
 
     @trace_method
-    async def _prepare_venv(self, local_configs, venv_path: str, env: Dict[str, str]):
+    async def _prepare_venv(self, local_configs: LocalSandboxConfig, env: Dict[str, str]) -> LocalSandboxConfig:
         """
-        Prepare virtual environment asynchronously (in a background thread).
+        Prepare virtual environment asynchronously (in a background thread), returning the sandbox config pointing at it.
         """
+        if resolve_pip_requirements(local_configs, self.tool):
+            # pip requirements get a venv of their own, shared by every tool with the same requirements
+            log_event(name="start local_venv_cache.get_or_build", attributes={"local_configs": local_configs.model_dump_json()})
+            venv_configs = await asyncio.to_thread(local_venv_cache.get_or_build, local_configs, self.tool, env, self.force_recreate_venv)
+            log_event(name="finish local_venv_cache.get_or_build", attributes={"venv_name": venv_configs.venv_name})
+            return venv_configs
+
+        sandbox_dir = os.path.expanduser(local_configs.sandbox_dir)
+        venv_path = str(os.path.join(sandbox_dir, local_configs.venv_name))
         if self.force_recreate_venv or not os.path.isdir(venv_path):
-            sandbox_dir = os.path.expanduser(local_configs.sandbox_dir)
             log_event(name="start create_venv_for_local_sandbox", attributes={"venv_path": venv_path})
             await asyncio.to_thread(
                 create_venv_for_local_sandbox,
@@ -177,13 +194,43 @@ class AsyncToolSandboxLocal(AsyncToolSandboxBase):
                 force_recreate=self.force_recreate_venv,
             )
             log_event(name="finish create_venv_for_local_sandbox")
+        return local_configs
 
-        if local_configs.pip_requirements or (self.tool and self.tool.pip_requirements):
-            log_event(name="start install_pip_requirements_for_sandbox", attributes={"local_configs": local_configs.model_dump_json()})
-            await asyncio.to_thread(
-                install_pip_requirements_for_sandbox, local_configs, upgrade=True, user_install_if_no_venv=False, env=env, tool=self.tool
-            )
-            log_event(name="finish install_pip_requirements_for_sandbox", attributes={"local_configs": local_configs.model_dump_json()})
+    @trace_method
+    async def _execute_tool_in_worker(
+        self, sbx_config, python_executable: str, code: str, worker_env: Dict[str, str], env: Dict[str, str], cwd: str
+    ) -> ToolExecutionResult:
+        """
+        Execute the script in a warm worker interpreter from the pool, which forks a fresh process for the call.
+        The tool's source code is compiled once per worker and reused across calls.
+        """
+        pool = local_sandbox_worker_pools.get_pool(
+            key=(sbx_config.fingerprint(), python_executable), python_executable=python_executable, env=worker_env, cwd=cwd
+        )
+        request = {
+            "script": code,
+            "tool_source": self.tool.source_code,
+            "tool_source_hash": hashlib.sha256(self.tool.source_code.encode("utf-8")).hexdigest(),
+            "future_import": self.uses_future_annotations,
+            "tool_code_var_name": self.PRECOMPILED_TOOL_CODE_VAR_NAME,
+            # the script imports letta to unpickle the agent state, so keep it imported in the worker
+            "imports": ["letta"] if self.inject_agent_state else [],
+            "env": env,
+            "cwd": cwd,
+            "timeout": tool_settings.tool_sandbox_timeout,
+        }
+        try:
+            log_event(name="start worker execution")
+            response = await pool.run(request, timeout=tool_settings.tool_sandbox_timeout)
+            log_event(name="finish worker execution")
+        except Exception as e:
+            logger.error(f"Worker execution for tool {self.tool_name} encountered an error: {e}")
+            return self._build_error_result(sbx_config, e, stdout_text="")
+
+        if response["timed_out"]:
+            raise TimeoutError(f"Executing tool {self.tool_name} timed out after {tool_settings.tool_sandbox_timeout} seconds.")
+        stderr = response["stderr"].decode("utf-8") if response["stderr"] else ""
+        return self._build_execution_result(sbx_config, response["returncode"], response["stdout"], stderr)
 
     @trace_method
     async def _execute_tool_subprocess(
@@ -217,26 +264,7 @@ class AsyncToolSandboxLocal(AsyncToolSandboxBase):
             stderr = stderr_bytes.decode("utf-8") if stderr_bytes else ""
             log_event(name="finish subprocess")
 
-            # Parse markers to isolate the function result
-            func_result_bytes, stdout_text = self.parse_out_function_results_markers(stdout_bytes)
-            func_return, agent_state = parse_stdout_best_effort(func_result_bytes)
-
-            if process.returncode != 0 and func_return is None:
-                exception_name, msg = parse_stderr_error_msg(stderr)
-                func_return = get_friendly_error_msg(
-                    function_name=self.tool_name,
-                    exception_name=exception_name,
-                    exception_message=msg,
-                )
-
-            return ToolExecutionResult(
-                func_return=func_return,
-                agent_state=agent_state,
-                stdout=[stdout_text] if stdout_text else [],
-                stderr=[stderr] if stderr else [],
-                status="success" if process.returncode == 0 else "error",
-                sandbox_config_fingerprint=sbx_config.fingerprint(),
-            )
+            return self._build_execution_result(sbx_config, process.returncode, stdout_bytes, stderr)
 
         except (TimeoutError, Exception) as e:
             # Distinguish between timeouts and other exceptions for clarity
@@ -246,20 +274,45 @@ class AsyncToolSandboxLocal(AsyncToolSandboxBase):
             logger.error(f"Subprocess execution for tool {self.tool_name} encountered an error: {e}")
             logger.error(e.__class__.__name__)
             logger.error(e.__traceback__)
+            return self._build_error_result(sbx_config, e, stdout_text=stdout_text)
+
+    def _build_execution_result(self, sbx_config, returncode: int, stdout_bytes: bytes, stderr: str) -> ToolExecutionResult:
+        # Parse markers to isolate the function result
+        func_result_bytes, stdout_text = self.parse_out_function_results_markers(stdout_bytes)
+        func_return, agent_state = parse_stdout_best_effort(func_result_bytes)
+
+        if returncode != 0 and func_return is None:
+            exception_name, msg = parse_stderr_error_msg(stderr)
             func_return = get_friendly_error_msg(
                 function_name=self.tool_name,
-                exception_name=type(e).__name__,
-                exception_message=str(e),
-            )
-            return ToolExecutionResult(
-                func_return=func_return,
-                agent_state=None,
-                stdout=[stdout_text],
-                stderr=[str(e)],
-                status="error",
-                sandbox_config_fingerprint=sbx_config.fingerprint(),
+                exception_name=exception_name,
+                exception_message=msg,
             )
 
+        return ToolExecutionResult(
+            func_return=func_return,
+            agent_state=agent_state,
+            stdout=[stdout_text] if stdout_text else [],
+            stderr=[stderr] if stderr else [],
+            status="success" if returncode == 0 else "error",
+            sandbox_config_fingerprint=sbx_config.fingerprint(),
+        )
+
+    def _build_error_result(self, sbx_config, e: Exception, stdout_text: str) -> ToolExecutionResult:
+        func_return = get_friendly_error_msg(
+            function_name=self.tool_name,
+            exception_name=type(e).__name__,
+            exception_message=str(e),
+        )
+        return ToolExecutionResult(
+            func_return=func_return,
+            agent_state=None,
+            stdout=[stdout_text],
+            stderr=[str(e)],
+            status="error",
+            sandbox_config_fingerprint=sbx_config.fingerprint(),
+        )
+
     def parse_out_function_results_markers(self, data: bytes) -> tuple[bytes, str]:
         """
         Parse the function results out of the stdout using special markers.
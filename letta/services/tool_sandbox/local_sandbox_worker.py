@@ -0,0 +1,152 @@
+"""
+Long-lived worker process for the local tool sandbox, see `local_sandbox_worker_pool.py`.
+
+This file is run directly by the sandbox's python interpreter (which may be a venv without letta installed), so it must
+only use the standard library. It reads length-prefixed pickled requests from stdin and forks a fresh child for every
+tool call: the child inherits everything this process already imported and compiled, but nothing a call does (globals,
+environment, working directory, open files) outlives it, just like running each call in its own interpreter.
+"""
+
+import __future__
+
+import importlib
+import os
+import pickle
+import signal
+import struct
+import sys
+import tempfile
+import time
+import traceback
+import warnings
+
+MAX_CACHED_CODE_OBJECTS = 256
+
+_code_cache = {}
+
+
+def read_message(stream):
+    header = stream.read(4)
+    if len(header) < 4:
+        return None
+    (length,) = struct.unpack(">I", header)
+    return pickle.loads(stream.read(length))
+
+
+def write_message(stream, message):
+    data = pickle.dumps(message)
+    stream.write(struct.pack(">I", len(data)) + data)
+    stream.flush()
+
+
+def compile_tool_source(source, source_hash, future_import):
+    key = (source_hash, future_import)
+    code = _code_cache.get(key)
+    if code is None:
+        if len(_code_cache) >= MAX_CACHED_CODE_OBJECTS:
+            _code_cache.pop(next(iter(_code_cache)))
+        flags = __future__.annotations.compiler_flag if future_import else 0
+        code = _code_cache[key] = compile(source, "<tool>", "exec", flags=flags, dont_inherit=True)
+    return code
+
+
+def run_child(request, tool_code, stdout_file, stderr_file):
+    """Runs in the forked child: execute the call with its own stdio, environment and working directory, then exit."""
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.dup2(stdout_file.fileno(), 1)
+    os.dup2(stderr_file.fileno(), 2)
+
+    os.environ.clear()
+    os.environ.update(request["env"])
+    os.chdir(request["cwd"])
+    sys.path[0] = request["cwd"]
+    if request["env"].get("PYTHONWARNINGS") == "ignore":
+        warnings.simplefilter("ignore")
+
+    namespace = {"__name__": "__main__", "__builtins__": __builtins__, request["tool_code_var_name"]: tool_code}
+    exit_code = 0
+    try:
+        exec(compile(request["script"], "<sandbox>", "exec", dont_inherit=True), namespace)
+    except SystemExit as e:
+        if isinstance(e.code, int) or e.code is None:
+            exit_code = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            exit_code = 1
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    os._exit(exit_code)
+
+
+def wait_for_child(pid, timeout):
+    """Wait for the child to exit, killing it after `timeout` seconds. Returns (returncode, timed_out)."""
+    deadline = time.monotonic() + timeout
+    delay = 0.0005
+    while True:
+        done_pid, status = os.waitpid(pid, os.WNOHANG)
+        if done_pid:
+            return os.waitstatus_to_exitcode(status), False
+        if time.monotonic() >= deadline:
+            os.kill(pid, signal.SIGKILL)
+            _, status = os.waitpid(pid, 0)
+            return os.waitstatus_to_exitcode(status), True
+        time.sleep(delay)
+        delay = min(delay * 2, 0.01)
+
+
+def handle(request):
+    for module in request.get("imports", []):
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+    try:
+        tool_code = compile_tool_source(request["tool_source"], request["tool_source_hash"], request["future_import"])
+    except SyntaxError:
+        # fail the call the same way the interpreter would have
+        return {"returncode": 1, "timed_out": False, "stdout": b"", "stderr": traceback.format_exc().encode()}
+
+    with tempfile.TemporaryFile() as stdout_file, tempfile.TemporaryFile() as stderr_file:
+        # anything still buffered here would otherwise be written again by the child
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            run_child(request, tool_code, stdout_file, stderr_file)
+
+        returncode, timed_out = wait_for_child(pid, request["timeout"])
+        stdout_file.seek(0)
+        stderr_file.seek(0)
+        return {"returncode": returncode, "timed_out": timed_out, "stdout": stdout_file.read(), "stderr": stderr_file.read()}
+
+
+def main():
+    # Keep the protocol pipes to ourselves so nothing printed by imported modules can corrupt them
+    requests = os.fdopen(os.dup(0), "rb")
+    responses = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+
+    # don't let this file's directory shadow modules imported by tools
+    sys.path[0] = os.getcwd()
+
+    while True:
+        request = read_message(requests)
+        if request is None:
+            return
+        try:
+            response = handle(request)
+        except Exception:
+            response = {"error": traceback.format_exc()}
+        write_message(responses, response)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import pickle
+import struct
+import threading
+import weakref
+from typing import Any, Dict, Hashable, List, Optional
+
+from letta.log import get_logger
+from letta.settings import tool_settings
+
+logger = get_logger(__name__)
+
+WORKER_SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "local_sandbox_worker.py")
+
+# Extra time the worker gets to report back after a call's own timeout before it is considered hung
+WORKER_RESPONSE_GRACE_SECONDS = 10
+
+
+def worker_pool_available() -> bool:
+    """Workers fork a child per call, so the pool is only used where fork is available and it hasn't been disabled."""
+    return hasattr(os, "fork") and tool_settings.tool_sandbox_worker_pool_size > 0
+
+
+class LocalSandboxWorker:
+    """A warm sandbox interpreter running `local_sandbox_worker.py`, handling one tool call at a time."""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.calls = 0
+
+    @classmethod
+    async def start(cls, python_executable: str, env: Dict[str, str], cwd: str) -> "LocalSandboxWorker":
+        process = await asyncio.create_subprocess_exec(
+            python_executable,
+            WORKER_SCRIPT_PATH,
+            env=env,
+            cwd=cwd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        return cls(process)
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def run(self, request: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        self.calls += 1
+        data = pickle.dumps(request)
+        self.process.stdin.write(struct.pack(">I", len(data)) + data)
+        await self.process.stdin.drain()
+
+        async def read_response():
+            (length,) = struct.unpack(">I", await self.process.stdout.readexactly(4))
+            return pickle.loads(await self.process.stdout.readexactly(length))
+
+        # the worker enforces the call timeout itself; this only guards against the worker hanging or dying
+        response = await asyncio.wait_for(read_response(), timeout=timeout + WORKER_RESPONSE_GRACE_SECONDS)
+        if "error" in response:
+            raise RuntimeError(f"Local sandbox worker failed: {response['error']}")
+        return response
+
+    async def close(self):
+        if not self.alive:
+            return
+        self.process.stdin.close()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+
+
+class LocalSandboxWorkerPool:
+    """
+    Warm workers for one (sandbox config, python interpreter) pair.
+
+    Workers are started on demand up to `tool_sandbox_worker_pool_size` and recycled after
+    `tool_sandbox_worker_max_calls` calls, or as soon as one fails or hangs.
+    """
+
+    def __init__(self, python_executable: str, env: Dict[str, str], cwd: str):
+        self.python_executable = python_executable
+        self.env = env
+        self.cwd = cwd
+        self._idle: List[LocalSandboxWorker] = []
+        self._num_workers = 0
+        self._available = asyncio.Condition()
+
+    async def run(self, request: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        worker = await self._acquire()
+        try:
+            response = await worker.run(request, timeout)
+        except BaseException:
+            await self._discard(worker)
+            raise
+
+        if worker.calls >= tool_settings.tool_sandbox_worker_max_calls:
+            await self._discard(worker)
+        else:
+            async with self._available:
+                self._idle.append(worker)
+                self._available.notify()
+        return response
+
+    async def _acquire(self) -> LocalSandboxWorker:
+        async with self._available:
+            while True:
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.alive:
+                        return worker
+                    self._num_workers -= 1
+                if self._num_workers < tool_settings.tool_sandbox_worker_pool_size:
+                    self._num_workers += 1
+                    break
+                await self._available.wait()
+
+        try:
+            return await LocalSandboxWorker.start(self.python_executable, self.env, self.cwd)
+        except BaseException:
+            async with self._available:
+                self._num_workers -= 1
+                self._available.notify()
+            raise
+
+    async def _discard(self, worker: LocalSandboxWorker):
+        async with self._available:
+            self._num_workers -= 1
+            self._available.notify()
+        await worker.close()
+
+    async def aclose(self):
+        async with self._available:
+            workers, self._idle = self._idle, []
+            self._num_workers -= len(workers)
+        await asyncio.gather(*(worker.close() for worker in workers))
+
+
+class LocalSandboxWorkerPools:
+    """Worker pools by key, kept per event loop since asyncio subprocesses are bound to the loop that started them."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, LocalSandboxWorkerPool]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get_pool(self, key: Hashable, python_executable: str, env: Dict[str, str], cwd: str) -> LocalSandboxWorkerPool:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pools = self._pools.setdefault(loop, {})
+            pool = pools.get(key)
+            if pool is None:
+                pool = pools[key] = LocalSandboxWorkerPool(python_executable=python_executable, env=env, cwd=cwd)
+            return pool
+
+    async def aclose(self, key: Optional[Hashable] = None):
+        """Stop the idle workers of the running event loop's pools (or just the pool for `key`)."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pools = self._pools.get(loop, {})
+            if key is None:
+                to_close = list(pools.values())
+                pools.clear()
+            else:
+                to_close = [pools.pop(key)] if key in pools else []
+        await asyncio.gather(*(pool.aclose() for pool in to_close))
+
+
+local_sandbox_worker_pools = LocalSandboxWorkerPools()
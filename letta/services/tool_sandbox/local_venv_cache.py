@@ -0,0 +1,191 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from letta.log import get_logger
+from letta.schemas.sandbox_config import LocalSandboxConfig, SandboxType
+from letta.services.helpers.tool_execution_helper import create_venv_for_local_sandbox, install_pip_requirements_for_sandbox
+from letta.settings import tool_settings
+from letta.utils import safe_create_task
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows, where builds are only serialized within the process
+    fcntl = None
+
+if TYPE_CHECKING:
+    from letta.schemas.tool import Tool
+    from letta.schemas.user import User
+
+logger = get_logger(__name__)
+
+VENV_CACHE_DIR_NAME = ".venv_cache"
+VENV_READY_MARKER = ".letta_venv_ready"
+
+
+def resolve_pip_requirements(local_configs: LocalSandboxConfig, tool: Optional["Tool"] = None) -> List[str]:
+    """The sandbox's and the tool's pip requirements as pip install specifiers, deduplicated and sorted."""
+    packages = [f"{req.name}=={req.version}" if req.version else req.name for req in local_configs.pip_requirements or []]
+    if tool and tool.pip_requirements:
+        packages.extend(str(req) for req in tool.pip_requirements)
+    return sorted(set(packages))
+
+
+class LocalVenvCache:
+    """
+    Content-addressed virtual environments for local sandboxes with pip requirements.
+
+    Each distinct set of requirements (together with the sandbox's requirements.txt and the python version) gets its own
+    venv under `<sandbox_dir>/.venv_cache/<hash>`, built once and reused by every tool with the same requirements.
+    The least recently used venvs are removed once a sandbox has more than `tool_sandbox_venv_cache_size` of them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+
+    def venv_key(self, local_configs: LocalSandboxConfig, tool: Optional["Tool"] = None) -> str:
+        sandbox_dir = os.path.expanduser(local_configs.sandbox_dir)
+        requirements_txt_path = os.path.join(sandbox_dir, "requirements.txt")
+        requirements_txt = ""
+        if os.path.isfile(requirements_txt_path):
+            with open(requirements_txt_path, "r") as f:
+                requirements_txt = f.read()
+        spec = {
+            "python": sys.version,
+            "requirements": resolve_pip_requirements(local_configs, tool),
+            "requirements_txt": requirements_txt,
+        }
+        return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+    def get_or_build(
+        self,
+        local_configs: LocalSandboxConfig,
+        tool: Optional["Tool"] = None,
+        env: Optional[Dict[str, str]] = None,
+        force_rebuild: bool = False,
+    ) -> LocalSandboxConfig:
+        """
+        Return a copy of `local_configs` pointing at the venv for its (and the tool's) requirements, building it first
+        if needed. Blocks while pip runs, so call it from a thread.
+        """
+        sandbox_dir = os.path.expanduser(local_configs.sandbox_dir)
+        key = self.venv_key(local_configs, tool)
+        venv_configs = local_configs.model_copy(update={"sandbox_dir": sandbox_dir, "venv_name": os.path.join(VENV_CACHE_DIR_NAME, key)})
+        venv_path = os.path.join(sandbox_dir, venv_configs.venv_name)
+        marker_path = os.path.join(venv_path, VENV_READY_MARKER)
+
+        if not force_rebuild and self._touch(marker_path):
+            return venv_configs
+
+        with self._build_lock(sandbox_dir, key):
+            # another thread or process may have built it while we waited
+            if force_rebuild or not self._touch(marker_path):
+                self._build(venv_configs, venv_path, marker_path, tool, env or os.environ.copy())
+        self._evict(sandbox_dir, keep=key)
+        return venv_configs
+
+    def _build(self, venv_configs: LocalSandboxConfig, venv_path: str, marker_path: str, tool: Optional["Tool"], env: Dict[str, str]):
+        logger.info(f"Building sandbox venv for requirements {resolve_pip_requirements(venv_configs, tool)} at {venv_path}")
+        try:
+            create_venv_for_local_sandbox(
+                sandbox_dir_path=venv_configs.sandbox_dir,
+                venv_path=venv_path,
+                env=env,
+                force_recreate=True,
+            )
+            # the venv is fresh, so there is nothing to upgrade
+            install_pip_requirements_for_sandbox(venv_configs, upgrade=False, user_install_if_no_venv=False, env=env, tool=tool)
+        except Exception:
+            # never leave a half-built venv behind for the next call to pick up
+            shutil.rmtree(venv_path, ignore_errors=True)
+            raise
+        with open(marker_path, "w"):
+            pass
+
+    def _evict(self, sandbox_dir: str, keep: str):
+        cache_dir = os.path.join(sandbox_dir, VENV_CACHE_DIR_NAME)
+        last_used = {}
+        for key in os.listdir(cache_dir):
+            try:
+                last_used[key] = os.path.getmtime(os.path.join(cache_dir, key, VENV_READY_MARKER))
+            except OSError:
+                # lock files, and venvs that are still being built
+                continue
+
+        stale = sorted((key for key in last_used if key != keep), key=last_used.get, reverse=True)[
+            max(tool_settings.tool_sandbox_venv_cache_size - 1, 0) :
+        ]
+        for key in stale:
+            with self._build_lock(sandbox_dir, key, blocking=False) as acquired:
+                if acquired:
+                    logger.info(f"Removing least recently used sandbox venv {key}")
+                    shutil.rmtree(os.path.join(cache_dir, key), ignore_errors=True)
+
+    @staticmethod
+    def _touch(marker_path: str) -> bool:
+        """Mark a venv as used, returns whether it is ready."""
+        try:
+            os.utime(marker_path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    @contextmanager
+    def _build_lock(self, sandbox_dir: str, key: str, blocking: bool = True):
+        """Serializes builds of a venv between threads, and between processes where file locks are available."""
+        with self._lock:
+            thread_lock = self._build_locks.setdefault(os.path.join(sandbox_dir, key), threading.Lock())
+        if not thread_lock.acquire(blocking=blocking):
+            yield False
+            return
+        try:
+            cache_dir = os.path.join(sandbox_dir, VENV_CACHE_DIR_NAME)
+            os.makedirs(cache_dir, exist_ok=True)
+            if fcntl is None:
+                yield True
+                return
+            with open(os.path.join(cache_dir, f"{key}.lock"), "w") as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    yield False
+                    return
+                try:
+                    yield True
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        finally:
+            thread_lock.release()
+
+
+local_venv_cache = LocalVenvCache()
+
+
+async def build_tool_venv_in_background(tool: "Tool", actor: "User") -> Optional[asyncio.Task]:
+    """Start building the venv for a tool's pip requirements ahead of its first call, if it will run in a local venv sandbox."""
+    if not tool.pip_requirements or tool_settings.e2b_api_key:
+        return None
+
+    from letta.services.sandbox_config_manager import SandboxConfigManager
+
+    # a sandbox without a config yet gets the default one, which doesn't use a venv
+    sandbox_config_manager = SandboxConfigManager()
+    sbx_config = await sandbox_config_manager.get_sandbox_config_by_type_async(SandboxType.LOCAL, actor=actor)
+    if not sbx_config or not sbx_config.get_local_config().use_venv:
+        return None
+
+    # build with the same environment the tool will run with, e.g. for custom package indexes
+    env = os.environ.copy()
+    env.update(await sandbox_config_manager.get_sandbox_env_vars_as_dict_async(sandbox_config_id=sbx_config.id, actor=actor, limit=100))
+    return safe_create_task(
+        asyncio.to_thread(local_venv_cache.get_or_build, sbx_config.get_local_config(), tool, env),
+        logger=logger,
+        label=f"build sandbox venv for tool {tool.name}",
+    )
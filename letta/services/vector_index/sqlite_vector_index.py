@@ -0,0 +1,278 @@
+import itertools
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Literal, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from letta.log import get_logger
+from letta.orm.passage import AgentPassage, SourcePassage
+from letta.otel.tracing import trace_method
+from letta.schemas.passage import Passage as PydanticPassage
+from letta.settings import settings
+
+logger = get_logger(__name__)
+
+CollectionKind = Literal["agent", "source"]
+CollectionKey = Tuple[CollectionKind, str]
+
+_INITIAL_CAPACITY = 256
+_LOAD_BATCH_SIZE = 500  # ids per SELECT when pulling unseen embeddings into the index
+_file_generation = itertools.count()
+
+
+@dataclass
+class _EmbeddingMatrix:
+    """Memory-mapped float32 matrix holding every embedding of one agent's archival memory or one source.
+
+    Rows are appended in place and removed by tombstoning; the file is grown by doubling and compacted once
+    more than half of it is dead rows. Row norms are kept alongside so a search is a single matmul.
+    """
+
+    path: Path
+    dim: int
+    capacity: int = _INITIAL_CAPACITY
+    size: int = 0
+    row_by_id: Dict[str, int] = field(default_factory=dict)
+    matrix: np.ndarray = field(init=False)
+    norms: np.ndarray = field(init=False)
+
+    def __post_init__(self):
+        self.matrix = self._allocate(self.capacity)
+        self.norms = np.zeros(self.capacity, dtype=np.float32)
+
+    def _allocate(self, capacity: int) -> np.ndarray:
+        # Every allocation gets a fresh file so resizing never truncates a file that is still mapped
+        path = self.path.with_name(f"{self.path.name}.{next(_file_generation)}.f32")
+        matrix = np.memmap(path, dtype=np.float32, mode="w+", shape=(capacity, self.dim))
+        if getattr(self, "matrix", None) is not None:
+            _unlink_quietly(Path(self.matrix.filename))
+        return matrix
+
+    def _grow(self, min_capacity: int):
+        capacity = self.capacity
+        while capacity < min_capacity:
+            capacity *= 2
+        previous = self.matrix
+        matrix = self._allocate(capacity)
+        matrix[: self.size] = previous[: self.size]
+        norms = np.zeros(capacity, dtype=np.float32)
+        norms[: self.size] = self.norms[: self.size]
+        self.matrix, self.norms, self.capacity = matrix, norms, capacity
+
+    def upsert(self, ids: Sequence[str], embeddings: np.ndarray):
+        embeddings = embeddings[:, : self.dim]
+        new_ids = [passage_id for passage_id in ids if passage_id not in self.row_by_id]
+        if self.size + len(new_ids) > self.capacity:
+            self._grow(self.size + len(new_ids))
+
+        rows = []
+        for passage_id in ids:
+            row = self.row_by_id.get(passage_id)
+            if row is None:
+                row = self.size
+                self.row_by_id[passage_id] = row
+                self.size += 1
+            rows.append(row)
+
+        rows = np.asarray(rows, dtype=np.int64)
+        self.matrix[rows, : embeddings.shape[1]] = embeddings
+        self.matrix[rows, embeddings.shape[1] :] = 0.0
+        self.norms[rows] = np.linalg.norm(embeddings, axis=1)
+
+    def remove(self, ids: Iterable[str]):
+        for passage_id in ids:
+            self.row_by_id.pop(passage_id, None)
+        if self.size > _INITIAL_CAPACITY and len(self.row_by_id) < self.size // 2:
+            self._compact()
+
+    def _compact(self):
+        live_ids = list(self.row_by_id)
+        live_rows = np.fromiter(self.row_by_id.values(), dtype=np.int64, count=len(live_ids))
+        embeddings = np.array(self.matrix[live_rows])
+        self.size = 0
+        self.row_by_id = {}
+        self.upsert(live_ids, embeddings)
+
+    def search(self, query: np.ndarray, ids: Sequence[str], limit: Optional[int]) -> List[Tuple[str, float]]:
+        """Cosine distances from `query` to the given ids, nearest first, truncated to `limit`."""
+        rows = np.fromiter((self.row_by_id[passage_id] for passage_id in ids), dtype=np.int64, count=len(ids))
+        query = np.pad(query[: self.dim], (0, max(0, self.dim - query.shape[0])))
+        if len(rows) * 2 > self.size:
+            # scoring every row and picking the candidates is cheaper than gathering a copy of most of the matrix
+            similarities = (self.matrix[: self.size] @ query)[rows]
+        else:
+            similarities = self.matrix[rows] @ query
+        denominators = self.norms[rows] * np.linalg.norm(query)
+        distances = 1.0 - np.divide(similarities, denominators, out=np.zeros_like(similarities), where=denominators > 0)
+
+        if limit is not None and limit < len(rows):
+            top = np.argpartition(distances, limit - 1)[:limit]
+            # stable sort keeps the caller's (created_at) order between equidistant passages
+            order = top[np.argsort(distances[top], kind="stable")]
+        else:
+            order = np.argsort(distances, kind="stable")
+        return [(ids[i], float(distances[i])) for i in order]
+
+
+def _unlink_quietly(path: Path):
+    try:
+        path.unlink(missing_ok=True)
+    except OSError:
+        # e.g. Windows refuses to delete a file that is still mapped; it gets cleared on the next startup
+        pass
+
+
+def _stack_embeddings(embeddings: Sequence[Sequence[float]]) -> np.ndarray:
+    """Stack (possibly zero-padded) embeddings, trimmed to the widest non-zero column so padding isn't stored."""
+    width = max(len(embedding) for embedding in embeddings)
+    matrix = np.zeros((len(embeddings), width), dtype=np.float32)
+    for i, embedding in enumerate(embeddings):
+        matrix[i, : len(embedding)] = embedding
+    nonzero_columns = np.flatnonzero(matrix.any(axis=0))
+    return matrix[:, : nonzero_columns[-1] + 1] if len(nonzero_columns) else matrix[:, :1]
+
+
+class SqliteVectorIndex:
+    """In-process vector search over passage embeddings for the SQLite backend.
+
+    Replaces ordering by the row-at-a-time `cosine_distance` UDF: each agent's archival memory and each source
+    is loaded once into an `_EmbeddingMatrix`, kept current by the PassageManager's create/update/delete paths,
+    and searched with one batched matmul + argpartition. Searches are always restricted to the candidate ids the
+    caller's SQL filters selected, so rows deleted behind the index's back can never be returned, and candidates
+    the index hasn't seen yet (e.g. written by another process) are loaded on demand.
+    """
+
+    def __init__(self, index_dir: Optional[Path] = None):
+        self._index_dir = index_dir
+        self._collections: Dict[CollectionKey, _EmbeddingMatrix] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.sqlite_vector_index_enabled and not settings.letta_pg_uri_no_default
+
+    @property
+    def index_dir(self) -> Path:
+        if self._index_dir is None:
+            self._index_dir = Path(settings.letta_dir) / "vector_index"
+            # matrices are rebuilt from the database in every process, so files left by a previous run are garbage
+            if self._index_dir.exists():
+                for stale_file in self._index_dir.glob("*.f32"):
+                    _unlink_quietly(stale_file)
+            self._index_dir.mkdir(parents=True, exist_ok=True)
+        return self._index_dir
+
+    @staticmethod
+    def collection_key(passage: PydanticPassage) -> CollectionKey:
+        return ("agent", passage.agent_id) if passage.agent_id else ("source", passage.source_id)
+
+    def _upsert(self, key: CollectionKey, ids: Sequence[str], embeddings: Sequence[Sequence[float]]):
+        if not ids:
+            return
+        matrix = _stack_embeddings(embeddings)
+        collection = self._collections.get(key)
+        if collection is None or collection.dim < matrix.shape[1]:
+            kind, collection_id = key
+            resized = _EmbeddingMatrix(path=self.index_dir / f"{kind}-{collection_id}", dim=matrix.shape[1])
+            if collection is not None:
+                # a wider embedding model showed up; re-home the existing rows at the new width
+                resized.upsert(list(collection.row_by_id), np.array(collection.matrix[list(collection.row_by_id.values())]))
+                _unlink_quietly(Path(collection.matrix.filename))
+            collection = self._collections[key] = resized
+        collection.upsert(ids, matrix)
+
+    # ======================================================================================================================
+    # Write-through from PassageManager
+    # ======================================================================================================================
+    def upsert_passages(self, passages: Sequence[PydanticPassage]):
+        """Add or refresh passages in collections that are already loaded; unloaded collections are built lazily on search."""
+        if not self.enabled:
+            return
+        grouped: Dict[CollectionKey, List[PydanticPassage]] = {}
+        for passage in passages:
+            if passage.embedding is not None:
+                grouped.setdefault(self.collection_key(passage), []).append(passage)
+
+        with self._lock:
+            for key, group in grouped.items():
+                if key in self._collections:
+                    self._upsert(key, [p.id for p in group], [p.embedding for p in group])
+
+    def remove_passages(self, passage_ids: Iterable[str]):
+        if not self.enabled:
+            return
+        passage_ids = set(passage_ids)
+        with self._lock:
+            for collection in self._collections.values():
+                collection.remove(passage_ids & collection.row_by_id.keys())
+
+    def drop_collection(self, kind: CollectionKind, collection_id: str):
+        with self._lock:
+            collection = self._collections.pop((kind, collection_id), None)
+        if collection is not None:
+            _unlink_quietly(Path(collection.matrix.filename))
+
+    # ======================================================================================================================
+    # Search
+    # ======================================================================================================================
+    async def _load_missing_async(self, session: AsyncSession, key: CollectionKey, passage_ids: Sequence[str]):
+        kind, _ = key
+        model = AgentPassage if kind == "agent" else SourcePassage
+        collection = self._collections.get(key)
+        known_ids = collection.row_by_id if collection is not None else {}
+        missing = [passage_id for passage_id in passage_ids if passage_id not in known_ids]
+        for start in range(0, len(missing), _LOAD_BATCH_SIZE):
+            batch = missing[start : start + _LOAD_BATCH_SIZE]
+            result = await session.execute(select(model.id, model.embedding).where(model.id.in_(batch)))
+            rows = [row for row in result if row.embedding is not None]
+            with self._lock:
+                self._upsert(key, [row.id for row in rows], [row.embedding for row in rows])
+
+    @trace_method
+    async def search_async(
+        self,
+        session: AsyncSession,
+        query_embedding: Sequence[float],
+        candidates: Sequence[Tuple[str, CollectionKey]],
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """Rank candidate passages by cosine distance to `query_embedding`.
+
+        Args:
+            session: Session used to load embeddings the index hasn't seen yet.
+            query_embedding: The query embedding (padded or native dimension).
+            candidates: (passage id, collection key) pairs that passed the caller's SQL filters, in tie-break order.
+            limit: Maximum number of ids to return.
+
+        Returns:
+            List[str]: Passage ids, nearest first.
+        """
+        by_collection: Dict[CollectionKey, List[str]] = {}
+        for passage_id, key in candidates:
+            by_collection.setdefault(key, []).append(passage_id)
+
+        for key, passage_ids in by_collection.items():
+            await self._load_missing_async(session, key, passage_ids)
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        ranked: List[Tuple[str, float]] = []
+        with self._lock:
+            for key, passage_ids in by_collection.items():
+                collection = self._collections.get(key)
+                if collection is None:
+                    continue  # none of the candidates have embeddings
+                passage_ids = [passage_id for passage_id in passage_ids if passage_id in collection.row_by_id]
+                if passage_ids:
+                    ranked.extend(collection.search(query, passage_ids, limit))
+
+        if len(by_collection) > 1:
+            position = {passage_id: i for i, (passage_id, _) in enumerate(candidates)}
+            ranked.sort(key=lambda item: (item[1], position[item[0]]))
+        return [passage_id for passage_id, _ in ranked[:limit]]
+
+
+sqlite_vector_index = SqliteVectorIndex()
@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -27,6 +27,12 @@ class ToolSettings(BaseSettings):
     tool_sandbox_timeout: float = 180
     tool_exec_venv_name: Optional[str] = None
     tool_exec_autoreload_venv: bool = True
+    # Warm worker interpreters per local sandbox config (0 runs every tool call in a freshly spawned interpreter)
+    tool_sandbox_worker_pool_size: int = 2
+    # Replace a warm worker after it has run this many tool calls
+    tool_sandbox_worker_max_calls: int = 100
+    # Number of venvs built for distinct pip requirement sets to keep per local sandbox directory
+    tool_sandbox_venv_cache_size: int = 8
 
     # MCP settings
     mcp_connect_to_server_timeout: float = 30.0
@@ -88,6 +94,16 @@ class ModelSettings(BaseSettings):
     # the "model wrapper" is responsible for prompt formatting and function calling parsing
     default_prompt_formatter: str = DEFAULT_WRAPPER_NAME
 
+    # connection pool shared by every OpenAI / Anthropic SDK client (see letta/llm_api/http_client_registry.py)
+    llm_http_max_connections: int = Field(100, description="Max open connections per event loop across all LLM provider hosts")
+    llm_http_max_keepalive_connections: int = Field(20, description="Max idle keep-alive connections kept in the LLM connection pool")
+    llm_http_keepalive_expiry: float = Field(60.0, description="Seconds an idle LLM connection is kept alive")
+    llm_http_connect_timeout: float = Field(10.0, description="Timeout (seconds) for opening a connection to an LLM provider")
+    llm_http2_enabled: bool = Field(True, description="Negotiate HTTP/2 with LLM providers (requires the `h2` package)")
+    llm_client_cache_size: int = Field(
+        256, description="Max number of provider SDK clients kept alive, keyed by provider, base url and API key"
+    )
+
     # openai
     openai_api_key: Optional[str] = None
     openai_api_base: str = Field(
@@ -209,15 +225,57 @@ class Settings(BaseSettings):
     pool_use_lifo: bool = True
     disable_sqlalchemy_pooling: bool = False
 
+    # pgvector HNSW indexes for archival / source passage search
+    pg_vector_index_enabled: bool = Field(default=True, description="Order vector searches by the HNSW-indexed embedding expression")
+    pg_hnsw_m: int = Field(default=16, ge=2, le=100, description="HNSW max connections per layer (applied when the index is built)")
+    pg_hnsw_ef_construction: int = Field(default=64, ge=4, le=1000, description="HNSW candidate list size at build time")
+    pg_hnsw_ef_search: int = Field(default=100, ge=1, le=1000, description="HNSW candidate list size at query time")
+
+    # in-process vector search for the SQLite backend (replaces ordering by the cosine_distance UDF)
+    sqlite_vector_index_enabled: bool = True
+
     redis_host: Optional[str] = Field(default=None, description="Host for Redis instance")
     redis_port: Optional[int] = Field(default=6379, description="Port for Redis instance")
 
+    # per-process cache of agents' in-context messages, invalidated across processes through redis when it is configured
+    in_context_message_cache_size: int = Field(
+        default=512, ge=0, description="Max number of agents whose in-context messages are cached in each process (0 disables the cache)"
+    )
+
+    # content-addressed store for the bytes of message attachments (images), which message rows reference by hash
+    message_blob_storage: Optional[Literal["filesystem", "database"]] = Field(
+        default=None,
+        description="Where message attachments are stored. Defaults to the database when Postgres is configured, so every replica can read "
+        "them, and to the filesystem otherwise. The database is also used if the blob directory isn't writable.",
+    )
+    message_blob_dir: Optional[Path] = Field(
+        default=None, description="Directory of the filesystem message attachment store (defaults to <letta_dir>/message_blobs)"
+    )
+    message_blob_cache_size_bytes: int = Field(
+        default=64 * 1024 * 1024, ge=0, description="Max size of the message attachments cached in each process (0 disables the cache)"
+    )
+
     plugin_register: Optional[str] = None
 
     # multi agent settings
     multi_agent_send_message_max_retries: int = 3
     multi_agent_send_message_timeout: int = 20 * 60
     multi_agent_concurrent_sends: int = 50
+    multi_agent_provider_rate_limit: float = Field(
+        default=0, ge=0, description="Max multi-agent sends started per second per LLM provider, in each process (0 disables rate limiting)"
+    )
+    multi_agent_provider_burst: int = Field(
+        default=10, ge=1, description="Number of multi-agent sends a provider's rate limit lets start at once"
+    )
+
+    # sleeptime agent runs, queued in the database and claimed by any server worker
+    sleeptime_max_concurrent_jobs: int = Field(
+        default=8, ge=1, description="Max number of sleeptime agent runs executing at once across all server workers"
+    )
+    sleeptime_worker_poll_interval_seconds: float = Field(
+        default=5.0, gt=0, description="How often each server worker checks for sleeptime jobs queued by other workers"
+    )
+    sleeptime_job_timeout_seconds: int = Field(default=20 * 60, gt=0, description="Max duration of a sleeptime agent run")
 
     # telemetry logging
     otel_exporter_otlp_endpoint: Optional[str] = None  # otel default: "http://localhost:4317"
@@ -228,6 +286,16 @@ class Settings(BaseSettings):
     llm_api_logging: bool = Field(default=True, description="Enable LLM API logging at each step")
     track_last_agent_run: bool = Field(default=False, description="Update last agent run metrics")
 
+    # write-behind queue for the provider traces of agent steps (see letta/services/provider_trace_writer.py)
+    provider_trace_queue_size: int = Field(
+        default=1000, ge=0, description="Max provider traces waiting to be written per event loop (0 writes them inline)"
+    )
+    provider_trace_batch_size: int = Field(default=100, ge=1, description="Max provider traces written in one insert")
+    provider_trace_flush_interval_seconds: float = Field(default=1.0, gt=0, description="Max time a provider trace waits for its batch")
+    provider_trace_enqueue_timeout_seconds: float = Field(
+        default=0.05, ge=0, description="How long a step waits for room in a full provider trace queue before dropping its trace"
+    )
+
     # uvicorn settings
     uvicorn_workers: int = 1
     uvicorn_reload: bool = False
@@ -1,6 +1,7 @@
 import os
+from functools import lru_cache
 
-from jinja2 import Environment, FileSystemLoader, StrictUndefined
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, Template
 
 TEMPLATE_DIR = os.path.dirname(__file__)
 jinja_env = Environment(
@@ -14,3 +15,9 @@ jinja_env = Environment(
 def render_template(template_name: str, **kwargs):
     template = jinja_env.get_template(template_name)
     return template.render(**kwargs)
+
+
+@lru_cache(maxsize=256)
+def compile_template(source: str) -> Template:
+    """Compile a Jinja2 template string once per process; compiled templates are safe to render concurrently."""
+    return Template(source)
@@ -21,7 +21,6 @@ from typing import Any, Coroutine, Union, _GenericAlias, get_args, get_origin, g
 from urllib.parse import urljoin, urlparse
 
 import demjson3 as demjson
-import tiktoken
 from pathvalidate import sanitize_filename as pathvalidate_sanitize_filename
 
 import letta
@@ -803,12 +802,9 @@ class OpenAIBackcompatUnpickler(pickle.Unpickler):
 
 
 def count_tokens(s: str, model: str = "gpt-4") -> int:
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        print("Falling back to cl100k base for token counting.")
-        encoding = tiktoken.get_encoding("cl100k_base")
-    return len(encoding.encode(s))
+    from letta.helpers.tokenizer import tokenizer
+
+    return tokenizer.count(s, model)
 
 
 def printd(*args, **kwargs):
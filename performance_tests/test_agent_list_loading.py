@@ -0,0 +1,117 @@
+import time
+import uuid
+
+import pytest
+from sqlalchemy import delete, insert
+
+from letta.config import LettaConfig
+from letta.orm.agent import Agent as AgentModel
+from letta.orm.agents_tags import AgentsTags
+from letta.orm.tools_agents import ToolsAgents
+from letta.schemas.embedding_config import EmbeddingConfig
+from letta.schemas.llm_config import LLMConfig
+from letta.server.db import db_registry, track_db_queries
+from letta.server.server import SyncServer
+
+# --- Benchmark Parameters --- #
+
+AGENT_COUNTS = [100, 1_000, 10_000]
+PAGE_SIZE = 50
+CALLS = 20
+TAGS_PER_AGENT = 3
+# roughly the size of a default system prompt, which every full listing drags along
+SYSTEM_PROMPT = "You are a helpful agent. " * 300
+
+
+# --- Server & Data Setup --- #
+
+
+@pytest.fixture(scope="module")
+def server():
+    config = LettaConfig.load()
+    config.save()
+    return SyncServer(init_with_default_org_and_user=True)
+
+
+@pytest.fixture(scope="module")
+def actor(server):
+    return server.user_manager.get_default_user()
+
+
+def _insert_agents(actor, tool_ids, count: int) -> list[str]:
+    """Bulk insert agents with tags and tools attached, creating 10k agents through the API would take far too long."""
+    agent_ids = [f"agent-{uuid.uuid4()}" for _ in range(count)]
+    llm_config = LLMConfig.default_config("gpt-4o-mini")
+    embedding_config = EmbeddingConfig.default_config(provider="openai")
+    with db_registry.session() as session:
+        session.execute(
+            insert(AgentModel),
+            [
+                {
+                    "id": agent_id,
+                    "name": f"bench-agent-{i}",
+                    "system": SYSTEM_PROMPT,
+                    "agent_type": "memgpt_v2_agent",
+                    "message_ids": [],
+                    "message_buffer_autoclear": False,
+                    "llm_config": llm_config,
+                    "embedding_config": embedding_config,
+                    "organization_id": actor.organization_id,
+                }
+                for i, agent_id in enumerate(agent_ids)
+            ],
+        )
+        session.execute(
+            insert(AgentsTags), [{"agent_id": agent_id, "tag": f"tag-{j}"} for agent_id in agent_ids for j in range(TAGS_PER_AGENT)]
+        )
+        session.execute(insert(ToolsAgents), [{"agent_id": agent_id, "tool_id": tool_id} for agent_id in agent_ids for tool_id in tool_ids])
+        session.commit()
+    return agent_ids
+
+
+def _delete_agents(agent_ids: list[str]):
+    with db_registry.session() as session:
+        session.execute(delete(AgentModel).where(AgentModel.id.in_(agent_ids)))
+        session.commit()
+
+
+# --- Benchmark --- #
+
+
+async def _measure(list_page) -> tuple[float, int]:
+    """Average latency and queries of listing one page of agents."""
+    await list_page()  # warm up the connection pool
+    with track_db_queries() as queries:
+        t0 = time.perf_counter()
+        for _ in range(CALLS):
+            await list_page()
+        elapsed = time.perf_counter() - t0
+    return elapsed / CALLS, queries.count // CALLS
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("agent_count", AGENT_COUNTS)
+async def test_list_agents_loading(server, actor, agent_count, event_loop):
+    tool_ids = [tool.id for tool in server.tool_manager.upsert_base_tools(actor=actor)]
+    agent_ids = _insert_agents(actor, tool_ids, agent_count)
+    manager = server.agent_manager
+    try:
+        modes = {
+            "all relationships": lambda: manager.list_agents_async(actor=actor, limit=PAGE_SIZE),
+            "tags and tools": lambda: manager.list_agents_async(actor=actor, limit=PAGE_SIZE, include_relationships=["tags", "tools"]),
+            "no relationships": lambda: manager.list_agents_async(actor=actor, limit=PAGE_SIZE, include_relationships=[]),
+            "summaries": lambda: manager.list_agent_summaries_async(actor=actor, limit=PAGE_SIZE),
+        }
+        results = {mode: await _measure(list_page) for mode, list_page in modes.items()}
+    finally:
+        _delete_agents(agent_ids)
+
+    print(f"\nListing {PAGE_SIZE} of {agent_count} agents ({len(tool_ids)} tools, {TAGS_PER_AGENT} tags each):")
+    for mode, (latency, queries) in results.items():
+        print(f"  {mode:<18} {latency * 1000:>9.2f}ms/call {queries:>3} queries/call")
+
+    # a page of agents is one query, plus one per relationship that is loaded
+    assert results["no relationships"][1] == 1
+    assert results["summaries"][1] == 2
+    assert results["tags and tools"][1] < results["all relationships"][1]
+    assert results["summaries"][0] < results["all relationships"][0]
@@ -0,0 +1,92 @@
+import time
+
+import pytest
+
+from letta.schemas.file import FileMetadata
+from letta.services.file_processor.chunker.line_chunker import LineChunker
+from letta.services.file_processor.chunker.line_index import SPAN_SIZE, LineIndex
+
+# --- Benchmark Parameters --- #
+
+FILE_LINES = [10_000, 100_000]
+ROUNDS = 5
+OPEN_OFFSET = 5_000
+OPEN_LENGTH = 20
+
+
+# --- Data Setup --- #
+
+
+def _file(num_lines: int, file_name: str) -> FileMetadata:
+    content = "\n".join(
+        f"    row {i}: the quick brown fox jumps over the lazy dog. Then it naps under tree {i % 97}." for i in range(num_lines)
+    )
+    return FileMetadata(file_name=file_name, source_id="source-00000000-0000-4000-8000-000000000000", content=content)
+
+
+def _timed(run) -> float:
+    run()
+    t0 = time.perf_counter()
+    for _ in range(ROUNDS):
+        run()
+    return (time.perf_counter() - t0) / ROUNDS
+
+
+# --- Benchmark --- #
+
+
+@pytest.mark.parametrize("file_name", ["data.py", "notes.txt"])
+@pytest.mark.parametrize("num_lines", FILE_LINES)
+def test_open_file_range(num_lines, file_name):
+    """Opening 20 lines of a large file, as open_files does with an offset and length."""
+    file = _file(num_lines, file_name)
+    chunker = LineChunker()
+    start, end = OPEN_OFFSET, OPEN_OFFSET + OPEN_LENGTH
+
+    # what is stored at ingest: the index, and the database returns only its slice and the text it covers
+    line_index = chunker.build_line_index(file)
+    stored_index = line_index.to_bytes()
+
+    def ranged():
+        sliced = LineIndex.from_bytes(line_index.strategy, stored_index[start * SPAN_SIZE : end * SPAN_SIZE])
+        text_start, text_end = sliced.text_span()
+        lines = sliced.chunks(file.content[text_start:text_end], text_offset=text_start)
+        return chunker.format_lines(file, lines, len(stored_index) // SPAN_SIZE, start=start, end=end, validate_range=True)
+
+    def rechunked():
+        return chunker.chunk_text(file, start=start, end=end, validate_range=True)
+
+    assert ranged() == rechunked()
+
+    rechunk_latency = _timed(rechunked)
+    ranged_latency = _timed(ranged)
+    print(f"\nOpening {OPEN_LENGTH} of {num_lines} lines of {file_name}:")
+    print(f"  re-chunk:   {rechunk_latency * 1000:>9.3f}ms")
+    print(f"  line index: {ranged_latency * 1000:>9.3f}ms ({rechunk_latency / ranged_latency:.1f}x)")
+    assert ranged_latency < rechunk_latency
+
+
+@pytest.mark.parametrize("num_lines", FILE_LINES)
+def test_grep_file(num_lines):
+    """Grepping every line of a large file, as grep_files does."""
+    file = _file(num_lines, "data.py")
+    chunker = LineChunker()
+    line_index = chunker.build_line_index(file)
+
+    def format_and_parse():
+        found = []
+        for formatted_line in chunker.chunk_text(file)[1:]:
+            line_num, content = formatted_line.split(":", 1)
+            if "tree 42." in content.strip():
+                found.append(int(line_num))
+        return found
+
+    def indexed():
+        return [i + 1 for i, line in enumerate(line_index.chunks(file.content)) if "tree 42." in line.strip()]
+
+    assert indexed() == format_and_parse()
+    legacy_latency = _timed(format_and_parse)
+    indexed_latency = _timed(indexed)
+    print(f"\nGrepping {num_lines} lines:")
+    print(f"  re-chunk, format and parse: {legacy_latency * 1000:>9.2f}ms")
+    print(f"  line index:                 {indexed_latency * 1000:>9.2f}ms ({legacy_latency / indexed_latency:.1f}x)")
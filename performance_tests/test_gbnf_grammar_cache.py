@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from letta.local_llm import chat_completion_proxy
+from letta.local_llm.chat_completion_proxy import generate_grammar_and_documentation
+
+# --- Benchmark Parameters --- #
+
+TOOL_COUNTS = [4, 16, 32]
+STEPS = 20
+
+
+# --- Data Setup --- #
+
+
+def _make_tool(i: int):
+    def tool(query: str, limit: int, include_archived: bool) -> str:
+        """
+        Look up records matching a query.
+
+        Args:
+            query (str): The text to search for.
+            limit (int): The maximum number of records to return.
+            include_archived (bool): Whether to also search archived records.
+
+        Returns:
+            str: The matching records.
+        """
+        return query
+
+    tool.__name__ = f"lookup_{i}"
+    return tool
+
+
+def _tools(count: int) -> dict:
+    return {f"lookup_{i}": _make_tool(i) for i in range(count)}
+
+
+# --- Benchmark --- #
+
+
+def _step(functions_python: dict):
+    generate_grammar_and_documentation(
+        functions_python=functions_python,
+        add_inner_thoughts_top_level=False,
+        add_inner_thoughts_param_level=True,
+        allow_only_inner_thoughts=False,
+    )
+
+
+def _agent_steps(functions_python: dict, cached: bool) -> float:
+    """Grammar generation time over an agent's steps, with the same tool set on every step as in a llama.cpp/koboldcpp agent."""
+    chat_completion_proxy._grammar_cache.clear()
+    t0 = time.perf_counter()
+    for _ in range(STEPS):
+        if not cached:
+            # what every step paid before grammars were cached
+            chat_completion_proxy._grammar_cache.clear()
+        _step(functions_python)
+    return time.perf_counter() - t0
+
+
+@pytest.mark.parametrize("tool_count", TOOL_COUNTS)
+def test_grammar_generation_per_step(tool_count):
+    functions_python = _tools(tool_count)
+
+    uncached = _agent_steps(functions_python, cached=False)
+    cached = _agent_steps(functions_python, cached=True)
+
+    print(f"\n{tool_count} tools over {STEPS} steps:")
+    print(f"  uncached: {uncached / STEPS * 1000:>9.2f}ms/step")
+    print(f"  cached: {cached / STEPS * 1000:>9.2f}ms/step ({uncached / cached:.1f}x)")
+
+    # only the first step generates the grammar, the rest are a hash of the tool signatures
+    assert cached < uncached
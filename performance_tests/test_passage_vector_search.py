@@ -0,0 +1,141 @@
+import os
+import time
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, insert, select, text
+
+from letta.services.helpers.agent_manager_helper import embedding_dimension_filter, hnsw_embedding_expression, pgvector_cosine_distance
+from letta.settings import settings
+
+# --- Benchmark Parameters --- #
+
+NUM_PASSAGES = int(os.getenv("LETTA_BENCH_NUM_PASSAGES", "20000"))
+NATIVE_DIM = 1536  # e.g. text-embedding-3-small, stored at native dimension like real passages
+NUM_QUERIES = 50
+TOP_K = 10
+EF_SEARCH_VALUES = [10, 20, 40, 100, 200, 400]
+INSERT_BATCH_SIZE = 1000
+
+pytestmark = pytest.mark.skipif(not settings.letta_pg_uri_no_default, reason="HNSW benchmark requires Postgres with pgvector")
+
+
+# --- Data Setup --- #
+
+
+def _clustered_embeddings(rng: np.random.Generator, n: int, n_clusters: int = 64) -> np.ndarray:
+    """Gaussian-mixture embeddings, closer to real text embeddings than uniform noise."""
+    centers = rng.standard_normal((n_clusters, NATIVE_DIM)).astype(np.float32)
+    vectors = centers[rng.integers(0, n_clusters, n)] + 0.35 * rng.standard_normal((n, NATIVE_DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.fixture(scope="module")
+def bench_table():
+    from pgvector.sqlalchemy import Vector
+
+    engine = create_engine(settings.letta_pg_uri)
+    metadata = MetaData()
+    table = Table(
+        "bench_hnsw_passages",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("embedding", Vector()),
+    )
+    metadata.drop_all(engine, tables=[table])
+    metadata.create_all(engine, tables=[table])
+
+    rng = np.random.default_rng(0)
+    corpus = _clustered_embeddings(rng, NUM_PASSAGES)
+    with engine.begin() as conn:
+        for start in range(0, NUM_PASSAGES, INSERT_BATCH_SIZE):
+            batch = corpus[start : start + INSERT_BATCH_SIZE]
+            conn.execute(insert(table), [{"id": start + i, "embedding": row.tolist()} for i, row in enumerate(batch)])
+
+        t0 = time.perf_counter()
+        index_expression = hnsw_embedding_expression(table.c.embedding, NATIVE_DIM).compile(engine, compile_kwargs={"literal_binds": True})
+        conn.execute(
+            text(
+                f"CREATE INDEX bench_hnsw_passages_embedding_idx ON bench_hnsw_passages "
+                f"USING hnsw (({index_expression}) vector_cosine_ops) "
+                f"WITH (m = {settings.pg_hnsw_m}, ef_construction = {settings.pg_hnsw_ef_construction}) "
+                f"WHERE vector_dims(embedding) = {NATIVE_DIM}"
+            )
+        )
+        print(f"Built HNSW index over {NUM_PASSAGES} passages in {time.perf_counter() - t0:.1f}s")
+
+    yield engine, table, corpus, rng
+
+    metadata.drop_all(engine, tables=[table])
+    engine.dispose()
+
+
+# --- Benchmark --- #
+
+
+def _timed_search(conn, query) -> tuple[list[int], float]:
+    t0 = time.perf_counter()
+    ids = list(conn.execute(query).scalars())
+    return ids, time.perf_counter() - t0
+
+
+def test_hnsw_recall_vs_latency(bench_table):
+    engine, table, corpus, rng = bench_table
+    queries = _clustered_embeddings(rng, NUM_QUERIES)
+    ground_truth = [set(np.argsort(-(corpus @ q))[:TOP_K].tolist()) for q in queries]
+
+    def indexed_query(q: np.ndarray):
+        distance = pgvector_cosine_distance(table.c.embedding, q.tolist(), NATIVE_DIM)
+        return select(table.c.id).where(embedding_dimension_filter(table.c.embedding, NATIVE_DIM)).order_by(distance.asc()).limit(TOP_K)
+
+    # Make sure the query shape used by the passage managers is actually served by the index
+    with engine.connect() as conn:
+        compiled = indexed_query(queries[0]).compile(engine, compile_kwargs={"literal_binds": True})
+        plan = "\n".join(row[0] for row in conn.exec_driver_sql(f"EXPLAIN {compiled}"))
+        assert "bench_hnsw_passages_embedding_idx" in plan, plan
+
+    results = {}
+    with engine.connect() as conn:
+        # Exact baseline: sequential scan over every embedding
+        with conn.begin():
+            conn.execute(text("SET LOCAL enable_indexscan = off"))
+            exact_latencies = []
+            for q in queries:
+                query = select(table.c.id).order_by(table.c.embedding.cosine_distance(q.tolist()).asc()).limit(TOP_K)
+                _, latency = _timed_search(conn, query)
+                exact_latencies.append(latency)
+
+        for ef_search in EF_SEARCH_VALUES:
+            latencies, recalls = [], []
+            with conn.begin():
+                conn.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+                for q, truth in zip(queries, ground_truth):
+                    ids, latency = _timed_search(conn, indexed_query(q))
+                    latencies.append(latency)
+                    recalls.append(len(truth & set(ids)) / TOP_K)
+            results[ef_search] = (float(np.mean(recalls)), float(np.percentile(latencies, 50)), float(np.percentile(latencies, 95)))
+
+    exact_p50 = float(np.percentile(exact_latencies, 50))
+    print(f"\nexact scan: p50={exact_p50 * 1000:.1f}ms p95={np.percentile(exact_latencies, 95) * 1000:.1f}ms")
+    print(f"{'ef_search':>10} {'recall@' + str(TOP_K):>10} {'p50 (ms)':>10} {'p95 (ms)':>10} {'speedup':>8}")
+    for ef_search, (recall, p50, p95) in results.items():
+        print(f"{ef_search:>10} {recall:>10.3f} {p50 * 1000:>10.1f} {p95 * 1000:>10.1f} {exact_p50 / p50:>7.1f}x")
+
+    fig, ax = plt.subplots(figsize=(6, 4))
+    ax.plot([r[1] * 1000 for r in results.values()], [r[0] for r in results.values()], marker="o")
+    for ef_search, (recall, p50, _) in results.items():
+        ax.annotate(f"ef={ef_search}", (p50 * 1000, recall))
+    ax.axvline(exact_p50 * 1000, linestyle="--", color="gray", label="exact scan p50")
+    ax.set_xlabel("p50 latency (ms)")
+    ax.set_ylabel(f"recall@{TOP_K}")
+    ax.set_title(f"HNSW recall vs. latency ({NUM_PASSAGES} passages)")
+    ax.legend()
+    plt.tight_layout()
+    plt.savefig("hnsw_recall_vs_latency.png", dpi=150)
+    print("Saved hnsw_recall_vs_latency.png")
+
+    # The default ef_search should be both accurate and faster than scanning every row
+    default_recall, default_p50, _ = results[min(EF_SEARCH_VALUES, key=lambda ef: abs(ef - settings.pg_hnsw_ef_search))]
+    assert default_recall >= 0.9
+    assert default_p50 < exact_p50
@@ -0,0 +1,69 @@
+import json
+import random
+import time
+
+import pytest
+
+from letta.server.rest_api.json_parser import IncrementalJSONParser, OptimisticJSONParser, PydanticJSONParser
+
+# --- Benchmark Parameters --- #
+
+PAYLOAD_SIZES_KB = [10, 50, 100]
+CHUNK_SIZE = 8  # roughly what providers send per tool call argument delta
+
+
+# --- Data Setup --- #
+
+
+def _tool_call_arguments(size_kb: int) -> str:
+    """send_message-style arguments with long streamed string values."""
+    rng = random.Random(size_kb)
+    words = ["the", "agent", "memory", "block", "tool", "call", "é", '"quoted"', "line\n", "漢字"]
+    text = " ".join(rng.choice(words) for _ in range(size_kb * 1024 // 5))
+    return json.dumps({"inner_thoughts": text[: len(text) // 4], "message": text, "request_heartbeat": False})[: size_kb * 1024]
+
+
+def _chunks(arguments: str) -> list[str]:
+    return [arguments[i : i + CHUNK_SIZE] for i in range(0, len(arguments), CHUNK_SIZE)]
+
+
+# --- Benchmark --- #
+
+
+def _reparse_stream(parser, chunks: list[str]) -> float:
+    """What the streaming interfaces did before: re-parse the whole accumulated buffer on every delta."""
+    t0 = time.perf_counter()
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        parser.parse(buffer)
+    return time.perf_counter() - t0
+
+
+def _incremental_stream(chunks: list[str]) -> float:
+    parser = IncrementalJSONParser()
+    t0 = time.perf_counter()
+    offset = 0
+    for chunk in chunks:
+        parser.feed(chunk)
+        offset += len(parser.read_string("message", offset) or "")
+    return time.perf_counter() - t0
+
+
+@pytest.mark.parametrize("size_kb", PAYLOAD_SIZES_KB)
+def test_streaming_parse_throughput(size_kb):
+    chunks = _chunks(_tool_call_arguments(size_kb))
+
+    incremental = _incremental_stream(chunks)
+    pydantic = _reparse_stream(PydanticJSONParser(), chunks)
+    # the optimistic parser is far slower still, so only time it on the smallest payload
+    optimistic = _reparse_stream(OptimisticJSONParser(strict=False), chunks) if size_kb == PAYLOAD_SIZES_KB[0] else None
+
+    print(f"\n{size_kb} KB in {len(chunks)} deltas:")
+    print(f"  incremental: {incremental * 1000:>9.1f}ms")
+    print(f"  pydantic re-parse: {pydantic * 1000:>9.1f}ms ({pydantic / incremental:.1f}x)")
+    if optimistic is not None:
+        print(f"  optimistic re-parse: {optimistic * 1000:>9.1f}ms ({optimistic / incremental:.1f}x)")
+
+    # re-parsing is quadratic in the payload size, feeding fragments is linear
+    assert incremental < pydantic
@@ -0,0 +1,117 @@
+import os
+import time
+
+import pytest
+import tiktoken
+
+from letta.helpers.tokenizer import Tokenizer, tokenizer
+from letta.local_llm.utils import num_tokens_from_messages
+
+# --- Benchmark Parameters --- #
+
+HISTORY_LENGTHS = [100, 1_000]
+MODEL = "gpt-4o-mini"
+ROUNDS = 5
+STEPS = 20
+# roughly the size of a system prompt with its memory blocks, which is counted on every step
+SYSTEM_PROMPT = "\n".join(
+    f"Memory {i}: the user prefers concise answers about topic {i} and works in timezone UTC+{i % 12}." for i in range(800)
+)
+
+
+# --- Data Setup --- #
+
+
+def _history(length: int) -> list[dict]:
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+    for i in range(length - 1):
+        if i % 3 == 0:
+            messages.append({"role": "user", "content": f"Message {i}: can you look up the order history of customer {i}?"})
+        elif i % 3 == 1:
+            arguments = f'{{"query": "orders of customer {i}", "limit": 10, "request_heartbeat": true}}'
+            messages.append(
+                {
+                    "role": "assistant",
+                    "content": "Looking up the customer's orders.",
+                    "tool_calls": [{"id": f"call_{i}", "type": "function", "function": {"name": "lookup", "arguments": arguments}}],
+                }
+            )
+        else:
+            messages.append(
+                {"role": "tool", "content": f"Order {i}: 3 items shipped on 2024-05-0{i % 9 + 1}. " * 10, "tool_call_id": f"call_{i}"}
+            )
+    return messages
+
+
+# --- Benchmark --- #
+
+
+def _legacy_num_tokens_from_messages(messages: list[dict]) -> int:
+    """What counting a history cost before: an encoder lookup per call, and one string encoded at a time."""
+    encoding = tiktoken.encoding_for_model("gpt-4-0613")
+    num_tokens = 0
+    for message in messages:
+        num_tokens += 3
+        for key, value in message.items():
+            if key == "tool_calls":
+                tool_call_encoding = tiktoken.encoding_for_model("gpt-4-0613")
+                for tool_call in value:
+                    num_tokens += len(tool_call_encoding.encode(tool_call["id"]))
+                    num_tokens += 2 + len(tool_call_encoding.encode(tool_call["type"]))
+                    num_tokens += 2 + len(tool_call_encoding.encode(tool_call["function"]["name"]))
+                    num_tokens += 2 + len(tool_call_encoding.encode(tool_call["function"]["arguments"]))
+                num_tokens += 12
+            elif value is not None:
+                num_tokens += len(encoding.encode(value))
+    return num_tokens + 3
+
+
+def _timed(count, rounds: int = ROUNDS) -> float:
+    count()  # load the encoding
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        count()
+    return (time.perf_counter() - t0) / rounds
+
+
+@pytest.mark.parametrize("history_length", HISTORY_LENGTHS)
+def test_count_history_tokens(history_length):
+    messages = _history(history_length)
+    assert num_tokens_from_messages(messages, model=MODEL) == _legacy_num_tokens_from_messages(messages)
+
+    def batched():
+        tokenizer.clear()
+        return num_tokens_from_messages(messages, model=MODEL)
+
+    texts = [message["content"] for message in messages[1:]]
+    results = {
+        "legacy": _timed(lambda: _legacy_num_tokens_from_messages(messages)),
+        "batched": _timed(batched),
+        "batched, cached": _timed(lambda: num_tokens_from_messages(messages, model=MODEL)),
+    }
+    serial = _timed(lambda: Tokenizer(max_workers=1).count_batch(texts, model=MODEL))
+    parallel = _timed(lambda: Tokenizer(max_workers=4).count_batch(texts, model=MODEL))
+
+    print(f"\nCounting a history of {history_length} messages:")
+    for mode, latency in results.items():
+        print(f"  {mode:<16} {latency * 1000:>9.2f}ms ({results['legacy'] / latency:.1f}x)")
+    print(f"Encoding its {len(texts)} message texts ({os.cpu_count()} CPUs):")
+    print(f"  1 thread         {serial * 1000:>9.2f}ms")
+    print(f"  4 threads        {parallel * 1000:>9.2f}ms ({serial / parallel:.1f}x)")
+
+
+def test_count_system_prompt_per_step():
+    """Counting the system prompt on every step of an agent, as the summarizer and the legacy agent loop do."""
+    encoding = tiktoken.encoding_for_model("gpt-4")
+
+    def legacy():
+        return len(tiktoken.encoding_for_model("gpt-4").encode(SYSTEM_PROMPT))
+
+    legacy_latency = _timed(legacy, rounds=STEPS)
+    cached_latency = _timed(lambda: tokenizer.count(SYSTEM_PROMPT, model="gpt-4"), rounds=STEPS)
+    assert tokenizer.count(SYSTEM_PROMPT, model="gpt-4") == len(encoding.encode(SYSTEM_PROMPT))
+
+    print(f"\nCounting a {len(SYSTEM_PROMPT)} character system prompt over {STEPS} steps:")
+    print(f"  legacy: {legacy_latency * 1000:>9.3f}ms/step")
+    print(f"  cached: {cached_latency * 1000:>9.3f}ms/step ({legacy_latency / cached_latency:.1f}x)")
+    assert cached_latency < legacy_latency
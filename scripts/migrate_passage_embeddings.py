@@ -0,0 +1,12 @@
+"""Rewrite passage embeddings that are still zero-padded to MAX_EMBEDDING_DIM at their native dimension.
+
+Postgres deployments get this from `alembic upgrade head`; run this for SQLite databases, or to pick up Postgres rows
+whose padding didn't match their embedding config.
+"""
+
+import asyncio
+
+from letta.services.passage_manager import PassageManager
+
+rewritten = asyncio.run(PassageManager().rewrite_padded_embeddings_async())
+print(f"Rewrote {rewritten} passage embeddings at their native dimension")
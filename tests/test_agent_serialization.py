@@ -1,3 +1,4 @@
+import base64
 import difflib
 import json
 import os
@@ -20,12 +21,15 @@ from letta.schemas.agent import AgentState, CreateAgent
 from letta.schemas.block import Block, CreateBlock
 from letta.schemas.embedding_config import EmbeddingConfig
 from letta.schemas.enums import MessageRole
+from letta.schemas.letta_message_content import Base64Image, ImageContent, TextContent
 from letta.schemas.llm_config import LLMConfig
-from letta.schemas.message import MessageCreate
+from letta.schemas.message import Message, MessageCreate
 from letta.schemas.organization import Organization
 from letta.schemas.user import User
 from letta.serialize_schemas.pydantic_agent_schema import AgentSchema
 from letta.server.server import SyncServer
+from letta.services.message_blob_store import message_blob_store
+from letta.settings import settings
 from tests.utils import create_tool_from_func
 
 console = Console()
@@ -610,6 +614,101 @@ def test_agent_serialize_update_blocks(disable_e2b_api_key, server, serialize_te
     assert copy_agent_response.completion_tokens > 0 and copy_agent_response.step_count > 0
 
 
+async def _collect_lines(lines: List[str]):
+    for line in lines:
+        yield line
+
+
+@pytest.mark.asyncio
+async def test_agent_serialize_stream_roundtrip(server, serialize_test_agent, default_user, other_user):
+    """Test that an NDJSON export imports back into an agent with the same messages and context window."""
+    lines = [line async for line in server.agent_manager.serialize_stream_async(agent_id=serialize_test_agent.id, actor=default_user)]
+    assert json.loads(lines[0])["type"] == "header"
+    assert json.loads(lines[-1])["type"] == "footer"
+
+    agent_copy = await server.agent_manager.deserialize_stream_async(
+        lines=_collect_lines(lines), actor=other_user, append_copy_suffix=False
+    )
+
+    original_messages = server.agent_manager.get_in_context_messages(agent_id=serialize_test_agent.id, actor=default_user)
+    copied_messages = server.agent_manager.get_in_context_messages(agent_id=agent_copy.id, actor=other_user)
+    assert agent_copy.id != serialize_test_agent.id
+    assert agent_copy.name == serialize_test_agent.name
+    assert [m.role for m in copied_messages] == [m.role for m in original_messages]
+    assert [m.content for m in copied_messages] == [m.content for m in original_messages]
+    assert {b.label: b.value for b in agent_copy.memory.blocks} == {b.label: b.value for b in serialize_test_agent.memory.blocks}
+    assert {t.name for t in agent_copy.tools} == {t.name for t in serialize_test_agent.tools}
+
+
+@pytest.mark.asyncio
+async def test_agent_serialize_stream_truncated(server, serialize_test_agent, default_user, other_user):
+    """Test that a truncated NDJSON export is rejected without leaving a partial agent behind."""
+    lines = [line async for line in server.agent_manager.serialize_stream_async(agent_id=serialize_test_agent.id, actor=default_user)]
+    agents_before = server.agent_manager.list_agents(actor=other_user)
+
+    with pytest.raises(ValueError):
+        await server.agent_manager.deserialize_stream_async(lines=_collect_lines(lines[:-1]), actor=other_user)
+
+    assert len(server.agent_manager.list_agents(actor=other_user)) == len(agents_before)
+
+
+@pytest.mark.asyncio
+async def test_agent_serialize_stream_out_of_order(server, serialize_test_agent, default_user, other_user):
+    """Test that block or tool lines after the messages are rejected rather than silently dropped."""
+    lines = [line async for line in server.agent_manager.serialize_stream_async(agent_id=serialize_test_agent.id, actor=default_user)]
+    types = [json.loads(line)["type"] for line in lines]
+    block_index, first_message_index = types.index("block"), types.index("message")
+    reordered = (
+        lines[:block_index] + lines[block_index + 1 : first_message_index + 1] + [lines[block_index]] + lines[first_message_index + 1 :]
+    )
+    agents_before = server.agent_manager.list_agents(actor=other_user)
+
+    with pytest.raises(ValueError, match="block line after its messages or passages"):
+        await server.agent_manager.deserialize_stream_async(lines=_collect_lines(reordered), actor=other_user)
+
+    assert len(server.agent_manager.list_agents(actor=other_user)) == len(agents_before)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("export_format", ["json", "ndjson"])
+async def test_agent_serialize_images(server, serialize_test_agent, default_user, other_user, export_format, tmp_path, monkeypatch):
+    """Test that images, which stored messages only reference, are exported with their data and imported on a fresh store."""
+    monkeypatch.setattr(settings, "message_blob_storage", "filesystem")
+    monkeypatch.setattr(settings, "message_blob_dir", tmp_path / "exporting")
+    image_data = base64.b64encode(os.urandom(1024)).decode("utf-8")
+    image_message = Message(
+        agent_id=serialize_test_agent.id,
+        role=MessageRole.user,
+        content=[TextContent(text="look"), ImageContent(source=Base64Image(media_type="image/png", data=image_data))],
+    )
+    server.agent_manager.append_to_in_context_messages([image_message], agent_id=serialize_test_agent.id, actor=default_user)
+    stored = server.agent_manager.get_in_context_messages(agent_id=serialize_test_agent.id, actor=default_user)[-1]
+    assert stored.content[1].source.data is None
+
+    if export_format == "json":
+        result = server.agent_manager.serialize(agent_id=serialize_test_agent.id, actor=default_user)
+        assert result.messages[-1].content[1].source.data == image_data
+    else:
+        lines = [line async for line in server.agent_manager.serialize_stream_async(agent_id=serialize_test_agent.id, actor=default_user)]
+        assert [json.loads(line)["data"]["content"][1]["source"]["data"] for line in lines if "look" in line] == [image_data]
+
+    # a server that never had the image
+    monkeypatch.setattr(settings, "message_blob_dir", tmp_path / "importing")
+    message_blob_store.clear_cache()
+    if export_format == "json":
+        agent_copy = server.agent_manager.deserialize(serialized_agent=result, actor=other_user)
+    else:
+        agent_copy = await server.agent_manager.deserialize_stream_async(lines=_collect_lines(lines), actor=other_user)
+
+    copied = server.agent_manager.get_in_context_messages(agent_id=agent_copy.id, actor=other_user)[-1]
+    assert copied.content[1].source.data is None
+    message_blob_store.clear_cache()
+    [loaded] = message_blob_store.load_images([copied])
+    assert loaded.content[1].source.data == image_data
+    recalled = await server.get_agent_recall_async(agent_id=agent_copy.id, actor=other_user)
+    assert recalled[-1].content[1].source.data == image_data
+
+
 # FastAPI endpoint tests
 
 
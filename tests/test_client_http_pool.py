@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from letta.client.async_client import AsyncRESTClient
+from letta.client.http import AsyncRetryTransport, RetryTransport
+from letta.schemas.agent import CreateAgent
+
+
+def _agent_json(agent_id: str, name: str) -> dict:
+    return {
+        "id": agent_id,
+        "name": name,
+        "system": "",
+        "agent_type": "memgpt_agent",
+        "llm_config": {"model": "gpt-4o-mini", "model_endpoint_type": "openai", "context_window": 128000},
+        "embedding_config": {"embedding_endpoint_type": "openai", "embedding_model": "text-embedding-3-small", "embedding_dim": 1536},
+        "memory": {"blocks": []},
+        "tools": [],
+        "sources": [],
+        "tags": [],
+    }
+
+
+def test_retry_transport_retries_overloaded_idempotent_requests():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.method)
+        if len(attempts) < 3:
+            return httpx.Response(503, headers={"retry-after": "0"})
+        return httpx.Response(200, json={"ok": True})
+
+    with httpx.Client(transport=RetryTransport(httpx.MockTransport(handler), max_retries=3, backoff=0)) as client:
+        assert client.get("http://letta.test/v1/agents").status_code == 200
+    assert attempts == ["GET"] * 3
+
+
+def test_retry_transport_does_not_resend_processed_posts():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.method)
+        return httpx.Response(503)
+
+    with httpx.Client(transport=RetryTransport(httpx.MockTransport(handler), max_retries=3, backoff=0)) as client:
+        assert client.post("http://letta.test/v1/agents").status_code == 503
+    assert attempts == ["POST"]
+
+
+def test_retry_transport_retries_connection_errors_for_any_method():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.method)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, json={})
+
+    with httpx.Client(transport=RetryTransport(httpx.MockTransport(handler), max_retries=2, backoff=0)) as client:
+        assert client.post("http://letta.test/v1/agents").status_code == 200
+    assert attempts == ["POST", "POST"]
+
+
+@pytest.mark.asyncio
+async def test_async_client_create_agents_bounded_and_ordered():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        name = json.loads(request.content)["name"]
+        # finish out of order, so results must be put back in request order
+        await asyncio.sleep(0.01 if name.endswith("0") else 0)
+        in_flight -= 1
+        if name == "agent-7":
+            return httpx.Response(500, text="boom")
+        return httpx.Response(200, json=_agent_json(f"agent-{name}", name))
+
+    http_client = httpx.AsyncClient(transport=AsyncRetryTransport(httpx.MockTransport(handler), backoff=0))
+    async with AsyncRESTClient("http://letta.test", http_client=http_client) as client:
+        requests = [CreateAgent(name=f"agent-{i}") for i in range(20)]
+        results = await client.create_agents(requests, max_concurrency=4, return_exceptions=True)
+
+        assert max_in_flight <= 4
+        assert isinstance(results[7], ValueError)
+        assert [result.name for i, result in enumerate(results) if i != 7] == [f"agent-{i}" for i in range(20) if i != 7]
+
+        with pytest.raises(ValueError):
+            await client.create_agents(requests, max_concurrency=4)
+
+    # the client doesn't close an httpx client it was given
+    assert not http_client.is_closed
+    await http_client.aclose()
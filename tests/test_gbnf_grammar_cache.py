@@ -0,0 +1,63 @@
+from letta.local_llm import chat_completion_proxy
+from letta.local_llm.chat_completion_proxy import generate_grammar_and_documentation
+
+
+def lookup(query: str, limit: int) -> str:
+    """
+    Look up records matching a query.
+
+    Args:
+        query (str): The text to search for.
+        limit (int): The maximum number of records to return.
+
+    Returns:
+        str: The matching records.
+    """
+    return query
+
+
+def _generate(functions_python: dict, top_level: bool = False):
+    return generate_grammar_and_documentation(
+        functions_python=functions_python,
+        add_inner_thoughts_top_level=top_level,
+        add_inner_thoughts_param_level=not top_level,
+        allow_only_inner_thoughts=top_level,
+    )
+
+
+def test_grammar_cached_per_function_set():
+    chat_completion_proxy._grammar_cache.clear()
+
+    grammar, documentation = _generate({"lookup": lookup})
+    assert _generate({"lookup": lookup}) == (grammar, documentation)
+    assert len(chat_completion_proxy._grammar_cache) == 1
+
+    # placing inner thoughts elsewhere changes the grammar
+    top_level_grammar, _ = _generate({"lookup": lookup}, top_level=True)
+    assert top_level_grammar != grammar
+    assert len(chat_completion_proxy._grammar_cache) == 2
+
+
+def test_grammar_cache_key_tracks_signature_and_docstring():
+    chat_completion_proxy._grammar_cache.clear()
+
+    def lookup_changed(query: str, limit: int, include_archived: bool) -> str:
+        """
+        Look up records matching a query.
+
+        Args:
+            query (str): The text to search for.
+            limit (int): The maximum number of records to return.
+            include_archived (bool): Whether to also search archived records.
+
+        Returns:
+            str: The matching records.
+        """
+        return query
+
+    lookup_changed.__name__ = "lookup"
+    grammar, _ = _generate({"lookup": lookup})
+    changed_grammar, changed_documentation = _generate({"lookup": lookup_changed})
+    assert changed_grammar != grammar
+    assert "include_archived" in changed_documentation
+    assert len(chat_completion_proxy._grammar_cache) == 2
@@ -0,0 +1,49 @@
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative `python -X importtime` budgets, in microseconds. These are generous so they hold on slow CI machines, but an
+# eager import of the ORM, schemas or a provider SDK at the package root blows well past them.
+IMPORT_TIME_BUDGETS_US = {
+    "letta": 500_000,
+    "letta.main": 1_500_000,
+}
+
+# modules that `import letta` must not load, they are only imported once the attribute or command needing them is used
+HEAVY_MODULES = ["letta.orm", "letta.schemas.agent", "letta.client.client", "openai", "anthropic", "composio", "sqlalchemy"]
+
+
+def _cumulative_import_time_us(module: str) -> int:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True, timeout=120
+    )
+    # lines look like "import time:  self [us] | cumulative | imported package", the top-level module is the unindented one
+    for line in result.stderr.splitlines():
+        _, _, fields = line.partition("import time:")
+        parts = fields.split("|")
+        if len(parts) == 3 and parts[2].strip() == module and not parts[2].startswith("  "):
+            return int(parts[1])
+    raise AssertionError(f"{module} not found in importtime output:\n{result.stderr[-2000:]}")
+
+
+@pytest.mark.parametrize("module", list(IMPORT_TIME_BUDGETS_US))
+def test_import_time_budget(module):
+    elapsed_us = min(_cumulative_import_time_us(module) for _ in range(3))
+    assert elapsed_us < IMPORT_TIME_BUDGETS_US[module], f"import {module} took {elapsed_us / 1000:.0f}ms"
+
+
+def test_import_letta_is_lazy():
+    code = "import sys, letta; print('\\n'.join(sorted(sys.modules)))"
+    loaded = set(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, timeout=120).stdout.split())
+    assert not loaded & set(HEAVY_MODULES)
+
+
+def test_lazy_root_attributes():
+    import letta
+    from letta.schemas.agent import AgentState
+
+    assert letta.AgentState is AgentState
+    assert set(letta.__all__) <= set(dir(letta))
+    with pytest.raises(AttributeError):
+        letta.DoesNotExist
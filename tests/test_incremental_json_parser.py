@@ -0,0 +1,127 @@
+import json
+import random
+
+import pytest
+
+from letta.server.rest_api.json_parser import IncrementalJSONParser
+
+DOCUMENTS = [
+    {
+        "inner_thoughts": 'Quotes "inside", a backslash \\ and a newline\n',
+        "message": "Unicode: é ü 漢字 \U0001f600",
+        "numbers": [0, -1, 2.5, -3.25e-2, 1e10],
+        "literals": [True, False, None],
+        "nested": {"a": {"b": [[], {}, [1, [2, [3]]]]}, "empty": ""},
+    },
+    [1, "two", {"three": 3}],
+    "just a string",
+    -12.5,
+    None,
+    {},
+    [],
+]
+
+
+def _feed_randomly(parser: IncrementalJSONParser, text: str, rng: random.Random, max_chunk: int):
+    i = 0
+    while i < len(text):
+        size = rng.randint(1, max_chunk)
+        parser.feed(text[i : i + size])
+        # reading partial values between fragments must not disturb parsing
+        parser.value
+        i += size
+
+
+@pytest.fixture
+def parser():
+    return IncrementalJSONParser()
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_random_chunking_matches_json_loads(document, ensure_ascii):
+    """Every way of splitting the input, including inside escapes and surrogate pairs, gives the json.loads result."""
+    text = json.dumps(document, ensure_ascii=ensure_ascii)
+    rng = random.Random(0)
+    for _ in range(50):
+        parser = IncrementalJSONParser()
+        _feed_randomly(parser, text, rng, max_chunk=6)
+        # a trailing top-level number can't be known to be finished until something follows it
+        parser.feed(" ")
+        assert parser.complete
+        assert parser.value == json.loads(text)
+
+
+def test_partial_values(parser):
+    parser.feed('{"inner_thoughts": "Thinking')
+    assert parser.value == {"inner_thoughts": "Thinking"}
+    assert parser.keys() == ["inner_thoughts"]
+
+    parser.feed(' hard", "message": ')
+    # keys only show up once their value has started
+    assert parser.value == {"inner_thoughts": "Thinking hard"}
+    assert parser.keys() == ["inner_thoughts"]
+
+    parser.feed('"Hel')
+    assert parser.get("message") == "Hel"
+    assert parser.keys() == ["inner_thoughts", "message"]
+
+    parser.feed('lo", "count": 4')
+    assert parser.get("count") == 4
+    parser.feed('2, "flag": tr')
+    # incomplete literals are left out
+    assert parser.value == {"inner_thoughts": "Thinking hard", "message": "Hello", "count": 42}
+
+    parser.feed('ue, "list": [1, {"a": "b')
+    assert parser.get("list") == [1, {"a": "b"}]
+    assert not parser.complete
+
+    parser.feed('"}]}')
+    assert parser.complete
+    assert parser.value == {"inner_thoughts": "Thinking hard", "message": "Hello", "count": 42, "flag": True, "list": [1, {"a": "b"}]}
+
+
+def test_snapshots_are_not_mutated(parser):
+    parser.feed('{"message": "a", "list": [1')
+    snapshot = parser.value
+    parser.feed(', 2], "other": "b"}')
+    assert snapshot == {"message": "a", "list": [1]}
+
+
+def test_read_string_returns_new_text(parser):
+    parser.feed('{"message": "Hello')
+    assert parser.read_string("message") == "Hello"
+    parser.feed(" wor")
+    assert parser.read_string("message", 5) == " wor"
+    parser.feed('ld\\n", "x": 1}')
+    assert parser.read_string("message", 9) == "ld\n"
+    assert parser.read_string("x") is None
+    assert parser.read_string("missing") is None
+
+
+def test_split_escapes(parser):
+    for fragment in ['{"m": "a\\', "nb \\u00", "e9 \\ud83d", "\\ude00", '"}']:
+        parser.feed(fragment)
+    assert parser.value == {"m": "a\nb é \U0001f600"}
+
+
+def test_parse_resumes_from_previous_input(parser):
+    assert parser.parse("") == {}
+    assert parser.parse('{"message": "He') == {"message": "He"}
+    assert parser.parse('{"message": "Hello"}') == {"message": "Hello"}
+
+    # input that doesn't extend the previous one starts over
+    assert parser.parse('{"other": 1') == {"other": 1}
+
+
+def test_trailing_and_malformed_input(parser):
+    parser.feed('{"a": 1} trailing')
+    assert parser.value == {"a": 1}
+    assert parser.last_parse_reminding == "trailing"
+
+    parser.reset()
+    parser.feed('{"a": "b", oops')
+    # malformed input keeps what was parsed before it
+    assert parser.value == {"a": "b"}
+    parser.feed('"c": 1}')
+    assert parser.value == {"a": "b"}
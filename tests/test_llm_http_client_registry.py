@@ -0,0 +1,57 @@
+import anthropic
+import httpx
+import pytest
+from openai import AsyncOpenAI, OpenAI
+
+from letta.llm_api.http_client_registry import LLMHTTPClientRegistry
+from letta.settings import model_settings
+
+
+@pytest.fixture
+def registry():
+    return LLMHTTPClientRegistry()
+
+
+def test_sync_clients_are_cached_by_key(registry):
+    client = registry.get_openai_client(api_key="sk-one", base_url="https://api.openai.com/v1")
+    assert isinstance(client, OpenAI)
+    assert registry.get_openai_client(api_key="sk-one", base_url="https://api.openai.com/v1") is client
+
+    # a different key, endpoint or client option gets its own client
+    assert registry.get_openai_client(api_key="sk-two", base_url="https://api.openai.com/v1") is not client
+    assert registry.get_openai_client(api_key="sk-one", base_url="https://api.together.xyz/v1") is not client
+    assert registry.get_openai_client(api_key="sk-one", base_url="https://api.openai.com/v1", max_retries=0) is not client
+
+
+@pytest.mark.asyncio
+async def test_async_clients_share_one_connection_pool(registry):
+    openai_client = registry.get_async_openai_client(api_key="sk-one", base_url="https://api.openai.com/v1")
+    anthropic_client = registry.get_async_anthropic_client(api_key="sk-ant", max_retries=3)
+    assert isinstance(openai_client, AsyncOpenAI)
+    assert isinstance(anthropic_client, anthropic.AsyncAnthropic)
+    assert registry.get_async_openai_client(api_key="sk-one", base_url="https://api.openai.com/v1") is openai_client
+
+    assert isinstance(openai_client._client, httpx.AsyncClient)
+    assert openai_client._client is anthropic_client._client
+
+    stats = registry.pool_stats()
+    assert stats["cached_clients"] == 2
+    assert stats["active_connections"] == stats["idle_connections"] == 0
+
+    # closing the pool drops the clients built on it
+    await registry.aclose()
+    assert openai_client._client.is_closed
+    fresh_client = registry.get_async_openai_client(api_key="sk-one", base_url="https://api.openai.com/v1")
+    assert fresh_client is not openai_client
+    assert not fresh_client._client.is_closed
+    await registry.aclose()
+
+
+def test_cache_is_bounded(registry, monkeypatch):
+    monkeypatch.setattr(model_settings, "llm_client_cache_size", 2)
+    first = registry.get_openai_client(api_key="sk-1", base_url=None)
+    registry.get_openai_client(api_key="sk-2", base_url=None)
+    registry.get_openai_client(api_key="sk-3", base_url=None)
+
+    assert registry.pool_stats()["cached_clients"] == 2
+    assert registry.get_openai_client(api_key="sk-1", base_url=None) is not first
@@ -0,0 +1,96 @@
+import hashlib
+import os
+import sys
+
+import pytest
+
+from letta.services.tool_sandbox.base import AsyncToolSandboxBase
+from letta.services.tool_sandbox.local_sandbox_worker_pool import LocalSandboxWorkerPool, worker_pool_available
+from letta.settings import tool_settings
+
+pytestmark = pytest.mark.skipif(not worker_pool_available(), reason="local sandbox workers need os.fork")
+
+TOOL_SOURCE = """
+import os
+
+def get_value(key):
+    return os.environ.get(key)
+"""
+
+
+def _request(script: str, tmp_path, env=None, tool_source=TOOL_SOURCE, timeout=10):
+    return {
+        "script": f"exec({AsyncToolSandboxBase.PRECOMPILED_TOOL_CODE_VAR_NAME}, globals())\n{script}",
+        "tool_source": tool_source,
+        "tool_source_hash": hashlib.sha256(tool_source.encode()).hexdigest(),
+        "future_import": False,
+        "tool_code_var_name": AsyncToolSandboxBase.PRECOMPILED_TOOL_CODE_VAR_NAME,
+        "imports": [],
+        "env": {"PATH": os.environ.get("PATH", ""), **(env or {})},
+        "cwd": str(tmp_path),
+        "timeout": timeout,
+    }
+
+
+@pytest.fixture
+async def pool(tmp_path):
+    pool = LocalSandboxWorkerPool(python_executable=sys.executable, env=dict(os.environ), cwd=str(tmp_path))
+    yield pool
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_runs_script_with_call_env_and_cwd(pool, tmp_path):
+    script = "import os, sys\nprint(get_value('SECRET'))\nprint(os.getcwd())\nprint('oops', file=sys.stderr)"
+    response = await pool.run(_request(script, tmp_path, env={"SECRET": "abc"}), timeout=10)
+
+    assert response["returncode"] == 0 and not response["timed_out"]
+    assert response["stdout"].decode().split() == ["abc", str(tmp_path)]
+    assert response["stderr"].decode().strip() == "oops"
+
+
+@pytest.mark.asyncio
+async def test_calls_are_isolated(pool, tmp_path):
+    script = "import os\nprint(globals().get('leaked'), get_value('SECRET'), get_value('LEAKED'))\nleaked = 1\nos.environ['LEAKED'] = '1'"
+    first = await pool.run(_request(script, tmp_path, env={"SECRET": "a"}), timeout=10)
+    second = await pool.run(_request(script, tmp_path), timeout=10)
+
+    assert first["stdout"].decode().split() == ["None", "a", "None"]
+    assert second["stdout"].decode().split() == ["None", "None", "None"]
+
+
+@pytest.mark.asyncio
+async def test_errors_and_exit_codes(pool, tmp_path):
+    response = await pool.run(_request("raise ValueError('bad input')", tmp_path), timeout=10)
+    assert response["returncode"] == 1
+    assert "ValueError: bad input" in response["stderr"].decode()
+
+    response = await pool.run(_request("import sys\nsys.exit(3)", tmp_path), timeout=10)
+    assert response["returncode"] == 3
+
+    response = await pool.run(_request("", tmp_path, tool_source="def broken(:\n"), timeout=10)
+    assert response["returncode"] == 1
+    assert "SyntaxError" in response["stderr"].decode()
+
+    # the worker survives all of the above
+    response = await pool.run(_request("print('still here')", tmp_path), timeout=10)
+    assert response["stdout"].decode().strip() == "still here"
+
+
+@pytest.mark.asyncio
+async def test_timeout_kills_call(pool, tmp_path):
+    response = await pool.run(_request("import time\nprint('started', flush=True)\ntime.sleep(30)", tmp_path, timeout=0.5), timeout=0.5)
+
+    assert response["timed_out"]
+    assert response["stdout"].decode().strip() == "started"
+
+
+@pytest.mark.asyncio
+async def test_workers_are_reused_then_recycled(pool, tmp_path, monkeypatch):
+    monkeypatch.setattr(tool_settings, "tool_sandbox_worker_max_calls", 2)
+    script = "import os\nprint(os.getppid())"
+
+    worker_pids = [int((await pool.run(_request(script, tmp_path), timeout=10))["stdout"]) for _ in range(3)]
+
+    assert worker_pids[0] == worker_pids[1]
+    assert worker_pids[2] != worker_pids[0]
@@ -0,0 +1,88 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from letta.schemas.sandbox_config import LocalSandboxConfig, PipRequirement
+from letta.services.tool_sandbox import local_venv_cache as local_venv_cache_module
+from letta.services.tool_sandbox.local_venv_cache import VENV_CACHE_DIR_NAME, LocalVenvCache
+from letta.settings import tool_settings
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    """Record venv builds instead of running venv and pip."""
+    builds = []
+
+    def create_venv(sandbox_dir_path, venv_path, env, force_recreate):
+        os.makedirs(venv_path, exist_ok=True)
+
+    def install_requirements(local_configs, upgrade, user_install_if_no_venv, env, tool):
+        builds.append(local_venv_cache_module.resolve_pip_requirements(local_configs, tool))
+
+    monkeypatch.setattr(local_venv_cache_module, "create_venv_for_local_sandbox", create_venv)
+    monkeypatch.setattr(local_venv_cache_module, "install_pip_requirements_for_sandbox", install_requirements)
+    return builds
+
+
+def _configs(tmp_path, *names):
+    return LocalSandboxConfig(sandbox_dir=str(tmp_path), use_venv=True, pip_requirements=[PipRequirement(name=name) for name in names])
+
+
+def _tool(*requirements):
+    return SimpleNamespace(name="tool", pip_requirements=list(requirements))
+
+
+def test_venvs_are_built_once_per_requirement_set(tmp_path, builds):
+    cache = LocalVenvCache()
+
+    first = cache.get_or_build(_configs(tmp_path, "cowsay"), _tool("numpy"))
+    # the same set of requirements, however it is split between the sandbox and the tool
+    second = cache.get_or_build(_configs(tmp_path, "numpy"), _tool("cowsay"))
+    other = cache.get_or_build(_configs(tmp_path, "cowsay"))
+
+    assert builds == [["cowsay", "numpy"], ["cowsay"]]
+    assert first.venv_name == second.venv_name != other.venv_name
+    assert first.venv_name.startswith(VENV_CACHE_DIR_NAME)
+
+    cache.get_or_build(_configs(tmp_path, "cowsay"), force_rebuild=True)
+    assert builds[-1] == ["cowsay"] and len(builds) == 3
+
+
+def test_requirements_txt_is_part_of_the_key(tmp_path, builds):
+    cache = LocalVenvCache()
+    before = cache.get_or_build(_configs(tmp_path, "cowsay"))
+    (tmp_path / "requirements.txt").write_text("tqdm\n")
+    after = cache.get_or_build(_configs(tmp_path, "cowsay"))
+
+    assert before.venv_name != after.venv_name
+    assert len(builds) == 2
+
+
+def test_least_recently_used_venvs_are_removed(tmp_path, builds, monkeypatch):
+    monkeypatch.setattr(tool_settings, "tool_sandbox_venv_cache_size", 2)
+    cache = LocalVenvCache()
+
+    a = cache.get_or_build(_configs(tmp_path, "a"))
+    b = cache.get_or_build(_configs(tmp_path, "b"))
+    marker = os.path.join(tmp_path, b.venv_name, local_venv_cache_module.VENV_READY_MARKER)
+    os.utime(marker, (0, 0))
+    # using a venv again makes it the most recently used one
+    cache.get_or_build(_configs(tmp_path, "a"))
+    c = cache.get_or_build(_configs(tmp_path, "c"))
+
+    assert os.path.isdir(os.path.join(tmp_path, a.venv_name))
+    assert not os.path.exists(os.path.join(tmp_path, b.venv_name))
+    assert os.path.isdir(os.path.join(tmp_path, c.venv_name))
+
+
+def test_failed_builds_are_not_reused(tmp_path, builds, monkeypatch):
+    cache = LocalVenvCache()
+
+    def failing_install(*args, **kwargs):
+        raise RuntimeError("Failed to install pip packages")
+
+    monkeypatch.setattr(local_venv_cache_module, "install_pip_requirements_for_sandbox", failing_install)
+    with pytest.raises(RuntimeError):
+        cache.get_or_build(_configs(tmp_path, "does-not-exist"))
+    assert os.listdir(tmp_path / VENV_CACHE_DIR_NAME) == [f"{cache.venv_key(_configs(tmp_path, 'does-not-exist'))}.lock"]
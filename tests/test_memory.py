@@ -56,3 +56,31 @@ def test_memory_jinja2_set_template(sample_memory: Memory):
     )
     with pytest.raises(ValueError):
         sample_memory.set_prompt_template(prompt_template=template_bad_memory_structure)
+
+
+def test_compile_reuses_render_for_unchanged_memory(sample_memory: Memory, monkeypatch):
+    """An unchanged memory is rendered once, and any edit to a block is picked up"""
+    from letta.schemas import memory as memory_module
+
+    renders = []
+    compile_template = memory_module.compile_template
+
+    def counting_compile_template(source):
+        template = compile_template(source)
+        renders.append(source)
+        return template
+
+    monkeypatch.setattr(memory_module, "compile_template", counting_compile_template)
+
+    first = sample_memory.compile()
+    assert sample_memory.compile() == first
+    # an equal copy of the memory (e.g. reloaded for the next step) hits the same render
+    assert sample_memory.model_copy(deep=True).compile() == first
+    assert len(renders) == 1
+
+    sample_memory.update_block_value(label="human", value="User likes tea")
+    updated = sample_memory.compile()
+    assert "User likes tea" in updated and updated != first
+    sample_memory.get_block("human").limit = 1000
+    assert 'chars_limit="1000"' in sample_memory.compile()
+    assert len(renders) == 3
@@ -0,0 +1,174 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from letta.helpers import fan_out as fan_out_module
+from letta.helpers.fan_out import TokenBucket, fan_out, get_provider_rate_limiter, round_robin_priority
+from letta.services.tool_executor.multi_agent_tool_executor import LettaMultiAgentToolExecutor
+from letta.settings import settings
+
+
+async def _collect(generator):
+    return [result async for result in generator]
+
+
+@pytest.mark.asyncio
+async def test_fan_out_bounds_concurrency():
+    running = 0
+    peak = 0
+
+    async def worker(item):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return item * 2
+
+    results = await _collect(fan_out(range(20), worker, max_concurrency=3))
+
+    assert peak == 3
+    assert sorted(result.result for result in results) == [item * 2 for item in range(20)]
+
+
+@pytest.mark.asyncio
+async def test_fan_out_yields_results_as_they_complete():
+    async def worker(delay):
+        await asyncio.sleep(delay)
+        return delay
+
+    results = await _collect(fan_out([0.05, 0.01, 0.03], worker))
+
+    assert [result.result for result in results] == [0.01, 0.03, 0.05]
+
+
+@pytest.mark.asyncio
+async def test_fan_out_starts_items_by_priority():
+    started = []
+
+    async def worker(item):
+        started.append(item)
+        return item
+
+    await _collect(fan_out(["low", "high", "medium"], worker, max_concurrency=1, priority=["high", "medium", "low"].index))
+
+    assert started == ["high", "medium", "low"]
+
+
+@pytest.mark.asyncio
+async def test_fan_out_round_robin_priority_alternates_providers():
+    started = []
+
+    async def worker(item):
+        started.append(item)
+
+    items = [("openai", 0), ("openai", 1), ("openai", 2), ("anthropic", 0), ("anthropic", 1)]
+    await _collect(fan_out(items, worker, max_concurrency=1, priority=round_robin_priority(items, key=lambda item: item[0])))
+
+    assert started == [("openai", 0), ("anthropic", 0), ("openai", 1), ("anthropic", 1), ("openai", 2)]
+
+
+@pytest.mark.asyncio
+async def test_fan_out_reports_errors_and_partial_results_on_timeout():
+    cancelled = []
+
+    async def worker(item):
+        if item == "error":
+            raise ValueError("boom")
+        if item == "slow":
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(item)
+                raise
+        return item
+
+    results = await _collect(fan_out(["fast", "error", "slow", "queued"], worker, max_concurrency=3, timeout=0.1))
+    by_item = {result.item: result for result in results}
+
+    assert by_item["fast"].result == "fast"
+    assert isinstance(by_item["error"].error, ValueError)
+    assert by_item["slow"].timed_out
+    assert by_item["queued"].result == "queued"
+    assert cancelled == ["slow"]
+
+
+@pytest.mark.asyncio
+async def test_fan_out_reports_unstarted_items_on_timeout():
+    async def worker(item):
+        await asyncio.sleep(10)
+
+    results = await _collect(fan_out(["a", "b", "c"], worker, max_concurrency=1, timeout=0.05))
+
+    assert [(result.item, result.timed_out) for result in results] == [("a", True), ("b", True), ("c", True)]
+
+
+def test_token_bucket_allows_burst_then_spaces_out():
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_fan_out_rate_limits_per_provider(monkeypatch):
+    monkeypatch.setattr(settings, "multi_agent_provider_rate_limit", 20)
+    monkeypatch.setattr(settings, "multi_agent_provider_burst", 1)
+    monkeypatch.setattr(fan_out_module, "_provider_buckets", {})
+    started = {}
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def worker(item):
+        started[item] = loop.time() - start
+
+    items = [("openai", 0), ("openai", 1), ("openai", 2), ("anthropic", 0)]
+    await _collect(fan_out(items, worker, rate_limiter=lambda item: get_provider_rate_limiter(item[0])))
+
+    assert started[("anthropic", 0)] < 0.04
+    assert started[("openai", 2)] >= 0.09
+    assert get_provider_rate_limiter("openai") is get_provider_rate_limiter("openai")
+
+
+def test_provider_rate_limiter_disabled_by_default():
+    assert settings.multi_agent_provider_rate_limit == 0
+    assert get_provider_rate_limiter("openai") is None
+
+
+@pytest.mark.asyncio
+async def test_broadcast_reports_errors_outside_the_send(monkeypatch):
+    def agent(agent_id, provider):
+        return SimpleNamespace(id=agent_id, llm_config=SimpleNamespace(model_endpoint_type=provider))
+
+    class FailingBucket:
+        async def acquire(self):
+            raise RuntimeError("rate limiter unavailable")
+
+    monkeypatch.setattr(
+        "letta.services.tool_executor.multi_agent_tool_executor.get_provider_rate_limiter",
+        lambda provider: FailingBucket() if provider == "anthropic" else None,
+    )
+    executor = LettaMultiAgentToolExecutor(None, SimpleNamespace(), None, None, None, actor=None)
+
+    async def list_agents_matching_tags_async(**kwargs):
+        return [agent("agent-a", "openai"), agent("agent-b", "anthropic")]
+
+    async def process_agent(agent_id, message):
+        return {"agent_id": agent_id, "response": ["hi"]}
+
+    executor.agent_manager.list_agents_matching_tags_async = list_agents_matching_tags_async
+    executor._process_agent = process_agent
+
+    response = await executor.send_message_to_agents_matching_tags_async(
+        SimpleNamespace(id="agent-sender"), message="hello", match_all=[], match_some=["worker"]
+    )
+
+    assert response == str(
+        [
+            {"agent_id": "agent-a", "response": ["hi"]},
+            {"agent_id": "agent-b", "error": "rate limiter unavailable", "type": "RuntimeError"},
+        ]
+    )
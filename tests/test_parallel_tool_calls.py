@@ -0,0 +1,165 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from letta.agents.letta_agent import LettaAgent
+from letta.helpers import ToolRulesSolver
+from letta.orm.enums import ToolType
+from letta.schemas.enums import MessageRole
+from letta.schemas.llm_config import LLMConfig
+from letta.schemas.openai.chat_completion_response import FunctionCall, ToolCall, UsageStatistics
+from letta.schemas.tool_execution_result import ToolExecutionResult
+from letta.schemas.tool_rule import ConditionalToolRule, TerminalToolRule
+
+
+def _tool(name: str, tool_type: ToolType = ToolType.CUSTOM):
+    return SimpleNamespace(name=name, tool_type=tool_type, return_char_limit=1000)
+
+
+def _tool_call(i: int, name: str, **args) -> ToolCall:
+    return ToolCall(id=f"call_{i}", function=FunctionCall(name=name, arguments=json.dumps({"request_heartbeat": False, **args})))
+
+
+@pytest.fixture
+def agent_state():
+    return SimpleNamespace(
+        id="agent-00000000-0000-4000-8000-000000000000",
+        project_id=None,
+        timezone="UTC",
+        llm_config=LLMConfig.default_config("gpt-4o-mini").model_copy(update={"parallel_tool_calls": True, "max_parallel_tool_calls": 2}),
+        tools=[
+            _tool("archival_memory_search", ToolType.LETTA_CORE),
+            _tool("core_memory_append", ToolType.LETTA_MEMORY_CORE),
+            _tool("core_memory_replace", ToolType.LETTA_MEMORY_CORE),
+            _tool("finish"),
+        ],
+    )
+
+
+@pytest.fixture
+def agent():
+    message_manager = MagicMock()
+    message_manager.create_many_messages_async = AsyncMock(side_effect=lambda messages, actor: messages)
+    step_manager = MagicMock()
+    step_manager.log_step_async = AsyncMock(return_value=None)
+    return LettaAgent(
+        agent_id="agent-00000000-0000-4000-8000-000000000000",
+        message_manager=message_manager,
+        agent_manager=MagicMock(),
+        block_manager=MagicMock(),
+        job_manager=MagicMock(),
+        passage_manager=MagicMock(),
+        actor=SimpleNamespace(id="user-00000000-0000-4000-8000-000000000000", organization_id="org-00000000-0000-4000-8000-000000000000"),
+        step_manager=step_manager,
+        enable_summarization=False,
+    )
+
+
+def _track_execution(agent: LettaAgent):
+    """Replace tool execution with a fake that records which tools overlap in time."""
+    running, events = set(), []
+
+    async def execute_tool(tool_name, tool_args, agent_state, agent_step_span=None, step_id=None):
+        running.add(tool_args["query"])
+        events.append(set(running))
+        await asyncio.sleep(0.01)
+        running.discard(tool_args["query"])
+        return ToolExecutionResult(status="success", func_return=f"result for {tool_args['query']}")
+
+    agent._execute_tool = execute_tool
+    return events
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_run_concurrently_and_persist_in_order(agent, agent_state):
+    events = _track_execution(agent)
+    tool_calls = [_tool_call(i, "archival_memory_search", query=f"q{i}") for i in range(4)]
+
+    messages, continue_stepping, stop_reason = await agent._handle_parallel_ai_response(
+        tool_calls,
+        [t.name for t in agent_state.tools],
+        agent_state,
+        ToolRulesSolver([]),
+        UsageStatistics(),
+    )
+
+    # concurrency is capped by max_parallel_tool_calls
+    assert max(len(running) for running in events) == 2
+    agent.message_manager.create_many_messages_async.assert_awaited_once()
+
+    assert messages[0].role == MessageRole.assistant
+    assert [tool_call.id for tool_call in messages[0].tool_calls] == [f"call_{i}" for i in range(4)]
+    tool_messages = [m for m in messages if m.role == MessageRole.tool]
+    assert [m.tool_call_id for m in tool_messages] == [f"call_{i}" for i in range(4)]
+    assert [json.loads(m.content[0].text)["message"] for m in tool_messages] == [f"result for q{i}" for i in range(4)]
+    assert not continue_stepping and stop_reason is None
+
+
+@pytest.mark.asyncio
+async def test_memory_edits_run_one_at_a_time(agent, agent_state):
+    events = _track_execution(agent)
+    tool_calls = [
+        _tool_call(0, "core_memory_append", query="append"),
+        _tool_call(1, "core_memory_replace", query="replace"),
+        _tool_call(2, "archival_memory_search", query="search"),
+    ]
+
+    await agent._handle_parallel_ai_response(
+        tool_calls, [t.name for t in agent_state.tools], agent_state, ToolRulesSolver([]), UsageStatistics()
+    )
+
+    assert not any({"append", "replace"} <= running for running in events)
+    assert any({"append", "search"} <= running for running in events)
+
+
+@pytest.mark.asyncio
+async def test_calls_after_terminal_tool_are_not_run(agent, agent_state):
+    events = _track_execution(agent)
+    tool_calls = [
+        _tool_call(0, "archival_memory_search", query="search"),
+        _tool_call(1, "finish", query="finish"),
+        _tool_call(2, "archival_memory_search", query="too late"),
+    ]
+
+    messages, continue_stepping, _ = await agent._handle_parallel_ai_response(
+        tool_calls,
+        [t.name for t in agent_state.tools],
+        agent_state,
+        ToolRulesSolver([TerminalToolRule(tool_name="finish")]),
+        UsageStatistics(),
+    )
+
+    assert set().union(*events) == {"search", "finish"}
+    assert not continue_stepping
+    skipped = json.loads([m for m in messages if m.tool_call_id == "call_2" and m.role == MessageRole.tool][0].content[0].text)
+    assert skipped["status"] == "Failed"
+    assert "must be called on its own" in skipped["message"]
+
+
+@pytest.mark.asyncio
+async def test_conditional_tool_output_decides_next_tools(agent, agent_state):
+    _track_execution(agent)
+    agent_state.tools.append(_tool("route"))
+    tool_rules_solver = ToolRulesSolver(
+        [ConditionalToolRule(tool_name="route", child_output_mapping={"result for route": "core_memory_append"}, default_child="finish")]
+    )
+    tool_calls = [
+        _tool_call(0, "route", query="route"),
+        _tool_call(1, "archival_memory_search", query="too late"),
+    ]
+
+    messages, continue_stepping, _ = await agent._handle_parallel_ai_response(
+        tool_calls, [t.name for t in agent_state.tools], agent_state, tool_rules_solver, UsageStatistics()
+    )
+
+    assert continue_stepping
+    allowed = tool_rules_solver.get_allowed_tool_names(
+        available_tools={t.name for t in agent_state.tools}, last_function_response=agent.last_function_response
+    )
+    assert allowed == ["core_memory_append"]
+    # the routing call's response is the last one in history, so the next step sees it too
+    assert [m.tool_call_id for m in messages if m.role == MessageRole.tool] == ["call_1", "call_0"]
+    assert agent._load_last_function_response(messages) == "result for route"
@@ -0,0 +1,156 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from letta.agents.letta_agent import LettaAgent
+from letta.helpers.tokenizer import tokenizer
+from letta.local_llm.utils import message_token_counts_key
+from letta.schemas.enums import MessageRole
+from letta.schemas.letta_message_content import TextContent
+from letta.schemas.llm_config import LLMConfig
+from letta.schemas.message import Message
+from letta.services.context_window_calculator.prompt_token_estimator import (
+    TOKENS_PER_MESSAGE,
+    PromptTokenEstimator,
+    context_window_budget,
+    prompt_token_estimator,
+)
+
+AGENT_ID = "agent-00000000-0000-4000-8000-000000000000"
+
+
+@pytest.fixture(autouse=True)
+def count_batch():
+    # count characters rather than download a tiktoken encoding
+    with patch.object(tokenizer, "count_batch", side_effect=lambda texts: [len(text) for text in texts]) as count_batch:
+        yield count_batch
+    prompt_token_estimator.clear()
+
+
+def _message(role: MessageRole, text: str) -> Message:
+    return Message(role=role, content=[TextContent(text=text)], agent_id=AGENT_ID)
+
+
+@pytest.fixture
+def messages():
+    return [
+        _message(MessageRole.system, "You are a helpful agent. " * 50),
+        _message(MessageRole.user, "What is the capital of France?"),
+        _message(MessageRole.assistant, "Paris."),
+    ]
+
+
+@pytest.fixture
+def agent():
+    return LettaAgent(
+        agent_id=AGENT_ID,
+        message_manager=MagicMock(),
+        agent_manager=MagicMock(),
+        block_manager=MagicMock(),
+        job_manager=MagicMock(),
+        passage_manager=MagicMock(),
+        actor=SimpleNamespace(id="user-00000000-0000-4000-8000-000000000000", organization_id="org-00000000-0000-4000-8000-000000000000"),
+    )
+
+
+def _counted_texts(count_batch) -> int:
+    return sum(len(call.args[0]) for call in count_batch.call_args_list)
+
+
+def test_estimate_caches_message_counts(messages, count_batch):
+    estimator = PromptTokenEstimator()
+    first = estimator.estimate(messages)
+    assert _counted_texts(count_batch) == len(messages)
+
+    # the next step only counts what is new
+    second = estimator.estimate(messages + [_message(MessageRole.user, "And of Spain?")])
+    assert _counted_texts(count_batch) == len(messages) + 1
+    assert second > first
+
+
+def test_estimate_counts_tools(messages):
+    estimator = PromptTokenEstimator()
+    tools = [{"type": "function", "function": {"name": "send_message", "parameters": {"type": "object", "properties": {}}}}]
+    without_tools = estimator.estimate(messages)
+    assert estimator.estimate(messages, tools) > without_tools
+    assert without_tools >= len(messages) * TOKENS_PER_MESSAGE
+
+
+def test_estimate_evicts_least_recently_used(count_batch):
+    estimator = PromptTokenEstimator(max_cached_counts=2)
+    first, second, third = (_message(MessageRole.user, text) for text in ("first", "second", "third"))
+    estimator.estimate([first, second])
+    estimator.estimate([first, third])
+    assert _counted_texts(count_batch) == 3
+    estimator.estimate([first])
+    assert _counted_texts(count_batch) == 3
+    estimator.estimate([second])
+    assert _counted_texts(count_batch) == 4
+
+
+@pytest.mark.asyncio
+async def test_estimate_uses_persisted_counts(messages, count_batch):
+    key = message_token_counts_key("gpt-4o-mini")
+    counted = messages[0].model_copy(update={"token_counts": {key: 7}})
+    estimator = PromptTokenEstimator()
+
+    # only the messages without a persisted count of the model's tokenizer family are tokenized, off the event loop
+    estimated = await estimator.estimate_async([counted] + messages[1:], model="gpt-4o-mini")
+    assert _counted_texts(count_batch) == len(messages) - 1
+    assert estimated == 7 + sum(estimator.count_message(message) for message in messages[1:])
+
+    # other tokenizer families' counts don't apply
+    other = messages[0].model_copy(update={"token_counts": {"anthropic": 7}})
+    assert estimator.estimate([other], model="gpt-4o-mini") == estimator.count_message(messages[0])
+
+
+def test_context_window_budget():
+    llm_config = LLMConfig.default_config("gpt-4o-mini")
+    assert context_window_budget(llm_config) == int(llm_config.context_window * 0.9)
+    assert context_window_budget(llm_config.model_copy(update={"context_window_safety_margin": 0.25})) == 96000
+    assert context_window_budget(llm_config.model_copy(update={"context_window_safety_margin": None})) is None
+
+
+@pytest.mark.asyncio
+async def test_preflight_summarizes_over_budget(agent, messages):
+    rebuilt = messages[:1]
+    agent._rebuild_context_window = AsyncMock(return_value=rebuilt)
+    llm_config = LLMConfig.default_config("gpt-4o-mini").model_copy(update={"context_window": 100})
+
+    assert await agent._preflight_context_window({}, messages, [], llm_config) is rebuilt
+    assert agent._rebuild_context_window.await_args.kwargs["force"] is True
+    assert agent._rebuild_context_window.await_args.kwargs["clear"] is False
+
+
+@pytest.mark.asyncio
+async def test_preflight_sends_within_budget(agent, messages):
+    agent._rebuild_context_window = AsyncMock()
+    llm_config = LLMConfig.default_config("gpt-4o-mini")
+
+    assert await agent._preflight_context_window({}, messages, [], llm_config) is None
+    assert (
+        await agent._preflight_context_window(
+            {}, messages, [], llm_config.model_copy(update={"context_window": 100, "context_window_safety_margin": None})
+        )
+        is None
+    )
+    agent._rebuild_context_window.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_preflight_sends_request_if_summarization_fails(agent, messages):
+    agent._rebuild_context_window = AsyncMock(side_effect=RuntimeError("summarizer unavailable"))
+    llm_config = LLMConfig.default_config("gpt-4o-mini").model_copy(update={"context_window": 100})
+
+    assert await agent._preflight_context_window({}, messages, [], llm_config) is None
+
+
+@pytest.mark.asyncio
+async def test_preflight_sends_request_if_estimate_fails(agent, messages, count_batch):
+    count_batch.side_effect = OSError("no tokenizer available")
+    agent._rebuild_context_window = AsyncMock()
+    llm_config = LLMConfig.default_config("gpt-4o-mini").model_copy(update={"context_window": 100})
+
+    assert await agent._preflight_context_window({}, messages, [], llm_config) is None
+    agent._rebuild_context_window.assert_not_awaited()
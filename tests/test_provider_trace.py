@@ -20,8 +20,10 @@ from letta.services.block_manager import BlockManager
 from letta.services.job_manager import JobManager
 from letta.services.message_manager import MessageManager
 from letta.services.passage_manager import PassageManager
+from letta.services.provider_trace_writer import provider_trace_writer
 from letta.services.step_manager import StepManager
 from letta.services.telemetry_manager import NoopTelemetryManager, TelemetryManager
+from letta.settings import settings
 
 
 def _run_server():
@@ -119,6 +121,7 @@ async def test_provider_trace_experimental_step(message, agent_state, default_us
     )
 
     response = await experimental_agent.step([MessageCreate(role="user", content=[TextContent(text=message)])])
+    await provider_trace_writer.flush()
     tool_step = response.messages[0].step_id
     reply_step = response.messages[-1].step_id
 
@@ -158,6 +161,7 @@ async def test_provider_trace_experimental_step_stream(message, agent_state, def
             message_id = json.loads(body[1])["id"]
 
     await result.stream_response(send=test_send)
+    await provider_trace_writer.flush()
 
     messages = await experimental_agent.message_manager.get_messages_by_ids_async([message_id], actor=default_user)
     step_ids = set((message.step_id for message in messages))
@@ -177,6 +181,8 @@ async def test_provider_trace_step(client, agent_state, default_user, message, e
     )
     tool_step = response.messages[0].step_id
     reply_step = response.messages[-1].step_id
+    # the server writes provider traces in the background
+    await asyncio.sleep(settings.provider_trace_flush_interval_seconds + 1)
 
     tool_telemetry = await TelemetryManager().get_provider_trace_by_step_id_async(step_id=tool_step, actor=default_user)
     reply_telemetry = await TelemetryManager().get_provider_trace_by_step_id_async(step_id=reply_step, actor=default_user)
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from letta.constants import MAX_EMBEDDING_DIM
+from letta.services.vector_index.sqlite_vector_index import SqliteVectorIndex, _EmbeddingMatrix
+
+DIM = 32
+
+
+def _padded(vector: np.ndarray) -> list:
+    return np.pad(vector, (0, MAX_EMBEDDING_DIM - vector.shape[0])).tolist()
+
+
+def _brute_force(query: np.ndarray, embeddings: dict, limit: int) -> list:
+    distances = {
+        passage_id: 1.0 - float(np.dot(query, embedding) / (np.linalg.norm(query) * np.linalg.norm(embedding)))
+        for passage_id, embedding in embeddings.items()
+    }
+    return sorted(distances, key=distances.get)[:limit]
+
+
+@pytest.fixture
+def index(tmp_path):
+    return SqliteVectorIndex(index_dir=tmp_path)
+
+
+def test_embedding_matrix_matches_brute_force(tmp_path):
+    rng = np.random.default_rng(0)
+    embeddings = {f"passage-{i}": rng.standard_normal(DIM).astype(np.float32) for i in range(1000)}
+    matrix = _EmbeddingMatrix(path=tmp_path / "agent-test", dim=DIM)
+    matrix.upsert(list(embeddings), np.stack(list(embeddings.values())))
+
+    assert matrix.capacity >= 1000
+    query = rng.standard_normal(DIM).astype(np.float32)
+    ranked = [passage_id for passage_id, _ in matrix.search(query, list(embeddings), limit=10)]
+    assert ranked == _brute_force(query, embeddings, 10)
+
+    # restricting to a subset of candidates only ranks those
+    subset = list(embeddings)[:50]
+    ranked = [passage_id for passage_id, _ in matrix.search(query, subset, limit=5)]
+    assert ranked == _brute_force(query, {k: embeddings[k] for k in subset}, 5)
+
+
+def test_embedding_matrix_update_remove_and_compact(tmp_path):
+    rng = np.random.default_rng(1)
+    ids = [f"passage-{i}" for i in range(600)]
+    matrix = _EmbeddingMatrix(path=tmp_path / "agent-test", dim=DIM)
+    matrix.upsert(ids, rng.standard_normal((600, DIM)).astype(np.float32))
+
+    target = rng.standard_normal(DIM).astype(np.float32)
+    matrix.upsert(["passage-7"], target[None, :])
+    assert matrix.search(target, ids, limit=1)[0][0] == "passage-7"
+
+    matrix.remove(ids[:400])
+    assert matrix.size == 200  # compacted once most rows were dead
+    assert set(matrix.row_by_id) == set(ids[400:])
+    assert [passage_id for passage_id, _ in matrix.search(target, ids[400:], limit=3)][0] in ids[400:]
+
+
+def test_stores_native_dimension_only(index):
+    vector = np.arange(1, DIM + 1, dtype=np.float32)
+    index._upsert(("agent", "agent-1"), ["passage-1"], [_padded(vector)])
+    assert index._collections[("agent", "agent-1")].dim == DIM
+
+
+@pytest.mark.asyncio
+async def test_search_across_collections(index):
+    rng = np.random.default_rng(2)
+    agent_embeddings = {f"agent-passage-{i}": rng.standard_normal(DIM).astype(np.float32) for i in range(20)}
+    source_embeddings = {f"source-passage-{i}": rng.standard_normal(DIM).astype(np.float32) for i in range(20)}
+    index._upsert(("agent", "agent-1"), list(agent_embeddings), [_padded(e) for e in agent_embeddings.values()])
+    index._upsert(("source", "source-1"), list(source_embeddings), [_padded(e) for e in source_embeddings.values()])
+
+    candidates = [(passage_id, ("agent", "agent-1")) for passage_id in agent_embeddings]
+    candidates += [(passage_id, ("source", "source-1")) for passage_id in source_embeddings]
+    query = rng.standard_normal(DIM).astype(np.float32)
+
+    # every candidate is already indexed, so no session is needed
+    ranked = await index.search_async(None, _padded(query), candidates, limit=7)
+    assert ranked == _brute_force(query, {**agent_embeddings, **source_embeddings}, 7)
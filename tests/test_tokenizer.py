@@ -0,0 +1,124 @@
+import pytest
+import tiktoken
+
+from letta.helpers import tokenizer as tokenizer_module
+from letta.helpers.tokenizer import Tokenizer, get_encoding
+from letta.local_llm.utils import num_tokens_from_functions, num_tokens_from_messages, num_tokens_per_message
+
+# one token per byte, so the tests don't download an encoding
+BYTE_ENCODING = tiktoken.Encoding(
+    name="bytes",
+    pat_str=r"\S+|\s+",
+    mergeable_ranks={bytes([i]): i for i in range(256)},
+    special_tokens={},
+)
+
+
+@pytest.fixture(autouse=True)
+def byte_encoding(monkeypatch):
+    monkeypatch.setattr(tokenizer_module, "get_encoding", lambda model: BYTE_ENCODING)
+    monkeypatch.setattr("letta.local_llm.utils.get_encoding", lambda model: BYTE_ENCODING)
+    tokenizer_module.tokenizer.clear()
+    yield
+    tokenizer_module.tokenizer.clear()
+
+
+def test_get_encoding_is_memoized(monkeypatch):
+    lookups = []
+
+    def encoding_for_model(model):
+        lookups.append(model)
+        if model == "unknown-model":
+            raise KeyError(model)
+        return BYTE_ENCODING
+
+    monkeypatch.setattr(tiktoken, "encoding_for_model", encoding_for_model)
+    monkeypatch.setattr(tiktoken, "get_encoding", lambda name: BYTE_ENCODING)
+    get_encoding.cache_clear()
+    try:
+        for _ in range(3):
+            assert get_encoding("gpt-4") is BYTE_ENCODING
+            assert get_encoding("unknown-model") is BYTE_ENCODING
+        assert lookups == ["gpt-4", "unknown-model"]
+    finally:
+        get_encoding.cache_clear()
+
+
+def test_count_batch_caches_long_texts():
+    tokenizer = Tokenizer(min_cached_text_length=100)
+    long_text, short_text = "x" * 200, "hello"
+
+    assert tokenizer.count_batch([long_text, short_text]) == [200, 5]
+    assert tokenizer.misses == 1
+    assert tokenizer.count(long_text) == 200
+    assert tokenizer.hits == 1
+    # short texts are encoded every time
+    assert tokenizer.count(short_text) == 5
+    assert tokenizer.hits == 1 and tokenizer.misses == 1
+
+    # counts are per model
+    assert tokenizer.count(long_text, model="gpt-4o") == 200
+    assert tokenizer.misses == 2
+
+
+def test_count_batch_evicts_least_recently_used():
+    tokenizer = Tokenizer(max_cached_counts=2, min_cached_text_length=0)
+    tokenizer.count_batch(["a", "bb", "ccc"])
+    tokenizer.count_batch(["bb", "ccc"])
+    assert tokenizer.hits == 2
+    tokenizer.count("a")
+    assert tokenizer.misses == 4
+
+
+def test_count_batch_in_parallel():
+    texts = [f"message {i} " * (i % 7) for i in range(1000)]
+    serial = Tokenizer(max_workers=1).count_batch(texts)
+    parallel = Tokenizer(max_workers=4).count_batch(texts)
+    assert parallel == serial == [len(text.encode()) for text in texts]
+
+
+def test_count_cached():
+    tokenizer = Tokenizer()
+    calls = []
+
+    def counter():
+        calls.append(1)
+        return 42
+
+    assert tokenizer.count_cached("functions:[]", "gpt-4", counter) == 42
+    assert tokenizer.count_cached("functions:[]", "gpt-4", counter) == 42
+    assert len(calls) == 1
+
+
+def test_num_tokens_from_messages_is_sum_of_messages():
+    messages = [
+        {"role": "system", "content": "You are a helpful agent."},
+        {"role": "user", "content": "What is the capital of France?", "name": "bob"},
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{"id": "call_1", "type": "function", "function": {"name": "send_message", "arguments": '{"message": "Paris"}'}}],
+        },
+    ]
+    per_message = num_tokens_per_message(messages, model="gpt-4o-mini")
+    assert per_message[0] == 3 + len("system") + len("You are a helpful agent.")
+    assert per_message[1] == 3 + len("user") + len("What is the capital of France?") + len("bob") + 1
+    assert per_message[2] == 3 + len("assistant") + len("call_1function") + len("send_message") + len('{"message": "Paris"}') + 6 + 12
+    assert num_tokens_from_messages(messages, model="gpt-4o-mini") == sum(per_message) + 3
+
+    with pytest.raises(ValueError):
+        num_tokens_per_message([{"role": "user", "content": 1}])
+
+
+def test_num_tokens_from_functions_is_cached():
+    functions = [
+        {
+            "name": "send_message",
+            "description": "Sends a message to the human user.",
+            "parameters": {"type": "object", "properties": {"message": {"type": "string", "description": "Message contents."}}},
+        }
+    ]
+    count = num_tokens_from_functions(functions, model="gpt-4")
+    misses = tokenizer_module.tokenizer.misses
+    assert num_tokens_from_functions(functions, model="gpt-4") == count
+    assert tokenizer_module.tokenizer.misses == misses
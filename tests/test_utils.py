@@ -4,6 +4,7 @@ from letta.constants import MAX_FILENAME_LENGTH
 from letta.functions.ast_parsers import coerce_dict_args_by_annotations, get_function_annotations_from_source
 from letta.schemas.file import FileMetadata
 from letta.services.file_processor.chunker.line_chunker import LineChunker
+from letta.services.file_processor.chunker.line_index import LineIndex
 from letta.services.helpers.agent_manager_helper import safe_format
 from letta.utils import sanitize_filename
 
@@ -508,3 +509,30 @@ def test_line_chunker_only_start_parameter():
     # Test invalid start only
     with pytest.raises(ValueError, match="File test.py has only 3 lines, but requested offset 4 is out of range"):
         chunker.chunk_text(file, start=3, validate_range=True)
+
+
+@pytest.mark.parametrize(
+    "file_name,text",
+    [
+        ("test.py", "def f():\n    return 1  \n\n\r\n\tpass\x85x  y \n"),
+        ("test.json", '  {\n  "a": 1,\r\n\n  "b": [2, 3]\n}  '),
+        ("test.md", "  # Title\n\nFirst sentence.  Second   sentence!\nThird? yes.   Fourth.\n"),
+        ("test.txt", " ".join(f"word{i}" + ("\n\n" if i % 17 == 0 else "") for i in range(200))),
+    ],
+)
+def test_line_chunker_line_index_matches_chunks(file_name, text):
+    """Test that the chunks read through a file's line index are the chunks LineChunker splits it into"""
+    file = FileMetadata(file_name=file_name, source_id="test_source", content=text)
+    chunker = LineChunker()
+    line_index = chunker.build_line_index(file)
+
+    chunks = [line.split(": ", 1)[1] for line in chunker.chunk_text(file, add_metadata=False)]
+    assert line_index.chunks(text) == chunks
+    assert len(line_index) == len(chunks)
+
+    # a range of chunks only needs its own spans and the text they cover
+    line_index = LineIndex.from_bytes(line_index.strategy, line_index.to_bytes())
+    ranged_index = LineIndex(line_index.strategy, line_index.offsets[2:8])
+    text_start, text_end = ranged_index.text_span()
+    assert ranged_index.chunks(text[text_start:text_end], text_offset=text_start) == chunks[1:4]
+    assert line_index.chunks(text, 1, 4) == chunks[1:4]
@@ -1,7 +1,9 @@
 import numpy as np
 
+from letta.constants import MAX_EMBEDDING_DIM
 from letta.orm.sqlalchemy_base import adapt_array
-from letta.orm.sqlite_functions import convert_array, verify_embedding_dimension
+from letta.orm.sqlite_functions import convert_array, cosine_distance, verify_embedding_dimension
+from letta.schemas.passage import unpad_embedding
 
 
 def test_vector_conversions():
@@ -36,4 +38,27 @@ def test_vector_conversions():
     print("✓ None handling verified")
 
 
+def test_unpad_embedding():
+    """Padded embeddings are trimmed to their native dimension; anything else is left alone"""
+    native = np.random.random(1536).astype(np.float32).tolist()
+    padded = native + [0.0] * (MAX_EMBEDDING_DIM - len(native))
+
+    assert unpad_embedding(padded, embedding_dim=1536) == native
+    # without a (matching) embedding_dim the last non-zero value marks the native dimension
+    assert unpad_embedding(padded) == native
+    assert unpad_embedding(padded, embedding_dim=1024) == native
+    assert unpad_embedding(native, embedding_dim=1536) is native
+
+
+def test_cosine_distance_padded_and_native():
+    """The SQLite UDF gives the same distance whether either side is zero-padded or not"""
+    query = np.random.random(768).astype(np.float32)
+    stored = np.random.random(768).astype(np.float32)
+    padded = np.pad(stored, (0, MAX_EMBEDDING_DIM - stored.shape[0]))
+
+    expected = cosine_distance(adapt_array(stored), adapt_array(query))
+    assert np.isclose(cosine_distance(adapt_array(padded), adapt_array(query)), expected)
+    assert np.isclose(cosine_distance(adapt_array(stored), adapt_array(np.pad(query, (0, 128)))), expected)
+
+
 # Run the tests